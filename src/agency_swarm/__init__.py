@@ -1,5 +1,6 @@
 import importlib
 import importlib.util
+from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
 
@@ -66,14 +67,20 @@ from openai.types.shared import Reasoning  # noqa: E402
 from .agency.core import Agency  # noqa: E402
 from .agent.core import AgencyContext, Agent  # noqa: E402
 from .agent.execution_streaming import StreamingRunResponse  # noqa: E402
+from .agent.guardrail_cache import GuardrailCache, InMemoryVerdictStore, VerdictStore  # noqa: E402
+from .agent.starter_cache_store import DirectoryStarterStore, SQLiteStarterStore, StarterCacheStore  # noqa: E402
 from .context import MasterContext  # noqa: E402
 from .hooks import PersistenceHooks  # noqa: E402
-from .integrations.fastapi import run_fastapi  # noqa: E402
-from .integrations.mcp_server import run_mcp  # noqa: E402
-from .integrations.realtime import run_realtime  # noqa: E402
+from .messages.history_compaction import (  # noqa: E402
+    HistoryCompaction,
+    SlidingWindow,
+    SummaryCheckpoint,
+    TruncateToolOutputs,
+)
 from .reminders import AfterEveryUserMessage, EveryNToolCalls, SystemReminder  # noqa: E402
 from .tools import (  # noqa: E402
     BaseTool,
+    BroadcastSendMessage,
     CodeInterpreter,
     CodeInterpreterContainer,
     CodeInterpreterContainerCodeInterpreterToolAuto,
@@ -109,20 +116,39 @@ from .tools import (  # noqa: E402
     tool_output_image_from_file_id,
     tool_output_image_from_path,
 )
+from .utils.run_budget import BudgetExceededError, RunBudget  # noqa: E402
 from .utils.thread import ThreadManager  # noqa: E402
 
+if TYPE_CHECKING:
+    from .integrations.fastapi import run_fastapi
+    from .integrations.mcp_server import run_mcp
+    from .integrations.realtime import run_realtime
+
 __all__ = [
     "Agent",
     "Agency",
     "AgencyContext",
     "AfterEveryUserMessage",
     "EveryNToolCalls",
+    "HistoryCompaction",
+    "SlidingWindow",
+    "SummaryCheckpoint",
+    "TruncateToolOutputs",
     "StreamingRunResponse",
+    "GuardrailCache",
+    "InMemoryVerdictStore",
+    "VerdictStore",
+    "StarterCacheStore",
+    "DirectoryStarterStore",
+    "SQLiteStarterStore",
+    "RunBudget",
+    "BudgetExceededError",
     "BaseTool",
     "MasterContext",
     "ThreadManager",
     "PersistenceHooks",
     "SendMessage",
+    "BroadcastSendMessage",
     "run_fastapi",
     "run_realtime",
     "run_mcp",
@@ -208,6 +234,13 @@ __all__ = [
     "tool_output_file_from_file_id",
 ]
 
+# Server integrations pull in FastAPI, FastMCP and the realtime SDK, so they are imported on first access
+_LAZY_INTEGRATION_EXPORTS = {
+    "run_fastapi": ".integrations.fastapi",
+    "run_mcp": ".integrations.mcp_server",
+    "run_realtime": ".integrations.realtime",
+}
+
 _OPENCLAW_EXPORTS = {
     "OpenClawIntegrationConfig",
     "OpenClawRuntime",
@@ -228,7 +261,11 @@ if _JUPYTER_AVAILABLE:
 
 
 def __getattr__(name: str):
-    """Provide helpful error messages for optional dependencies."""
+    """Import integration entry points on first use and give helpful errors for optional dependencies."""
+    if name in _LAZY_INTEGRATION_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_INTEGRATION_EXPORTS[name], package=__name__), name)
+        globals()[name] = value
+        return value
     if name == "LitellmModel":
         try:
             from agents.extensions.models.litellm_model import LitellmModel
@@ -364,6 +364,7 @@ class Agency:
         file_ids: list[str] | None = None,
         additional_instructions: str | None = None,
         agency_context_override: AgencyContext | None = None,
+        thread_manager_override: ThreadManager | None = None,
         **kwargs: Any,
     ) -> RunResult:
         """
@@ -381,6 +382,8 @@ class Agency:
             context_override (dict[str, Any] | None, optional): Additional context to pass to the agent run.
             agency_context_override (AgencyContext | None, optional): Run-scoped agency context to use instead of
                 the default context derived from the agency instance.
+            thread_manager_override (ThreadManager | None, optional): Conversation store for this run only. Pass a
+                separate ThreadManager per conversation to multiplex many concurrent conversations over one agency.
             hooks_override (RunHooks | None, optional): Specific hooks to use for this run, overriding
                                                        agency-level persistence hooks.
             run_config (RunConfig | None, optional): Configuration for the agent run.
@@ -405,6 +408,7 @@ class Agency:
             file_ids,
             additional_instructions,
             agency_context_override=agency_context_override,
+            thread_manager_override=thread_manager_override,
             **kwargs,
         )
 
@@ -418,6 +422,7 @@ class Agency:
         file_ids: list[str] | None = None,
         additional_instructions: str | None = None,
         agency_context_override: AgencyContext | None = None,
+        thread_manager_override: ThreadManager | None = None,
         **kwargs: Any,
     ) -> RunResult:
         """Synchronous wrapper around :meth:`get_response`."""
@@ -433,6 +438,7 @@ class Agency:
             file_ids,
             additional_instructions,
             agency_context_override=agency_context_override,
+            thread_manager_override=thread_manager_override,
             **kwargs,
         )
 
@@ -446,6 +452,7 @@ class Agency:
         file_ids: list[str] | None = None,
         additional_instructions: str | None = None,
         agency_context_override: AgencyContext | None = None,
+        thread_manager_override: ThreadManager | None = None,
         **kwargs: Any,
     ) -> StreamingRunResponse:
         """
@@ -462,6 +469,8 @@ class Agency:
             context_override (dict[str, Any] | None, optional): Additional context for the run.
             agency_context_override (AgencyContext | None, optional): Run-scoped agency context to use instead of
                 the default context derived from the agency instance.
+            thread_manager_override (ThreadManager | None, optional): Conversation store for this run only. Pass a
+                separate ThreadManager per conversation to multiplex many concurrent conversations over one agency.
             hooks_override (RunHooks | None, optional): Specific hooks for this run.
             run_config_override (RunConfig | None, optional): Specific run configuration for this run.
             file_ids (list[str] | None, optional): Additional file IDs for the agent run.
@@ -485,6 +494,7 @@ class Agency:
             file_ids,
             additional_instructions,
             agency_context_override=agency_context_override,
+            thread_manager_override=thread_manager_override,
             **kwargs,
         )
 
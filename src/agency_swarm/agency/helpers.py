@@ -13,6 +13,7 @@ from agency_swarm.agent.constants import AgentVoice
 if TYPE_CHECKING:
     from agency_swarm.agent.core import AgencyContext, Agent
     from agency_swarm.integrations.fastapi_utils.oauth_support import OAuthUserIdDependency
+    from agency_swarm.utils.thread import ThreadManager
 
     from .core import Agency
 
@@ -56,9 +57,11 @@ def read_instructions(agency: "Agency", path: str) -> None:
         agency.shared_instructions = f.read()
 
 
-def get_agent_context(agency: "Agency", agent_name: str) -> "AgencyContext":
+def get_agent_context(
+    agency: "Agency", agent_name: str, thread_manager_override: "ThreadManager | None" = None
+) -> "AgencyContext":
     """Get the agency context for a specific agent."""
-    return agency.get_agent_context(agent_name)
+    return agency.get_agent_context(agent_name, thread_manager_override)
 
 
 def run_fastapi(
@@ -8,6 +8,7 @@ from typing import TYPE_CHECKING, Any, cast
 
 if TYPE_CHECKING:
     from agency_swarm.agent.context_types import AgencyContext
+    from agency_swarm.utils.thread import ThreadManager
 
     from .core import Agency
 
@@ -178,6 +179,7 @@ async def get_response(
     file_ids: list[str] | None = None,
     additional_instructions: str | None = None,
     agency_context_override: "AgencyContext | None" = None,
+    thread_manager_override: "ThreadManager | None" = None,
     **kwargs: Any,
 ) -> RunResult:
     """
@@ -198,6 +200,8 @@ async def get_response(
         file_ids (list[str] | None, optional): Additional file IDs for the agent run.
         additional_instructions (str | None, optional): Additional instructions to be appended to the recipient
             agent's instructions for this run only.
+        thread_manager_override (ThreadManager | None, optional): Conversation store for this run only. Lets one
+            long-lived agency serve many concurrent conversations without sharing history.
         **kwargs: Additional arguments passed down to the target agent's `get_response` method
                   and subsequently to `agents.Runner.run`.
 
@@ -228,7 +232,7 @@ async def get_response(
     effective_hooks = _resolve_effective_hooks(agency, hooks_override)
 
     # Get agency context for the target agent (stateless context passing)
-    agency_context = agency_context_override or get_agent_context(agency, target_agent.name)
+    agency_context = agency_context_override or get_agent_context(agency, target_agent.name, thread_manager_override)
 
     # On handoffs all servers need to be initialized to be used
     previous_oauth_user_id = _set_attach_oauth_user_context(agency, context_override)
@@ -266,6 +270,7 @@ def get_response_sync(
     file_ids: list[str] | None = None,
     additional_instructions: str | None = None,
     agency_context_override: "AgencyContext | None" = None,
+    thread_manager_override: "ThreadManager | None" = None,
     **kwargs: Any,
 ) -> RunResult:
     """Synchronous wrapper around :meth:`get_response`."""
@@ -277,6 +282,7 @@ def get_response_sync(
             recipient_agent=recipient_agent,
             context_override=context_override,
             agency_context_override=agency_context_override,
+            thread_manager_override=thread_manager_override,
             hooks_override=hooks_override,
             run_config=run_config,
             file_ids=file_ids,
@@ -319,6 +325,7 @@ def get_response_stream(
     file_ids: list[str] | None = None,
     additional_instructions: str | None = None,
     agency_context_override: "AgencyContext | None" = None,
+    thread_manager_override: "ThreadManager | None" = None,
     **kwargs: Any,
 ) -> StreamingRunResponse:
     """
@@ -338,6 +345,8 @@ def get_response_stream(
         file_ids (list[str] | None, optional): Additional file IDs for the agent run.
         additional_instructions (str | None, optional): Additional instructions to be appended to the recipient
             agent's instructions for this run only.
+        thread_manager_override (ThreadManager | None, optional): Conversation store for this run only. Lets one
+            long-lived agency serve many concurrent conversations without sharing history.
         **kwargs: Additional arguments passed down to `get_response_stream` and `run_streamed`.
 
     Raises:
@@ -371,12 +380,11 @@ def get_response_stream(
 
         try:
             async with agency.event_stream_merger.create_streaming_context() as streaming_context:
-                enhanced_context = context_override.copy() if context_override else {}
-                enhanced_context["streaming_context"] = streaming_context
-
-                agency_context = agency_context_override or get_agent_context(agency, target_agent.name)
+                agency_context = agency_context_override or get_agent_context(
+                    agency, target_agent.name, thread_manager_override
+                )
 
-                previous_oauth_user_id = _set_attach_oauth_user_context(agency, enhanced_context)
+                previous_oauth_user_id = _set_attach_oauth_user_context(agency, context_override)
                 try:
                     await attach_persistent_mcp_servers(agency)
                     message_for_call: str | list[TResponseInputItem] = message
@@ -393,7 +401,7 @@ def get_response_stream(
                     primary_stream = target_agent.get_response_stream(
                         message=message_for_call,
                         sender_name=None,
-                        context_override=enhanced_context,
+                        context_override=context_override,
                         hooks_override=effective_hooks,
                         run_config_override=run_config_override,
                         file_ids=file_ids,
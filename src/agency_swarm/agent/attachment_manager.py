@@ -28,7 +28,7 @@ class AttachmentManager:
                 "Please initialize the agent with a valid 'files_folder'."
             )
 
-        # Temp variables used to hold attachment data to be used in cleanup
+        # Code interpreter files attached by in-flight runs, once per run that attached them
         self._temp_code_interpreter_file_ids: list[str] = []
 
     def init_attachments_vs(self, vs_name: str = "attachments_vs"):
@@ -50,12 +50,15 @@ class AttachmentManager:
             created_vs = self.agent.client_sync.vector_stores.create(name=vs_name)
             return created_vs.id
 
-    async def sort_file_attachments(self, file_ids: list[str]) -> list[dict]:
+    async def sort_file_attachments(
+        self, file_ids: list[str], attached_file_ids: list[str] | None = None
+    ) -> list[dict]:
         """
         Sort file attachments by type and prepare them for processing.
 
         Args:
             file_ids: List of OpenAI file IDs
+            attached_file_ids: Collects the files added to the code interpreter, for `attachments_cleanup`
 
         Returns:
             list: Content items for PDF files that can be directly attached to messages
@@ -114,7 +117,9 @@ class AttachmentManager:
         if code_interpreter_ids:
             logger.info(f"Adding file ids: {code_interpreter_ids} for {self.agent.name}'s code interpreter")
             self.agent.file_manager.add_code_interpreter_tool(code_interpreter_ids)  # type: ignore[union-attr]
-            self._temp_code_interpreter_file_ids = code_interpreter_ids
+            self._temp_code_interpreter_file_ids.extend(code_interpreter_ids)
+            if attached_file_ids is not None:
+                attached_file_ids.extend(code_interpreter_ids)
             filenames = ", ".join(code_interpreter_filenames)
             content_list.append(
                 {
@@ -130,11 +135,26 @@ class AttachmentManager:
 
         return content_list
 
-    def attachments_cleanup(self):
+    def attachments_cleanup(self, file_ids: list[str] | None = None):
         """
         Clean up temporary attachments and reset agent to initial state.
+
+        Args:
+            file_ids: Files attached by the run that is finishing. Files that another in-flight run also
+                attached stay in place until that run finishes. None removes every temporary attachment.
         """
-        if self._temp_code_interpreter_file_ids:
+        if file_ids is None:
+            released = self._temp_code_interpreter_file_ids
+            self._temp_code_interpreter_file_ids = []
+        else:
+            released = []
+            for file_id in file_ids:
+                if file_id in self._temp_code_interpreter_file_ids:
+                    self._temp_code_interpreter_file_ids.remove(file_id)
+                    if file_id not in self._temp_code_interpreter_file_ids:
+                        released.append(file_id)
+
+        if released:
             # Remove temporary files from CodeInterpreterTool
             for tool in self.agent.tools:
                 if isinstance(tool, CodeInterpreterTool):
@@ -143,7 +163,7 @@ class AttachmentManager:
                         logger.warning(f"Agent {self.agent.name}: Cannot modify container directly for file removal")
                         break
                     file_ids_list = code_interpreter_container.get("file_ids", [])
-                    for file_id in self._temp_code_interpreter_file_ids:
+                    for file_id in released:
                         if file_id in file_ids_list:
                             file_ids_list.remove(file_id)
                             if len(file_ids_list) == 0:
@@ -154,9 +174,6 @@ class AttachmentManager:
                     code_interpreter_container["file_ids"] = file_ids_list
                     tool.tool_config["container"] = code_interpreter_container
 
-        # Reset temp variables
-        self._temp_code_interpreter_file_ids = []
-
     def _get_filename_by_id(self, file_id: str) -> str:
         """Get the filename of a file by its ID"""
         file_data = self.agent.client_sync.files.retrieve(file_id)
@@ -167,8 +184,12 @@ class AttachmentManager:
         processed_current_message_items: list[TResponseInputItem],
         file_ids: list[str] | None,
         kwargs: dict[str, Any],
+        attached_file_ids: list[str] | None = None,
     ) -> None:
-        """Handle file attachments for messages."""
+        """Handle file attachments for messages.
+
+        ``attached_file_ids`` collects the files added to the code interpreter, so the run can release them.
+        """
         if "message_files" in kwargs:
             raise TypeError("message_files is not supported. Use file_ids instead.")
         files_to_attach = file_ids or kwargs.get("file_ids")
@@ -187,7 +208,7 @@ class AttachmentManager:
                     else:
                         content_list = []
 
-                    file_content_items = await self.sort_file_attachments(files_to_attach)
+                    file_content_items = await self.sort_file_attachments(files_to_attach, attached_file_ids)
                     hosted_tool_compat.apply_openai_hosted_tool_compatibility_after_attachment(self.agent)
                     content_list.extend(file_content_items)
 
@@ -207,8 +228,13 @@ class AttachmentManager:
         file_ids: list[str] | None,
         kwargs: dict[str, Any],
         method_name: str = "execution",
+        attached_file_ids: list[str] | None = None,
     ) -> list[TResponseInputItem]:
-        """Process message and handle file attachments. Returns processed_items."""
+        """Process message and handle file attachments. Returns processed_items.
+
+        Pass ``attached_file_ids`` to collect the files this call attached, then hand them to
+        `attachments_cleanup` when the run ends.
+        """
         # Process current message items
         try:
             processed_current_message_items = ItemHelpers.input_to_new_input_list(message)
@@ -217,6 +243,6 @@ class AttachmentManager:
             raise AgentsException(f"Failed to process input message for agent {self.agent.name}") from e
 
         # Handle file attachments
-        await self.prepare_and_attach_files(processed_current_message_items, file_ids, kwargs)
+        await self.prepare_and_attach_files(processed_current_message_items, file_ids, kwargs, attached_file_ids)
 
         return processed_current_message_items
@@ -7,6 +7,7 @@ from typing import Any, cast
 from agents import TResponseInputItem
 from agents.run_config import CallModelData, ModelInputData, RunConfig
 
+from agency_swarm.agent.context_assembly import assemble_model_input
 from agency_swarm.agent.system_reminder_state import TRANSIENT_REMINDER_MARKER
 from agency_swarm.agent.system_reminders import inject_pending_system_reminders
 from agency_swarm.context import MasterContext
@@ -35,6 +36,7 @@ def with_codex_model_input_role_rewrite(
         if not isinstance(model_data, ModelInputData):
             return model_data
 
+        model_data = assemble_model_input(model_data, data.agent, data.context)
         if uses_codex:
             model_data = ModelInputData(
                 input=cast(
@@ -16,12 +16,17 @@ AGENT_PARAMS = {
     "conversation_starters",
     "quick_replies",
     "cache_conversation_starters",
+    "starter_cache_store",
     "include_search_results",
     "include_web_search_sources",
     "validation_attempts",
     "raise_input_guardrail_error",
+    "speculative_input_guardrails",
+    "guardrail_cache",
     "supports_outbound_communication",
     "supports_framework_tool_wiring",
+    "stable_prompt_prefix",
+    "history_compaction",
     "voice",
 }
 
@@ -0,0 +1,108 @@
+"""Prompt-cache-aware assembly of the per-call model request.
+
+Provider prompt caches reuse the longest request prefix that is byte-identical to an earlier request:
+tool schemas first, then instructions, then input items in order. Content that changes between model
+calls therefore only costs a cache miss for what follows it, so the request is assembled as:
+
+1. Tool schemas in a deterministic order (`order_tools_for_prompt_cache`).
+2. Instructions that stay fixed for the agent (shared + agent instructions).
+3. Conversation history, which only grows at the end.
+4. Volatile content: transient system reminders and the run's ``additional_instructions``.
+
+Only agents created with ``stable_prompt_prefix=True`` are assembled this way; other agents keep reminders
+at the start of the input and per-run instructions in the system prompt.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, cast
+
+from agents import TResponseInputItem
+from agents.run_config import ModelInputData
+
+from agency_swarm.agent.system_reminder_state import TRANSIENT_REMINDER_MARKER, build_system_message
+
+if TYPE_CHECKING:
+    from agents import Tool
+
+_MCP_SERVER_TOOL_ATTR = "_agency_swarm_mcp_server_name"
+
+
+@dataclass(frozen=True)
+class RunInstructions:
+    """Instructions one run adds for the agent that started it.
+
+    Stored on the run's MasterContext rather than on the Agent, so concurrent runs of one agent keep their
+    own. Agents reached through a handoff do not receive them.
+    """
+
+    agent_name: str
+    shared: str | None = None  # Agency shared instructions, placed before the agent's own
+    additional: str | None = None  # Appended to the system prompt
+    volatile: str | None = None  # Sent after the history instead of in the system prompt
+
+    def compose(self, base: str | None) -> str | None:
+        """Return the run's system prompt in the order shared -> base -> additional."""
+        core = "\n\n".join(part for part in (self.shared, base) if part) or None
+        if not self.additional:
+            return core
+        if core is None:
+            return self.additional
+        separator = "\n\n---\n\n" if self.shared else "\n\n"
+        return f"{core}{separator}{self.additional}"
+
+
+def get_run_instructions(context: object, agent_name: str) -> RunInstructions | None:
+    """Return the run's instructions when ``agent_name`` started the run with ``context``."""
+    run_instructions = getattr(context, "run_instructions", None)
+    if isinstance(run_instructions, RunInstructions) and run_instructions.agent_name == agent_name:
+        return run_instructions
+    return None
+
+
+def order_tools_for_prompt_cache(tools: list[Tool]) -> list[Tool]:
+    """Keep declared tools in their given order and put MCP tools after them, sorted by server and name.
+
+    MCP servers may list their tools in a different order after a reconnect, which would change the
+    tool-schema prefix of every later request.
+    """
+    declared: list[Tool] = []
+    mcp_tools: list[tuple[str, str, Tool]] = []
+    for tool in tools:
+        server_name = getattr(tool, _MCP_SERVER_TOOL_ATTR, None)
+        if server_name is None:
+            declared.append(tool)
+        else:
+            mcp_tools.append((str(server_name), str(getattr(tool, "name", "")), tool))
+    mcp_tools.sort(key=lambda entry: (entry[0], entry[1]))
+    return declared + [tool for _, _, tool in mcp_tools]
+
+
+def assemble_model_input(model_data: ModelInputData, agent: object, context: object) -> ModelInputData:
+    """Move transient items behind the conversation history and append the run's volatile instructions.
+
+    Only applies to agents with ``stable_prompt_prefix=True``. The relative order within the history and
+    within the volatile tail is preserved. Volatile items keep the transient marker, so they are never
+    persisted and are stripped before the request is sent.
+    """
+    if not getattr(agent, "stable_prompt_prefix", False):
+        return model_data
+    history: list[TResponseInputItem] = []
+    volatile: list[TResponseInputItem] = []
+    for item in model_data.input:
+        if isinstance(item, dict) and cast(dict[object, object], item).get(TRANSIENT_REMINDER_MARKER) is True:
+            volatile.append(item)
+        else:
+            history.append(item)
+
+    run_instructions = get_run_instructions(context, str(getattr(agent, "name", "")))
+    volatile_instructions = run_instructions.volatile if run_instructions is not None else None
+    if volatile_instructions:
+        message = build_system_message(volatile_instructions)
+        cast(dict[object, object], message)[TRANSIENT_REMINDER_MARKER] = True
+        volatile.insert(0, message)
+
+    if not volatile:
+        return model_data
+    return ModelInputData(input=history + volatile, instructions=model_data.instructions)
@@ -8,6 +8,8 @@ if TYPE_CHECKING:
 
     from agency_swarm.tools.concurrency import ToolConcurrencyManager
     from agency_swarm.tools.send_message import SendMessage
+    from agency_swarm.utils.cost_ledger import CostLedger
+    from agency_swarm.utils.run_timings import RunTimings
     from agency_swarm.utils.thread import ThreadManager
 
     from .core import Agent
@@ -66,6 +68,9 @@ class AgencyContext:
         load_threads_callback: Callable[..., Any] | None = None,
         save_threads_callback: Callable[..., Any] | None = None,
         shared_instructions: str | None = None,
+        run_timings: "RunTimings | None" = None,
+        cost_ledger: "CostLedger | None" = None,
+        record_timings: bool | None = None,
     ) -> None:
         self.agency_instance = agency_instance
         self.thread_manager = thread_manager
@@ -73,6 +78,10 @@ class AgencyContext:
         self.load_threads_callback = load_threads_callback
         self.save_threads_callback = save_threads_callback
         self.shared_instructions = shared_instructions
+        self.run_timings = run_timings
+        self.cost_ledger = cost_ledger
+        # Set for sub-agent runs: whether the calling run records timings. None lets the run keyword decide.
+        self.record_timings = record_timings
 
         if subagents:
             for agent in subagents.values():
@@ -42,6 +42,7 @@ if TYPE_CHECKING:
 
 _CACHE_DIR_NAME = "starter_cache"
 _SENSITIVE_KEYS = ("key", "secret", "token", "authorization", "password")
+_FINGERPRINT_MEMO_SIZE = 16
 
 
 @dataclass(frozen=True)
@@ -117,6 +118,81 @@ def compute_starter_cache_fingerprint(
     return _hash_string(digest)
 
 
+def memoized_starter_cache_fingerprint(
+    agent: Agent,
+    runtime_state: AgentRuntimeState | None = None,
+    shared_instructions: str | None = None,
+    instructions_override: str | Callable | None = None,
+    use_instructions_override: bool = False,
+) -> str:
+    """Return `compute_starter_cache_fingerprint`, memoized per agent configuration version.
+
+    The memo lives on the agent's shared starter cache index, so agents with the same name and store reuse it,
+    including agents rebuilt for every request by an agency factory.
+
+    The version describes the configuration by content that is cheap to read: instruction text, model name,
+    tool names and parameter schemas, handoff targets, and the qualified names of callables such as guardrail
+    functions. Unlike the fingerprint it does not hash callable source, so editing a function in place is not
+    detected; call ``Agent.refresh_conversation_starters_cache()`` after such edits.
+    """
+    instructions = instructions_override if use_instructions_override else agent.instructions
+    handoffs = [handoff for handoff in agent.handoffs if isinstance(handoff, SDKHandoff)]
+    if runtime_state is not None:
+        handoffs.extend(handoff for handoff in runtime_state.handoffs if isinstance(handoff, SDKHandoff))
+    version = (
+        _version_key(instructions),
+        shared_instructions if isinstance(shared_instructions, str) else None,
+        _version_key(agent.prompt),
+        get_model_name(agent.model),
+        get_usage_tracking_model_name(agent.model),
+        repr(agent.model_settings),
+        agent.reset_tool_choice,
+        _version_key(agent.tool_use_behavior),
+        _version_key(agent.mcp_config),
+        _version_key(_output_type_signature(agent.output_type)),
+        tuple(_version_key(tool) for tool in agent.tools),
+        tuple(_version_key(tool) for tool in runtime_state.send_message_tools.values())
+        if runtime_state is not None
+        else (),
+        tuple(_version_key(handoff) for handoff in handoffs),
+        tuple((type(server).__qualname__, server.name) for server in (agent.mcp_servers or [])),
+        tuple(_version_key(guardrail) for guardrail in agent.input_guardrails),
+        tuple(_version_key(guardrail) for guardrail in agent.output_guardrails),
+        tuple(_version_key(reminder) for reminder in agent.system_reminders),
+    )
+    memo = agent._starter_cache_index.fingerprint_memo
+    cached = memo.get(version)
+    if cached is not None:
+        return cached
+    fingerprint = compute_starter_cache_fingerprint(
+        agent,
+        runtime_state=runtime_state,
+        shared_instructions=shared_instructions,
+        instructions_override=instructions_override,
+        use_instructions_override=use_instructions_override,
+    )
+    if len(memo) >= _FINGERPRINT_MEMO_SIZE:
+        memo.clear()
+    memo[version] = fingerprint
+    return fingerprint
+
+
+def clear_starter_cache_fingerprint_memo(agent: Agent) -> None:
+    agent._starter_cache_index.fingerprint_memo.clear()
+
+
+def compute_guardrail_fingerprint(guardrail: Any) -> str:
+    """Fingerprint one guardrail the way agent fingerprints serialize their guardrails.
+
+    Scheduling settings such as ``run_in_parallel`` do not change a verdict and are left out.
+    """
+    serialized = _serialize_value(guardrail)
+    if isinstance(serialized, dict):
+        serialized.pop("run_in_parallel", None)
+    payload = {"type": type(guardrail).__name__, "guardrail": serialized}
+    return _hash_string(json.dumps(payload, sort_keys=True, separators=(",", ":")))
+
+
 def extract_text_from_content(content: Any) -> str | None:
     if isinstance(content, str):
         return content
@@ -294,6 +370,10 @@ def load_cached_starter(
     *,
     expected_fingerprint: str | None = None,
 ) -> CachedStarter | None:
+    """Read one entry from the default cache directory.
+
+    Agents write their entries in the background; call ``flush_starter_cache_writes()`` first to see them.
+    """
     path = _cache_path(agent_name, starter)
     if not path.exists():
         return None
@@ -301,6 +381,16 @@ def load_cached_starter(
         payload = json.loads(path.read_text())
     except Exception:
         return None
+    return cached_starter_from_payload(payload, starter, expected_fingerprint=expected_fingerprint)
+
+
+def cached_starter_from_payload(
+    payload: Any,
+    starter: str,
+    *,
+    expected_fingerprint: str | None = None,
+) -> CachedStarter | None:
+    """Validate a stored cache entry; returns None for entries that must not be replayed."""
     if not isinstance(payload, dict):
         return None
     items = payload.get("items")
@@ -334,15 +424,31 @@ def save_cached_starter(
     resolved_metadata = dict(metadata or {})
     if fingerprint:
         resolved_metadata["fingerprint"] = fingerprint
-    payload = {
+    payload = build_cached_starter_payload(agent_name, starter, items, resolved_metadata)
+    path = _cache_path(agent_name, starter)
+    path.write_text(json.dumps(payload, indent=2))
+    cached = CachedStarter(prompt=starter, items=items, metadata=resolved_metadata)
+    # Imported here because the store module imports this one
+    from agency_swarm.agent.starter_cache_store import DirectoryStarterStore, find_starter_cache_index
+
+    index = find_starter_cache_index(agent_name, DirectoryStarterStore())
+    if index is not None:
+        index.remember(cached)
+    return cached
+
+
+def build_cached_starter_payload(
+    agent_name: str,
+    starter: str,
+    items: list[TResponseInputItem],
+    metadata: dict[str, Any],
+) -> dict[str, Any]:
+    return {
         "prompt": starter,
         "agent": agent_name,
         "items": items,
-        "metadata": resolved_metadata,
+        "metadata": metadata,
     }
-    path = _cache_path(agent_name, starter)
-    path.write_text(json.dumps(payload, indent=2))
-    return CachedStarter(prompt=starter, items=items, metadata=resolved_metadata)
 
 
 def load_cached_starters(
@@ -564,6 +670,38 @@ def _callable_signature(value: Any) -> dict[str, Any]:
     }
 
 
+def _version_key(value: Any) -> Any:
+    """Hashable, content-based key for `memoized_starter_cache_fingerprint`, without reading callable source."""
+    if value is None or isinstance(value, str | int | float | bool):
+        return value
+    if isinstance(value, FunctionTool):
+        return (
+            type(value).__qualname__,
+            value.name,
+            value.description,
+            value.strict_json_schema,
+            json.dumps(value.params_json_schema, sort_keys=True, default=str),
+        )
+    if isinstance(value, SDKHandoff):
+        schema = value.input_json_schema
+        return (
+            value.tool_name,
+            value.agent_name,
+            json.dumps(schema, sort_keys=True, default=str),
+            _version_key(getattr(value, "_agency_swarm_tool_class", None)),
+        )
+    if isinstance(value, list | tuple):
+        return tuple(_version_key(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _version_key(val)) for key, val in value.items())
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = tuple(_version_key(getattr(value, item.name)) for item in dataclasses.fields(value))
+        return (type(value).__qualname__, fields)
+    if callable(value):
+        return (getattr(value, "__module__", None), getattr(value, "__qualname__", type(value).__qualname__))
+    return type(value).__qualname__
+
+
 def _serialize_value(value: Any) -> Any:
     if value is None or isinstance(value, str | int | float | bool):
         return value
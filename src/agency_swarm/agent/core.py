@@ -37,16 +37,28 @@ from agency_swarm.agent import (
 from agency_swarm.agent.agent_flow import AgentFlow
 from agency_swarm.agent.attachment_manager import AttachmentManager
 from agency_swarm.agent.constants import AGENT_REALTIME_VOICES, AgentVoice
+from agency_swarm.agent.context_assembly import (
+    _MCP_SERVER_TOOL_ATTR,
+    get_run_instructions,
+    order_tools_for_prompt_cache,
+)
 from agency_swarm.agent.conversation_starters_cache import (
-    compute_starter_cache_fingerprint,
-    load_cached_starter,
-    load_cached_starters,
+    clear_starter_cache_fingerprint_memo,
+    memoized_starter_cache_fingerprint,
     merge_cacheable_starters,
     normalize_starter_text,
 )
 from agency_swarm.agent.execution_streaming import StreamingRunResponse
 from agency_swarm.agent.file_manager import AgentFileManager
+from agency_swarm.agent.guardrail_cache import GuardrailCache, install_guardrail_cache, normalize_guardrail_cache
 from agency_swarm.agent.runner import install_runner_boundary
+from agency_swarm.agent.speculative_guardrails import normalize_speculative_input_guardrails
+from agency_swarm.agent.starter_cache_store import (
+    StarterCacheIndex,
+    StarterCacheStore,
+    get_starter_cache_index,
+    normalize_starter_cache_store,
+)
 from agency_swarm.agent.system_reminders import (
     normalize_system_reminders,
     prepare_agent_hooks,
@@ -54,6 +66,7 @@ from agency_swarm.agent.system_reminders import (
 )
 from agency_swarm.agent.tools import _attach_one_call_guard
 from agency_swarm.context import MasterContext
+from agency_swarm.messages.history_compaction import HistoryCompaction, normalize_history_compaction
 from agency_swarm.reminders import SystemReminder
 from agency_swarm.tools.concurrency import ToolConcurrencyManager
 from agency_swarm.tools.function_tool_compat import normalize_function_tool
@@ -65,7 +78,6 @@ from .context_types import AgencyContext as AgencyContext, AgentRuntimeState
 logger = logging.getLogger(__name__)
 _WEB_SEARCH_SOURCES_INCLUDE = "web_search_call.action.sources"
 _MCP_AUTHENTICATION_TOOL_ATTR = "_agency_swarm_mcp_authentication_tool"
-_MCP_SERVER_TOOL_ATTR = "_agency_swarm_mcp_server_name"
 
 
 def _resolve_oauth_owner_id(master_context: MasterContext | None) -> str | None:
@@ -110,13 +122,18 @@ class Agent(BaseAgent[MasterContext]):
     conversation_starters: list[str] | None
     quick_replies: list[str] | None
     cache_conversation_starters: bool = False
+    starter_cache_store: StarterCacheStore
     output_type: type[Any] | None
     include_search_results: bool = False
     include_web_search_sources: bool = True
     validation_attempts: int = 1
     raise_input_guardrail_error: bool = False
+    speculative_input_guardrails: int = 0
+    guardrail_cache: GuardrailCache | None = None
     supports_outbound_communication: bool = True
     supports_framework_tool_wiring: bool = True
+    stable_prompt_prefix: bool = False
+    history_compaction: HistoryCompaction | None = None
     voice: AgentVoice | None
     system_reminders: list[SystemReminder]
 
@@ -127,7 +144,7 @@ class Agent(BaseAgent[MasterContext]):
     file_manager: AgentFileManager | None = None  # Initialized in setup_file_manager()
     attachment_manager: AttachmentManager | None = None  # Initialized in setup_file_manager()
     _tool_concurrency_manager: ToolConcurrencyManager
-    _conversation_starters_cache: dict[str, Any]
+    _starter_cache_index: StarterCacheIndex
     _conversation_starters_fingerprint: str | None
     _conversation_starters_warmup_started: bool
 
@@ -151,6 +168,8 @@ class Agent(BaseAgent[MasterContext]):
             conversation_starters (list[str] | None): Conversation starters for this agent.
             quick_replies (list[str] | None): Additional first-message prompts eligible for cache replay.
             cache_conversation_starters (bool): Enable cached conversation starters from .agency_swarm.
+            starter_cache_store (StarterCacheStore | None): Where cached starter replies are persisted. Defaults to
+                a `DirectoryStarterStore` under the chats directory.
             send_message_tool_class (type | None): DEPRECATED. Configure SendMessage tool classes via
                 `communication_flows` on `Agency` instead of setting this per agent.
             include_search_results (bool): Include search results in FileSearchTool output for citation extraction.
@@ -160,11 +179,24 @@ class Agent(BaseAgent[MasterContext]):
             validation_attempts (int): Number of retries when an output guardrail trips. Defaults to 1.
             raise_input_guardrail_error (bool): Whether to raise input guardrail errors as exceptions.
                 Defaults to False.
+            speculative_input_guardrails (bool | int): Run input guardrails concurrently with the first model call.
+                Streamed events are held until the guardrails pass and tool calls wait for the verdict; a tripwire
+                cancels the run. An int sets the size of the event buffer. Defaults to False.
+            guardrail_cache (GuardrailCache | bool | None): Reuse input and output guardrail verdicts for inputs
+                that normalize to the same text. `True` enables a cache with default TTL and size limits.
+                Defaults to None.
             voice (str | None): Realtime session voice used when this agent is the entry agent. A realtime
                 session keeps one voice from start to finish, so a voice set on any other agent is not heard.
             system_reminders (str | Callable | SystemReminder | list[str | Callable | SystemReminder] | None):
                 Transient system reminders injected before model calls. Plain strings and callables run after each
                 top-level user message.
+            stable_prompt_prefix (bool): Keep the system prompt and tool list identical across runs so provider
+                prompt caching can reuse them. System reminders and per-run `additional_instructions` are sent as
+                system messages after the conversation history instead of before it or in the instructions, and
+                MCP tools are listed in a fixed order. Defaults to False.
+            history_compaction (HistoryCompaction | int | None): Token budget for the conversation history sent
+                to the model. Once the thread's estimated size crosses it, older turns are truncated, windowed or
+                summarized. An int is shorthand for `HistoryCompaction(max_tokens=...)`. Defaults to None.
             handoff_reminder (str | None): Custom reminder for handoffs.
                 Defaults to `Transfer completed. You are {recipient_agent_name}. Please continue the task.`
 
@@ -248,6 +280,7 @@ class Agent(BaseAgent[MasterContext]):
         self.quick_replies = _validate_quick_replies(quick_replies)
         cache_enabled = current_agent_params.get("cache_conversation_starters", False)
         self.cache_conversation_starters = _validate_cache_conversation_starters(cache_enabled)
+        self.starter_cache_store = normalize_starter_cache_store(current_agent_params.get("starter_cache_store"))
         self.send_message_tool_class = current_agent_params.get("send_message_tool_class")
         self.include_search_results = current_agent_params.get("include_search_results", False)
         self.include_web_search_sources = bool(current_agent_params.get("include_web_search_sources", True))
@@ -271,13 +304,19 @@ class Agent(BaseAgent[MasterContext]):
                 )
             self.voice = cast(AgentVoice, normalized_voice)
         self.system_reminders = system_reminders
+        self.stable_prompt_prefix = bool(current_agent_params.get("stable_prompt_prefix", False))
+        self.history_compaction = normalize_history_compaction(current_agent_params.get("history_compaction"))
+        self.speculative_input_guardrails = normalize_speculative_input_guardrails(
+            current_agent_params.get("speculative_input_guardrails", False)
+        )
+        self.guardrail_cache = normalize_guardrail_cache(current_agent_params.get("guardrail_cache"))
         self.handoff_reminder = current_agent_params.get("handoff_reminder")
 
         # Internal state
         self._openai_client = None
         self._openai_client_sync = None
         self._tool_concurrency_manager = ToolConcurrencyManager()
-        self._conversation_starters_cache = {}
+        self._starter_cache_index = get_starter_cache_index(self.name, self.starter_cache_store)
         self._conversation_starters_fingerprint = None
         self._conversation_starters_warmup_started = False
         self._mcp_tools_initialized = False
@@ -315,6 +354,7 @@ class Agent(BaseAgent[MasterContext]):
 
         # Wrap input guardrails
         wrap_input_guardrails(self)
+        install_guardrail_cache(self)
 
         # Wrap any FunctionTool instances that were provided directly via constructor
         for tool in self.tools:
@@ -379,6 +419,15 @@ class Agent(BaseAgent[MasterContext]):
         """Backward-compatible alias for `raise_input_guardrail_error`."""
         self.raise_input_guardrail_error = bool(value)
 
+    async def get_system_prompt(self, run_context: RunContextWrapper[MasterContext]) -> str | None:
+        """Add the shared and per-run instructions of the run this agent started to its own instructions."""
+        base_instructions = await super().get_system_prompt(run_context)
+        run_instructions = get_run_instructions(run_context.context, self.name)
+        if run_instructions is None:
+            return base_instructions
+        combined = run_instructions.compose(str(base_instructions) if base_instructions else None)
+        return combined if combined is not None else base_instructions
+
     async def get_all_tools(self, run_context: RunContextWrapper[MasterContext]) -> list[Tool]:
         """Include agency-scoped runtime tools alongside static tools."""
         base_tools = await super().get_all_tools(run_context)
@@ -394,13 +443,12 @@ class Agent(BaseAgent[MasterContext]):
                 for server_tools in runtime_state.scoped_oauth_mcp_tools(owner_id).values():
                     runtime_tools.extend(server_tools)
 
-        if not runtime_tools:
-            return base_tools
-
         seen = {id(tool) for tool in base_tools}
         for tool in runtime_tools:
             if id(tool) not in seen:
                 base_tools.append(tool)
+        if self.stable_prompt_prefix:
+            return order_tools_for_prompt_cache(base_tools)
         return base_tools
 
     def add_tool(self, tool: Tool) -> None:
@@ -711,7 +759,7 @@ class Agent(BaseAgent[MasterContext]):
             additional_instructions: Additional instructions to be appended to the agent's
                                     instructions for this run only
             agency_context: AgencyContext for this execution (provided by Agency, or None for standalone use)
-            **kwargs: Additional keyword arguments including max_turns
+            **kwargs: Additional keyword arguments including max_turns, run_budget and record_timings
 
         Returns:
             RunResult: The complete execution result
@@ -789,7 +837,10 @@ class Agent(BaseAgent[MasterContext]):
         runtime_state: AgentRuntimeState | None = None,
         shared_instructions: str | None = None,
     ) -> None:
-        """Recompute conversation starter cache fingerprint and reload cached entries."""
+        """Recompute the conversation starter cache fingerprint.
+
+        Cached entries are read from the store on the first lookup, in a worker thread.
+        """
         cacheable_starters = merge_cacheable_starters(
             self.conversation_starters if self.cache_conversation_starters else None,
             self.quick_replies,
@@ -798,20 +849,13 @@ class Agent(BaseAgent[MasterContext]):
         if not cacheable_starters:
             return
 
-        fingerprint = compute_starter_cache_fingerprint(
+        # Explicit refreshes also pick up configuration objects that were mutated in place
+        clear_starter_cache_fingerprint_memo(self)
+        self._conversation_starters_fingerprint = memoized_starter_cache_fingerprint(
             self,
             runtime_state=runtime_state,
             shared_instructions=shared_instructions,
         )
-        if fingerprint == self._conversation_starters_fingerprint and self._conversation_starters_cache:
-            return
-
-        self._conversation_starters_fingerprint = fingerprint
-        self._conversation_starters_cache = load_cached_starters(
-            self.name,
-            cacheable_starters,
-            expected_fingerprint=fingerprint,
-        )
 
     async def warm_conversation_starters_cache(self, agency_context: AgencyContext | None = None) -> None:
         """Populate missing conversation starters cache entries using the model."""
@@ -826,17 +870,13 @@ class Agent(BaseAgent[MasterContext]):
             return
         self._conversation_starters_warmup_started = True
 
-        cache_map = self._conversation_starters_cache
         fingerprint = self._conversation_starters_fingerprint
-        missing: list[str] = []
-        for starter in cacheable_starters:
-            normalized = normalize_starter_text(starter)
-            if normalized and normalized not in cache_map:
-                cached = load_cached_starter(self.name, starter, expected_fingerprint=fingerprint)
-                if cached:
-                    cache_map[normalized] = cached
-                else:
-                    missing.append(starter)
+        await self._starter_cache_index.aload()
+        missing = [
+            starter
+            for starter in cacheable_starters
+            if normalize_starter_text(starter) and self._starter_cache_index.get(starter, fingerprint) is None
+        ]
 
         if not missing:
             return
@@ -18,19 +18,16 @@ from agents.stream_events import StreamEvent
 
 from agency_swarm.agent.conversation_starters_cache import (
     build_run_items_from_cached,
-    compute_starter_cache_fingerprint,
     extract_final_output_text,
     extract_starter_segment,
     filter_replay_items,
     is_simple_text_message,
-    load_cached_starter,
     match_conversation_starter,
+    memoized_starter_cache_fingerprint,
     merge_cacheable_starters,
-    normalize_starter_text,
     parse_cached_output,
     prepare_cached_items_for_replay,
     reorder_cached_items_for_tools,
-    save_cached_starter,
 )
 from agency_swarm.agent.conversation_starters_streaming import stream_cached_items_events
 from agency_swarm.agent.execution_helpers import (
@@ -49,7 +46,10 @@ from agency_swarm.messages import (
 )
 from agency_swarm.streaming.id_normalizer import StreamIdNormalizer
 from agency_swarm.utils.citation_extractor import extract_direct_file_annotations
+from agency_swarm.utils.cost_ledger import CostLedger, resolve_cost_ledger
 from agency_swarm.utils.model_utils import get_usage_tracking_model_name
+from agency_swarm.utils.run_budget import normalize_run_budget
+from agency_swarm.utils.run_timings import RunTimings, optional_span, resolve_run_timings
 
 if TYPE_CHECKING:
     from agents.items import ModelResponse
@@ -65,6 +65,11 @@ class _UsageTrackingRunResult(typing.Protocol):
     _main_agent_model: str
 
 
+class _TimedRunResult(typing.Protocol):
+    timings: RunTimings | None
+    cost_ledger: CostLedger
+
+
 class Execution:
     def __init__(self, agent: "Agent"):
         self.agent = agent
@@ -95,7 +100,7 @@ class Execution:
             file_ids: List of OpenAI file IDs to attach to the message
             additional_instructions: Additional instructions to be appended to
                 the agent's instructions for this run only
-            **kwargs: Additional keyword arguments including max_turns
+            **kwargs: Additional keyword arguments including max_turns, run_budget and record_timings
 
         Returns:
             RunResult: The complete execution result
@@ -103,22 +108,27 @@ class Execution:
         logger.info(f"Agent '{self.agent.name}' starting run.")
 
         # Common setup and validation
-        original_instructions = setup_execution(
+        run_instructions = setup_execution(
             self.agent, sender_name, agency_context, additional_instructions, "get_response"
         )
 
         master_context_for_run = None
         run_result: RunResult | None = None
+        attached_file_ids: list[str] = []
         try:
             if self.agent.attachment_manager is None:
                 raise RuntimeError(f"attachment_manager not initialized for agent {self.agent.name}")
             processed_current_message_items = await self.agent.attachment_manager.process_message_and_files(
-                message, file_ids, kwargs, "get_response"
+                message, file_ids, kwargs, "get_response", attached_file_ids
             )
             # Generate a unique run id for this agent execution (non-streaming)
             current_agent_run_id = f"agent_run_{uuid.uuid4().hex}"
 
             run_trace_id = get_run_trace_id(run_config_override, agency_context)
+            run_timings = resolve_run_timings(agency_context, bool(kwargs.get("record_timings", True)))
+            cost_ledger = resolve_cost_ledger(agency_context, normalize_run_budget(kwargs.get("run_budget")))
+            if run_timings is not None:
+                run_timings.register_run(current_agent_run_id, agent=self.agent.name, parent_run_id=parent_run_id)
 
             initial_saved_count = 0
             if agency_context and agency_context.thread_manager:
@@ -129,23 +139,29 @@ class Execution:
             is_first_message = initial_saved_count == 0
 
             # Prepare history for runner, persisting initiating messages with agent_run_id and parent_run_id
-            history_for_runner = MessageFormatter.prepare_history_for_runner(
-                processed_current_message_items,
-                self.agent,
-                sender_name,
-                agency_context,
-                agent_run_id=current_agent_run_id,
-                parent_run_id=parent_run_id,
-                run_trace_id=run_trace_id,
-                run_config_override=run_config_override,
-            )
+            with optional_span(run_timings, "history_preparation", current_agent_run_id):
+                history_for_runner = MessageFormatter.prepare_history_for_runner(
+                    processed_current_message_items,
+                    self.agent,
+                    sender_name,
+                    agency_context,
+                    agent_run_id=current_agent_run_id,
+                    parent_run_id=parent_run_id,
+                    run_trace_id=run_trace_id,
+                    run_config_override=run_config_override,
+                )
             logger.debug(f"Running agent '{self.agent.name}' with history length {len(history_for_runner)}")
 
             # Prepare context and store reference for potential sync-back
-            master_context_for_run = prepare_master_context(self.agent, context_override, agency_context)
+            master_context_for_run = prepare_master_context(
+                self.agent, context_override, agency_context, run_instructions
+            )
             try:
                 master_context_for_run._current_agent_run_id = current_agent_run_id
                 master_context_for_run._parent_run_id = parent_run_id
+                master_context_for_run.run_timings = run_timings
+                master_context_for_run.record_timings = run_timings is not None
+                master_context_for_run.cost_ledger = cost_ledger
             except Exception:
                 pass
 
@@ -167,9 +183,7 @@ class Execution:
                 self.agent.quick_replies,
                 self.agent.system_reminders,
             )
-            has_user_context_override = bool(
-                context_override and any(key != "streaming_context" for key in context_override)
-            )
+            has_user_context_override = bool(context_override)
             if (
                 sender_name is None
                 and cacheable_starters
@@ -181,32 +195,15 @@ class Execution:
             ):
                 runtime_state = agency_context.runtime_state if agency_context else None
                 shared_instructions = agency_context.shared_instructions if agency_context else None
-                cache_fingerprint = compute_starter_cache_fingerprint(
+                cache_fingerprint = memoized_starter_cache_fingerprint(
                     self.agent,
                     runtime_state=runtime_state,
                     shared_instructions=shared_instructions,
-                    instructions_override=original_instructions,
-                    use_instructions_override=True,
                 )
                 matched_starter = match_conversation_starter(processed_current_message_items, cacheable_starters)
                 if matched_starter:
-                    normalized = normalize_starter_text(matched_starter)
-                    cache_map = self.agent._conversation_starters_cache
-                    cached_starter = cache_map.get(normalized)
-                    if (
-                        cached_starter is not None
-                        and cache_fingerprint
-                        and cached_starter.metadata.get("fingerprint") != cache_fingerprint
-                    ):
-                        cached_starter = None
-                    if cached_starter is None:
-                        cached_starter = load_cached_starter(
-                            self.agent.name,
-                            matched_starter,
-                            expected_fingerprint=cache_fingerprint,
-                        )
-                        if cached_starter is not None:
-                            cache_map[normalized] = cached_starter
+                    await self.agent._starter_cache_index.aload()
+                    cached_starter = self.agent._starter_cache_index.get(matched_starter, cache_fingerprint)
 
             if cached_starter is None:
                 run_result, master_context_for_run = await run_with_guardrails(
@@ -270,6 +267,8 @@ class Execution:
                         typing.cast(_UsageTrackingRunResult, run_result)._main_agent_model = main_model_name
                 except Exception as e:
                     logger.debug(f"Could not store main agent model on RunResult: {e}")
+                typing.cast(_TimedRunResult, run_result).timings = run_timings
+                typing.cast(_TimedRunResult, run_result).cost_ledger = cost_ledger
 
             completion_info = (
                 f"Output Type: {type(run_result.final_output).__name__}"
@@ -342,7 +341,8 @@ class Execution:
                 normalizer = StreamIdNormalizer()
                 normalized_items = normalizer.normalize_message_dicts(filtered_items)
 
-                agency_context.thread_manager.add_messages(normalized_items)  # type: ignore[arg-type] # Save filtered items to flat storage
+                with optional_span(run_timings, "persistence", current_agent_run_id):
+                    agency_context.thread_manager.add_messages(normalized_items)  # type: ignore[arg-type] # Save filtered items to flat storage
                 logger.debug(f"Saved {len(filtered_items)} items to storage (filtered from {len(items_to_save)}).")
 
             if (
@@ -358,15 +358,12 @@ class Execution:
                     segment = extract_starter_segment(new_messages, matched_starter) or new_messages
                     if segment and extract_final_output_text(segment):
                         segment = reorder_cached_items_for_tools(segment, self.agent.name)
-                        cached = save_cached_starter(
-                            self.agent.name,
+                        self.agent._starter_cache_index.put(
                             matched_starter,
                             segment,
                             metadata={"source": "live_run"},
                             fingerprint=cache_fingerprint,
                         )
-                        cache_map = self.agent._conversation_starters_cache
-                        cache_map[normalize_starter_text(matched_starter)] = cached
                 except Exception as e:
                     logger.debug(f"Failed to cache conversation starter: {e}")
 
@@ -392,18 +389,14 @@ class Execution:
             if "master_context_for_run" in locals() and master_context_for_run is not None:  # type: ignore[used-before-def]
                 cleanup_execution(
                     self.agent,
-                    original_instructions,
                     context_override,
                     agency_context,
                     master_context_for_run,
                     run_result,
                 )
-            else:
-                # Ensure instructions are restored even if context was not prepared
-                self.agent.instructions = original_instructions
             if self.agent.attachment_manager is None:
                 raise RuntimeError(f"attachment_manager not initialized for agent {self.agent.name}")
-            self.agent.attachment_manager.attachments_cleanup()
+            self.agent.attachment_manager.attachments_cleanup(attached_file_ids)
 
     def get_response_stream(
         self,
@@ -433,7 +426,7 @@ class Execution:
             file_ids: List of OpenAI file IDs to attach to the message
             additional_instructions: Additional instructions to be appended to
                 the agent's instructions for this run only
-            **kwargs: Additional keyword arguments including max_turns
+            **kwargs: Additional keyword arguments including max_turns, run_budget and record_timings
 
         Returns:
             StreamingRunResponse: Async iterable yielding stream events and exposing the
@@ -461,22 +454,28 @@ class Execution:
         async def _stream() -> AsyncGenerator[StreamEvent | dict[str, Any]]:
             nonlocal wrapper
 
-            original_instructions = setup_execution(
+            run_instructions = setup_execution(
                 self.agent, sender_name, agency_context, additional_instructions, "get_response_stream"
             )
 
             master_context_for_run = None
             stream_handle: StreamingRunResponse | None = None
+            attached_file_ids: list[str] = []
 
             try:
                 if self.agent.attachment_manager is None:
                     raise RuntimeError(f"attachment_manager not initialized for agent {self.agent.name}")
                 processed_current_message_items = await self.agent.attachment_manager.process_message_and_files(
-                    message, file_ids, kwargs, "get_response_stream"
+                    message, file_ids, kwargs, "get_response_stream", attached_file_ids
                 )
                 current_agent_run_id = f"agent_run_{uuid.uuid4().hex}"
 
                 run_trace_id = get_run_trace_id(run_config_override, agency_context)
+                run_timings = resolve_run_timings(agency_context, bool(kwargs.get("record_timings", True)))
+                cost_ledger = resolve_cost_ledger(agency_context, normalize_run_budget(kwargs.get("run_budget")))
+                wrapper.cost_ledger = cost_ledger
+                if run_timings is not None:
+                    run_timings.register_run(current_agent_run_id, agent=self.agent.name, parent_run_id=parent_run_id)
 
                 initial_saved_count = 0
                 if agency_context and agency_context.thread_manager:
@@ -486,16 +485,17 @@ class Execution:
                         initial_saved_count = 0
                 is_first_message = initial_saved_count == 0
 
-                history_for_runner = MessageFormatter.prepare_history_for_runner(
-                    processed_current_message_items,
-                    self.agent,
-                    sender_name,
-                    agency_context,
-                    agent_run_id=current_agent_run_id,
-                    parent_run_id=parent_run_id,
-                    run_trace_id=run_trace_id,
-                    run_config_override=run_config_override,
-                )
+                with optional_span(run_timings, "history_preparation", current_agent_run_id):
+                    history_for_runner = MessageFormatter.prepare_history_for_runner(
+                        processed_current_message_items,
+                        self.agent,
+                        sender_name,
+                        agency_context,
+                        agent_run_id=current_agent_run_id,
+                        parent_run_id=parent_run_id,
+                        run_trace_id=run_trace_id,
+                        run_config_override=run_config_override,
+                    )
 
                 logger.debug(
                     "Starting streaming run for agent '%s' with %d history items.",
@@ -511,9 +511,7 @@ class Execution:
                     self.agent.quick_replies,
                     self.agent.system_reminders,
                 )
-                has_user_context_override = bool(
-                    context_override and any(key != "streaming_context" for key in context_override)
-                )
+                has_user_context_override = bool(context_override)
                 if (
                     sender_name is None
                     and cacheable_starters
@@ -525,38 +523,26 @@ class Execution:
                 ):
                     runtime_state = agency_context.runtime_state if agency_context else None
                     shared_instructions = agency_context.shared_instructions if agency_context else None
-                    cache_fingerprint = compute_starter_cache_fingerprint(
+                    cache_fingerprint = memoized_starter_cache_fingerprint(
                         self.agent,
                         runtime_state=runtime_state,
                         shared_instructions=shared_instructions,
-                        instructions_override=original_instructions,
-                        use_instructions_override=True,
                     )
                     matched_starter = match_conversation_starter(processed_current_message_items, cacheable_starters)
                     if matched_starter:
-                        normalized = normalize_starter_text(matched_starter)
-                        cache_map = self.agent._conversation_starters_cache
-                        cached_starter = cache_map.get(normalized)
-                        if (
-                            cached_starter is not None
-                            and cache_fingerprint
-                            and cached_starter.metadata.get("fingerprint") != cache_fingerprint
-                        ):
-                            cached_starter = None
-                        if cached_starter is None:
-                            cached_starter = load_cached_starter(
-                                self.agent.name,
-                                matched_starter,
-                                expected_fingerprint=cache_fingerprint,
-                            )
-                            if cached_starter is not None:
-                                cache_map[normalized] = cached_starter
+                        await self.agent._starter_cache_index.aload()
+                        cached_starter = self.agent._starter_cache_index.get(matched_starter, cache_fingerprint)
 
                 if cached_starter is not None:
-                    master_context_for_run = prepare_master_context(self.agent, context_override, agency_context)
+                    master_context_for_run = prepare_master_context(
+                        self.agent, context_override, agency_context, run_instructions
+                    )
                     try:
                         master_context_for_run._current_agent_run_id = current_agent_run_id
                         master_context_for_run._parent_run_id = parent_run_id
+                        master_context_for_run.run_timings = run_timings
+                        master_context_for_run.record_timings = run_timings is not None
+                        master_context_for_run.cost_ledger = cost_ledger
                     except Exception:
                         pass
 
@@ -567,7 +553,8 @@ class Execution:
                     )
                     replay_items = filter_replay_items(replay_items)
                     if agency_context and agency_context.thread_manager:
-                        agency_context.thread_manager.add_messages(replay_items)
+                        with optional_span(run_timings, "persistence", current_agent_run_id):
+                            agency_context.thread_manager.add_messages(replay_items)
 
                     run_items = build_run_items_from_cached(self.agent, replay_items)
                     final_output_text = extract_final_output_text(replay_items)
@@ -588,6 +575,8 @@ class Execution:
                     main_model_name = get_usage_tracking_model_name(self.agent.model)
                     if main_model_name:
                         typing.cast(_UsageTrackingRunResult, run_result)._main_agent_model = main_model_name
+                    typing.cast(_TimedRunResult, run_result).timings = run_timings
+                    typing.cast(_TimedRunResult, run_result).cost_ledger = cost_ledger
 
                     async for cached_event in stream_cached_items_events(items=replay_items, agent=self.agent):
                         yield cached_event
@@ -605,7 +594,12 @@ class Execution:
                         if isinstance(agency_instance_name, str):
                             agency_name = agency_instance_name
 
-                master_context_for_run = prepare_master_context(self.agent, context_override, agency_context)
+                master_context_for_run = prepare_master_context(
+                    self.agent, context_override, agency_context, run_instructions
+                )
+                master_context_for_run.run_timings = run_timings
+                master_context_for_run.record_timings = run_timings is not None
+                master_context_for_run.cost_ledger = cost_ledger
 
                 stream_handle = run_stream_with_guardrails(
                     agent=self.agent,
@@ -639,14 +633,11 @@ class Execution:
                 if master_context_for_run is not None:
                     cleanup_execution(
                         self.agent,
-                        original_instructions,
                         context_override,
                         agency_context,
                         master_context_for_run,
                         wrapper.final_result,
                     )
-                else:
-                    self.agent.instructions = original_instructions
                 if (
                     matched_starter
                     and cached_starter is None
@@ -660,20 +651,17 @@ class Execution:
                         segment = extract_starter_segment(new_messages, matched_starter) or new_messages
                         if segment and extract_final_output_text(segment):
                             segment = reorder_cached_items_for_tools(segment, self.agent.name)
-                            cached = save_cached_starter(
-                                self.agent.name,
+                            self.agent._starter_cache_index.put(
                                 matched_starter,
                                 segment,
                                 metadata={"source": "live_stream"},
                                 fingerprint=cache_fingerprint,
                             )
-                            cache_map = self.agent._conversation_starters_cache
-                            cache_map[normalize_starter_text(matched_starter)] = cached
                     except Exception as e:
                         logger.debug(f"Failed to cache conversation starter: {e}")
                 if self.agent.attachment_manager is None:
                     raise RuntimeError(f"attachment_manager not initialized for agent {self.agent.name}")
-                self.agent.attachment_manager.attachments_cleanup()
+                self.agent.attachment_manager.attachments_cleanup(attached_file_ids)
 
                 if stream_handle is None and wrapper.final_result is None:
                     wrapper._resolve_final_result(None)
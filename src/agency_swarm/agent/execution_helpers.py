@@ -1,7 +1,5 @@
-import inspect
 import logging
 import re
-from collections.abc import Callable
 from contextlib import AsyncExitStack
 from typing import TYPE_CHECKING, Any
 
@@ -24,6 +22,7 @@ from openai.types.responses import (
 )
 
 from agency_swarm.agent.codex_model_input import with_codex_model_input_role_rewrite
+from agency_swarm.agent.context_assembly import RunInstructions
 from agency_swarm.agent.context_types import AgentRuntimeState
 from agency_swarm.agent.system_reminder_state import agency_system_reminder_run
 from agency_swarm.agent.system_reminders import (
@@ -34,8 +33,11 @@ from agency_swarm.context import MasterContext
 from agency_swarm.messages import MessageFormatter
 from agency_swarm.tools.mcp_manager import default_mcp_manager
 from agency_swarm.tools.send_message import Handoff
+from agency_swarm.utils.run_budget import BudgetExceededError
+from agency_swarm.utils.run_hooks import with_run_hooks
 
 from .execution_guardrails import append_guardrail_feedback, extract_guardrail_texts
+from .speculative_guardrails import open_input_guardrail_gate
 
 if TYPE_CHECKING:
     from agency_swarm.agent.core import AgencyContext, Agent
@@ -82,7 +84,7 @@ async def perform_single_run(
                 starting_agent=agent,
                 input=history_for_runner,
                 context=master_context_for_run,
-                hooks=hooks_override,
+                hooks=with_run_hooks(hooks_override, timing=master_context_for_run.run_timings is not None),
                 run_config=with_codex_model_input_role_rewrite(run_config_override or RunConfig()),
                 max_turns=kwargs.get("max_turns", 1000000),
             )
@@ -111,6 +113,8 @@ async def run_with_guardrails(
     """Run a single turn with guardrail handling and optional retries."""
     attempts_remaining = int(validation_attempts or 0)
     while True:
+        # Parallel input guardrails already cancel the model call on a tripwire; the gate holds tool calls
+        open_input_guardrail_gate(agent, master_context_for_run)
         try:
             run_result = await perform_single_run(
                 agent=agent,
@@ -181,13 +185,11 @@ async def run_with_guardrails(
                     master_context_for_run,
                 )
             raise e
+        except BudgetExceededError:
+            raise
         except Exception as e:
             cause_type = type(e).__name__
             raise AgentsException(f"Runner execution failed for agent {agent.name} (cause: {cause_type})") from e
-        finally:
-            if agent.attachment_manager is None:
-                raise RuntimeError(f"attachment_manager not initialized for agent {agent.name}")
-            agent.attachment_manager.attachments_cleanup()
 
 
 def run_item_to_tresponse_input_item(item: RunItem) -> TResponseInputItem | None:
@@ -229,7 +231,10 @@ def _resolve_latest_shared_instructions(agency_context: "AgencyContext | None")
 
 
 def prepare_master_context(
-    agent: "Agent", context_override: dict[str, Any] | None, agency_context: "AgencyContext | None" = None
+    agent: "Agent",
+    context_override: dict[str, Any] | None,
+    agency_context: "AgencyContext | None" = None,
+    run_instructions: RunInstructions | None = None,
 ) -> MasterContext:
     """Constructs the MasterContext for the current run."""
     if not agency_context or not agency_context.thread_manager:
@@ -247,6 +252,7 @@ def prepare_master_context(
             user_context=context_override or {},
             current_agent_name=agent.name,
             shared_instructions=shared_instructions_for_run,
+            run_instructions=run_instructions,
             agent_runtime_state={agent.name: AgentRuntimeState(agent.tool_concurrency_manager)},
         )
 
@@ -268,6 +274,7 @@ def prepare_master_context(
         user_context=user_context,
         current_agent_name=agent.name,
         shared_instructions=shared_instructions_for_run,
+        run_instructions=run_instructions,
         agent_runtime_state=runtime_state_map,
     )
 
@@ -308,77 +315,37 @@ def setup_execution(
     agency_context: "AgencyContext | None",
     additional_instructions: str | None,
     method_name: str = "execution",
-) -> str | Callable | None:
-    """Common setup logic for both get_response and get_response_stream."""
+) -> RunInstructions | None:
+    """Common setup logic for both get_response and get_response_stream.
+
+    Returns the shared and additional instructions of this run. They belong on the run's MasterContext,
+    where `Agent.get_system_prompt` picks them up, so concurrent runs never see each other's instructions.
+    """
     # Validate agency instance exists if this is agent-to-agent communication
     _validate_agency_for_delegation(agent, sender_name, agency_context)
 
-    # Store original instructions for restoration
-    original_instructions = agent.instructions
-
-    # Temporarily modify instructions if shared or additional instructions provided
     shared_instructions_text = _resolve_latest_shared_instructions(agency_context)
 
     if additional_instructions and not isinstance(additional_instructions, str):
         raise ValueError("additional_instructions must be a string")
 
-    additional_for_run: str | None = additional_instructions or None
-
-    def build_combined_instructions(base_text: str | None) -> str | None:
-        """Compose the runtime instructions in the order: shared -> base -> additional."""
-        core_parts: list[str] = []
-        if shared_instructions_text:
-            core_parts.append(shared_instructions_text)
-        if base_text:
-            core_parts.append(base_text)
-
-        core_instructions = "\n\n".join(core_parts) if core_parts else None
-        if not additional_for_run:
-            return core_instructions
-
-        separator = "\n\n---\n\n" if shared_instructions_text else "\n\n"
-        if core_instructions:
-            return f"{core_instructions}{separator}{additional_for_run}"
-        return additional_for_run
-
-    # Skip modification if nothing to add
-    if shared_instructions_text or additional_for_run:
+    run_instructions: RunInstructions | None = None
+    if shared_instructions_text or additional_instructions:
         logger.debug(
             "Preparing combined instructions for agent '%s' (shared: %s, additional: %s)",
             agent.name,
             bool(shared_instructions_text),
-            bool(additional_for_run),
+            bool(additional_instructions),
         )
-
-        if isinstance(agent.instructions, str) and agent.instructions:
-            combined = build_combined_instructions(agent.instructions)
-            if combined is not None:
-                agent.instructions = combined
-        elif callable(agent.instructions):
-            # Create a wrapper function that calls original callable and joins shared/additional instructions
-            original_callable = agent.instructions
-
-            async def combined_instructions(run_context, agent_instance):
-                # Call the original callable instructions (handle both sync and async)
-                if inspect.iscoroutinefunction(original_callable):
-                    base_instructions = await original_callable(run_context, agent_instance)
-                else:
-                    base_instructions = original_callable(run_context, agent_instance)
-
-                base_text = None
-                if base_instructions:
-                    base_text = str(base_instructions)
-
-                combined = build_combined_instructions(base_text)
-                # Fall back to original result if nothing was combined (should be rare)
-                return combined if combined is not None else base_instructions
-
-            agent.instructions = combined_instructions
+        if getattr(agent, "stable_prompt_prefix", False):
+            # Keep the system prompt byte-identical across runs; the run's instructions go after the history
+            run_instructions = RunInstructions(
+                agent_name=agent.name, shared=shared_instructions_text, volatile=additional_instructions or None
+            )
         else:
-            # Replace if it's None or unsupported type with the composed shared/additional instructions
-            combined = build_combined_instructions(None)
-            if combined is not None:
-                agent.instructions = combined
+            run_instructions = RunInstructions(
+                agent_name=agent.name, shared=shared_instructions_text, additional=additional_instructions or None
+            )
 
     # Align handoffs with runtime state for this execution. The SDK run loop can
     # switch to any agency agent mid-run via chained handoffs without re-entering
@@ -411,7 +378,7 @@ def setup_execution(
     # Log the conversation context
     logger.info(f"Agent '{agent.name}' handling {method_name} from sender: {sender_name}")
 
-    return original_instructions
+    return run_instructions
 
 
 def _validate_agency_for_delegation(
@@ -439,7 +406,6 @@ def _validate_agency_for_delegation(
 
 def cleanup_execution(
     agent: "Agent",
-    original_instructions: str | Callable | None,
     context_override: dict[str, Any] | None,
     agency_context: "AgencyContext | None",
     master_context_for_run: MasterContext,
@@ -459,9 +425,6 @@ def cleanup_execution(
             if key not in context_override:  # Don't sync back override keys
                 base_user_context[key] = value
 
-    # Always restore original instructions
-    agent.instructions = original_instructions
-
     restore_entries: list[tuple[Any, list[Any]]] | None = None
     if agency_context is not None:
         try:
@@ -10,7 +10,7 @@ from agents import TResponseInputItem
 from agents.items import MessageOutputItem, RunItem
 from agents.models.fake_id import FAKE_RESPONSES_ID
 
-from agency_swarm.messages import MessageFilter, MessageFormatter
+from agency_swarm.messages import IncrementalMessageFilter, MessageFilter, MessageFormatter
 from agency_swarm.streaming.id_normalizer import StreamIdNormalizer
 from agency_swarm.utils.citation_extractor import extract_direct_file_annotations
 
@@ -41,13 +41,82 @@ HashKey = tuple[str, str | None]  # (content_hash, item_type)
 class StreamMetadataStore:
     """Container for metadata collected during streaming.
 
-    Stores metadata by various keys for matching items between streaming
-    and final persistence. Hash-based matching uses queues to preserve
-    metadata for all identical items.
+    Each streamed item gets its identity recorded at emission time: the RunItem object itself
+    (kept alive so its ``id()`` stays unique for the whole run), plus its message id or call_id.
+    The SDK hands the same RunItem objects back in ``new_items``, so final persistence is a keyed
+    lookup per item. Content hashes are only computed, lazily and once, when an item arrives
+    that none of those identities match.
     """
 
     by_item: dict[MetadataKey, ItemMetadata] = field(default_factory=dict)
     hash_queues: dict[HashKey, deque[ItemMetadata]] = field(default_factory=dict)
+    # Streamed items without a usable message id or call_id, hashed only if identity matching fails
+    unhashed_items: list[tuple[RunItem, ItemMetadata]] = field(default_factory=list)
+    # Strong references that keep ``id(run_item)`` keys in ``by_item`` from being reused
+    pinned_items: list[RunItem] = field(default_factory=list)
+
+    def record(self, run_item: RunItem, metadata: ItemMetadata) -> None:
+        """Assign stable identities to a streamed item and remember its metadata."""
+        self.pinned_items.append(run_item)
+        self.by_item[id(run_item)] = metadata
+        item_id, item_type, call_id = _item_identity(run_item)
+        # Message ID for recreated objects (skip placeholder IDs)
+        if item_id is not None:
+            self.by_item[(item_id, item_type)] = metadata
+        # Call ID for tool calls (works for LiteLLM where message ID is fake)
+        if call_id is not None:
+            self.by_item[("call", call_id, item_type)] = metadata
+        elif item_id is None:
+            self.unhashed_items.append((run_item, metadata))
+
+    def lookup(self, run_item: RunItem) -> ItemMetadata | None:
+        """Return the metadata recorded for ``run_item`` during streaming, if any.
+
+        Matching order: Python object identity, message id + type, call_id + type, then
+        content hash (FIFO, so identical items keep their own metadata).
+        """
+        metadata = self.by_item.get(id(run_item))
+        if metadata is not None:
+            return metadata
+
+        item_id, item_type, call_id = _item_identity(run_item)
+        if item_id is not None and (metadata := self.by_item.get((item_id, item_type))) is not None:
+            return metadata
+        if call_id is not None and (metadata := self.by_item.get(("call", call_id, item_type))) is not None:
+            return metadata
+
+        self._hash_pending_items()
+        content_hash = _compute_content_hash(run_item)
+        if content_hash:
+            queue = self.hash_queues.get((content_hash, item_type))
+            if queue:
+                return queue.popleft()
+        return None
+
+    def _hash_pending_items(self) -> None:
+        for pending_item, metadata in self.unhashed_items:
+            content_hash = _compute_content_hash(pending_item)
+            if content_hash:
+                hash_key: HashKey = (content_hash, getattr(pending_item, "type", None))
+                self.hash_queues.setdefault(hash_key, deque()).append(metadata)
+        self.unhashed_items.clear()
+
+
+def _item_identity(run_item: Any) -> tuple[str | None, str | None, str | None]:
+    """Return ``(message_id, item_type, call_id)`` with placeholder and empty ids mapped to None."""
+    raw_item = getattr(run_item, "raw_item", None)
+    item_id = getattr(run_item, "id", None)
+    if not item_id:
+        # Handle both dict-backed and object-backed raw_items
+        item_id = raw_item.get("id") if isinstance(raw_item, dict) else getattr(raw_item, "id", None)
+    call_id = getattr(run_item, "call_id", None)
+    if not call_id:
+        call_id = raw_item.get("call_id") if isinstance(raw_item, dict) else getattr(raw_item, "call_id", None)
+    return (
+        item_id if isinstance(item_id, str) and item_id and item_id != FAKE_RESPONSES_ID else None,
+        getattr(run_item, "type", None),
+        call_id if isinstance(call_id, str) and call_id else None,
+    )
 
 
 def _compute_content_hash(run_item: RunItem) -> str | None:
@@ -216,41 +285,8 @@ def _persist_run_item_if_needed(
     if not isinstance(item_agent_name, str) or not item_agent_name:
         item_agent_name = current_stream_agent_name
 
-    # Track metadata using multiple keys for matching in _persist_streamed_items:
-    # 1. Python object id() - works for items that maintain identity (e.g., tool_call_output_item)
-    # 2. Message ID - works for OpenAI Responses API (items may be recreated but keep same ID)
-    obj_id = id(run_item_obj)
-    raw_item = getattr(run_item_obj, "raw_item", None)
-    item_id = getattr(run_item_obj, "id", None)
-    if not item_id:
-        # Handle both dict-backed and object-backed raw_items
-        item_id = raw_item.get("id") if isinstance(raw_item, dict) else getattr(raw_item, "id", None)
-    item_type = getattr(run_item_obj, "type", None)
-    # Store (agent_name, agent_run_id, caller_name, timestamp)
-    metadata = (item_agent_name, current_agent_run_id, caller_for_event, emission_timestamp)
-
-    # Store by Python object ID (primary)
-    metadata_store.by_item[obj_id] = metadata
-    # Also store by message ID if available and not fake (for matching recreated objects)
-    if isinstance(item_id, str) and item_id and item_id != FAKE_RESPONSES_ID:
-        metadata_store.by_item[(item_id, item_type)] = metadata
-    # Also store by call_id for tool_call_item (works for LiteLLM where message ID is fake)
-    call_id = getattr(run_item_obj, "call_id", None)
-    if not call_id:
-        call_id = raw_item.get("call_id") if isinstance(raw_item, dict) else getattr(raw_item, "call_id", None)
-    has_call_id = isinstance(call_id, str) and call_id
-    if has_call_id:
-        call_key = cast(tuple[str, str, str | None], ("call", call_id, item_type))
-        metadata_store.by_item[call_key] = metadata
-    # Store by content hash for items without reliable IDs (e.g., reasoning_item with LiteLLM)
-    needs_hash_fallback = (
-        not isinstance(item_id, str) or not item_id or item_id == FAKE_RESPONSES_ID
-    ) and not has_call_id
-    if needs_hash_fallback:
-        content_hash = _compute_content_hash(run_item_obj)
-        if content_hash:
-            hash_key: HashKey = (content_hash, item_type)
-            metadata_store.hash_queues.setdefault(hash_key, deque()).append(metadata)
+    # Store (agent_name, agent_run_id, caller_name, timestamp) keyed by the item's identities
+    metadata_store.record(run_item_obj, (item_agent_name, current_agent_run_id, caller_for_event, emission_timestamp))
 
 
 def _persist_streamed_items(
@@ -265,6 +301,7 @@ def _persist_streamed_items(
     fallback_agent_run_id: str,
     agency_context: "AgencyContext",
     initial_saved_count: int,
+    run_anchor: TResponseInputItem | None = None,
 ) -> None:
     """Persist sanitized items after streaming completes."""
     if agency_context.thread_manager is None:
@@ -296,6 +333,8 @@ def _persist_streamed_items(
     )
 
     items_to_save: list[TResponseInputItem] = []
+    # The protocol depends only on the agent's model, so resolve it once per agent name
+    history_protocols: dict[str, str] = {}
     current_agent_name = agent.name
     current_agent_run_id = fallback_agent_run_id
 
@@ -306,63 +345,16 @@ def _persist_streamed_items(
             continue
         item_copy: dict[str, Any] = dict(item_dict)
 
-        # Look up metadata using hybrid matching:
-        # 1. Try Python object id() first (works for items that maintain identity)
-        # 2. Try message ID + type (works for OpenAI where items may be recreated)
-        obj_id = id(run_item)
-        raw_item = run_item.raw_item
-        item_id = getattr(run_item, "id", None)
-        if not item_id:
-            item_id = raw_item.get("id") if isinstance(raw_item, dict) else getattr(raw_item, "id", None)
-        item_type = getattr(run_item, "type", None)
-
-        # Try matching by call_id for tool calls (works for LiteLLM)
-        call_id = getattr(run_item, "call_id", None)
-        if not call_id:
-            call_id = raw_item.get("call_id") if isinstance(raw_item, dict) else getattr(raw_item, "call_id", None)
-
-        matched = False
         emission_timestamp: int | None = None
-
-        # Try matching strategies in order of preference:
-        # 1. Python object id() - most reliable, works when objects maintain identity
-        if obj_id in metadata_store.by_item:
-            current_agent_name, current_agent_run_id, caller_name, emission_timestamp = metadata_store.by_item[obj_id]
-            matched = True
-
-        # 2. Message ID + type - works for OpenAI where items may be recreated
-        if not matched and isinstance(item_id, str) and item_id and item_id != FAKE_RESPONSES_ID:
-            id_key = (item_id, item_type)
-            if id_key in metadata_store.by_item:
-                current_agent_name, current_agent_run_id, caller_name, emission_timestamp = metadata_store.by_item[
-                    id_key
-                ]
-                matched = True
-
-        # 3. Call ID + type - works for tool calls with LiteLLM (FAKE_RESPONSES_ID)
-        if not matched and isinstance(call_id, str) and call_id:
-            call_key = ("call", call_id, item_type)
-            if call_key in metadata_store.by_item:
-                current_agent_name, current_agent_run_id, caller_name, emission_timestamp = metadata_store.by_item[
-                    call_key
-                ]
-                matched = True
-
-        # 4. Content hash matching as last resort (for reasoning_item with LiteLLM)
-        # Use queues preserve metadata for identical items - pop from front (FIFO)
-        if not matched:
-            content_hash = _compute_content_hash(run_item)
-            if content_hash:
-                hash_key: HashKey = (content_hash, item_type)
-                if hash_key in metadata_store.hash_queues and metadata_store.hash_queues[hash_key]:
-                    current_agent_name, current_agent_run_id, caller_name, emission_timestamp = (
-                        metadata_store.hash_queues[hash_key].popleft()
-                    )
-                    matched = True
-
-        if not matched:
+        metadata = metadata_store.lookup(run_item)
+        if metadata is not None:
+            current_agent_name, current_agent_run_id, caller_name, emission_timestamp = metadata
+        else:
             # Fallback for items not seen during streaming (shouldn't happen normally)
-            logger.debug(f"Metadata fallback for unmatched item type={item_type} - using persist-time timestamp")
+            logger.debug(
+                f"Metadata fallback for unmatched item type={getattr(run_item, 'type', None)} - "
+                "using persist-time timestamp"
+            )
             caller_name = _resolve_caller_agent(item_copy, sender_name)
             current_agent_name = agent.name
             current_agent_run_id = fallback_agent_run_id
@@ -374,6 +366,16 @@ def _persist_streamed_items(
         if isinstance(run_item, MessageOutputItem):
             MessageFormatter.add_citations_to_message(run_item, item_payload, citations_by_message, is_streaming=True)
 
+        history_protocol = history_protocols.get(current_agent_name)
+        if history_protocol is None:
+            history_protocol = history_protocols[current_agent_name] = (
+                MessageFormatter.resolve_history_protocol_for_agent_name(
+                    current_agent_name,
+                    default_agent=agent,
+                    agency_context=agency_context,
+                )
+            )
+
         formatted_item: TResponseInputItem = MessageFormatter.add_agency_metadata(
             item_payload,
             agent=current_agent_name,
@@ -381,11 +383,7 @@ def _persist_streamed_items(
             agent_run_id=current_agent_run_id,
             parent_run_id=parent_run_id,
             run_trace_id=run_trace_id,
-            history_protocol=MessageFormatter.resolve_history_protocol_for_agent_name(
-                current_agent_name,
-                default_agent=agent,
-                agency_context=agency_context,
-            ),
+            history_protocol=history_protocol,
             timestamp=emission_timestamp,
         )
         items_to_save.append(formatted_item)
@@ -435,15 +433,21 @@ def _persist_streamed_items(
             if key:
                 synthetic_keys_to_replace.add(key)
 
+    thread_manager = agency_context.thread_manager
+    initial_index = _run_tail_start(thread_manager, initial_saved_count, run_anchor)
+    tail_reader = getattr(thread_manager, "get_messages_since", None)
     try:
-        existing_messages = agency_context.thread_manager.get_all_messages()
+        if callable(tail_reader):
+            mutable_tail = tail_reader(initial_index)
+            preserved_prefix = None
+        else:
+            existing_messages = thread_manager.get_all_messages()
+            initial_index = min(initial_index, len(existing_messages))
+            preserved_prefix = existing_messages[:initial_index]
+            mutable_tail = existing_messages[initial_index:]
     except Exception:
-        existing_messages = []
-
-    initial_index = min(max(initial_saved_count, 0), len(existing_messages))
-    preserved_prefix = existing_messages[:initial_index]
-
-    mutable_tail = existing_messages[initial_index:]
+        mutable_tail = []
+        preserved_prefix = None if callable(tail_reader) else []
 
     # Only collect run_ids from items that are actually being saved (filtered_items).
     run_ids_to_replace: set[str] = {
@@ -461,7 +465,8 @@ def _persist_streamed_items(
         if isinstance(call_id, str) and call_id:
             keys_to_replace.add(("call", call_id, item_type))
 
-    rebuilt_tail: list[TResponseInputItem] = []
+    # Track call/approval pairing while the tail is rebuilt so orphan removal does not need extra passes
+    combined_tracker = IncrementalMessageFilter(remove_duplicates=False, drop_filtered=False)
     for existing_item in mutable_tail:
         existing_key = _message_key(existing_item)
         run_id = existing_item.get("agent_run_id")
@@ -474,16 +479,91 @@ def _persist_streamed_items(
             synthetic_key = (origin, str(existing_item.get("content")))
             if synthetic_key in synthetic_keys_to_replace:
                 continue
-        rebuilt_tail.append(existing_item)
+        combined_tracker.add(existing_item)
+    combined_tracker.extend(filtered_items)
 
     # Remove orphaned items (e.g., function_call without output) before saving
-    combined_new_items = rebuilt_tail + filtered_items
-    combined_new_items = MessageFilter.remove_orphaned_messages(combined_new_items)
+    combined_new_items = combined_tracker.messages()
+
+    if preserved_prefix is None:
+        # Only the run's tail is rewritten; the earlier history is never copied
+        thread_manager.replace_messages_since(initial_index, combined_new_items)
+    else:
+        thread_manager.replace_messages(preserved_prefix + combined_new_items)
+    thread_manager.persist()
 
-    sanitized_history = preserved_prefix + combined_new_items
 
-    agency_context.thread_manager.replace_messages(sanitized_history)
-    agency_context.thread_manager.persist()
+def _stored_message_count(thread_manager: Any) -> int:
+    """Number of stored messages, without copying the history when the thread manager can count it."""
+    counter = getattr(thread_manager, "message_count", None)
+    return counter() if callable(counter) else len(thread_manager.get_all_messages())
+
+
+def _run_tail_anchor(thread_manager: Any, initial_saved_count: int) -> TResponseInputItem | None:
+    """Newest message stored before a run starts; `_run_tail_start` locates it again to find the run's tail."""
+    tail_reader = getattr(thread_manager, "get_messages_since", None)
+    if initial_saved_count <= 0 or not callable(tail_reader):
+        return None
+    stored = tail_reader(initial_saved_count - 1)
+    return stored[0] if stored else None
+
+
+def _run_tail_start(thread_manager: Any, initial_saved_count: int, run_anchor: TResponseInputItem | None) -> int:
+    """Current index of the first message stored by the run.
+
+    Concurrent sibling runs rewrite their own tails and can shift positions, so the run's anchor message is
+    located again by identity or id. The count taken when the run started is only the fallback.
+    """
+    finder = getattr(thread_manager, "find_message_index", None)
+    if run_anchor is not None and callable(finder):
+        index = finder(run_anchor)
+        if index is not None:
+            return index + 1
+    return max(initial_saved_count, 0)
+
+
+def _stored_ids_before(thread_manager: Any, ids: set[str], start: int) -> set[str]:
+    """Which of ``ids`` already belong to messages stored before index ``start``."""
+    if not ids:
+        return set()
+    finder = getattr(thread_manager, "find_message_ids", None)
+    if callable(finder):
+        return finder(ids, start)
+    return {
+        message_id for message in thread_manager.get_all_messages()[:start] if (message_id := message.get("id")) in ids
+    }
+
+
+def _clean_up_run_tail(
+    thread_manager: Any, initial_saved_count: int, run_anchor: TResponseInputItem | None = None
+) -> int:
+    """Drop duplicates, filtered types and orphans among the messages stored since the run started, then persist.
+
+    Earlier history was already cleaned by the runs that wrote it, so only the run's tail is scanned when the
+    thread manager can read it; tail items repeating an id from the earlier history are still dropped. Returns
+    the number of messages scanned.
+    """
+    tail_reader = getattr(thread_manager, "get_messages_since", None)
+    if callable(tail_reader):
+        start = _run_tail_start(thread_manager, initial_saved_count, run_anchor)
+        scanned = tail_reader(start)
+        tail_ids = {
+            message_id
+            for message in scanned
+            if isinstance(message_id := message.get("id"), str) and message_id and message_id != FAKE_RESPONSES_ID
+        }
+        history_filter = IncrementalMessageFilter(seen_ids=_stored_ids_before(thread_manager, tail_ids, start))
+    else:
+        scanned = thread_manager.get_all_messages()
+        history_filter = IncrementalMessageFilter()
+    history_filter.extend(scanned)
+    if history_filter.changed:
+        if callable(tail_reader):
+            thread_manager.replace_messages_since(start, history_filter.messages())
+        else:
+            thread_manager.replace_messages(history_filter.messages())
+    thread_manager.persist()
+    return len(scanned)
 
 
 def _message_key(message: TResponseInputItem) -> tuple[str, str | None, str | None] | None:
@@ -6,6 +6,8 @@ from typing import Any
 from agents import RunResultStreaming
 from agents.stream_events import StreamEvent
 
+from agency_swarm.utils.cost_ledger import CostLedger
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +47,18 @@ class StreamingRunResponse(AsyncGenerator[StreamEvent | dict[str, Any]]):
         self._cancel_event = cancel_event
         self._cancel_state = cancel_state  # Shared state for cancel mode
         self._cancel_requested = False  # Track if cancel was already called
+        self._cost_ledger: CostLedger | None = None
+
+    @property
+    def cost_ledger(self) -> CostLedger | None:
+        """Live usage and cost of the run, updated as each model response completes."""
+        if self._cost_ledger is None and self._inner is not None:
+            return self._inner.cost_ledger
+        return self._cost_ledger
+
+    @cost_ledger.setter
+    def cost_ledger(self, ledger: CostLedger | None) -> None:
+        self._cost_ledger = ledger
 
     def __aiter__(self) -> AsyncGenerator[StreamEvent | dict[str, Any]]:
         self._maybe_bind_loop()
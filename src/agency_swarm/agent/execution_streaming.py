@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 import typing
 from collections.abc import AsyncGenerator, Callable
 from contextlib import AsyncExitStack, suppress
@@ -25,16 +26,24 @@ from agency_swarm.messages import MessageFilter, MessageFormatter
 from agency_swarm.streaming.id_normalizer import StreamIdNormalizer
 from agency_swarm.streaming.utils import add_agent_name_to_event
 from agency_swarm.tools.mcp_manager import default_mcp_manager
+from agency_swarm.utils.cost_ledger import CostLedger
 from agency_swarm.utils.model_utils import get_usage_tracking_model_name
+from agency_swarm.utils.run_budget import BudgetExceededError
+from agency_swarm.utils.run_hooks import with_run_hooks
+from agency_swarm.utils.run_timings import RunTimings, optional_span
 
 from .execution_guardrails import append_guardrail_feedback, extract_guardrail_texts
 from .execution_stream_persistence import (
     StreamMetadataStore,
+    _clean_up_run_tail,
     _persist_run_item_if_needed,
     _persist_streamed_items,
+    _run_tail_anchor,
+    _stored_message_count,
     _update_names_from_event,
 )
 from .execution_stream_response import StreamingRunResponse
+from .speculative_guardrails import open_input_guardrail_gate
 
 __all__ = [
     "StreamingRunResponse",
@@ -57,6 +66,11 @@ class _UsageTrackingRunResult(typing.Protocol):
     _main_agent_model: str
 
 
+class _TimedRunResult(typing.Protocol):
+    timings: RunTimings
+    cost_ledger: CostLedger
+
+
 GUARDRAIL_ORIGINS = {"input_guardrail_message", "input_guardrail_error"}
 SENTINEL_TRACE_IDS = {"no-op", "", None}
 
@@ -136,7 +150,7 @@ def perform_streamed_run(
             starting_agent=agent,
             input=history_for_runner,
             context=master_context_for_run,
-            hooks=hooks_override,
+            hooks=with_run_hooks(hooks_override, timing=master_context_for_run.run_timings is not None),
             run_config=with_codex_model_input_role_rewrite(run_config_override or RunConfig()),
             max_turns=kwargs.get("max_turns", 1000000),
         )
@@ -201,11 +215,14 @@ def run_stream_with_guardrails(
             id_normalizer = StreamIdNormalizer()
             streaming_result: RunResultStreaming | None = None
             initial_saved_count = 0
+            run_anchor: TResponseInputItem | None = None
             if agency_context and agency_context.thread_manager:
                 try:
-                    initial_saved_count = len(agency_context.thread_manager.get_all_messages())
+                    initial_saved_count = _stored_message_count(agency_context.thread_manager)
+                    run_anchor = _run_tail_anchor(agency_context.thread_manager, initial_saved_count)
                 except Exception:
                     initial_saved_count = 0
+                    run_anchor = None
 
             async def _streaming_worker(
                 history_for_runner=history_for_runner,
@@ -222,6 +239,28 @@ def run_stream_with_guardrails(
                 nonlocal input_guardrail_from_exception, exception_guardrail_guidance
                 nonlocal input_guardrail_exception
                 local_result = None
+                run_timings = master_context_for_run.run_timings
+
+                async def _enqueue(ev: StreamEvent) -> None:
+                    if run_timings is None:
+                        await event_queue.put(ev)
+                        return
+                    if getattr(ev, "type", None) == "raw_response_event":
+                        run_timings.observe_stream_event(
+                            id(master_context_for_run), getattr(getattr(ev, "data", None), "type", "")
+                        )
+                    if not event_queue.full():
+                        event_queue.put_nowait(ev)
+                        return
+                    # Consumer is behind: account the back-pressure wait as queueing time
+                    wait_started = time.perf_counter()
+                    await event_queue.put(ev)
+                    run_timings.add_duration(
+                        "queueing",
+                        time.perf_counter() - wait_started,
+                        agent_run_id=master_context_for_run._current_agent_run_id,
+                    )
+
                 try:
                     async with AsyncExitStack() as mcp_stack:
                         for server in agent.mcp_servers:
@@ -231,6 +270,7 @@ def run_stream_with_guardrails(
                                 logger.warning(f"Entering async context for server {server.name}")
                                 await mcp_stack.enter_async_context(server)  # type: ignore[arg-type]
 
+                        gate = open_input_guardrail_gate(agent, master_context_for_run)
                         local_result = perform_streamed_run(
                             agent=agent,
                             history_for_runner=history_for_runner,
@@ -242,73 +282,75 @@ def run_stream_with_guardrails(
                         streaming_result = cast(RunResultStreaming, local_result)
                         cancel_state["run_result"] = streaming_result
 
-                        # OpenAI pattern: call cancel() INSIDE the loop, then continue consuming
-                        # until the generator stops naturally.
-                        # Use manual iteration to check cancel_requested while waiting for events.
-                        cancelled = False
-                        stream_gen = local_result.stream_events()
-
-                        # Create cancel_wait once outside the loop (Fix #4: reduce task churn)
-                        cancel_wait: asyncio.Task[bool] | None = asyncio.create_task(cancel_requested.wait())
-
-                        while True:
-                            # Check for cancellation while waiting for the next event
-                            next_task = asyncio.create_task(stream_gen.__anext__())
-
-                            # Build task set: always include next_task, include cancel_wait if still active
-                            tasks_to_wait: list[asyncio.Task[Any]] = [next_task]
-                            if cancel_wait is not None:
-                                tasks_to_wait.append(cancel_wait)
-
-                            done, pending = await asyncio.wait(
-                                tasks_to_wait,
-                                return_when=asyncio.FIRST_COMPLETED,
-                            )
-
-                            # Handle cancellation request
-                            if cancel_wait is not None and cancel_wait in done and not cancelled:
-                                mode = cancel_state["mode"]
-                                local_result.cancel(mode=mode)
-                                cancelled = True
-                                cancel_wait = None  # Don't reuse after it fired
-
-                                if mode == "immediate":
-                                    # Immediate mode: cancel pending task and exit quickly
-                                    if next_task in pending:
-                                        next_task.cancel()
-                                        with suppress(asyncio.CancelledError, StopAsyncIteration):
-                                            await next_task
-                                else:
-                                    # after_turn mode: wait for pending task to complete (don't lose event)
-                                    if next_task in pending:
-                                        with suppress(asyncio.CancelledError, StopAsyncIteration):
-                                            await next_task
-
-                                    # Queue the event if we got one
-                                    if next_task.done():
-                                        with suppress(asyncio.CancelledError, StopAsyncIteration):
-                                            ev = next_task.result()
-                                            await event_queue.put(ev)
-
-                                    # Drain remaining events (OpenAI: keep polling after cancel)
-                                    async for ev in stream_gen:
-                                        await event_queue.put(ev)
-                                break
-
-                            # Handle next event
-                            if next_task in done:
-                                try:
-                                    ev = next_task.result()
-                                except StopAsyncIteration:
-                                    # Generator exhausted normally - cleanup cancel_wait
-                                    if cancel_wait is not None and not cancel_wait.done():
-                                        cancel_wait.cancel()
-                                        with suppress(asyncio.CancelledError):
-                                            await cancel_wait
+                        # OpenAI pattern: call cancel(), then keep consuming until the generator stops.
+                        # A single long-lived watcher performs the cancel; the SDK signals it to the
+                        # event loop below through its own event queue, so no task is created per event.
+                        immediate_cancel = False
+
+                        async def _cancel_when_requested(local_result=local_result) -> None:
+                            nonlocal immediate_cancel
+                            await cancel_requested.wait()
+                            mode = cancel_state["mode"]
+                            immediate_cancel = mode == "immediate"
+                            local_result.cancel(mode=mode)
+                            if gate is not None:
+                                # A cancelled run gets no verdict; do not leave a full buffer waiting
+                                gate.fail()
+
+                        # Speculative input guardrails: hold events until the verdict, cancel on a tripwire
+                        held_events: list[StreamEvent] | None = [] if gate is not None else None
+                        release_lock = asyncio.Lock()
+
+                        async def _release_held_events() -> None:
+                            nonlocal held_events
+                            async with release_lock:
+                                pending, held_events = held_events or [], None
+                                for held_event in pending:
+                                    await _enqueue(held_event)
+
+                        async def _await_guardrail_verdict(local_result=local_result) -> None:
+                            nonlocal immediate_cancel
+                            if gate is None:
+                                return
+                            if await gate.wait():
+                                await _release_held_events()
+                            elif gate.tripwire_result is not None:
+                                immediate_cancel = True
+                                local_result.cancel(mode="immediate")
+
+                        cancel_watcher = asyncio.create_task(_cancel_when_requested())
+                        verdict_watcher = asyncio.create_task(_await_guardrail_verdict())
+                        try:
+                            async for ev in local_result.stream_events():
+                                if immediate_cancel:
+                                    # Immediate mode: stop forwarding as soon as the cancel lands
                                     break
-
-                                # Put event to queue
-                                await event_queue.put(ev)
+                                if gate is None:
+                                    await _enqueue(ev)
+                                    continue
+                                if gate.resolved and not gate.passed:
+                                    # Tripwires cancel the run; guardrail errors surface from the stream
+                                    continue
+                                async with release_lock:
+                                    if held_events is None:
+                                        await _enqueue(ev)
+                                        continue
+                                    held_events.append(ev)
+                                    buffer_full = len(held_events) >= agent.speculative_input_guardrails
+                                if buffer_full:
+                                    # Bounded buffer: stop pulling events until the guardrails decide
+                                    await gate.wait()
+                            if gate is not None:
+                                if gate.tripwire_result is not None:
+                                    raise InputGuardrailTripwireTriggered(gate.tripwire_result)
+                                if not gate.failed and not immediate_cancel:
+                                    await _release_held_events()
+                        finally:
+                            for watcher in (cancel_watcher, verdict_watcher):
+                                if not watcher.done():
+                                    watcher.cancel()
+                                    with suppress(asyncio.CancelledError):
+                                        await watcher
 
                 except OutputGuardrailTripwireTriggered as e:
                     guardrail_exception = e
@@ -336,6 +378,8 @@ def run_stream_with_guardrails(
                         await event_queue.put({"type": "error", "content": guidance_text})
                     else:
                         await event_queue.put({"type": "input_guardrail_guidance", "content": guidance_text})
+                except BudgetExceededError as e:
+                    await event_queue.put(e.to_event())
                 except Exception as e:
                     await event_queue.put({"type": "error", "content": str(e)})
                 finally:
@@ -368,6 +412,7 @@ def run_stream_with_guardrails(
 
             forward_task = asyncio.create_task(_forward_subagent_events())
 
+            run_timings = master_context_for_run.run_timings
             try:
                 current_stream_agent_name = agent.name
                 while True:
@@ -432,6 +477,7 @@ def run_stream_with_guardrails(
                     if isinstance(event, RunItemStreamEvent) and event.item:
                         collected_items.append(event.item)
 
+                    persist_started = time.perf_counter()
                     _persist_run_item_if_needed(
                         event,
                         agent=agent,
@@ -443,6 +489,10 @@ def run_stream_with_guardrails(
                         agency_context=agency_context,
                         metadata_store=metadata_store,
                     )
+                    if run_timings is not None:
+                        run_timings.add_duration(
+                            "persistence", time.perf_counter() - persist_started, agent_run_id=current_agent_run_id
+                        )
 
                     yield event
 
@@ -489,19 +539,25 @@ def run_stream_with_guardrails(
                         raise input_guardrail_exception
                     if agency_context and agency_context.thread_manager and streaming_result is not None:
                         if not input_guardrail_tripped:
-                            _persist_streamed_items(
-                                streaming_result=streaming_result,
-                                metadata_store=metadata_store,
-                                collected_items=collected_items,
-                                agent=agent,
-                                sender_name=sender_name,
-                                parent_run_id=parent_run_id,
-                                run_trace_id=run_trace_id,
-                                fallback_agent_run_id=current_agent_run_id,
-                                agency_context=agency_context,
-                                initial_saved_count=initial_saved_count,
-                            )
+                            with optional_span(run_timings, "persistence", current_agent_run_id):
+                                _persist_streamed_items(
+                                    streaming_result=streaming_result,
+                                    metadata_store=metadata_store,
+                                    collected_items=collected_items,
+                                    agent=agent,
+                                    sender_name=sender_name,
+                                    parent_run_id=parent_run_id,
+                                    run_trace_id=run_trace_id,
+                                    fallback_agent_run_id=current_agent_run_id,
+                                    agency_context=agency_context,
+                                    initial_saved_count=initial_saved_count,
+                                    run_anchor=run_anchor,
+                                )
                     if streaming_result is not None:
+                        if run_timings is not None:
+                            cast(_TimedRunResult, streaming_result).timings = run_timings
+                        if master_context_for_run.cost_ledger is not None:
+                            cast(_TimedRunResult, streaming_result).cost_ledger = master_context_for_run.cost_ledger
                         if result_callback is not None:
                             try:
                                 result_callback(streaming_result)
@@ -557,12 +613,8 @@ def run_stream_with_guardrails(
 
                     # Clean up duplicates and orphans (idempotent - safe to run always)
                     if agency_context and agency_context.thread_manager:
-                        all_messages = agency_context.thread_manager.get_all_messages()
-                        cleaned = MessageFilter.remove_duplicates(all_messages)
-                        cleaned = MessageFilter.filter_messages(cleaned)
-                        cleaned = MessageFilter.remove_orphaned_messages(cleaned)
-                        agency_context.thread_manager.replace_messages(cleaned)
-                        agency_context.thread_manager.persist()
+                        with optional_span(run_timings, "persistence", current_agent_run_id, phase="cleanup"):
+                            _clean_up_run_tail(agency_context.thread_manager, initial_saved_count, run_anchor)
 
                     # Store sub-agent raw_responses with model info for per-response cost calculation
                     # These are tuples of (model_name, response) to enable accurate per-model pricing
@@ -0,0 +1,250 @@
+"""Verdict cache for input and output guardrails.
+
+Guardrails are often LLM calls that classify the same recurring inputs (greetings, canned commands,
+conversation starters). With ``Agent(guardrail_cache=...)`` each verdict is stored under a key built from:
+
+- the agent name and the guardrail's fingerprint (its name, settings and the source of its function), so
+  editing a guardrail invalidates its cached verdicts;
+- the checked text, normalized the same way conversation starters are matched;
+- the scope returned by ``GuardrailCache(key_fn=...)``, for guardrails whose verdict depends on the run context.
+
+Inputs that are not plain text (files, images) are never cached. Verdicts live for ``ttl_seconds`` in a
+pluggable `VerdictStore`; the default `InMemoryVerdictStore` keeps the ``max_entries`` most recently used.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Literal
+
+from agents import GuardrailFunctionOutput, RunContextWrapper
+from pydantic import BaseModel
+
+from agency_swarm.agent.conversation_starters_cache import (
+    compute_guardrail_fingerprint,
+    extract_text_from_content,
+    normalize_starter_text,
+)
+from agency_swarm.utils.metrics import get_metrics_registry
+
+if TYPE_CHECKING:
+    from agency_swarm.agent.core import Agent
+
+type GuardrailKind = Literal["input", "output"]
+
+_CACHED_GUARDRAIL_ATTR = "_agency_swarm_guardrail_cache_wrapper"
+_FINGERPRINT_ATTR = "_agency_swarm_guardrail_fingerprint"
+
+
+@dataclass(frozen=True)
+class CachedVerdict:
+    output: GuardrailFunctionOutput
+    expires_at: float | None
+
+
+class VerdictStore(ABC):
+    """Storage backend for guardrail verdicts. Subclass it to share verdicts across processes."""
+
+    @abstractmethod
+    def get(self, key: str) -> CachedVerdict | None:
+        """Return the stored verdict, or None."""
+
+    @abstractmethod
+    def set(self, key: str, verdict: CachedVerdict) -> None:
+        """Store a verdict, replacing any previous one."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a verdict if present."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every verdict."""
+
+
+class InMemoryVerdictStore(VerdictStore):
+    """Process-local verdict store that keeps the ``max_entries`` most recently used verdicts."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedVerdict] = OrderedDict()
+
+    def get(self, key: str) -> CachedVerdict | None:
+        verdict = self._entries.get(key)
+        if verdict is not None:
+            self._entries.move_to_end(key)
+        return verdict
+
+    def set(self, key: str, verdict: CachedVerdict) -> None:
+        self._entries[key] = verdict
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class GuardrailCache:
+    """Cache of guardrail verdicts keyed by guardrail fingerprint and normalized input.
+
+    Args:
+        ttl_seconds: How long a verdict is reused (None keeps it until evicted).
+        max_entries: Size of the default in-memory store; ignored when ``store`` is given.
+        store: Backend holding the verdicts. Defaults to an `InMemoryVerdictStore`.
+        cache_tripwires: Also reuse verdicts that triggered the tripwire. Disable it when blocked inputs
+            should always be re-checked.
+        key_fn: Scopes verdicts to the run context. It receives the guardrail's ``RunContextWrapper`` and
+            returns a string (for example the user or tenant ID) that becomes part of every key, or None to
+            skip the cache for that check. Guardrails that read the run context must not be cached without it.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float | None = 3600.0,
+        max_entries: int = 1024,
+        store: VerdictStore | None = None,
+        cache_tripwires: bool = True,
+        key_fn: Callable[[RunContextWrapper[Any]], str | None] | None = None,
+    ) -> None:
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be positive or None")
+        self.ttl_seconds = ttl_seconds
+        self.store = store if store is not None else InMemoryVerdictStore(max_entries)
+        self.cache_tripwires = cache_tripwires
+        self.key_fn = key_fn
+
+    def get(self, key: str) -> GuardrailFunctionOutput | None:
+        verdict = self.store.get(key)
+        if verdict is None:
+            return None
+        if verdict.expires_at is not None and time.time() >= verdict.expires_at:
+            self.store.delete(key)
+            return None
+        return verdict.output
+
+    def set(self, key: str, output: GuardrailFunctionOutput) -> None:
+        if output.tripwire_triggered and not self.cache_tripwires:
+            return
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds is not None else None
+        self.store.set(key, CachedVerdict(output=output, expires_at=expires_at))
+
+    def clear(self) -> None:
+        self.store.clear()
+
+
+def normalize_guardrail_cache(value: object) -> GuardrailCache | None:
+    """Validate Agent(guardrail_cache=...). ``True`` enables a cache with default limits."""
+    if value is None or value is False:
+        return None
+    if value is True:
+        return GuardrailCache()
+    if isinstance(value, GuardrailCache):
+        return value
+    raise TypeError("guardrail_cache must be a GuardrailCache, a bool, or None.")
+
+
+def guardrail_cache_key(
+    agent_name: str, fingerprint: str, kind: GuardrailKind, checked: Any, scope: str | None = None
+) -> str | None:
+    """Build the cache key for one check, or None when the checked value cannot be cached."""
+    normalized = _normalize_checked_value(checked, kind)
+    if normalized is None:
+        return None
+    payload = json.dumps([agent_name, fingerprint, kind, normalized, scope], separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _normalize_checked_value(checked: Any, kind: GuardrailKind) -> Any:
+    if isinstance(checked, str):
+        return normalize_starter_text(checked)
+    if kind == "output":
+        if isinstance(checked, BaseModel):
+            return checked.model_dump(mode="json")
+        try:
+            return json.loads(json.dumps(checked, sort_keys=True))
+        except (TypeError, ValueError):
+            return None
+    if not isinstance(checked, list):
+        return None
+    if all(isinstance(item, str) for item in checked):
+        return [normalize_starter_text(item) for item in checked]
+    # Raw input items: the guardrail checks the trailing user messages
+    texts: list[str] = []
+    for item in reversed(checked):
+        if not isinstance(item, dict) or item.get("role") != "user":
+            break
+        content = item.get("content")
+        if isinstance(content, list) and any(
+            not isinstance(part, dict) or part.get("type") != "input_text" for part in content
+        ):
+            return None
+        text = extract_text_from_content(content)
+        if text is None:
+            return None
+        texts.append(normalize_starter_text(text))
+    return list(reversed(texts)) or None
+
+
+def _observe_lookup(agent_name: str, kind: GuardrailKind, hit: bool) -> None:
+    get_metrics_registry().counter(
+        "agency_swarm_guardrail_cache_lookups_total",
+        "Guardrail checks looked up in the verdict cache.",
+        ("agent", "kind", "result"),
+    ).inc(agent=agent_name, kind=kind, result="hit" if hit else "miss")
+
+
+def _cache_verdicts(guardrail: Any, kind: GuardrailKind) -> None:
+    guardrail_func = guardrail.guardrail_function
+    if getattr(guardrail_func, _CACHED_GUARDRAIL_ATTR, False):
+        return
+
+    @wraps(guardrail_func)
+    async def cached_guardrail(context, agent, checked):
+        cache = getattr(agent, "guardrail_cache", None)
+        key = None
+        scope = cache.key_fn(context) if isinstance(cache, GuardrailCache) and cache.key_fn is not None else None
+        if isinstance(cache, GuardrailCache) and (cache.key_fn is None or scope is not None):
+            fingerprint = getattr(cached_guardrail, _FINGERPRINT_ATTR, None)
+            if fingerprint is None:
+                fingerprint = compute_guardrail_fingerprint(guardrail)
+                setattr(cached_guardrail, _FINGERPRINT_ATTR, fingerprint)
+            key = guardrail_cache_key(agent.name, fingerprint, kind, checked, scope)
+        if key is not None:
+            cached = cache.get(key)
+            _observe_lookup(agent.name, kind, cached is not None)
+            if cached is not None:
+                return cached
+        output = guardrail_func(context, agent, checked)
+        if inspect.isawaitable(output):
+            output = await output
+        if key is not None and isinstance(output, GuardrailFunctionOutput):
+            cache.set(key, output)
+        return output
+
+    setattr(cached_guardrail, _CACHED_GUARDRAIL_ATTR, True)
+    guardrail.guardrail_function = cached_guardrail
+
+
+def install_guardrail_cache(agent: Agent) -> None:
+    """Route the agent's guardrails through its verdict cache (idempotent; no-op without a cache)."""
+    if getattr(agent, "guardrail_cache", None) is None:
+        return
+    for guardrail in agent.input_guardrails or []:
+        _cache_verdicts(guardrail, "input")
+    for guardrail in agent.output_guardrails or []:
+        _cache_verdicts(guardrail, "output")
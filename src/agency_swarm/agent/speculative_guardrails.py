@@ -0,0 +1,135 @@
+"""Speculative input guardrails: start the model call while input guardrails are still deciding.
+
+With ``Agent(speculative_input_guardrails=True)`` every input guardrail of the agent runs concurrently with
+the first model call, including guardrails declared with ``run_in_parallel=False``. The run stays safe to
+expose because nothing leaves it before the verdict:
+
+- Streamed events are held in a bounded buffer and released once every guardrail has passed.
+- Function tool calls wait for the same verdict before they execute.
+- A tripwire cancels the in-flight run and discards the held events.
+
+Time to first token becomes the slower of the guardrails and the model instead of their sum.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from contextvars import ContextVar
+from dataclasses import replace
+from functools import wraps
+from typing import TYPE_CHECKING, Any
+
+from agents import InputGuardrail, InputGuardrailResult
+
+if TYPE_CHECKING:
+    from agency_swarm.agent.core import Agent
+    from agency_swarm.context import MasterContext
+
+DEFAULT_SPECULATIVE_BUFFER_SIZE = 256
+_GATE_RECORDER_ATTR = "_agency_swarm_guardrail_gate_recorder"
+# Set while the outermost recorder of a guardrail call runs, so nested recorders do not count it twice
+_recording_verdict: ContextVar[bool] = ContextVar("_agency_swarm_recording_guardrail_verdict", default=False)
+
+
+class InputGuardrailGate:
+    """Verdict of one run's input guardrails, shared by the stream buffer and tool calls."""
+
+    def __init__(self, expected: int) -> None:
+        self._remaining = expected
+        self._resolved = asyncio.Event()
+        self.tripwire_result: InputGuardrailResult | None = None
+        self.failed = False
+        if expected <= 0:
+            self._resolved.set()
+
+    @property
+    def resolved(self) -> bool:
+        return self._resolved.is_set()
+
+    @property
+    def passed(self) -> bool:
+        return self.resolved and self.tripwire_result is None and not self.failed
+
+    def record(self, result: InputGuardrailResult) -> None:
+        if self.resolved:
+            return
+        if result.output.tripwire_triggered:
+            self.tripwire_result = result
+            self._resolved.set()
+            return
+        self._remaining -= 1
+        if self._remaining <= 0:
+            self._resolved.set()
+
+    def fail(self) -> None:
+        """Resolve the gate as not passed when a guardrail raised or the run was cancelled before the verdict."""
+        if not self.resolved:
+            self.failed = True
+            self._resolved.set()
+
+    async def wait(self) -> bool:
+        """Wait for the verdict and return whether every guardrail passed."""
+        await self._resolved.wait()
+        return self.passed
+
+
+def normalize_speculative_input_guardrails(value: object) -> int:
+    """Validate Agent(speculative_input_guardrails=...) and return the buffer size (0 when disabled)."""
+    if value is None or value is False:
+        return 0
+    if value is True:
+        return DEFAULT_SPECULATIVE_BUFFER_SIZE
+    if isinstance(value, int) and value > 0:
+        return value
+    raise ValueError("speculative_input_guardrails must be a bool or a positive event buffer size.")
+
+
+def _record_verdicts(guardrail: InputGuardrail[Any]) -> None:
+    """Report the guardrail's verdict to the gate of the run it is checking (no-op outside such runs)."""
+    guardrail_func = guardrail.guardrail_function
+    # The recorder must stay outermost; wrappers installed later (e.g. the verdict cache) copy the marker
+    if getattr(guardrail_func, _GATE_RECORDER_ATTR, None) is guardrail_func:
+        return
+
+    @wraps(guardrail_func)
+    async def recording_guardrail(context, agent, user_input):
+        gate = getattr(getattr(context, "context", None), "_input_guardrail_gate", None)
+        if gate is None or _recording_verdict.get():
+            output = guardrail_func(context, agent, user_input)
+            return await output if inspect.isawaitable(output) else output
+        token = _recording_verdict.set(True)
+        try:
+            output = guardrail_func(context, agent, user_input)
+            if inspect.isawaitable(output):
+                output = await output
+        except Exception:
+            gate.fail()
+            raise
+        finally:
+            _recording_verdict.reset(token)
+        gate.record(InputGuardrailResult(guardrail=guardrail, output=output))
+        return output
+
+    setattr(recording_guardrail, _GATE_RECORDER_ATTR, recording_guardrail)
+    guardrail.guardrail_function = recording_guardrail
+
+
+def open_input_guardrail_gate(agent: Agent, master_context: MasterContext) -> InputGuardrailGate | None:
+    """Attach a fresh verdict gate to the run when the agent runs its input guardrails speculatively."""
+    master_context._input_guardrail_gate = None
+    if not getattr(agent, "speculative_input_guardrails", 0) or not agent.input_guardrails:
+        return None
+
+    guardrails = list(agent.input_guardrails)
+    for index, guardrail in enumerate(guardrails):
+        if not guardrail.run_in_parallel:
+            # Copy instead of flipping the flag, the guardrail may be shared with a blocking agent
+            guardrails[index] = guardrail = replace(guardrail, run_in_parallel=True)
+        _record_verdicts(guardrail)
+    if guardrails != agent.input_guardrails:
+        agent.input_guardrails = guardrails
+
+    gate = InputGuardrailGate(len(guardrails))
+    master_context._input_guardrail_gate = gate
+    return gate
@@ -0,0 +1,338 @@
+"""Storage for cached conversation starter replies.
+
+Agents share one `StarterCacheIndex` per store and agent name for the whole process: every stored reply of
+the agent is read from its `StarterCacheStore` once, off the event loop, and lookups after that are
+dictionary reads. New replies update the index right away and are written
+to the store by a single background thread, so the event loop never waits on disk.
+
+Two stores are included:
+
+- `DirectoryStarterStore` writes one JSON file per starter (the default, under ``starter_cache/`` in the
+  chats directory).
+- `SQLiteStarterStore` keeps every agent's replies in one SQLite file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from agents import TResponseInputItem
+
+from agency_swarm.agent.conversation_starters_cache import (
+    _CACHE_DIR_NAME,
+    CachedStarter,
+    _cache_filename,
+    _safe_agent_name,
+    build_cached_starter_payload,
+    cached_starter_from_payload,
+    normalize_starter_text,
+)
+from agency_swarm.utils.files import get_chats_dir
+from agency_swarm.utils.metrics import get_metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+class StarterCacheStore(ABC):
+    """Persistent storage for cached starter replies. Subclass it to keep them elsewhere.
+
+    Methods are called from worker threads, never concurrently for the same agent and starter. Agents
+    share an index only when their stores compare equal; custom stores compare by identity unless they
+    define ``__eq__`` and ``__hash__``.
+    """
+
+    @abstractmethod
+    def load_agent(self, agent_name: str) -> list[dict[str, Any]]:
+        """Return every stored entry payload of the agent."""
+
+    @abstractmethod
+    def save(self, agent_name: str, starter: str, payload: dict[str, Any]) -> None:
+        """Store the entry payload of one starter, replacing any previous one."""
+
+
+class DirectoryStarterStore(StarterCacheStore):
+    """One JSON file per agent and starter.
+
+    Args:
+        path: Directory holding the files. Defaults to ``starter_cache/`` in the chats directory
+            (``AGENCY_SWARM_CHATS_DIR``), resolved on first access.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self._path = Path(path) if path is not None else None
+
+    def _resolve_path(self) -> Path:
+        if self._path is None:
+            # Resolve before the first background write, which must not depend on the writer thread's environment
+            self._path = get_chats_dir() / _CACHE_DIR_NAME
+        return self._path
+
+    @property
+    def directory(self) -> Path:
+        path = self._resolve_path()
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DirectoryStarterStore) or type(other) is not type(self):
+            return NotImplemented
+        return os.path.abspath(self._resolve_path()) == os.path.abspath(other._resolve_path())
+
+    def __hash__(self) -> int:
+        return hash((type(self), os.path.abspath(self._resolve_path())))
+
+    def load_agent(self, agent_name: str) -> list[dict[str, Any]]:
+        payloads: list[dict[str, Any]] = []
+        for path in self.directory.glob(f"{_safe_agent_name(agent_name)}_*.json"):
+            try:
+                payload = json.loads(path.read_text())
+            except Exception:
+                continue
+            # Sanitized names can share a prefix, so keep only files named after this agent and prompt
+            if isinstance(payload, dict) and isinstance(payload.get("prompt"), str):
+                if path.name == _cache_filename(agent_name, payload["prompt"]):
+                    payloads.append(payload)
+        return payloads
+
+    def save(self, agent_name: str, starter: str, payload: dict[str, Any]) -> None:
+        path = self.directory / _cache_filename(agent_name, starter)
+        temp_path = path.with_suffix(".json.tmp")
+        temp_path.write_text(json.dumps(payload, indent=2))
+        temp_path.replace(path)
+
+
+class SQLiteStarterStore(StarterCacheStore):
+    """All agents' starter replies in a single SQLite file.
+
+    Args:
+        path: Database file. Processes sharing it share their cached replies.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = str(path)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS starter_cache (
+                    agent TEXT NOT NULL,
+                    starter TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (agent, starter)
+                )
+                """
+            )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SQLiteStarterStore) or type(other) is not type(self):
+            return NotImplemented
+        return os.path.abspath(self._path) == os.path.abspath(other._path)
+
+    def __hash__(self) -> int:
+        return hash((type(self), os.path.abspath(self._path)))
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self._path, timeout=5.0, isolation_level=None)
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def load_agent(self, agent_name: str) -> list[dict[str, Any]]:
+        with self._connect() as connection:
+            rows = connection.execute("SELECT payload FROM starter_cache WHERE agent = ?", (agent_name,)).fetchall()
+        payloads: list[dict[str, Any]] = []
+        for (raw_payload,) in rows:
+            try:
+                payload = json.loads(raw_payload)
+            except ValueError:
+                continue
+            if isinstance(payload, dict):
+                payloads.append(payload)
+        return payloads
+
+    def save(self, agent_name: str, starter: str, payload: dict[str, Any]) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO starter_cache (agent, starter, payload, updated_at) VALUES (?, ?, ?, ?)",
+                (agent_name, normalize_starter_text(starter), json.dumps(payload), time.time()),
+            )
+
+
+class _BackgroundWriter:
+    """Runs store writes in submission order on one worker thread."""
+
+    def __init__(self) -> None:
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: set[Future[None]] = set()
+        self._lock = threading.Lock()
+
+    def submit(self, write: Callable[..., None], *args: Any) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="agency-starter-cache")
+            future = self._executor.submit(write, *args)
+            self._pending.add(future)
+        future.add_done_callback(self._finish)
+
+    def _finish(self, future: Future[None]) -> None:
+        with self._lock:
+            self._pending.discard(future)
+        error = future.exception()
+        if error is not None:
+            logger.warning("Failed to persist conversation starter cache entry: %s", error)
+
+    def flush(self, timeout: float | None = None) -> None:
+        with self._lock:
+            pending = list(self._pending)
+        if pending:
+            wait(pending, timeout=timeout)
+
+
+_writer = _BackgroundWriter()
+
+
+def flush_starter_cache_writes(timeout: float | None = None) -> None:
+    """Block until cached starter replies saved so far are written to their stores."""
+    _writer.flush(timeout)
+
+
+def normalize_starter_cache_store(value: object) -> StarterCacheStore:
+    """Validate Agent(starter_cache_store=...). ``None`` selects the default directory store."""
+    if value is None:
+        return DirectoryStarterStore()
+    if isinstance(value, StarterCacheStore):
+        return value
+    raise TypeError("starter_cache_store must be a StarterCacheStore or None.")
+
+
+class StarterCacheIndex:
+    """In-memory view of one agent's cached starter replies, keyed by normalized starter text.
+
+    Use `get_starter_cache_index` so agents with the same name and store share one instance. The index is
+    read from the store on first use; async callers load it with `aload`. `put` updates it immediately and
+    hands the write to the background writer. ``fingerprint_memo`` holds the memoized configuration
+    fingerprints of the agents sharing it.
+    """
+
+    def __init__(self, agent_name: str, store: StarterCacheStore) -> None:
+        self.agent_name = agent_name
+        self.store = store
+        self.fingerprint_memo: dict[tuple[Any, ...], str] = {}
+        self._entries: dict[str, CachedStarter] | None = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._entries is not None
+
+    def load(self) -> dict[str, CachedStarter]:
+        """Read the store once. Blocks on the store, so async code should call `aload` first."""
+        entries = self._entries
+        if entries is not None:
+            return entries
+        with self._load_lock:
+            if self._entries is not None:
+                return self._entries
+            entries = {}
+            try:
+                payloads = self.store.load_agent(self.agent_name)
+            except Exception as e:
+                logger.warning("Failed to load conversation starter cache for %s: %s", self.agent_name, e)
+                payloads = []
+            for payload in payloads:
+                cached = cached_starter_from_payload(payload, "")
+                normalized = normalize_starter_text(cached.prompt) if cached is not None else ""
+                if cached is not None and normalized:
+                    entries[normalized] = cached
+            self._entries = entries
+            return entries
+
+    async def aload(self) -> None:
+        """Read the store in a worker thread unless the index is already loaded."""
+        if self._entries is None:
+            await asyncio.to_thread(self.load)
+
+    def get(self, starter: str, fingerprint: str | None = None) -> CachedStarter | None:
+        """Return the cached reply for the starter, or None when missing or built for another configuration."""
+        cached = self.load().get(normalize_starter_text(starter))
+        if cached is not None and fingerprint and cached.metadata.get("fingerprint") != fingerprint:
+            cached = None
+        _observe_lookup(self.agent_name, cached is not None)
+        return cached
+
+    def put(
+        self,
+        starter: str,
+        items: list[TResponseInputItem],
+        metadata: dict[str, Any] | None = None,
+        *,
+        fingerprint: str | None = None,
+    ) -> CachedStarter:
+        resolved_metadata = dict(metadata or {})
+        if fingerprint:
+            resolved_metadata["fingerprint"] = fingerprint
+        cached = CachedStarter(prompt=starter, items=items, metadata=resolved_metadata)
+        self.load()[normalize_starter_text(starter)] = cached
+        payload = build_cached_starter_payload(self.agent_name, starter, items, resolved_metadata)
+        _writer.submit(self.store.save, self.agent_name, starter, payload)
+        return cached
+
+    def remember(self, cached: CachedStarter) -> None:
+        """Record an entry that was already written to the store. Does nothing until the index is loaded."""
+        entries = self._entries
+        if entries is not None:
+            entries[normalize_starter_text(cached.prompt)] = cached
+
+    def reload(self) -> None:
+        """Drop the in-memory entries so the next lookup reads the store again."""
+        self._entries = None
+
+
+# Least recently used last; agents keep working with an evicted index, they just stop sharing it
+_indexes: OrderedDict[tuple[StarterCacheStore, str], StarterCacheIndex] = OrderedDict()
+_indexes_lock = threading.Lock()
+_MAX_INDEXES = 256
+
+
+def get_starter_cache_index(agent_name: str, store: StarterCacheStore) -> StarterCacheIndex:
+    """Return the process-wide index of the agent name in the store, creating it on first use."""
+    key = (store, agent_name)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = StarterCacheIndex(agent_name, store)
+            if len(_indexes) > _MAX_INDEXES:
+                _indexes.popitem(last=False)
+        else:
+            _indexes.move_to_end(key)
+        return index
+
+
+def find_starter_cache_index(agent_name: str, store: StarterCacheStore) -> StarterCacheIndex | None:
+    """Return the process-wide index of the agent name in the store if one exists, without creating it."""
+    with _indexes_lock:
+        return _indexes.get((store, agent_name))
+
+
+def _observe_lookup(agent_name: str, hit: bool) -> None:
+    get_metrics_registry().counter(
+        "agency_swarm_starter_cache_lookups_total",
+        "Conversation starter messages looked up in the reply cache.",
+        ("agent", "result"),
+    ).inc(agent=agent_name, result="hit" if hit else "miss")
@@ -186,7 +186,11 @@ class SystemReminderHooks(AgentHooks[MasterContext]):
         ]
         state.pending_reminders.clear()
         state.pending_tool_reminder_indexes.clear()
-        input_items[0:0] = messages
+        if getattr(agent, "stable_prompt_prefix", False):
+            # Reminders go after the history so the cached prompt prefix from earlier calls stays reusable
+            input_items.extend(messages)
+        else:
+            input_items[0:0] = messages
         return messages
 
     def _advance_tool_call_counters(
@@ -14,6 +14,7 @@ from typing import TYPE_CHECKING, get_args, get_origin
 from agents import FunctionTool, Tool
 
 from agency_swarm.tools import BaseTool, ToolFactory, validate_openapi_spec
+from agency_swarm.tools.concurrency import SingleFlightGroup
 from agency_swarm.tools.function_tool_compat import normalize_function_tool
 
 logger = logging.getLogger(__name__)
@@ -234,7 +235,12 @@ def validate_tools(tools: list) -> None:
 
 
 def _attach_one_call_guard(tool: Tool, agent: "Agent") -> None:
-    """Attach a one-call-at-a-time guard to a FunctionTool in-place (idempotent)."""
+    """Attach a one-call-at-a-time guard to a FunctionTool in-place (idempotent).
+
+    Tools with ``deduplicate_concurrent_calls`` set also coalesce identical concurrent
+    invocations made within the same run: a duplicate call awaits the in-flight result
+    instead of running again.
+    """
     if not isinstance(tool, FunctionTool):
         return
 
@@ -249,7 +255,9 @@ def _attach_one_call_guard(tool: Tool, agent: "Agent") -> None:
             "Do not try to run it in parallel with other tools."
         )
 
-    async def guarded_on_invoke(ctx, input_json: str):
+    single_flight = SingleFlightGroup() if getattr(tool, "deduplicate_concurrent_calls", False) else None
+
+    async def run_guarded(ctx, input_json: str):
         concurrency_manager = None
         master_context = getattr(ctx, "context", None)
         runtime_state = None
@@ -291,8 +299,22 @@ def _attach_one_call_guard(tool: Tool, agent: "Agent") -> None:
             # Decrement active tool count
             concurrency_manager.decrement_active_count()
 
+    async def guarded_on_invoke(ctx, input_json: str):
+        gate = getattr(getattr(ctx, "context", None), "_input_guardrail_gate", None)
+        if gate is not None and not await gate.wait():
+            # Speculative input guardrails: no side effects before the input is cleared
+            return f"Error: Tool {tool.name} was not run because the input guardrails did not pass."
+        if single_flight is None:
+            return await run_guarded(ctx, input_json)
+        # Only coalesce within one run: the result depends on that run's context and user_context
+        master_context = getattr(ctx, "context", None)
+        scope = None if master_context is None else str(id(master_context))
+        key = SingleFlightGroup.make_key(tool.name, input_json, scope)
+        return await single_flight.run(key, lambda: run_guarded(ctx, input_json))
+
     tool.on_invoke_tool = guarded_on_invoke  # type: ignore[attr-defined]
     tool._one_call_guard_installed = True  # type: ignore[attr-defined]
+    tool._single_flight_group = single_flight  # type: ignore[attr-defined]
 
 
 def _runtime_tool_types() -> tuple[type, ...]:
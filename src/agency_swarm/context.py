@@ -13,9 +13,13 @@ from typing import TYPE_CHECKING, Any, Literal
 if TYPE_CHECKING:
     from agents.items import ModelResponse
 
+    from .agent.context_assembly import RunInstructions
     from .agent.context_types import AgentRuntimeState
     from .agent.core import Agent
+    from .agent.speculative_guardrails import InputGuardrailGate
     from .streaming.utils import StreamingContext
+    from .utils.cost_ledger import CostLedger
+    from .utils.run_timings import RunTimings
     from .utils.thread import ThreadManager
 
 logger = logging.getLogger(__name__)
@@ -35,11 +39,16 @@ class MasterContext:
     agent_runtime_state: dict[str, "AgentRuntimeState"] = field(default_factory=dict)
     current_agent_name: str | None = None  # Name of the agent currently executing
     shared_instructions: str | None = None  # Shared instructions from the agency
+    run_instructions: "RunInstructions | None" = None  # Per-run instructions of the agent that started the run
     _current_agent_run_id: str | None = None  # Current agent run ID for tracking
     _parent_run_id: str | None = None  # Parent run ID for nested agent calls
     _is_streaming: bool = False  # Flag to indicate if we're in streaming mode
     _system_reminder_role: Literal["system", "developer"] = "system"
     streaming_context: "StreamingContext | None" = None  # Streaming context for passing state
+    run_timings: "RunTimings | None" = None  # Per-hop latency recorder shared across nested runs
+    record_timings: bool = True  # Whether this run records timings; sub-agent runs it starts follow it
+    cost_ledger: "CostLedger | None" = None  # Live usage and cost totals shared across nested runs
+    _input_guardrail_gate: "InputGuardrailGate | None" = None  # Verdict of speculatively run input guardrails
     # Internal: tuples of (model_name, response) from sub-agents for per-model cost calculation
     _sub_agent_raw_responses: list[tuple[str | None, "ModelResponse"]] = field(default_factory=list)
 
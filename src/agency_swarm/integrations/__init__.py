@@ -1,7 +1,22 @@
 """Integration helpers exposed at the package level."""
 
-from .fastapi import run_fastapi
-from .mcp_server import run_mcp
-from .realtime import run_realtime
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .fastapi import run_fastapi
+    from .mcp_server import run_mcp
+    from .realtime import run_realtime
 
 __all__ = ["run_fastapi", "run_mcp", "run_realtime"]
+
+_EXPORT_MODULES = {"run_fastapi": ".fastapi", "run_mcp": ".mcp_server", "run_realtime": ".realtime"}
+
+
+def __getattr__(name: str):
+    # Importing one integration (or a fastapi_utils helper) must not load the other servers' dependencies
+    if name in _EXPORT_MODULES:
+        value = getattr(importlib.import_module(_EXPORT_MODULES[name], package=__name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
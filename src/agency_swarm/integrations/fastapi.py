@@ -3,8 +3,8 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
-from collections.abc import Callable, Mapping
-from contextlib import suppress
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager, suppress
 from typing import TYPE_CHECKING, Any
 
 from agents.tool import FunctionTool
@@ -19,7 +19,12 @@ from agency_swarm.integrations.realtime import (
 )
 
 if TYPE_CHECKING:
+    from agency_swarm.integrations.fastapi_utils.admission import AdmissionLimits
+    from agency_swarm.integrations.fastapi_utils.file_handler import FileUploadCache
     from agency_swarm.integrations.fastapi_utils.oauth_support import OAuthStateRegistry, OAuthUserIdDependency
+    from agency_swarm.integrations.fastapi_utils.run_registry import RunRegistryBackend
+    from agency_swarm.integrations.fastapi_utils.tool_endpoints import ToolExecutor
+    from agency_swarm.utils.metrics import MetricsRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +47,13 @@ def run_fastapi(
     oauth_registry: OAuthStateRegistry | None = None,
     oauth_user_id_dependency: OAuthUserIdDependency | None = None,
     verify_oauth_callback_user: bool = False,
+    run_registry_backend: RunRegistryBackend | None = None,
+    tool_executor: ToolExecutor | None = None,
+    file_upload_cache: FileUploadCache | None = None,
+    admission_limits: AdmissionLimits | Mapping[str, AdmissionLimits] | None = None,
+    enable_metrics: bool = False,
+    metrics_registry: MetricsRegistry | None = None,
+    stream_compression: bool = False,
 ):
     """Launch a FastAPI server exposing endpoints for multiple agencies and tools.
 
@@ -89,6 +101,37 @@ def run_fastapi(
         pending flow is bound to the redirect by state entropy alone. Enable it
         when the deployment authenticates browsers by cookie or session so the
         dependency can resolve a user on that redirect.
+    run_registry_backend : RunRegistryBackend | None
+        Optional run state shared across workers (for example
+        ``SQLiteRunRegistryBackend("/tmp/agency-runs.sqlite")``) so a cancel
+        request reaches a streaming run owned by another worker. Defaults to
+        in-memory, where cancel only works on the worker that owns the run.
+    tool_executor : ToolExecutor | None
+        Executor for the ``/tool/<name>`` endpoints. Synchronous tools run on its
+        bounded thread pool instead of the event loop, with optional per-tool
+        concurrency limits. Defaults to a shared ``ToolExecutor()`` with 8 threads.
+    file_upload_cache : FileUploadCache | None
+        Cache mapping attachment content (and unchanged ``file_urls``) to OpenAI
+        file IDs that were already uploaded, so repeated attachments skip the
+        download, upload and processing wait. Defaults to None, which uploads
+        every attachment; pass ``FileUploadCache()`` to turn the cache on.
+    admission_limits : AdmissionLimits | Mapping[str, AdmissionLimits] | None
+        Concurrency caps for agency runs, applied per agency (or a mapping of
+        endpoint name to limits). Runs over the caps wait in a bounded queue
+        served round robin across tenants; requests that would wait past the
+        deadline get ``429``/``503`` with ``Retry-After``. Defaults to no limits.
+    enable_metrics : bool
+        Record per-route request counts and latency and expose every runtime
+        metric (active runs, stream and MCP queue depths, kernel pools, tool
+        executors, admission, model latency and time to first token) in the
+        Prometheus text format at ``/metrics``.
+    metrics_registry : MetricsRegistry | None
+        Registry to make active for the process instead of the default one.
+    stream_compression : bool
+        Compress streaming responses with gzip or deflate when the client's
+        ``Accept-Encoding`` allows it. Defaults to False: browsers and proxies
+        send ``Accept-Encoding: gzip`` on every request, and some proxies hold
+        compressed responses back until they end, which stalls event delivery.
     """
     if (agencies is None or len(agencies) == 0) and (tools is None or len(tools) == 0):
         logger.warning("No endpoints to deploy. Please provide at least one agency or tool.")
@@ -101,7 +144,10 @@ def run_fastapi(
         from starlette.websockets import WebSocket as StarletteWebSocket, WebSocketDisconnect
 
         from agency_swarm.utils.dry_run import force_dry_run
+        from agency_swarm.utils.metrics import set_metrics_registry
 
+        from .fastapi_utils.admission import AdmissionController
+        from .fastapi_utils.chat_name_cache import ChatNameCache
         from .fastapi_utils.endpoint_handlers import (
             ActiveRunRegistry,
             exception_handler,
@@ -113,10 +159,12 @@ def run_fastapi(
             make_response_endpoint,
             make_stream_endpoint,
         )
+        from .fastapi_utils.file_handler import close_shared_clients
         from .fastapi_utils.logging_middleware import (
             RequestTracker,
             setup_enhanced_logging,
         )
+        from .fastapi_utils.metrics_middleware import MetricsMiddleware, make_metrics_endpoint
         from .fastapi_utils.oauth_support import (
             FastAPIOAuthConfig,
             OAuthFlowError,
@@ -148,8 +196,15 @@ def run_fastapi(
         base_url = f"http://{host}:{port}"
 
     normalized_allowed_dirs = allowed_local_file_dirs
+    chat_name_cache = ChatNameCache()
 
-    app = FastAPI(servers=[{"url": base_url}])
+    @asynccontextmanager
+    async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        yield
+        # HTTP and OpenAI clients shared by file handling are bound to the serving loop
+        await close_shared_clients()
+
+    app = FastAPI(servers=[{"url": base_url}], lifespan=lifespan)
     app.state.verify_token = verify_token
     app.state.oauth_user_id_dependency = oauth_user_id_dependency
 
@@ -158,6 +213,11 @@ def run_fastapi(
         setup_enhanced_logging(logs_dir)
         app.add_middleware(RequestTracker)
 
+    if metrics_registry is not None:
+        set_metrics_registry(metrics_registry)
+    if enable_metrics:
+        app.add_middleware(MetricsMiddleware)
+
     if cors_origins is None:
         cors_origins = ["*"]
 
@@ -234,6 +294,11 @@ def run_fastapi(
                     enable_hosted_mcp_oauth=has_hosted_mcp_oauth,
                 )
 
+            agency_limits = (
+                admission_limits.get(agency_name) if isinstance(admission_limits, Mapping) else admission_limits
+            )
+            admission = AdmissionController(agency_limits, name=agency_name) if agency_limits is not None else None
+
             AGENT_INSTANCES: dict[str, Agent] = dict(preview_instance.agents.items())
             AgencyRequest = add_agent_validator(BaseRequest, AGENT_INSTANCES)
             if enable_agui:
@@ -245,12 +310,15 @@ def run_fastapi(
                         verify_token,
                         allowed_local_dirs=normalized_allowed_dirs,
                         oauth_config=agency_oauth_config,
+                        upload_cache=file_upload_cache,
+                        admission=admission,
+                        stream_compression=stream_compression,
                     ),
                     methods=["POST"],
                 )
                 endpoints.append(f"/{agency_name}/get_response_stream")
             else:
-                run_registry = ActiveRunRegistry()
+                run_registry = ActiveRunRegistry(run_registry_backend)
                 app.add_api_route(
                     f"/{agency_name}/get_response",
                     make_response_endpoint(
@@ -259,6 +327,9 @@ def run_fastapi(
                         verify_token,
                         allowed_local_dirs=normalized_allowed_dirs,
                         oauth_config=agency_oauth_config,
+                        upload_cache=file_upload_cache,
+                        chat_name_cache=chat_name_cache,
+                        admission=admission,
                     ),
                     methods=["POST"],
                 )
@@ -271,6 +342,10 @@ def run_fastapi(
                         run_registry,
                         allowed_local_dirs=normalized_allowed_dirs,
                         oauth_config=agency_oauth_config,
+                        upload_cache=file_upload_cache,
+                        chat_name_cache=chat_name_cache,
+                        admission=admission,
+                        stream_compression=stream_compression,
                     ),
                     methods=["POST"],
                 )
@@ -477,7 +552,7 @@ def run_fastapi(
     if tools:
         for tool in tools:
             tool_name = str(getattr(tool, "name", None) or tool.__name__)
-            tool_handler = make_tool_endpoint(tool, verify_token)
+            tool_handler = make_tool_endpoint(tool, verify_token, executor=tool_executor)
             app.add_api_route(
                 f"/tool/{tool_name}",
                 tool_handler,
@@ -492,6 +567,10 @@ def run_fastapi(
 
     app.add_exception_handler(Exception, exception_handler)
 
+    if enable_metrics:
+        app.add_api_route("/metrics", make_metrics_endpoint(verify_token), methods=["GET"])
+        endpoints.append("/metrics")
+
     # Add get_logs endpoint if logging is enabled
     if enable_logging:
         app.add_api_route("/get_logs", make_logs_endpoint(LogRequest, logs_dir, verify_token), methods=["POST"])
@@ -0,0 +1,250 @@
+"""Admission control for agency runs: concurrency caps, a bounded wait queue and fair tenant scheduling.
+
+Every run served by an agency endpoint takes an admission ticket before it acquires the agency request lease and
+returns it when the request finishes. Requests over the caps wait in a per-tenant queue; tenants are served round
+robin so one busy tenant cannot starve the others. Requests that would wait past the queue deadline are shed with
+``429 Too Many Requests`` (the tenant is over its own cap) or ``503 Service Unavailable`` (the agency is saturated),
+both with a ``Retry-After`` header.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+import weakref
+from collections import Counter, OrderedDict, deque
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import HTTPException
+
+from agency_swarm.utils.metrics import MetricFamily, register_builtin_collector
+
+DEFAULT_TENANT = "default"
+
+# Weight of the newest run duration in the moving average used to estimate queue waits
+_HOLD_TIME_SMOOTHING = 0.2
+
+
+@dataclass(frozen=True)
+class AdmissionLimits:
+    """Admission limits applied to each agency served by `run_fastapi`.
+
+    Args:
+        max_concurrent_runs: Runs executing at once per agency. None leaves it unlimited.
+        max_concurrent_runs_per_tenant: Runs executing at once per tenant within an agency. None leaves it unlimited.
+        max_queued_requests: Requests allowed to wait for a slot; further requests are rejected immediately.
+        queue_timeout_seconds: Longest a request waits for a slot before it is shed. Requests whose estimated
+            wait already exceeds it are shed on arrival.
+        tenant_header: Request header identifying the tenant when OAuth does not resolve a user ID. Off by
+            default because clients can send any value; set it only when a trusted proxy sets the header.
+            Requests without a user ID or tenant header share the ``"default"`` tenant.
+    """
+
+    max_concurrent_runs: int | None = None
+    max_concurrent_runs_per_tenant: int | None = None
+    max_queued_requests: int = 100
+    queue_timeout_seconds: float = 30.0
+    tenant_header: str | None = None
+
+
+class AdmissionRejectedError(HTTPException):
+    """Raised when a request is shed; FastAPI turns it into a 429/503 response with ``Retry-After``."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: float) -> None:
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(status_code=status_code, detail=detail, headers={"Retry-After": str(self.retry_after)})
+
+
+@dataclass
+class AdmissionTicket:
+    tenant: str
+    admitted_at: float
+    released: bool = False
+
+
+@dataclass
+class _Waiter:
+    tenant: str
+    future: asyncio.Future[AdmissionTicket]
+
+
+class AdmissionController:
+    """Admits runs for one agency within its `AdmissionLimits`.
+
+    State lives on the event loop serving the app; `acquire` and `release` must be called from that loop.
+
+    Args:
+        limits: Caps and queue settings.
+        name: Agency name reported in metrics.
+    """
+
+    def __init__(self, limits: AdmissionLimits | None = None, *, name: str = "") -> None:
+        self.limits = limits or AdmissionLimits()
+        self.name = name
+        self._active = 0
+        self._active_by_tenant: Counter[str] = Counter()
+        # Tenants with waiting requests, in round-robin order
+        self._queues: OrderedDict[str, deque[_Waiter]] = OrderedDict()
+        self._queued = 0
+        self._mean_hold_seconds: float | None = None
+        self._admitted = 0
+        self._rejected = 0
+        _LIVE_CONTROLLERS.add(self)
+
+    def tenant_for(self, user_id: object = None, headers: Any = None) -> str:
+        """Resolve the tenant of a request: the OAuth user ID, then the tenant header, then the default tenant."""
+        if isinstance(user_id, str) and user_id:
+            return user_id
+        header = self.limits.tenant_header
+        if header and headers is not None:
+            value = headers.get(header) or headers.get(header.lower())
+            if value:
+                return str(value)
+        return DEFAULT_TENANT
+
+    async def acquire(self, tenant: str = DEFAULT_TENANT) -> AdmissionTicket:
+        """Wait for a run slot. Raises `AdmissionRejectedError` when the request is shed."""
+        if tenant not in self._queues and self._has_capacity(tenant):
+            return self._admit(tenant)
+
+        if self._queued >= self.limits.max_queued_requests:
+            raise self._reject(tenant, "Too many queued requests", self._estimate_wait(tenant))
+        estimated_wait = self._estimate_wait(tenant)
+        if estimated_wait > self.limits.queue_timeout_seconds:
+            raise self._reject(tenant, "Estimated queue wait exceeds the admission deadline", estimated_wait)
+
+        waiter = _Waiter(tenant, asyncio.get_running_loop().create_future())
+        self._queues.setdefault(tenant, deque()).append(waiter)
+        self._queued += 1
+        try:
+            async with asyncio.timeout(self.limits.queue_timeout_seconds):
+                return await waiter.future
+        except TimeoutError:
+            # A slot granted in the same loop iteration as the deadline must not leak
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(waiter.future.result())
+            raise self._reject(tenant, "Timed out waiting for a run slot", self._estimate_wait(tenant)) from None
+        except asyncio.CancelledError:
+            # A slot granted in the same loop iteration as the cancellation must not leak
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(waiter.future.result())
+            raise
+        finally:
+            self._discard(waiter)
+
+    def release(self, ticket: AdmissionTicket) -> None:
+        """Return a run slot and hand it to the next waiting tenant."""
+        if ticket.released:
+            return
+        ticket.released = True
+        self._active -= 1
+        self._active_by_tenant[ticket.tenant] -= 1
+        if self._active_by_tenant[ticket.tenant] <= 0:
+            del self._active_by_tenant[ticket.tenant]
+        held = time.monotonic() - ticket.admitted_at
+        if self._mean_hold_seconds is None:
+            self._mean_hold_seconds = held
+        else:
+            self._mean_hold_seconds += _HOLD_TIME_SMOOTHING * (held - self._mean_hold_seconds)
+        self._dispatch()
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of admission state for monitoring."""
+        return {
+            "active": self._active,
+            "queued": self._queued,
+            "admitted": self._admitted,
+            "rejected": self._rejected,
+            "active_by_tenant": dict(self._active_by_tenant),
+            "queued_by_tenant": {tenant: len(queue) for tenant, queue in self._queues.items()},
+        }
+
+    def _has_capacity(self, tenant: str) -> bool:
+        limits = self.limits
+        if limits.max_concurrent_runs is not None and self._active >= limits.max_concurrent_runs:
+            return False
+        per_tenant = limits.max_concurrent_runs_per_tenant
+        return per_tenant is None or self._active_by_tenant[tenant] < per_tenant
+
+    def _tenant_saturated(self, tenant: str) -> bool:
+        per_tenant = self.limits.max_concurrent_runs_per_tenant
+        return per_tenant is not None and self._active_by_tenant[tenant] >= per_tenant
+
+    def _admit(self, tenant: str) -> AdmissionTicket:
+        self._active += 1
+        self._active_by_tenant[tenant] += 1
+        self._admitted += 1
+        return AdmissionTicket(tenant=tenant, admitted_at=time.monotonic())
+
+    def _dispatch(self) -> None:
+        """Grant free slots round robin: at most one waiter per tenant per pass."""
+        granted = True
+        while granted and self._queues:
+            granted = False
+            for tenant in list(self._queues):
+                queue = self._queues[tenant]
+                while queue and queue[0].future.done():
+                    queue.popleft()
+                    self._queued -= 1
+                if not queue:
+                    del self._queues[tenant]
+                    continue
+                if not self._has_capacity(tenant):
+                    continue
+                waiter = queue.popleft()
+                self._queued -= 1
+                waiter.future.set_result(self._admit(tenant))
+                # Served tenants go to the back of the rotation
+                if queue:
+                    self._queues.move_to_end(tenant)
+                else:
+                    del self._queues[tenant]
+                granted = True
+
+    def _discard(self, waiter: _Waiter) -> None:
+        queue = self._queues.get(waiter.tenant)
+        if queue is None or waiter not in queue:
+            return
+        queue.remove(waiter)
+        self._queued -= 1
+        if not queue:
+            del self._queues[waiter.tenant]
+
+    def _estimate_wait(self, tenant: str) -> float:
+        """Expected wait for a new request of ``tenant``, from the mean run duration and the queue ahead of it."""
+        if self._mean_hold_seconds is None:
+            return 0.0
+        if self._tenant_saturated(tenant):
+            ahead = len(self._queues.get(tenant, ()))
+            slots = self.limits.max_concurrent_runs_per_tenant or 1
+        else:
+            ahead = self._queued
+            slots = self.limits.max_concurrent_runs or 1
+        return self._mean_hold_seconds * (ahead // slots + 1)
+
+    def _reject(self, tenant: str, reason: str, retry_after: float) -> AdmissionRejectedError:
+        self._rejected += 1
+        if self._tenant_saturated(tenant):
+            return AdmissionRejectedError(429, f"{reason}: tenant concurrency limit reached", retry_after)
+        return AdmissionRejectedError(503, f"{reason}: agency is at capacity", retry_after)
+
+
+_LIVE_CONTROLLERS: weakref.WeakSet[AdmissionController] = weakref.WeakSet()
+
+
+@register_builtin_collector
+def _collect_admission_metrics() -> Iterator[MetricFamily]:
+    families = {
+        "active": MetricFamily("agency_swarm_admission_active", "gauge", "Runs holding an admission slot."),
+        "queued": MetricFamily("agency_swarm_admission_queued", "gauge", "Requests waiting for an admission slot."),
+        "admitted": MetricFamily("agency_swarm_admission_admitted_total", "counter", "Requests admitted."),
+        "rejected": MetricFamily("agency_swarm_admission_rejected_total", "counter", "Requests shed."),
+    }
+    for controller in list(_LIVE_CONTROLLERS):
+        stats = controller.stats()
+        for key, family in families.items():
+            family.add(stats[key], agency=controller.name)
+    yield from families.values()
@@ -0,0 +1,90 @@
+"""Background chat name generation, memoized per conversation."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class ChatNameCache:
+    """Remembers the generated name of each conversation and shares generations that are still running.
+
+    A conversation is identified by a key from `conversation_key`: the client's chat ID within its owner.
+    Requests without a key get a fresh, unshared generation. Generations run as tasks owned by the cache,
+    so a request that finishes or disconnects early does not cancel a name other requests are waiting for.
+
+    Args:
+        max_entries: Maximum remembered names; 0 keeps only in-flight generations.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self._names: OrderedDict[str, str] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task[str]] = {}
+
+    def get(self, key: str) -> str | None:
+        name = self._names.get(key)
+        if name is not None:
+            self._names.move_to_end(key)
+        return name
+
+    def start(self, key: str | None, generate: Callable[[], Awaitable[str]]) -> asyncio.Future[str]:
+        """Return a future for the conversation's name, starting a generation only when none is known or running."""
+        if key is None:
+            task = asyncio.create_task(generate())
+            task.add_done_callback(self._log_failure)
+            return self._waiter(task)
+        name = self.get(key)
+        if name is not None:
+            future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+            future.set_result(name)
+            return future
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._generate(key, generate))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._finish(key, done))
+        return self._waiter(task)
+
+    @staticmethod
+    def _waiter(task: asyncio.Task[str]) -> asyncio.Future[str]:
+        waiter = asyncio.shield(task)
+        # The error is logged once by _log_failure; waiters that never await it stay silent
+        waiter.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return waiter
+
+    async def _generate(self, key: str, generate: Callable[[], Awaitable[str]]) -> str:
+        name = await generate()
+        if self.max_entries > 0:
+            self._names[key] = name
+            while len(self._names) > self.max_entries:
+                self._names.popitem(last=False)
+        return name
+
+    def _finish(self, key: str, task: asyncio.Task[str]) -> None:
+        self._inflight.pop(key, None)
+        self._log_failure(task)
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task[str]) -> None:
+        if task.cancelled():
+            return
+        if (exc := task.exception()) is not None:
+            logger.error(f"Error generating chat name: {exc}")
+
+
+def conversation_key(chat_id: str | None, owner: str) -> str | None:
+    """Key a conversation by the client's chat ID within its owner (the OAuth user or tenant).
+
+    Returns None without a chat ID. Message content is not used: two users can open a chat with the same
+    message, and one must never receive the name generated for the other.
+    """
+    if not chat_id:
+        return None
+    return hashlib.sha256(json.dumps([owner, chat_id]).encode()).hexdigest()
@@ -8,12 +8,12 @@ import threading
 import time
 import traceback
 import uuid
-from collections.abc import AsyncGenerator, Callable, Sequence
+from collections.abc import AsyncGenerator, Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
 from importlib import metadata
 from pathlib import Path
 from typing import Any, Literal, cast
-from weakref import ReferenceType, ref
+from weakref import ReferenceType, WeakSet, ref
 
 from ag_ui.core import (
     AudioInputContent,
@@ -69,7 +69,13 @@ from agency_swarm import (
 )
 from agency_swarm.agent.execution_stream_response import StreamingRunResponse
 from agency_swarm.agent.initialization import apply_framework_defaults
-from agency_swarm.integrations.fastapi_utils.file_handler import upload_from_urls
+from agency_swarm.integrations.fastapi_utils.admission import (
+    DEFAULT_TENANT,
+    AdmissionController,
+    AdmissionTicket,
+)
+from agency_swarm.integrations.fastapi_utils.chat_name_cache import ChatNameCache, conversation_key
+from agency_swarm.integrations.fastapi_utils.file_handler import FileUploadCache, upload_from_urls
 from agency_swarm.integrations.fastapi_utils.logging_middleware import get_logs_endpoint_impl
 from agency_swarm.integrations.fastapi_utils.oauth_support import (
     FastAPIOAuthConfig,
@@ -85,6 +91,8 @@ from agency_swarm.integrations.fastapi_utils.override_policy import (
     get_allowed_dirs_for_metadata,
 )
 from agency_swarm.integrations.fastapi_utils.request_models import ClientConfig
+from agency_swarm.integrations.fastapi_utils.run_registry import RunRegistryBackend
+from agency_swarm.integrations.fastapi_utils.stream_transport import StreamEncoder
 from agency_swarm.messages import MessageFilter, MessageFormatter
 from agency_swarm.messages.codex_input import (
     is_codex_base_url as _is_codex_base_url,
@@ -104,6 +112,7 @@ from agency_swarm.tools.mcp_manager import (
 from agency_swarm.ui.core.agui_adapter import AguiAdapter
 from agency_swarm.utils import hosted_tool_compat
 from agency_swarm.utils.dry_run import force_dry_run
+from agency_swarm.utils.metrics import MetricFamily, register_builtin_collector
 from agency_swarm.utils.openrouter import (
     OPENROUTER_API_KEY_ENV,
     OPENROUTER_BASE_URL,
@@ -111,6 +120,7 @@ from agency_swarm.utils.openrouter import (
     get_openrouter_model_name,
     is_openrouter_model_name,
 )
+from agency_swarm.utils.run_timings import RunTimings
 from agency_swarm.utils.serialization import serialize
 from agency_swarm.utils.usage_tracking import (
     calculate_usage_with_cost,
@@ -151,8 +161,19 @@ type _OAuthAgentStateSnapshot = dict[
 _ATTR_MISSING = object()
 
 
-def _sse_keepalive_comment() -> str:
-    return f": keepalive {int(time.time())}\n\n"
+def _admission_tenant(admission: AdmissionController | None, user_id: object, http_request: Request | None) -> str:
+    if admission is None:
+        return DEFAULT_TENANT
+    return admission.tenant_for(user_id, getattr(http_request, "headers", None))
+
+
+async def _iterate_frames(frames: Iterable[str | bytes]) -> AsyncGenerator[str | bytes]:
+    for frame in frames:
+        yield frame
+
+
+def _keepalive_comment(transport: StreamEncoder) -> str | bytes:
+    return transport.comment(f"keepalive {int(time.time())}")
 
 
 def _update_oauth_pending(pending_states: set[str], payload: dict[str, Any]) -> None:
@@ -200,16 +221,26 @@ class _RequestOverrideSession:
     agency: Agency
     policy: RequestOverridePolicy
     restore_oauth_state: bool = False
+    admission: AdmissionController | None = None
+    tenant: str = DEFAULT_TENANT
+    admission_ticket: AdmissionTicket | None = None
     lease: _AgencyRequestLease | None = None
     restore_snapshot: _AgencyStateSnapshot | None = None
     oauth_snapshot: _OAuthAgentStateSnapshot | None = None
     _is_cleaned: bool = False
 
     async def acquire(self) -> None:
-        self.lease = await _acquire_agency_request_lease(
-            self.agency,
-            is_override=self.policy.has_client_overrides or self.restore_oauth_state,
-        )
+        # Admission comes first so shed requests never queue on the agency lease
+        if self.admission is not None:
+            self.admission_ticket = await self.admission.acquire(self.tenant)
+        try:
+            self.lease = await _acquire_agency_request_lease(
+                self.agency,
+                is_override=self.policy.has_client_overrides or self.restore_oauth_state,
+            )
+        except BaseException:
+            self._release_admission()
+            raise
         if self.restore_oauth_state:
             self.oauth_snapshot = _snapshot_oauth_agent_state(self.agency)
         if self.policy.has_client_overrides and self.policy.config is not None:
@@ -256,9 +287,15 @@ class _RequestOverrideSession:
                 preserve_primary_error(exc)
             else:
                 self.lease = None
+        self._release_admission()
         if primary_error is not None:
             raise primary_error
 
+    def _release_admission(self) -> None:
+        if self.admission is not None and self.admission_ticket is not None:
+            self.admission.release(self.admission_ticket)
+            self.admission_ticket = None
+
 
 type _RequestStateEntry = tuple[ReferenceType[object], dict[asyncio.AbstractEventLoop, _AgencyRequestState]]
 _AGENT_REQUEST_STATES: dict[int, _RequestStateEntry] = {}
@@ -677,16 +714,42 @@ class ActiveRun:
     done_event: asyncio.Event = field(default_factory=asyncio.Event)
 
 
+_LIVE_RUN_REGISTRIES: "WeakSet[ActiveRunRegistry]" = WeakSet()
+
+
+@register_builtin_collector
+def _collect_active_run_metrics() -> Iterator[MetricFamily]:
+    yield MetricFamily("agency_swarm_active_runs", "gauge", "Streaming runs registered for cancellation.").add(
+        sum(registry.active_count() for registry in list(_LIVE_RUN_REGISTRIES))
+    )
+
+
 class ActiveRunRegistry:
-    """Async-safe registry for active runs so cancel endpoints see local state."""
+    """Async-safe registry for active runs so cancel endpoints see local state.
+
+    With a ``backend`` shared by all workers, runs are also published there. A cancel request received by a
+    worker that does not own the run is stored in the backend, and the owning worker applies it within
+    ``cancel_poll_interval`` seconds (plus one backend round trip).
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, backend: RunRegistryBackend | None = None, *, cancel_poll_interval: float = 0.1) -> None:
         self._runs: dict[str, ActiveRun] = {}
         self._lock = asyncio.Lock()
+        self._backend = backend
+        self._cancel_poll_interval = cancel_poll_interval
+        self._poll_task: asyncio.Task[None] | None = None
+        _LIVE_RUN_REGISTRIES.add(self)
+
+    def active_count(self) -> int:
+        return len(self._runs)
 
     async def register(self, run_id: str, run: ActiveRun) -> None:
+        if self._backend is not None:
+            await self._backend.add_run(run_id)
         async with self._lock:
             self._runs[run_id] = run
+            if self._backend is not None and (self._poll_task is None or self._poll_task.done()):
+                self._poll_task = asyncio.create_task(self._poll_remote_cancellations())
 
     async def get(self, run_id: str) -> ActiveRun | None:
         async with self._lock:
@@ -704,10 +767,82 @@ class ActiveRunRegistry:
     async def finish(self, run_id: str) -> ActiveRun | None:
         async with self._lock:
             run = self._runs.pop(run_id, None)
+        if self._backend is not None:
+            try:
+                if await self._backend.finish_run(run_id) and run is not None:
+                    await self._backend.set_cancel_result(
+                        run_id, _cancelled_run_payload(run_id, run, run.cancel_mode or "immediate", timed_out=False)
+                    )
+            except Exception as exc:
+                logger.warning("Failed to publish finished run %s to the run registry backend: %s", run_id, exc)
         if run is not None:
             run.done_event.set()
         return run
 
+    async def cancel_remote(self, run_id: str, cancel_mode: str, *, timeout: float) -> dict[str, Any] | None:
+        """Cancel a run owned by another worker and wait for its cancel response.
+
+        Returns None when no worker owns an active run with this id.
+        """
+        if self._backend is None or not await self._backend.request_cancel(run_id, cancel_mode):
+            return None
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            result = await self._backend.pop_cancel_result(run_id)
+            if result is not None:
+                return result
+            await asyncio.sleep(self._cancel_poll_interval)
+        logger.warning("Timed out waiting for remote run %s to finish cancellation (mode=%s)", run_id, cancel_mode)
+        return {
+            "ok": False,
+            "run_id": run_id,
+            "cancelled": False,
+            "cancel_mode": cancel_mode,
+            "new_messages": [],
+            "timed_out": True,
+        }
+
+    async def _poll_remote_cancellations(self) -> None:
+        backend = self._backend
+        if backend is None:
+            return
+        while True:
+            await asyncio.sleep(self._cancel_poll_interval)
+            async with self._lock:
+                run_ids = list(self._runs)
+            if not run_ids:
+                return
+            try:
+                requests = await backend.pop_cancel_requests(run_ids)
+            except Exception as exc:
+                logger.warning("Failed to poll the run registry backend for cancel requests: %s", exc)
+                continue
+            for run_id, cancel_mode in requests.items():
+                run = await self.mark_cancelled(run_id, cancel_mode)
+                if run is not None:
+                    run.stream.cancel(mode=cancel_mode)
+                    logger.info(f"Cancelled run {run_id} via another worker (mode={cancel_mode})")
+
+
+def _cancelled_run_payload(run_id: str, active_run: ActiveRun, cancel_mode: str, *, timed_out: bool) -> dict[str, Any]:
+    """Build the cancel endpoint response from the messages generated before cancellation."""
+    all_messages = active_run.agency.thread_manager.get_all_messages()
+    new_messages = all_messages[active_run.initial_message_count :]
+    # Remove duplicates, filter unwanted types, and remove orphaned tool calls/outputs
+    filtered_messages = MessageFilter.remove_duplicates(new_messages)
+    filtered_messages = MessageFilter.filter_messages(filtered_messages)
+    filtered_messages = MessageFilter.remove_orphaned_messages(filtered_messages)
+    filtered_messages = _normalize_new_messages_for_client(filtered_messages)
+
+    return {
+        "ok": not timed_out,
+        "run_id": run_id,
+        "cancelled": not timed_out,
+        "cancel_mode": cancel_mode,
+        "new_messages": filtered_messages,
+        "timed_out": timed_out,
+    }
+
 
 def get_verify_token(app_token):
     auto_error = app_token is not None and app_token != ""
@@ -928,11 +1063,48 @@ def _build_message_with_file_urls_context(
     ]
 
 
+def _run_timings_payload(run_result: Any) -> dict[str, Any] | None:
+    """Serialize the latency recorder attached to a run result, if any."""
+    timings = getattr(run_result, "timings", None)
+    return timings.to_dict() if isinstance(timings, RunTimings) else None
+
+
 def _build_chat_name_messages(messages: list[TResponseInputItem]) -> list[TResponseInputItem]:
     """Drop synthetic file_urls metadata before generating a chat title."""
     return [message for message in messages if not _is_file_urls_context_message(message)]
 
 
+_UNMEMOIZED_CHAT_NAMES = ChatNameCache(max_entries=0)
+
+
+def _start_chat_name_generation(
+    request: Any,
+    openai_client: AsyncOpenAI | None,
+    chat_name_cache: ChatNameCache | None,
+    owner: str,
+) -> asyncio.Future[str]:
+    """Name the conversation from its user input in the background, while the agency run proceeds.
+
+    The name is remembered per ``request.chat_id`` and ``owner`` (the OAuth user or admission tenant).
+    """
+    history = [
+        message
+        for message in request.chat_history or []
+        if isinstance(message, dict) and message.get("role") in ("user", "assistant")
+    ]
+    current = (
+        request.message
+        if isinstance(request.message, list)
+        else [cast(TResponseInputItem, {"role": "user", "content": request.message})]
+    )
+    messages = _build_chat_name_messages([*history, *current])
+    cache = chat_name_cache if chat_name_cache is not None else _UNMEMOIZED_CHAT_NAMES
+    return cache.start(
+        conversation_key(request.chat_id, owner),
+        lambda: generate_chat_name(messages, openai_client=openai_client),
+    )
+
+
 def _build_agui_message_input(request_messages: list[Any] | None) -> str | list[TResponseInputItem]:
     """Convert the latest AG-UI message into a Responses input shape."""
     if not request_messages:
@@ -1071,10 +1243,14 @@ def make_response_endpoint(
     verify_token,
     allowed_local_dirs: Sequence[str | Path] | None = None,
     oauth_config: FastAPIOAuthConfig | None = None,
+    upload_cache: FileUploadCache | None = None,
+    chat_name_cache: ChatNameCache | None = None,
+    admission: AdmissionController | None = None,
 ):
     user_id_dependency = oauth_config.user_id_dependency if oauth_config else _no_oauth_user_id
 
     async def handler(
+        http_request: Request,
         request: request_model,
         token: str = Depends(verify_token),
         user_id: object = Depends(user_id_dependency),
@@ -1106,6 +1282,8 @@ def make_response_endpoint(
             agency=agency_instance,
             policy=override_policy,
             restore_oauth_state=_requires_oauth_agent_state_restore(agency_instance, oauth_runtime),
+            admission=admission,
+            tenant=_admission_tenant(admission, user_id, http_request),
         )
         request_upload_client: AsyncOpenAI | None = None
 
@@ -1143,6 +1321,7 @@ def make_response_endpoint(
                         request.file_urls,
                         allowed_local_dirs=allowed_local_dirs,
                         openai_client=request_upload_client,
+                        upload_cache=upload_cache,
                     )
                     combined_file_ids = (combined_file_ids or []) + list(file_ids_map.values())
                     message_input = _build_message_with_file_urls_context(
@@ -1153,6 +1332,14 @@ def make_response_endpoint(
                 except Exception as e:
                     return {"error": f"Error downloading file from provided urls: {e}"}
 
+            chat_name_future = (
+                _start_chat_name_generation(
+                    request, request_upload_client, chat_name_cache, user_id or override_session.tenant
+                )
+                if request.generate_chat_name
+                else None
+            )
+
             # Attach persistent MCP servers and ensure connections before handling the request
             await attach_persistent_mcp_servers(agency_instance)
 
@@ -1180,17 +1367,15 @@ def make_response_endpoint(
                 usage_stats = calculate_usage_with_cost(usage_stats, run_result=response)
                 result["usage"] = usage_stats.to_dict()
 
+            if getattr(request, "include_timings", False) and (timings := _run_timings_payload(response)) is not None:
+                result["timings"] = timings
             if request.file_urls is not None and file_ids_map is not None:
                 result["file_ids_map"] = file_ids_map
-            if request.generate_chat_name:
-                try:
-                    result["chat_name"] = await generate_chat_name(
-                        _build_chat_name_messages(filtered_messages),
-                        openai_client=request_upload_client,
-                    )
-                except Exception as e:
-                    # Do not add errors to the result as they might be mistaken for chat name
-                    logger.error(f"Error generating chat name: {e}")
+            if chat_name_future is not None:
+                # Generated concurrently with the run; errors are logged and left out of the result
+                # so they are not mistaken for a chat name
+                with contextlib.suppress(Exception):
+                    result["chat_name"] = await chat_name_future
             return result
         finally:
             await override_session.cleanup()
@@ -1207,6 +1392,10 @@ def make_stream_endpoint(
     run_registry: ActiveRunRegistry,
     allowed_local_dirs: Sequence[str | Path] | None = None,
     oauth_config: FastAPIOAuthConfig | None = None,
+    upload_cache: FileUploadCache | None = None,
+    chat_name_cache: ChatNameCache | None = None,
+    admission: AdmissionController | None = None,
+    stream_compression: bool = False,
 ):
     user_id_dependency = oauth_config.user_id_dependency if oauth_config else _no_oauth_user_id
 
@@ -1237,6 +1426,15 @@ def make_stream_endpoint(
 
         agency_instance = agency_factory(load_threads_callback=load_callback)
         _ensure_request_oauth_config(agency_instance, oauth_config)
+        transport = StreamEncoder.negotiate(
+            getattr(http_request, "headers", None), allow_compression=stream_compression
+        )
+        stream_headers = {
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+            **transport.headers,
+        }
         client_config = _resolve_stream_client_config(http_request, request.client_config)
         request_user_context = _with_oauth_user_context(request.user_context, user_id)
         override_policy = RequestOverridePolicy(client_config)
@@ -1244,6 +1442,8 @@ def make_stream_endpoint(
             agency=agency_instance,
             policy=override_policy,
             restore_oauth_state=_requires_oauth_agent_state_restore(agency_instance, oauth_runtime),
+            admission=admission,
+            tenant=_admission_tenant(admission, user_id, http_request),
         )
         request_upload_client: AsyncOpenAI | None = None
 
@@ -1270,6 +1470,7 @@ def make_stream_endpoint(
                         request.file_urls,
                         allowed_local_dirs=allowed_local_dirs,
                         openai_client=request_upload_client,
+                        upload_cache=upload_cache,
                     )
                     combined_file_ids = (combined_file_ids or []) + list(file_ids_map.values())
                     message_input = _build_message_with_file_urls_context(
@@ -1282,21 +1483,13 @@ def make_stream_endpoint(
                     await cleanup_setup_context()
 
                     async def error_generator():
-                        yield (
-                            "data: "
-                            + json.dumps({"error": f"Error downloading file from provided urls: {error_msg}"})
-                            + "\n\n"
-                        )
-                        yield "event: end\ndata: [DONE]\n\n"
+                        yield transport.event({"error": f"Error downloading file from provided urls: {error_msg}"})
+                        yield transport.event("[DONE]", "end")
 
                     return StreamingResponse(
-                        error_generator(),
-                        media_type="text/event-stream",
-                        headers={
-                            "Cache-Control": "no-cache",
-                            "Connection": "keep-alive",
-                            "X-Accel-Buffering": "no",
-                        },
+                        transport.stream(error_generator()),
+                        media_type=transport.media_type,
+                        headers=stream_headers,
                     )
         except Exception:
             await cleanup_setup_context()
@@ -1331,7 +1524,7 @@ def make_stream_endpoint(
             )
             keepalive_task: asyncio.Task | None = None
 
-            async def _emit_oauth(payload: dict[str, Any]) -> AsyncGenerator[str]:
+            async def _emit_oauth(payload: dict[str, Any]) -> AsyncGenerator[str | bytes]:
                 event_type = payload.get("type")
                 data = {
                     "state": payload.get("state"),
@@ -1345,9 +1538,16 @@ def make_stream_endpoint(
                     name = "oauth_status"
                 else:
                     return
-                yield f"event: {name}\ndata: {json.dumps(data)}\n\n"
+                yield transport.event(data, name)
+
+            chat_name_future: asyncio.Future[str] | None = None
+            chat_name_sent = False
 
             try:
+                if request.generate_chat_name:
+                    chat_name_future = _start_chat_name_generation(
+                        request, request_upload_client, chat_name_cache, user_id or override_session.tenant
+                    )
                 stream = agency_instance.get_response_stream(
                     message=message_input,
                     recipient_agent=request.recipient_agent,
@@ -1365,7 +1565,7 @@ def make_stream_endpoint(
                 cancel_task = asyncio.create_task(active_run.cancel_event.wait())
 
                 # Now send run_id - client can safely call cancel endpoint
-                yield f"event: meta\ndata: {json.dumps({'run_id': run_id})}\n\n"
+                yield transport.event({"run_id": run_id}, "meta")
 
                 if oauth_runtime:
                     connect_task = asyncio.create_task(attach_persistent_mcp_servers(agency_instance))
@@ -1403,7 +1603,7 @@ def make_stream_endpoint(
 
                         if keepalive_task and keepalive_task in done:
                             if oauth_pending:
-                                yield _sse_keepalive_comment()
+                                yield _keepalive_comment(transport)
                                 keepalive_task = asyncio.create_task(asyncio.sleep(OAUTH_KEEPALIVE_SECONDS))
                             else:
                                 keepalive_task = None
@@ -1411,7 +1611,7 @@ def make_stream_endpoint(
                         if connect_task in done:
                             await connect_task
                             if oauth_pending:
-                                yield _sse_keepalive_comment()
+                                yield _keepalive_comment(transport)
                             break
                 else:
                     await attach_persistent_mcp_servers(agency_instance)
@@ -1429,9 +1629,16 @@ def make_stream_endpoint(
                         wait_set.add(keepalive_task)
                     if cancel_task:
                         wait_set.add(cancel_task)
+                    if chat_name_future is not None and not chat_name_sent:
+                        wait_set.add(chat_name_future)
 
                     done, _ = await asyncio.wait(wait_set, return_when=asyncio.FIRST_COMPLETED)
 
+                    if chat_name_future is not None and chat_name_future in done:
+                        chat_name_sent = True
+                        if chat_name_future.exception() is None:
+                            yield transport.event({"chat_name": chat_name_future.result()}, "chat_name")
+
                     if cancel_task and cancel_task in done:
                         stream_task.cancel()
                         with contextlib.suppress(asyncio.CancelledError):
@@ -1456,7 +1663,7 @@ def make_stream_endpoint(
 
                     if keepalive_task and keepalive_task in done:
                         if oauth_pending:
-                            yield _sse_keepalive_comment()
+                            yield _keepalive_comment(transport)
                             keepalive_task = asyncio.create_task(asyncio.sleep(OAUTH_KEEPALIVE_SECONDS))
                         else:
                             keepalive_task = None
@@ -1480,26 +1687,22 @@ def make_stream_endpoint(
 
                         try:
                             data = serialize(event)
-                            yield "data: " + json.dumps({"data": data}) + "\n\n"
+                            yield transport.event({"data": data})
                         except Exception as e:
-                            yield "data: " + json.dumps({"error": f"Failed to serialize event: {e}"}) + "\n\n"
+                            yield transport.event({"error": f"Failed to serialize event: {e}"})
 
                         stream_task = asyncio.create_task(stream_iter.__anext__())
 
             except Exception as exc:
                 if isinstance(exc, OutputGuardrailTripwireTriggered):
-                    yield (
-                        "data: "
-                        + json.dumps(
-                            {
-                                "error": "Guardrail OutputGuardrail triggered tripwire: "
-                                + str(exc.guardrail_result.output.output_info)
-                            }
-                        )
-                        + "\n\n"
+                    yield transport.event(
+                        {
+                            "error": "Guardrail OutputGuardrail triggered tripwire: "
+                            + str(exc.guardrail_result.output.output_info)
+                        }
                     )
                 else:
-                    yield "data: " + json.dumps({"error": str(exc)}) + "\n\n"
+                    yield transport.event({"error": str(exc)})
             finally:
                 # Ensure registry cleanup happens even if serialization fails (Fix #10)
                 try:
@@ -1525,23 +1728,27 @@ def make_stream_endpoint(
                         result["cancelled"] = True
                     if request.file_urls is not None and file_ids_map is not None:
                         result["file_ids_map"] = file_ids_map
-                    if request.generate_chat_name:
-                        try:
-                            result["chat_name"] = await generate_chat_name(
-                                _build_chat_name_messages(filtered_messages),
-                                openai_client=request_upload_client,
-                            )
-                        except Exception as e:
-                            logger.error(f"Error generating chat name: {e}")
+                    chat_name_ready = chat_name_future is not None and chat_name_future.done()
+                    if chat_name_ready and chat_name_future.exception() is None:
+                        result["chat_name"] = chat_name_future.result()
                     if usage_stats:
                         result["usage"] = usage_stats.to_dict()
 
-                    yield "event: messages\ndata: " + json.dumps(result) + "\n\n"
-                    yield "event: end\ndata: [DONE]\n\n"
+                    yield transport.event(result, "messages")
+                    if chat_name_future is not None and not chat_name_ready:
+                        # Still generating: deliver the name as a late event instead of delaying messages
+                        with contextlib.suppress(Exception):
+                            yield transport.event({"chat_name": await chat_name_future}, "chat_name")
+                    if (
+                        getattr(request, "include_timings", False)
+                        and (timings := _run_timings_payload(final_result)) is not None
+                    ):
+                        yield transport.event(timings, "timings")
+                    yield transport.event("[DONE]", "end")
                 except Exception as e:
                     logger.error(f"Error building final response: {e}")
-                    yield "data: " + json.dumps({"error": f"Error building response: {e}"}) + "\n\n"
-                    yield "event: end\ndata: [DONE]\n\n"
+                    yield transport.event({"error": f"Error building response: {e}"})
+                    yield transport.event("[DONE]", "end")
                 finally:
                     if keepalive_task and not keepalive_task.done():
                         keepalive_task.cancel()
@@ -1567,13 +1774,9 @@ def make_stream_endpoint(
                     await cleanup_stream_context()
 
         return StreamingResponse(
-            event_generator(),
-            media_type="text/event-stream",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "X-Accel-Buffering": "no",
-            },
+            transport.stream(event_generator()),
+            media_type=transport.media_type,
+            headers=stream_headers,
             background=BackgroundTask(cleanup_stream_context),
         )
 
@@ -1593,6 +1796,10 @@ def make_cancel_endpoint(request_model, verify_token, run_registry: ActiveRunReg
 
         active_run = await run_registry.mark_cancelled(run_id, cancel_mode)
         if active_run is None:
+            # The run may be owned by another worker sharing the registry backend
+            remote_result = await run_registry.cancel_remote(run_id, cancel_mode, timeout=60)
+            if remote_result is not None:
+                return remote_result
             raise HTTPException(
                 status_code=404,
                 detail=f"Run '{run_id}' not found or already completed",
@@ -1609,23 +1816,7 @@ def make_cancel_endpoint(request_model, verify_token, run_registry: ActiveRunReg
         except TimeoutError:
             logger.warning("Timed out waiting for run %s to finish cancellation (mode=%s)", run_id, cancel_mode)
             timed_out = True
-        # Get messages generated before cancel
-        all_messages = active_run.agency.thread_manager.get_all_messages()
-        new_messages = all_messages[active_run.initial_message_count :]
-        # Remove duplicates, filter unwanted types, and remove orphaned tool calls/outputs
-        filtered_messages = MessageFilter.remove_duplicates(new_messages)
-        filtered_messages = MessageFilter.filter_messages(filtered_messages)
-        filtered_messages = MessageFilter.remove_orphaned_messages(filtered_messages)
-        filtered_messages = _normalize_new_messages_for_client(filtered_messages)
-
-        return {
-            "ok": not timed_out,
-            "run_id": run_id,
-            "cancelled": not timed_out,
-            "cancel_mode": cancel_mode,
-            "new_messages": filtered_messages,
-            "timed_out": timed_out,
-        }
+        return _cancelled_run_payload(run_id, active_run, cancel_mode, timed_out=timed_out)
 
     return handler
 
@@ -1636,10 +1827,14 @@ def make_agui_chat_endpoint(
     verify_token,
     allowed_local_dirs: Sequence[str | Path] | None = None,
     oauth_config: FastAPIOAuthConfig | None = None,
+    upload_cache: FileUploadCache | None = None,
+    admission: AdmissionController | None = None,
+    stream_compression: bool = False,
 ):
     user_id_dependency = oauth_config.user_id_dependency if oauth_config else _no_oauth_user_id
 
     async def handler(
+        http_request: Request,
         request: request_model,
         token: str = Depends(verify_token),
         user_id: object = Depends(user_id_dependency),
@@ -1648,6 +1843,11 @@ def make_agui_chat_endpoint(
         user_id = _resolve_oauth_user_id(user_id, oauth_config)
 
         encoder = EventEncoder()
+        transport = StreamEncoder.negotiate(
+            getattr(http_request, "headers", None),
+            allow_compression=stream_compression,
+            model_encoder=encoder.encode,
+        )
 
         combined_file_ids = list(request.file_ids or []) if getattr(request, "file_ids", None) else []
         message_input: str | list[TResponseInputItem] | None
@@ -1666,8 +1866,11 @@ def make_agui_chat_endpoint(
                 run_id=request.run_id,
             )
             return StreamingResponse(
-                (encoder.encode(event) for event in (run_started, run_error, run_finished)),
-                media_type=encoder.get_content_type(),
+                transport.stream(
+                    _iterate_frames(transport.model(event) for event in (run_started, run_error, run_finished))
+                ),
+                media_type=transport.media_type,
+                headers=transport.headers,
             )
 
         # Determine the message source and extract input message.
@@ -1737,6 +1940,8 @@ def make_agui_chat_endpoint(
             agency=agency,
             policy=override_policy,
             restore_oauth_state=_requires_oauth_agent_state_restore(agency, oauth_runtime),
+            admission=admission,
+            tenant=_admission_tenant(admission, user_id, http_request),
         )
         request_upload_client: AsyncOpenAI | None = None
 
@@ -1755,6 +1960,7 @@ def make_agui_chat_endpoint(
                         request.file_urls,
                         allowed_local_dirs=allowed_local_dirs,
                         openai_client=request_upload_client,
+                        upload_cache=upload_cache,
                     )
                     combined_file_ids = combined_file_ids + list(file_ids_map.values())
                     if message_input is not None:
@@ -1778,8 +1984,11 @@ def make_agui_chat_endpoint(
                         run_id=request.run_id,
                     )
                     return StreamingResponse(
-                        (encoder.encode(event) for event in (run_started, run_error, run_finished)),
-                        media_type=encoder.get_content_type(),
+                        transport.stream(
+                            _iterate_frames(transport.model(event) for event in (run_started, run_error, run_finished))
+                        ),
+                        media_type=transport.media_type,
+                        headers=transport.headers,
                     )
         except Exception:
             await cleanup_setup_context()
@@ -1797,9 +2006,9 @@ def make_agui_chat_endpoint(
                 await override_session.cleanup()
                 _clear_oauth_request_context()
 
-        async def event_generator() -> AsyncGenerator[str]:
+        async def event_generator() -> AsyncGenerator[str | bytes]:
             # Emit RUN_STARTED first.
-            yield encoder.encode(
+            yield transport.model(
                 RunStartedEvent(
                     type=EventType.RUN_STARTED,
                     thread_id=request.thread_id,
@@ -1815,7 +2024,7 @@ def make_agui_chat_endpoint(
             stream_task: asyncio.Task | None = None
             oauth_pending: set[str] = set()
 
-            async def _emit_oauth(payload: dict[str, Any]) -> AsyncGenerator[str]:
+            async def _emit_oauth(payload: dict[str, Any]) -> AsyncGenerator[str | bytes]:
                 event_type = payload.get("type")
                 data = {
                     "state": payload.get("state"),
@@ -1829,7 +2038,7 @@ def make_agui_chat_endpoint(
                     name = "oauth_status"
                 else:
                     return
-                yield f"event: {name}\ndata: {json.dumps(data)}\n\n"
+                yield transport.event(data, name)
 
             try:
                 # Handle error case: no messages available
@@ -1877,7 +2086,7 @@ def make_agui_chat_endpoint(
 
                         if keepalive_task and keepalive_task in done:
                             if oauth_pending:
-                                yield _sse_keepalive_comment()
+                                yield _keepalive_comment(transport)
                                 keepalive_task = asyncio.create_task(asyncio.sleep(OAUTH_KEEPALIVE_SECONDS))
                             else:
                                 keepalive_task = None
@@ -1885,7 +2094,7 @@ def make_agui_chat_endpoint(
                         if connect_task in done:
                             await connect_task
                             if oauth_pending:
-                                yield _sse_keepalive_comment()
+                                yield _keepalive_comment(transport)
                             break
                 else:
                     await attach_persistent_mcp_servers(agency)
@@ -1919,7 +2128,7 @@ def make_agui_chat_endpoint(
 
                     if keepalive_task and keepalive_task in done:
                         if oauth_pending:
-                            yield _sse_keepalive_comment()
+                            yield _keepalive_comment(transport)
                             keepalive_task = asyncio.create_task(asyncio.sleep(OAUTH_KEEPALIVE_SECONDS))
                         else:
                             keepalive_task = None
@@ -1936,17 +2145,17 @@ def make_agui_chat_endpoint(
                             for agui_evt in agui_events:
                                 if isinstance(agui_evt, MessagesSnapshotEvent):
                                     snapshot_messages.append(agui_evt.messages[0])
-                                    yield encoder.encode(
+                                    yield transport.model(
                                         MessagesSnapshotEvent(
                                             type=EventType.MESSAGES_SNAPSHOT, messages=snapshot_messages
                                         )
                                     )
                                 else:
-                                    yield encoder.encode(agui_evt)
+                                    yield transport.model(agui_evt)
 
                         stream_task = asyncio.create_task(stream_iter.__anext__())
 
-                yield encoder.encode(
+                yield transport.model(
                     RunFinishedEvent(
                         type=EventType.RUN_FINISHED,
                         thread_id=request.thread_id,
@@ -1958,7 +2167,7 @@ def make_agui_chat_endpoint(
                 # Surface error as AG-UI event so the frontend can react.
                 tb_str = "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
                 error_message = f"{str(exc)}\n\nTraceback:\n{tb_str}"
-                yield encoder.encode(RunErrorEvent(type=EventType.RUN_ERROR, message=error_message))
+                yield transport.model(RunErrorEvent(type=EventType.RUN_ERROR, message=error_message))
             finally:
                 if keepalive_task and not keepalive_task.done():
                     keepalive_task.cancel()
@@ -1979,8 +2188,9 @@ def make_agui_chat_endpoint(
                 await cleanup_stream_context()
 
         return StreamingResponse(
-            event_generator(),
-            media_type=encoder.get_content_type(),
+            transport.stream(event_generator()),
+            media_type=transport.media_type,
+            headers=transport.headers,
             background=BackgroundTask(cleanup_stream_context),
         )
 
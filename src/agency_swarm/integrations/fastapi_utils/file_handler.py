@@ -1,21 +1,34 @@
 import asyncio
+import hashlib
 import logging
 import ntpath
 import os
 import shutil
 import sys
 import tempfile
-from collections.abc import Sequence
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 from urllib.parse import unquote, urlparse
 
 import aiofiles
 import filetype
 import httpx
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, NotFoundError
 
 logger = logging.getLogger(__name__)
 
+_DOWNLOAD_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+}
+
 
 # ============================================================
 # Public API
@@ -26,6 +39,7 @@ async def upload_from_urls(
     file_map: dict[str, str],
     allowed_local_dirs: Sequence[str | Path] | None = None,
     openai_client: AsyncOpenAI | None = None,
+    upload_cache: "FileUploadCache | None" = None,
 ) -> dict[str, str]:
     """
     Upload files from URLs or local absolute paths to OpenAI.
@@ -33,6 +47,8 @@ async def upload_from_urls(
     Args:
         file_map: {"filename": "url_or_absolute_path"}
         allowed_local_dirs: Optional allowlist of directories for local files.
+        openai_client: Request-scoped client; defaults to a client shared by all requests.
+        upload_cache: Optional cache that reuses file IDs for content uploaded before.
 
     Returns:
         Mapping of filename → OpenAI file_id
@@ -106,6 +122,11 @@ async def upload_from_urls(
         if parsed.scheme not in allowed_remote_schemes:
             raise ValueError(f"Unsupported URL scheme: {parsed.scheme or 'none'}")
 
+    account = _account_key(openai_client) if upload_cache is not None and upload_cache.enabled else None
+    if upload_cache is not None and account is not None:
+        cached_ids = await _upload_with_cache(remote_files, local_files, openai_client, upload_cache, account)
+        return {name: cached_ids[name] for name in names_order}
+
     # Download + upload remote files
     remote_file_ids: dict[str, str] = {}
     if remote_files:
@@ -139,13 +160,308 @@ async def upload_from_urls(
     return dict(zip(names_order, ordered_ids, strict=True))
 
 
+# ============================================================
+# Upload cache
+# ============================================================
+
+
+@dataclass(slots=True)
+class _UrlEntry:
+    sha256: str
+    etag: str | None
+    last_modified: str | None
+
+
+@dataclass(slots=True)
+class _Download:
+    path: str
+    sha256: str
+    etag: str | None
+    last_modified: str | None
+
+
+class FileUploadCache:
+    """Content-addressed map from attachment bytes to OpenAI file IDs that finished processing.
+
+    Entries are keyed by the SHA-256 of the file content and by the OpenAI account (base URL, API key,
+    organization, project) that owns the file. Remote URLs also remember their ``ETag`` / ``Last-Modified``
+    validators, so an unchanged URL costs one conditional request and a file lookup instead of a download, an
+    upload and a processing wait. Concurrent requests for the same content share a single upload. A cached file
+    ID that OpenAI no longer has (deleted or expired) is evicted and the content is uploaded again.
+
+    Args:
+        max_entries: Maximum cached file IDs (and URL / local path entries); 0 disables the cache.
+        ttl_seconds: Re-upload content whose file ID is older than this (None keeps entries until evicted).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float | None = 3600.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._file_ids: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+        self._urls: OrderedDict[str, _UrlEntry] = OrderedDict()
+        self._local_digests: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self._inflight: dict[tuple[str, str], asyncio.Task[str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get_file_id(self, account: str, sha256: str) -> str | None:
+        """Return the processed file ID for this content, or None."""
+        key = (account, sha256)
+        entry = self._file_ids.get(key)
+        if entry is None:
+            return None
+        file_id, stored_at = entry
+        if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._file_ids[key]
+            return None
+        self._file_ids.move_to_end(key)
+        return file_id
+
+    def forget(self, file_id: str) -> None:
+        """Drop a file ID, for example after deleting the file from OpenAI."""
+        for key in [key for key, (cached_id, _) in self._file_ids.items() if cached_id == file_id]:
+            del self._file_ids[key]
+
+    def clear(self) -> None:
+        self._file_ids.clear()
+        self._urls.clear()
+        self._local_digests.clear()
+
+    async def get_or_upload(
+        self,
+        account: str,
+        sha256: str,
+        upload: Callable[[], Awaitable[str]],
+        *,
+        verify: Callable[[str], Awaitable[bool]] | None = None,
+        release: Callable[[], None] | None = None,
+    ) -> str:
+        """Return the cached file ID, or run ``upload`` once for all concurrent callers and cache its result.
+
+        Args:
+            account: Key of the OpenAI account that owns the file.
+            sha256: SHA-256 of the file content.
+            upload: Uploads the content and waits until it is processed.
+            verify: Checks that a cached file ID still exists; a missing file is evicted and uploaded again.
+            release: Frees what ``upload`` reads. The shared upload task calls it when it finishes, so a caller
+                that is cancelled or returns first never removes a file the upload still needs. It runs right
+                away when this caller's ``upload`` is not used.
+        """
+        key = (account, sha256)
+        handed_off = False
+        try:
+            file_id = self.get_file_id(account, sha256)
+            if file_id is not None and verify is not None and not await verify(file_id):
+                self.forget(file_id)
+                file_id = None
+            if file_id is not None:
+                return file_id
+            task = self._inflight.get(key)
+            if task is None:
+                task = asyncio.create_task(self._upload(key, upload))
+                self._inflight[key] = task
+                task.add_done_callback(lambda done, key=key: self._finish_inflight(key, done))
+                if release is not None:
+                    task.add_done_callback(lambda _done: release())
+                    handed_off = True
+        finally:
+            if release is not None and not handed_off:
+                release()
+        return await asyncio.shield(task)
+
+    async def _upload(self, key: tuple[str, str], upload: Callable[[], Awaitable[str]]) -> str:
+        file_id = await upload()
+        self._remember(self._file_ids, key, (file_id, time.monotonic()))
+        return file_id
+
+    def _finish_inflight(self, key: tuple[str, str], task: asyncio.Task[str]) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark the error as retrieved when every waiter was cancelled
+            task.exception()
+
+    def url_entry(self, url: str) -> _UrlEntry | None:
+        entry = self._urls.get(url)
+        if entry is not None:
+            self._urls.move_to_end(url)
+        return entry
+
+    def remember_url(self, url: str, download: _Download) -> None:
+        if download.etag is None and download.last_modified is None:
+            self._urls.pop(url, None)
+            return
+        self._remember(self._urls, url, _UrlEntry(download.sha256, download.etag, download.last_modified))
+
+    async def local_digest(self, path: Path) -> str:
+        """SHA-256 of a local file, rehashed only when its size or mtime changes."""
+        stat = await asyncio.to_thread(path.stat)
+        key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+        digest = self._local_digests.get(key)
+        if digest is None:
+            digest = await asyncio.to_thread(_hash_file, path)
+            self._remember(self._local_digests, key, digest)
+        return digest
+
+    def _remember(self, entries: OrderedDict[Any, Any], key: Any, value: Any) -> None:
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+
+async def _upload_with_cache(
+    remote_files: dict[str, str],
+    local_files: dict[str, Path],
+    openai_client: AsyncOpenAI | None,
+    cache: FileUploadCache,
+    account: str,
+) -> dict[str, str]:
+    async def upload_and_wait(path: str) -> str:
+        if openai_client is None:
+            file_id = await upload_to_openai(path)
+            await _wait_for_file_processed(file_id)
+        else:
+            file_id = await upload_to_openai(path, openai_client=openai_client)
+            await _wait_for_file_processed(file_id, openai_client=openai_client)
+        return file_id
+
+    async def file_exists(file_id: str) -> bool:
+        if openai_client is None:
+            return await _file_exists(file_id)
+        return await _file_exists(file_id, openai_client=openai_client)
+
+    async def resolve_remote(name: str, url: str) -> str:
+        # Downloads go to a directory owned by the upload task rather than by this request: other requests
+        # may join the upload and keep it running after this one returns or is cancelled.
+        save_dir = tempfile.mkdtemp(prefix="agency_swarm_upload_")
+
+        def release() -> None:
+            shutil.rmtree(save_dir, ignore_errors=True)
+
+        try:
+            download = None
+            entry = cache.url_entry(url)
+            if entry is not None and cache.get_file_id(account, entry.sha256) is not None:
+                download = await _download_file(url, name, save_dir, cached=entry)
+                if download is None:
+                    file_id = cache.get_file_id(account, entry.sha256)
+                    if file_id is not None and await file_exists(file_id):
+                        release()
+                        return file_id
+                    if file_id is not None:
+                        cache.forget(file_id)
+            if download is None:
+                download = await _download_file(url, name, save_dir)
+            assert download is not None
+        except BaseException:
+            release()
+            raise
+        cache.remember_url(url, download)
+        return await cache.get_or_upload(
+            account,
+            download.sha256,
+            lambda: upload_and_wait(download.path),
+            verify=file_exists,
+            release=release,
+        )
+
+    async def resolve_local(path: Path) -> str:
+        digest = await cache.local_digest(path)
+        return await cache.get_or_upload(account, digest, lambda: upload_and_wait(str(path)), verify=file_exists)
+
+    names = [*remote_files, *local_files]
+    ids = await asyncio.gather(
+        *(resolve_remote(name, url) for name, url in remote_files.items()),
+        *(resolve_local(path) for path in local_files.values()),
+    )
+    return dict(zip(names, ids, strict=True))
+
+
+def _account_key(openai_client: AsyncOpenAI | None) -> str | None:
+    """Identify the OpenAI account that owns uploaded files, or None when it cannot be determined."""
+    if openai_client is None:
+        parts = [
+            os.getenv("OPENAI_BASE_URL") or "",
+            os.getenv("OPENAI_API_KEY") or "",
+            os.getenv("OPENAI_ORG_ID") or "",
+            os.getenv("OPENAI_PROJECT_ID") or "",
+        ]
+    else:
+        api_key = getattr(openai_client, "api_key", None)
+        if not isinstance(api_key, str):
+            return None
+        parts = [
+            str(getattr(openai_client, "base_url", "")),
+            api_key,
+            str(getattr(openai_client, "organization", None) or ""),
+            str(getattr(openai_client, "project", None) or ""),
+        ]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ============================================================
+# Shared clients
+# ============================================================
+
+# Clients hold connection pools bound to the event loop that created them, so they are shared per loop.
+_loop_state: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Any, Any]] = weakref.WeakKeyDictionary()
+
+
+def _get_loop_state() -> dict[Any, Any]:
+    loop = asyncio.get_running_loop()
+    state = _loop_state.get(loop)
+    if state is None:
+        state = _loop_state[loop] = {}
+    return state
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    state = _get_loop_state()
+    client = state.get("http_client")
+    if client is None or client.is_closed:
+        client = state["http_client"] = httpx.AsyncClient(timeout=30.0)
+    return client
+
+
+async def close_shared_clients() -> None:
+    """Close the HTTP and OpenAI clients shared on the running event loop. `run_fastapi` calls it on shutdown."""
+    state = _loop_state.pop(asyncio.get_running_loop(), None)
+    if not state:
+        return
+    for client in state.values():
+        try:
+            if isinstance(client, httpx.AsyncClient):
+                await client.aclose()
+            elif isinstance(client, AsyncOpenAI):
+                await client.close()
+        except Exception as e:  # pragma: no cover - best effort during shutdown
+            logger.debug("Failed to close shared client: %s", e)
+
+
 # ============================================================
 # OpenAI helpers
 # ============================================================
 
 
 def _get_openai_client(openai_client: AsyncOpenAI | None = None) -> AsyncOpenAI:
-    return openai_client if openai_client is not None else AsyncOpenAI()
+    if openai_client is not None:
+        return openai_client
+    state = _get_loop_state()
+    key = ("openai_client", _account_key(None))
+    client = state.get(key)
+    if client is None:
+        client = state[key] = AsyncOpenAI()
+    return client
 
 
 async def upload_to_openai(file_path: str, openai_client: AsyncOpenAI | None = None) -> str:
@@ -159,21 +475,62 @@ async def upload_to_openai(file_path: str, openai_client: AsyncOpenAI | None = N
         raise
 
 
-async def _wait_for_file_processed(file_id: str, timeout: int = 60, openai_client: AsyncOpenAI | None = None) -> None:
+async def _file_exists(file_id: str, openai_client: AsyncOpenAI | None = None) -> bool:
+    """Return False when OpenAI no longer has ``file_id``; other lookup errors count as present."""
     client = _get_openai_client(openai_client=openai_client)
-    for _ in range(timeout):
+    try:
+        await client.files.retrieve(file_id)
+    except NotFoundError:
+        return False
+    except Exception as e:
+        logger.warning("Error checking cached file %s: %s", file_id, e)
+    return True
+
+
+async def _wait_for_file_processed(file_id: str, timeout: int = 60, openai_client: AsyncOpenAI | None = None) -> None:
+    """Wait until OpenAI finishes processing ``file_id``; concurrent waiters share one poller."""
+    waits: dict[str, asyncio.Task[None]] = _get_loop_state().setdefault("processing_waits", {})
+    task = waits.get(file_id)
+    if task is None:
+        client = _get_openai_client(openai_client=openai_client)
+        task = asyncio.create_task(_poll_file_processed(client, file_id, timeout))
+        waits[file_id] = task
+
+        def _done(done: asyncio.Task[None]) -> None:
+            waits.pop(file_id, None)
+            if not done.cancelled():
+                done.exception()
+
+        task.add_done_callback(_done)
+    await asyncio.shield(task)
+
+
+async def _poll_file_processed(
+    client: AsyncOpenAI,
+    file_id: str,
+    timeout: float,
+    initial_delay: float = 0.1,
+    max_delay: float = 2.0,
+) -> None:
+    """Poll with exponential backoff: small files are usually ready within a few hundred milliseconds."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = initial_delay
+    while True:
         try:
             info = await client.files.retrieve(file_id)
         except Exception as e:  # pragma: no cover - retry on any transient error
             logger.warning("Error retrieving status for file %s: %s", file_id, e)
-            await asyncio.sleep(1)
-            continue
-        if getattr(info, "status", None) == "processed":
-            return
-        if getattr(info, "status", None) == "error":
-            raise RuntimeError(f"File processing failed: {file_id}")
-        await asyncio.sleep(1)
-    raise TimeoutError(f"File processing timed out: {file_id}")
+        else:
+            if getattr(info, "status", None) == "processed":
+                return
+            if getattr(info, "status", None) == "error":
+                raise RuntimeError(f"File processing failed: {file_id}")
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise TimeoutError(f"File processing timed out: {file_id}")
+        await asyncio.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
 
 
 # ============================================================
@@ -203,6 +560,13 @@ def _validate_download_name(name: str) -> str:
 
 
 async def download_file(url: str, name: str, save_dir: str) -> str:
+    download = await _download_file(url, name, save_dir)
+    assert download is not None
+    return download.path
+
+
+async def _download_file(url: str, name: str, save_dir: str, cached: _UrlEntry | None = None) -> _Download | None:
+    """Download ``url`` while hashing it. Returns None when ``cached`` validators show the content is unchanged."""
     validated_name = _validate_download_name(name)
     ext = get_extension_from_name(validated_name) or get_extension_from_url(url)
     base = os.path.splitext(validated_name)[0]
@@ -213,19 +577,25 @@ async def download_file(url: str, name: str, save_dir: str) -> str:
     os.close(tmp_fd)
     tmp_path = Path(tmp_str)
 
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        ),
-    }
+    headers = dict(_DOWNLOAD_HEADERS)
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+    digest = hashlib.sha256()
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            async with client.stream("GET", url, headers=headers) as r:
-                r.raise_for_status()
-                async with aiofiles.open(tmp_path, "wb") as f:
-                    async for chunk in r.aiter_bytes():
-                        await f.write(chunk)
+        async with _get_http_client().stream("GET", url, headers=headers) as r:
+            if cached is not None and r.status_code == 304:
+                tmp_path.unlink(missing_ok=True)
+                return None
+            r.raise_for_status()
+            etag = _header_value(r, "etag")
+            last_modified = _header_value(r, "last-modified")
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in r.aiter_bytes():
+                    digest.update(chunk)
+                    await f.write(chunk)
     except Exception:
         tmp_path.unlink(missing_ok=True)
         raise
@@ -240,7 +610,12 @@ async def download_file(url: str, name: str, save_dir: str) -> str:
     # with the same base+ext never overwrite each other's output.
     final_path = tmp_path.with_suffix(ext)
     shutil.move(str(tmp_path), str(final_path))
-    return str(final_path)
+    return _Download(str(final_path), digest.hexdigest(), etag, last_modified)
+
+
+def _header_value(response: httpx.Response, name: str) -> str | None:
+    value = response.headers.get(name)
+    return value if isinstance(value, str) else None
 
 
 # ============================================================
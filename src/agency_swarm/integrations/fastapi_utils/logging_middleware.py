@@ -1,6 +1,9 @@
+import asyncio
 import json
 import logging
 import os
+import queue
+import threading
 import traceback
 import uuid
 from contextvars import ContextVar
@@ -75,26 +78,130 @@ class FileFormatter(logging.Formatter):
 
 
 class ConditionalFileHandler(logging.Handler):
-    """Handler that only logs to file when enabled via context variable."""
+    """Handler that only logs to file when enabled via context variable.
 
-    def __init__(self, logs_dir: str):
+    Records are formatted on the logging thread (so call stacks and context stay correct) and queued.
+    A background writer thread appends them in batches, opening each request's file once per batch,
+    so logging never blocks the event loop on file I/O. The writer also keeps a per-request index of
+    bytes written, which lets `read_request_logs` return a request's entries with a single read.
+    """
+
+    def __init__(self, logs_dir: str, *, batch_size: int = 256, flush_interval: float = 0.05):
         super().__init__()
         self.logs_dir = logs_dir
         os.makedirs(logs_dir, exist_ok=True)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: queue.SimpleQueue[tuple[str, str] | threading.Event | None] = queue.SimpleQueue()
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
+        # request_id -> bytes this handler appended to the request's file
+        self._written_bytes: dict[str, int] = {}
+        self._index_lock = threading.Lock()
+        _file_handlers[os.path.abspath(logs_dir)] = self
 
     def emit(self, record):
         if log_to_file_context.get(False):
             request_id = request_id_context.get("")
             if request_id:
                 try:
-                    log_file = os.path.join(self.logs_dir, f"{request_id}.jsonl")
-                    formatted_message = self.format(record)
-
-                    with open(log_file, "a", encoding="utf-8") as f:
-                        f.write(formatted_message + "\n")
+                    self._ensure_writer()
+                    self._queue.put((request_id, self.format(record) + "\n"))
                 except Exception:
                     pass
 
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until every record queued so far has been written."""
+        writer = self._writer
+        if writer is None or not writer.is_alive():
+            return
+        written = threading.Event()
+        self._queue.put(written)
+        written.wait(timeout)
+
+    def close(self) -> None:
+        writer = self._writer
+        if writer is not None and writer.is_alive():
+            self._queue.put(None)
+            writer.join(timeout=5.0)
+        _file_handlers.pop(os.path.abspath(self.logs_dir), None)
+        super().close()
+
+    def read_request_logs(self, request_id: str) -> str | None:
+        """Return a request's log lines joined with ``", "`` and forget the request. Call `flush` first.
+
+        Wrapped in brackets, the result is byte-for-byte what ``json.dumps`` produces for the parsed entries.
+
+        Returns None when the file also holds lines this handler did not write (or was changed
+        externally); the caller should then parse the file line by line.
+        """
+        with self._index_lock:
+            expected_bytes = self._written_bytes.pop(request_id, None)
+        if expected_bytes is None:
+            return None
+        log_file = os.path.join(self.logs_dir, f"{request_id}.jsonl")
+        with open(log_file, "rb") as f:
+            content = f.read(expected_bytes + 1)
+        if len(content) != expected_bytes:
+            return None
+        return ", ".join(content.decode("utf-8").splitlines())
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_batches, name="agency-log-writer", daemon=True)
+                self._writer.start()
+
+    def _write_batches(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: dict[str, list[str]] = {}
+            waiters: list[threading.Event] = []
+            stop = False
+            count = 0
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.setdefault(item[0], []).append(item[1])
+                    count += 1
+                if stop or count >= self._batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=self._flush_interval if not waiters else 0)
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _write_batch(self, batch: dict[str, list[str]]) -> None:
+        for request_id, lines in batch.items():
+            try:
+                data = "".join(lines).encode("utf-8")
+                log_file = os.path.join(self.logs_dir, f"{request_id}.jsonl")
+                with open(log_file, "ab") as f:
+                    offset = f.tell()
+                    f.write(data)
+                with self._index_lock:
+                    # Only index files that contain nothing but this handler's lines
+                    if self._written_bytes.get(request_id, 0) == offset:
+                        self._written_bytes[request_id] = offset + len(data)
+                    else:
+                        self._written_bytes.pop(request_id, None)
+            except Exception:
+                pass
+
+
+# File handlers by absolute logs directory, so the logs endpoint can use the writer's index
+_file_handlers: dict[str, ConditionalFileHandler] = {}
+
 
 def setup_enhanced_logging(logs_dir: str = "activity-logs"):
     """Setup custom logging configuration with request tracking."""
@@ -102,8 +209,11 @@ def setup_enhanced_logging(logs_dir: str = "activity-logs"):
     # Create logs directory
     os.makedirs(logs_dir, exist_ok=True)
 
-    # Clear existing handlers
+    # Clear existing handlers, letting a previous file handler write out its queued records and stop its writer
     logger = logging.getLogger()
+    for handler in list(logger.handlers):
+        if isinstance(handler, ConditionalFileHandler):
+            handler.close()
     logger.handlers.clear()
 
     # Console handler
@@ -152,6 +262,37 @@ class RequestTracker(BaseHTTPMiddleware):
         return response
 
 
+def _read_and_remove_request_logs(log_id: str, logs_dir: str, handler: ConditionalFileHandler | None) -> str | None:
+    """Return a request's log entries as a JSON array and delete its file, or None when there is no file."""
+    if handler is not None:
+        # Records may still be queued for the background writer
+        handler.flush()
+
+    log_file = os.path.join(logs_dir, f"{log_id}.jsonl")
+    if not os.path.exists(log_file):
+        return None
+
+    joined_entries = handler.read_request_logs(log_id) if handler is not None else None
+    if joined_entries is not None:
+        # Lines written by the handler are known-valid JSON, so they are spliced without re-parsing
+        content = f"[{joined_entries}]"
+    else:
+        log_entries = []
+        with open(log_file, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        log_entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        pass
+        content = json.dumps(log_entries, ensure_ascii=False)
+
+    # Remove the log file after reading
+    os.remove(log_file)
+    return content
+
+
 async def get_logs_endpoint_impl(log_id: str, logs_dir: str = "activity-logs"):
     """Implementation to retrieve and delete log files."""
     try:
@@ -162,33 +303,19 @@ async def get_logs_endpoint_impl(log_id: str, logs_dir: str = "activity-logs"):
                 media_type="application/json",
             )
 
-        log_file = os.path.join(logs_dir, f"{log_id}.jsonl")
-
-        if not os.path.exists(log_file):
+        handler = _file_handlers.get(os.path.abspath(logs_dir))
+        # Flushing the writer and reading the file both block, so they run off the event loop
+        content = await asyncio.to_thread(_read_and_remove_request_logs, log_id, logs_dir, handler)
+        if content is None:
             return Response(
                 status_code=404,
                 content='{"error": "Log file not found"}',
                 media_type="application/json",
             )
 
-        log_entries = []
-        with open(log_file, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        log_entry = json.loads(line)
-                        log_entries.append(log_entry)
-                    except json.JSONDecodeError:
-                        pass
-
-        # Remove the log file after reading
-        os.remove(log_file)
-
-        # Return JSON format (same as original script)
         return Response(
             status_code=200,
-            content=json.dumps(log_entries, ensure_ascii=False, indent=2),
+            content=content,
             media_type="application/json",
         )
 
@@ -0,0 +1,62 @@
+"""Per-endpoint request metrics and the Prometheus ``/metrics`` endpoint."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+from fastapi import Depends
+from fastapi.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from agency_swarm.utils.metrics import MetricsRegistry, get_metrics_registry
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts and latency per route.
+
+    Latency runs until the last body chunk is sent, so streaming endpoints report the full stream
+    duration. Routes are labelled by their path template to keep label cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp, registry: Callable[[], MetricsRegistry] = get_metrics_registry) -> None:
+        self.app = app
+        self._registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            labels = {"method": scope.get("method", ""), "route": route, "status": str(status_code)}
+            registry = self._registry()
+            registry.counter(
+                "agency_swarm_http_requests_total", "HTTP requests served.", ("method", "route", "status")
+            ).inc(**labels)
+            registry.histogram(
+                "agency_swarm_http_request_seconds",
+                "HTTP request duration, including the whole body for streaming responses.",
+                ("method", "route", "status"),
+            ).observe(time.perf_counter() - started_at, **labels)
+
+
+def make_metrics_endpoint(verify_token, registry: Callable[[], MetricsRegistry] = get_metrics_registry):
+    async def handler(token: str = Depends(verify_token)):
+        return PlainTextResponse(registry().render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    return handler
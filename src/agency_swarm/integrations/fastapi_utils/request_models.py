@@ -162,9 +162,20 @@ class BaseRequest(BaseModel):
         default=None,
         description="Structured context merged into MasterContext.user_context for this run only.",
     )
+    chat_id: str | None = Field(
+        default=None,
+        description=(
+            "Client-side conversation ID. A generated chat name is remembered per chat_id (and OAuth user or "
+            "tenant) and reused on later turns; without it the name is generated on every request."
+        ),
+    )
     generate_chat_name: bool | None = Field(
         default=False, description="Generate a fitting chat name for the user input."
     )
+    include_timings: bool | None = Field(
+        default=False,
+        description="Return per-hop latency spans (model, tool, persistence, queueing) for this run.",
+    )
     client_config: ClientConfig | None = Field(
         default=None,
         description="Override client configuration (base_url, api_key, litellm_keys, model) for this request only.",
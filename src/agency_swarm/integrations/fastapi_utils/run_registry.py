@@ -0,0 +1,185 @@
+"""Shared run state so cancel requests reach streaming runs owned by another worker.
+
+`ActiveRunRegistry` keeps live runs in process memory. Under several uvicorn workers a cancel request can land on a
+worker that does not own the run. A `RunRegistryBackend` shares three facts between workers: which runs are active,
+which of them have a pending cancel request, and the messages a remotely cancelled run produced.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Collection, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class RunRegistryBackend(ABC):
+    """Storage shared by every worker serving the same agencies.
+
+    Subclass to back the registry with Redis or a database. Methods may be called concurrently from several
+    processes, so each one must be atomic on its own.
+    """
+
+    @abstractmethod
+    async def add_run(self, run_id: str) -> None:
+        """Announce a run started by this worker."""
+
+    @abstractmethod
+    async def request_cancel(self, run_id: str, cancel_mode: str) -> bool:
+        """Store a cancel request. Returns False when no worker owns an active run with this id."""
+
+    @abstractmethod
+    async def pop_cancel_requests(self, run_ids: Collection[str]) -> dict[str, str]:
+        """Return and consume pending cancel requests (``run_id -> cancel_mode``) for the given runs."""
+
+    @abstractmethod
+    async def finish_run(self, run_id: str) -> bool:
+        """Mark a run as finished. Returns True when a remote worker is waiting for its cancel result."""
+
+    @abstractmethod
+    async def set_cancel_result(self, run_id: str, result: dict[str, Any]) -> None:
+        """Publish the cancel response for a finished run that was cancelled remotely."""
+
+    @abstractmethod
+    async def pop_cancel_result(self, run_id: str) -> dict[str, Any] | None:
+        """Return and consume the published cancel response, or None if it is not available yet."""
+
+
+class SQLiteRunRegistryBackend(RunRegistryBackend):
+    """`RunRegistryBackend` stored in a SQLite file, for workers that share a host or a mounted volume.
+
+    Args:
+        path: Database file. Every worker must use the same path.
+        expiry_seconds: Drop entries older than this, so runs of crashed workers do not accumulate.
+    """
+
+    def __init__(self, path: str | Path, *, expiry_seconds: float | None = 86_400.0) -> None:
+        self._path = str(path)
+        self._expiry_seconds = expiry_seconds
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS agency_runs (
+                    run_id TEXT PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    cancel_mode TEXT,
+                    cancel_delivered INTEGER NOT NULL DEFAULT 0,
+                    finished INTEGER NOT NULL DEFAULT 0,
+                    result TEXT
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self._path, timeout=5.0, isolation_level=None)
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    async def add_run(self, run_id: str) -> None:
+        await asyncio.to_thread(self._add_run, run_id)
+
+    def _add_run(self, run_id: str) -> None:
+        now = time.time()
+        with self._transaction() as connection:
+            if self._expiry_seconds is not None:
+                connection.execute("DELETE FROM agency_runs WHERE created_at < ?", (now - self._expiry_seconds,))
+            connection.execute(
+                "INSERT OR REPLACE INTO agency_runs (run_id, created_at) VALUES (?, ?)",
+                (run_id, now),
+            )
+
+    async def request_cancel(self, run_id: str, cancel_mode: str) -> bool:
+        return await asyncio.to_thread(self._request_cancel, run_id, cancel_mode)
+
+    def _request_cancel(self, run_id: str, cancel_mode: str) -> bool:
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE agency_runs SET cancel_mode = COALESCE(cancel_mode, ?) WHERE run_id = ? AND finished = 0",
+                (cancel_mode, run_id),
+            )
+            return cursor.rowcount > 0
+
+    async def pop_cancel_requests(self, run_ids: Collection[str]) -> dict[str, str]:
+        if not run_ids:
+            return {}
+        return await asyncio.to_thread(self._pop_cancel_requests, list(run_ids))
+
+    def _pop_cancel_requests(self, run_ids: list[str]) -> dict[str, str]:
+        placeholders = ",".join("?" * len(run_ids))
+        with self._transaction() as connection:
+            rows = connection.execute(
+                "SELECT run_id, cancel_mode FROM agency_runs "
+                f"WHERE cancel_mode IS NOT NULL AND cancel_delivered = 0 AND run_id IN ({placeholders})",
+                run_ids,
+            ).fetchall()
+            if rows:
+                connection.executemany(
+                    "UPDATE agency_runs SET cancel_delivered = 1 WHERE run_id = ?",
+                    [(run_id,) for run_id, _ in rows],
+                )
+        return dict(rows)
+
+    async def finish_run(self, run_id: str) -> bool:
+        return await asyncio.to_thread(self._finish_run, run_id)
+
+    def _finish_run(self, run_id: str) -> bool:
+        with self._transaction() as connection:
+            row = connection.execute("SELECT cancel_mode FROM agency_runs WHERE run_id = ?", (run_id,)).fetchone()
+            if row is None:
+                return False
+            if row[0] is None:
+                connection.execute("DELETE FROM agency_runs WHERE run_id = ?", (run_id,))
+                return False
+            # Keep the row until the waiting worker collects the result
+            connection.execute("UPDATE agency_runs SET finished = 1 WHERE run_id = ?", (run_id,))
+            return True
+
+    async def set_cancel_result(self, run_id: str, result: dict[str, Any]) -> None:
+        payload = json.dumps(result)
+        await asyncio.to_thread(self._set_cancel_result, run_id, payload)
+
+    def _set_cancel_result(self, run_id: str, payload: str) -> None:
+        with self._connect() as connection:
+            connection.execute("UPDATE agency_runs SET result = ? WHERE run_id = ?", (payload, run_id))
+
+    async def pop_cancel_result(self, run_id: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self._pop_cancel_result, run_id)
+
+    def _pop_cancel_result(self, run_id: str) -> dict[str, Any] | None:
+        with self._transaction() as connection:
+            row = connection.execute(
+                "SELECT result FROM agency_runs WHERE run_id = ? AND finished = 1 AND result IS NOT NULL",
+                (run_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute("DELETE FROM agency_runs WHERE run_id = ?", (run_id,))
+        try:
+            result = json.loads(row[0])
+        except json.JSONDecodeError:
+            logger.warning("Discarding unreadable cancel result for run %s", run_id)
+            return None
+        return result if isinstance(result, dict) else None
@@ -0,0 +1,151 @@
+"""Wire encoding for streaming endpoints, negotiated per request from its headers.
+
+Streams are plain-text Server-Sent Events unless the client asks for something else:
+
+- ``Accept-Encoding: gzip`` (or ``deflate``) compresses the whole stream with one compressor that is
+  flushed after every frame, so each event can be decoded as soon as it arrives and repeated JSON keys
+  across events compress against each other. Only honoured when the server enables stream compression:
+  browsers and proxies send ``Accept-Encoding: gzip`` by default, and some proxies buffer compressed
+  responses until they end.
+- ``Accept: application/x-msgpack`` replaces SSE text with msgpack maps ``{"event": ..., "data": ...}``
+  written back to back (a streaming msgpack unpacker reads them one by one). Requires the ``msgpack``
+  extra (``pip install "agency-swarm[msgpack]"``); without it the stream stays SSE.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from collections.abc import AsyncIterator, Callable, Mapping
+from typing import Any, Literal
+
+# msgpack is optional - binary framing is only offered when it is installed
+try:
+    import msgpack
+
+    _MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None  # type: ignore[assignment]
+    _MSGPACK_AVAILABLE = False
+
+SSE_MEDIA_TYPE = "text/event-stream"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+Compression = Literal["gzip", "deflate"]
+
+_WBITS: dict[str, int] = {"gzip": 31, "deflate": 15}
+
+
+class StreamEncoder:
+    """Encodes the events of one streaming response into wire frames.
+
+    Endpoints build frames with `event`, `comment` and `model`, then pass their frame generator through
+    `stream`, which applies the negotiated compression.
+
+    Args:
+        binary: Use msgpack framing instead of SSE text.
+        compression: Compress the stream with ``gzip`` or ``deflate``.
+        model_encoder: SSE encoder for pydantic event models (for example ``ag_ui.encoder.EventEncoder().encode``).
+    """
+
+    def __init__(
+        self,
+        *,
+        binary: bool = False,
+        compression: Compression | None = None,
+        model_encoder: Callable[[Any], str] | None = None,
+    ) -> None:
+        if binary and not _MSGPACK_AVAILABLE:
+            raise RuntimeError(
+                'msgpack framing requires the msgpack package. Install with `pip install "agency-swarm[msgpack]"`.'
+            )
+        self.binary = binary
+        self.compression = compression
+        self._model_encoder = model_encoder
+
+    @classmethod
+    def negotiate(
+        cls,
+        headers: Mapping[str, str] | None,
+        *,
+        allow_compression: bool = False,
+        model_encoder: Callable[[Any], str] | None = None,
+    ) -> StreamEncoder:
+        """Pick framing from ``Accept`` and, when ``allow_compression`` is set, compression from
+        ``Accept-Encoding``; defaults to plain SSE."""
+        if headers is None:
+            return cls(model_encoder=model_encoder)
+        headers = {key.lower(): value for key, value in headers.items()}
+        accepted_types = _accepted_tokens(headers.get("accept", ""))
+        binary = _MSGPACK_AVAILABLE and MSGPACK_MEDIA_TYPE in accepted_types
+        compression: Compression | None = None
+        if allow_compression:
+            accepted_encodings = _accepted_tokens(headers.get("accept-encoding", ""))
+            compression = next((name for name in ("gzip", "deflate") if name in accepted_encodings), None)
+        return cls(binary=binary, compression=compression, model_encoder=model_encoder)
+
+    @property
+    def media_type(self) -> str:
+        return MSGPACK_MEDIA_TYPE if self.binary else SSE_MEDIA_TYPE
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Response headers describing the negotiated encoding."""
+        headers = {"Vary": "Accept, Accept-Encoding"}
+        if self.compression is not None:
+            headers["Content-Encoding"] = self.compression
+        return headers
+
+    def event(self, data: Any, event: str | None = None) -> str | bytes:
+        """Encode one event. String data is sent as-is; anything else as JSON (or msgpack)."""
+        if self.binary:
+            return msgpack.packb({"event": event or "message", "data": data})
+        payload = data if isinstance(data, str) else json.dumps(data)
+        if event:
+            return f"event: {event}\ndata: {payload}\n\n"
+        return f"data: {payload}\n\n"
+
+    def comment(self, text: str) -> str | bytes:
+        """Encode a keepalive/comment frame that clients should ignore."""
+        if self.binary:
+            return msgpack.packb({"event": "comment", "data": text})
+        return f": {text}\n\n"
+
+    def model(self, event_model: Any) -> str | bytes:
+        """Encode a pydantic event model (AG-UI events)."""
+        if self.binary:
+            return msgpack.packb({"event": "message", "data": event_model.model_dump(mode="json", by_alias=True)})
+        if self._model_encoder is not None:
+            return self._model_encoder(event_model)
+        return f"data: {event_model.model_dump_json(by_alias=True)}\n\n"
+
+    async def stream(self, frames: AsyncIterator[str | bytes]) -> AsyncIterator[str | bytes]:
+        """Yield ``frames`` with the negotiated compression, flushing after every frame."""
+        if self.compression is None:
+            async for frame in frames:
+                yield frame
+            return
+        compressor = zlib.compressobj(wbits=_WBITS[self.compression])
+        try:
+            async for frame in frames:
+                data = frame.encode() if isinstance(frame, str) else frame
+                if data:
+                    yield compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield compressor.flush()
+        finally:
+            aclose = getattr(frames, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+
+def _accepted_tokens(header: str) -> set[str]:
+    """Lower-cased tokens of an ``Accept``-style header, without the ones refused with ``q=0``."""
+    tokens: set[str] = set()
+    for part in header.split(","):
+        token, *params = (piece.strip() for piece in part.split(";"))
+        if not token:
+            continue
+        refused = any(param.replace(" ", "").lower() in ("q=0", "q=0.0", "q=0.00", "q=0.000") for param in params)
+        if not refused:
+            tokens.add(token.lower())
+    return tokens
@@ -1,5 +1,14 @@
 import asyncio
+import contextvars
+import functools
+import inspect
 import json
+import threading
+import time
+import weakref
+from collections.abc import Callable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from typing import Any, cast
 
 from agents import FunctionTool
@@ -7,15 +16,217 @@ from fastapi import Depends, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
-from agency_swarm.tools import BaseTool
+from agency_swarm.tools import BaseTool, ToolConcurrencyManager
 from agency_swarm.tools.function_tool_compat import build_manual_tool_context, normalize_function_tool
+from agency_swarm.utils.metrics import MetricFamily, register_builtin_collector
 
 from .tool_request_models import build_request_model
 
 
-def make_tool_endpoint(tool, verify_token, context=None):
+class ToolConcurrencyError(Exception):
+    """Raised when a one-call-at-a-time tool is invoked while another call of it is running."""
+
+
+@dataclass
+class _ToolStats:
+    queued: int = 0
+    active: int = 0
+    completed: int = 0
+    rejected: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+class _NoLimit:
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(self, *_exc: object) -> None:
+        return None
+
+
+_NO_LIMIT = _NoLimit()
+
+
+class ToolExecutor:
+    """Runs tool calls for direct tool endpoints without blocking the event loop.
+
+    Synchronous tool code runs on a bounded thread pool shared by all tool endpoints; async tool
+    code stays on the loop. Each tool gets its own `ToolConcurrencyManager`, so a tool with
+    ``one_call_at_a_time`` rejects overlapping calls exactly as it does inside an agent (the endpoint
+    answers them with 409 instead of queueing them), and
+    ``tool_limits`` caps how many calls of one tool run at once (extra calls wait their turn).
+
+    Args:
+        max_workers: Threads available to synchronous tools across all endpoints.
+        tool_limits: Maximum concurrent calls per tool name.
+        default_tool_limit: Maximum concurrent calls for tools not listed in ``tool_limits``
+            (None means limited only by ``max_workers``).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        *,
+        tool_limits: Mapping[str, int] | None = None,
+        default_tool_limit: int | None = None,
+    ) -> None:
+        self._max_workers = max_workers
+        self._pool: ThreadPoolExecutor | None = None
+        self._tool_limits = dict(tool_limits or {})
+        self._default_tool_limit = default_tool_limit
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._managers: dict[str, ToolConcurrencyManager] = {}
+        self._stats: dict[str, _ToolStats] = {}
+        self._stats_lock = threading.Lock()
+        _LIVE_EXECUTORS.add(self)
+
+    async def run(self, tool_name: str, func: Callable[..., Any], *args: Any, one_call_at_a_time: bool = False) -> Any:
+        """Call ``func(*args)`` for ``tool_name``, in the thread pool when it is synchronous."""
+        manager = self._managers.setdefault(tool_name, ToolConcurrencyManager())
+        stats = self._stats.setdefault(tool_name, _ToolStats())
+        busy, owner = manager.is_lock_active()
+        if busy or (one_call_at_a_time and manager.get_active_count() > 0):
+            with self._stats_lock:
+                stats.rejected += 1
+            raise ToolConcurrencyError(
+                f"Tool concurrency violation. Tool {owner or tool_name} can only be used sequentially "
+                "and is still running."
+            )
+
+        manager.increment_active_count()
+        if one_call_at_a_time:
+            manager.acquire_lock(tool_name)
+        enqueued_at = time.perf_counter()
+        with self._stats_lock:
+            stats.queued += 1
+        started = False
+
+        def _mark_started() -> None:
+            nonlocal started
+            started = True
+            wait = time.perf_counter() - enqueued_at
+            with self._stats_lock:
+                stats.queued -= 1
+                stats.active += 1
+                stats.total_wait_seconds += wait
+                stats.max_wait_seconds = max(stats.max_wait_seconds, wait)
+
+        try:
+            async with self._semaphore(tool_name):
+                if _is_async_callable(func):
+                    _mark_started()
+                    result = await func(*args)
+                else:
+                    # Copy the context like asyncio.to_thread does, so tools still see request-scoped contextvars
+                    call = functools.partial(contextvars.copy_context().run, _run_started, _mark_started, func, *args)
+                    result = await asyncio.get_running_loop().run_in_executor(self._get_pool(), call)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+        finally:
+            with self._stats_lock:
+                if started:
+                    stats.active -= 1
+                    stats.completed += 1
+                else:
+                    stats.queued -= 1
+            if one_call_at_a_time:
+                manager.release_lock()
+            manager.decrement_active_count()
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        """Per-tool queue depth, running calls, completions, rejections and time spent waiting for a slot."""
+        with self._stats_lock:
+            return {
+                name: {
+                    "queued": stats.queued,
+                    "active": stats.active,
+                    "completed": stats.completed,
+                    "rejected": stats.rejected,
+                    "total_wait_seconds": round(stats.total_wait_seconds, 6),
+                    "max_wait_seconds": round(stats.max_wait_seconds, 6),
+                }
+                for name, stats in self._stats.items()
+            }
+
+    def shutdown(self) -> None:
+        """Stop the thread pool after running calls finish."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _semaphore(self, tool_name: str) -> asyncio.Semaphore | _NoLimit:
+        limit = self._tool_limits.get(tool_name, self._default_tool_limit)
+        if limit is None:
+            return _NO_LIMIT
+        semaphore = self._semaphores.get(tool_name)
+        if semaphore is None:
+            semaphore = self._semaphores[tool_name] = asyncio.Semaphore(limit)
+        return semaphore
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="agency-tool")
+        return self._pool
+
+
+def _run_started(mark_started: Callable[[], None], func: Callable[..., Any], *args: Any) -> Any:
+    mark_started()
+    return func(*args)
+
+
+_LIVE_EXECUTORS: weakref.WeakSet[ToolExecutor] = weakref.WeakSet()
+
+
+@register_builtin_collector
+def _collect_tool_executor_metrics() -> Iterator[MetricFamily]:
+    families = {
+        "queued": MetricFamily("agency_swarm_tool_endpoint_queued", "gauge", "Tool endpoint calls waiting for a slot."),
+        "active": MetricFamily("agency_swarm_tool_endpoint_active", "gauge", "Tool endpoint calls running."),
+        "completed": MetricFamily(
+            "agency_swarm_tool_endpoint_completed_total", "counter", "Tool endpoint calls finished."
+        ),
+        "rejected": MetricFamily(
+            "agency_swarm_tool_endpoint_rejected_total", "counter", "Tool endpoint calls rejected as concurrent."
+        ),
+        "total_wait_seconds": MetricFamily(
+            "agency_swarm_tool_endpoint_wait_seconds_total", "counter", "Time tool endpoint calls spent queued."
+        ),
+    }
+    totals: dict[tuple[str, str], float] = {}
+    for executor in list(_LIVE_EXECUTORS):
+        for tool_name, stats in executor.metrics().items():
+            for key in families:
+                totals[(key, tool_name)] = totals.get((key, tool_name), 0.0) + stats[key]
+    for (key, tool_name), value in totals.items():
+        families[key].add(value, tool=tool_name)
+    yield from families.values()
+
+
+def _is_async_callable(func: Any) -> bool:
+    if inspect.iscoroutinefunction(func):
+        return True
+    # Callable instances with an ``async def __call__``
+    return not inspect.isroutine(func) and inspect.iscoroutinefunction(type(func).__call__)
+
+
+_default_executor: ToolExecutor | None = None
+
+
+def _get_default_executor() -> ToolExecutor:
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ToolExecutor()
+    return _default_executor
+
+
+def make_tool_endpoint(tool, verify_token, context=None, executor: ToolExecutor | None = None):
     if isinstance(tool, FunctionTool):
         tool = normalize_function_tool(tool)
+    tool_executor = executor or _get_default_executor()
+    tool_name = tool.name if hasattr(tool, "name") else tool.__name__
+    one_call_at_a_time = _is_one_call_at_a_time(tool)
 
     def _get_invocation_context(input_json: str) -> Any:
         if isinstance(tool, FunctionTool) and getattr(tool, "_is_agent_tool", False):
@@ -27,22 +238,23 @@ def make_tool_endpoint(tool, verify_token, context=None):
             )
         return context
 
+    async def _run(func: Callable[..., Any], *args: Any) -> Any:
+        return await tool_executor.run(tool_name, func, *args, one_call_at_a_time=one_call_at_a_time)
+
     async def generic_handler(request: Request, token: str = Depends(verify_token)):
         try:
             data = await request.json()
             if hasattr(tool, "on_invoke_tool"):
                 input_json = json.dumps(data)
-                result = await tool.on_invoke_tool(_get_invocation_context(input_json), input_json)
+                result = await _run(tool.on_invoke_tool, _get_invocation_context(input_json), input_json)
             elif isinstance(tool, type):
                 tool_instance = tool(**data)
-                result = tool_instance.run()
-                if asyncio.iscoroutine(result):
-                    result = await result
+                result = await _run(tool_instance.run)
             else:
-                result = tool(**data)
-                if asyncio.iscoroutine(result):
-                    result = await result
+                result = await _run(functools.partial(tool, **data))
             return {"response": result}
+        except ToolConcurrencyError as e:
+            return JSONResponse(status_code=409, content={"Error": str(e)})
         except Exception as e:
             return JSONResponse(status_code=500, content={"Error": str(e)})
 
@@ -53,17 +265,16 @@ def make_tool_endpoint(tool, verify_token, context=None):
             try:
                 data = cast(BaseModel, request_data).model_dump(mode="python", exclude_unset=True)
                 tool_instance = tool(**data)
-                result = tool_instance.run()
-                if asyncio.iscoroutine(result):
-                    result = await result
+                result = await _run(tool_instance.run)
                 return {"response": result}
+            except ToolConcurrencyError as e:
+                return JSONResponse(status_code=409, content={"Error": str(e)})
             except Exception as e:
                 return JSONResponse(status_code=500, content={"Error": str(e)})
 
         handler.__annotations__["request_data"] = RequestModel
         return handler
 
-    tool_name = tool.name if hasattr(tool, "name") else tool.__name__
     parameters: dict[str, Any] | None = None
     strict_schema = False
     if hasattr(tool, "openai_schema"):
@@ -86,14 +297,21 @@ def make_tool_endpoint(tool, verify_token, context=None):
             data = request_model.model_dump(mode="python", exclude_unset=True)
             if hasattr(tool, "on_invoke_tool"):
                 input_json = request_model.model_dump_json(exclude_unset=True)
-                result = await tool.on_invoke_tool(_get_invocation_context(input_json), input_json)
+                result = await _run(tool.on_invoke_tool, _get_invocation_context(input_json), input_json)
             else:
-                result = tool(**data)
-                if asyncio.iscoroutine(result):
-                    result = await result
+                result = await _run(functools.partial(tool, **data))
             return {"response": result}
+        except ToolConcurrencyError as e:
+            return JSONResponse(status_code=409, content={"Error": str(e)})
         except Exception as e:
             return JSONResponse(status_code=500, content={"Error": str(e)})
 
     handler.__annotations__["request_data"] = RequestModel
     return handler
+
+
+def _is_one_call_at_a_time(tool: Any) -> bool:
+    tool_config = getattr(tool, "ToolConfig", None)
+    if tool_config is not None:
+        return bool(getattr(tool_config, "one_call_at_a_time", False))
+    return bool(getattr(tool, "one_call_at_a_time", False))
@@ -1,10 +1,23 @@
 """Message handling utilities for Agency Swarm."""
 
-from .message_filter import MessageFilter
+from .history_compaction import (
+    CompactionPolicy,
+    HistoryCompaction,
+    SlidingWindow,
+    SummaryCheckpoint,
+    TruncateToolOutputs,
+)
+from .message_filter import IncrementalMessageFilter, MessageFilter
 from .message_formatter import IncompatibleChatHistoryError, MessageFormatter
 
 __all__ = [
+    "CompactionPolicy",
+    "HistoryCompaction",
+    "IncrementalMessageFilter",
     "IncompatibleChatHistoryError",
     "MessageFilter",
     "MessageFormatter",
+    "SlidingWindow",
+    "SummaryCheckpoint",
+    "TruncateToolOutputs",
 ]
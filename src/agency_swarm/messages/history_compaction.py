@@ -0,0 +1,271 @@
+"""Token-budgeted compaction of conversation history before it is sent to the model.
+
+`HistoryCompaction` is configured per agent (``Agent(history_compaction=...)``). When the estimated size of the
+thread crosses ``max_tokens``, its policies run in order until the history fits ``target_tokens``:
+
+- `TruncateToolOutputs` shortens long tool outputs in older turns.
+- `SlidingWindow` drops the oldest turns from the request (the stored thread is left untouched).
+- `SummaryCheckpoint` replaces the oldest turns with a summary message that is saved to the thread. Later
+  runs start from the latest checkpoint, so the thread stays compact without re-summarizing every turn.
+
+Policies only cut history at user-message boundaries, so tool calls stay paired with their outputs and
+reasoning items with their followers (the invariants `MessageFilter.remove_orphaned_messages` enforces).
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from agents import TResponseInputItem
+
+from agency_swarm.messages.message_filter import MessageFilter
+from agency_swarm.utils.thread import HISTORY_CHECKPOINT_FIELD, estimate_item_tokens
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+_TRUNCATION_NOTICE = "\n...[truncated {count} characters]"
+_SUMMARY_LINE_CHARS = 200
+
+type Summarizer = Callable[[list[TResponseInputItem]], str]
+
+
+def is_history_checkpoint(item: object) -> bool:
+    return isinstance(item, dict) and bool(item.get(HISTORY_CHECKPOINT_FIELD))
+
+
+def history_since_checkpoint(history: list[TResponseInputItem]) -> list[TResponseInputItem]:
+    """Drop everything before the latest checkpoint; the checkpoint summarizes it."""
+    for index in range(len(history) - 1, -1, -1):
+        if is_history_checkpoint(history[index]):
+            return history[index:]
+    return history
+
+
+def estimate_history_tokens(history: Sequence[TResponseInputItem]) -> int:
+    return sum(estimate_item_tokens(item) for item in history)
+
+
+def _is_turn_start(item: TResponseInputItem) -> bool:
+    return isinstance(item, dict) and item.get("role") == "user" and item.get("type", "message") == "message"
+
+
+def _split_turns(history: list[TResponseInputItem]) -> tuple[list[TResponseInputItem], list[list[TResponseInputItem]]]:
+    """Split history into a leading checkpoint (if any) and turns that each start at a user message."""
+    head: list[TResponseInputItem] = []
+    body = history
+    if body and is_history_checkpoint(body[0]):
+        head, body = [body[0]], body[1:]
+    turns: list[list[TResponseInputItem]] = []
+    for item in body:
+        if not turns or _is_turn_start(item):
+            turns.append([item])
+        else:
+            turns[-1].append(item)
+    return head, turns
+
+
+def _flatten(head: list[TResponseInputItem], turns: list[list[TResponseInputItem]]) -> list[TResponseInputItem]:
+    return head + [item for turn in turns for item in turn]
+
+
+class CompactionPolicy(ABC):
+    """Base class for history compaction policies."""
+
+    @abstractmethod
+    def compact(self, history: list[TResponseInputItem], target_tokens: int) -> list[TResponseInputItem]:
+        """Return a smaller history, aiming for ``target_tokens``. Must not modify ``history`` or its items."""
+
+
+@dataclass(frozen=True)
+class TruncateToolOutputs(CompactionPolicy):
+    """Shorten long tool outputs, oldest first, leaving the most recent turns intact.
+
+    Args:
+        max_chars: Characters kept from each truncated output.
+        keep_last_turns: Most recent turns whose outputs are never truncated.
+    """
+
+    max_chars: int = 2000
+    keep_last_turns: int = 1
+
+    def compact(self, history: list[TResponseInputItem], target_tokens: int) -> list[TResponseInputItem]:
+        head, turns = _split_turns(history)
+        total = estimate_history_tokens(history)
+        for turn in turns[: max(len(turns) - self.keep_last_turns, 0)]:
+            for index, item in enumerate(turn):
+                if total <= target_tokens:
+                    return _flatten(head, turns)
+                output = item.get("output") if isinstance(item, dict) else None
+                if (
+                    item.get("type") not in MessageFilter.CALL_ID_OUTPUT_TYPES
+                    or not isinstance(output, str)
+                    or len(output) <= self.max_chars
+                ):
+                    continue
+                truncated = output[: self.max_chars] + _TRUNCATION_NOTICE.format(count=len(output) - self.max_chars)
+                replacement = cast(TResponseInputItem, {**item, "output": truncated})
+                total += estimate_item_tokens(replacement) - estimate_item_tokens(item)
+                turn[index] = replacement
+        return _flatten(head, turns)
+
+
+@dataclass(frozen=True)
+class SlidingWindow(CompactionPolicy):
+    """Send only the most recent turns that fit the budget.
+
+    Args:
+        min_turns: Turns always kept, even when they exceed the budget on their own.
+    """
+
+    min_turns: int = 1
+
+    def compact(self, history: list[TResponseInputItem], target_tokens: int) -> list[TResponseInputItem]:
+        head, turns = _split_turns(history)
+        total = estimate_history_tokens(history)
+        dropped = 0
+        while total > target_tokens and len(turns) - dropped > self.min_turns:
+            total -= estimate_history_tokens(turns[dropped])
+            dropped += 1
+        return _flatten(head, turns[dropped:])
+
+
+@dataclass(frozen=True)
+class SummaryCheckpoint(CompactionPolicy):
+    """Replace the oldest turns with a summary message that is saved to the thread.
+
+    Args:
+        summarize: Builds the summary text from the replaced items (including the previous checkpoint, if any).
+            Defaults to an extractive summary of the user and assistant messages.
+        keep_last_turns: Most recent turns always kept verbatim.
+        max_summary_chars: Upper bound on the summary length; the oldest lines are dropped first.
+    """
+
+    summarize: Summarizer | None = None
+    keep_last_turns: int = 2
+    max_summary_chars: int = 4000
+
+    def compact(self, history: list[TResponseInputItem], target_tokens: int) -> list[TResponseInputItem]:
+        head, turns = _split_turns(history)
+        total = estimate_history_tokens(history)
+        dropped = 0
+        # Leave room for the summary itself
+        budget = max(target_tokens - self.max_summary_chars // 4, 0)
+        while total > budget and len(turns) - dropped > self.keep_last_turns:
+            total -= estimate_history_tokens(turns[dropped])
+            dropped += 1
+        if dropped == 0:
+            return history
+
+        replaced = _flatten(head, turns[:dropped])
+        summary = (self.summarize or _extractive_summary)(replaced)
+        if len(summary) > self.max_summary_chars:
+            summary = summary[-self.max_summary_chars :]
+            summary = summary.partition("\n")[2] or summary
+        checkpoint = cast(
+            TResponseInputItem,
+            {"role": "system", "type": "message", "content": SUMMARY_PREFIX + summary, HISTORY_CHECKPOINT_FIELD: True},
+        )
+        return [checkpoint] + _flatten([], turns[dropped:])
+
+
+def _extractive_summary(items: list[TResponseInputItem]) -> str:
+    lines: list[str] = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        if is_history_checkpoint(item):
+            previous = _message_text(item).removeprefix(SUMMARY_PREFIX)
+            if previous:
+                lines.append(previous)
+            continue
+        item_type = item.get("type", "message")
+        if item_type == "message" and item.get("role") in ("user", "assistant"):
+            text = " ".join(_message_text(item).split())
+            if text:
+                lines.append(f"{item['role']}: {text[:_SUMMARY_LINE_CHARS]}")
+        elif item_type in MessageFilter.CALL_ID_CALL_TYPES and item.get("name"):
+            lines.append(f"tool call: {item['name']}")
+    return "\n".join(lines)
+
+
+def _message_text(item: dict[str, Any]) -> str:
+    content = item.get("content")
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(
+            part["text"] for part in content if isinstance(part, dict) and isinstance(part.get("text"), str)
+        )
+    return ""
+
+
+def _default_policies() -> tuple[CompactionPolicy, ...]:
+    return (TruncateToolOutputs(), SlidingWindow())
+
+
+@dataclass(frozen=True)
+class HistoryCompaction:
+    """Token budget for the history an agent sends to the model.
+
+    Args:
+        max_tokens: Estimated history size that triggers compaction.
+        target_tokens: Size compaction aims for once triggered. Defaults to three quarters of ``max_tokens``,
+            so compaction does not run again on the very next turn.
+        policies: Policies applied in order until the history fits ``target_tokens``.
+    """
+
+    max_tokens: int
+    target_tokens: int | None = None
+    policies: tuple[CompactionPolicy, ...] = field(default_factory=_default_policies)
+
+    def __post_init__(self) -> None:
+        if self.max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if self.target_tokens is not None and not 0 < self.target_tokens <= self.max_tokens:
+            raise ValueError("target_tokens must be positive and at most max_tokens")
+        if not self.policies:
+            raise ValueError("at least one compaction policy is required")
+        object.__setattr__(self, "policies", tuple(self.policies))
+
+    @property
+    def effective_target_tokens(self) -> int:
+        return self.target_tokens if self.target_tokens is not None else self.max_tokens * 3 // 4
+
+    def compact(
+        self,
+        history: list[TResponseInputItem],
+        *,
+        reserved_tokens: int = 0,
+        estimated_tokens: int | None = None,
+    ) -> list[TResponseInputItem]:
+        """Return ``history`` (from its latest checkpoint) within budget.
+
+        Args:
+            history: Stored thread history; neither the list nor its items are modified.
+            reserved_tokens: Tokens needed for the incoming message, taken from the budget.
+            estimated_tokens: Known estimate for ``history`` since its latest checkpoint, to skip recounting.
+        """
+        history = history_since_checkpoint(history)
+        if estimated_tokens is None:
+            estimated_tokens = estimate_history_tokens(history)
+        if estimated_tokens + reserved_tokens <= self.max_tokens:
+            return history
+
+        target = max(self.effective_target_tokens - reserved_tokens, 0)
+        compacted = list(history)
+        for policy in self.policies:
+            compacted = policy.compact(compacted, target)
+            if estimate_history_tokens(compacted) <= target:
+                break
+        return MessageFilter.remove_orphaned_messages(compacted)
+
+
+def normalize_history_compaction(value: object) -> HistoryCompaction | None:
+    """Validate Agent(history_compaction=...). An int is shorthand for ``HistoryCompaction(max_tokens=value)``."""
+    if value is None or isinstance(value, HistoryCompaction):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return HistoryCompaction(max_tokens=value)
+    raise TypeError("history_compaction must be a HistoryCompaction, an int token budget, or None.")
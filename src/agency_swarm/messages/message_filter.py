@@ -1,6 +1,7 @@
 """Message filtering functionality for removing unwanted message types."""
 
 import logging
+from collections.abc import Iterable
 
 from agents.items import TResponseInputItem
 from agents.models.fake_id import FAKE_RESPONSES_ID
@@ -287,3 +288,134 @@ class MessageFilter:
             result.append(msg)
 
         return result
+
+
+class IncrementalMessageFilter:
+    """Applies `MessageFilter` rules to messages one at a time as they arrive.
+
+    Produces the same result as ``remove_orphaned_messages(filter_messages(remove_duplicates(messages)))``
+    but tracks seen ids and unmatched call_ids / approval_request_ids while items are appended, so the
+    final result only needs a second pass when something is actually orphaned.
+
+    Args:
+        remove_duplicates: Drop messages whose ``id`` was already seen (placeholder ids are never deduplicated).
+        drop_filtered: Drop message types listed in `MessageFilter.FILTERED_TYPES`.
+        seen_ids: Ids already kept earlier in the thread; messages carrying them are dropped as duplicates.
+    """
+
+    def __init__(
+        self, *, remove_duplicates: bool = True, drop_filtered: bool = True, seen_ids: Iterable[str] = ()
+    ) -> None:
+        self._remove_duplicates = remove_duplicates
+        self._drop_filtered = drop_filtered
+        self._messages: list[TResponseInputItem] = []
+        self._seen_ids: set[str] = set(seen_ids)
+        self._dropped = 0
+        # Pattern 1: call_id linking
+        self._call_ids: set[str] = set()
+        self._output_call_ids: set[str] = set()
+        self._unmatched_call_ids: set[str] = set()
+        self._unmatched_output_call_ids: set[str] = set()
+        # Pattern 2: approval_request_id linking
+        self._approval_request_ids: set[str] = set()
+        self._approval_response_ids: set[str] = set()
+        self._unmatched_request_ids: set[str] = set()
+        self._unmatched_response_ids: set[str] = set()
+        # Paired items without a usable id are always orphans
+        self._untracked_orphans = 0
+
+    def add(self, message: TResponseInputItem) -> bool:
+        """Track one message. Returns False when it was dropped as a duplicate or filtered type."""
+        if self._remove_duplicates:
+            msg_id = message.get("id")
+            if isinstance(msg_id, str) and msg_id and msg_id != FAKE_RESPONSES_ID:
+                if msg_id in self._seen_ids:
+                    logger.debug(f"Removing duplicate message with id={msg_id}")
+                    self._dropped += 1
+                    return False
+                self._seen_ids.add(msg_id)
+        if self._drop_filtered and MessageFilter.should_filter(message):
+            self._dropped += 1
+            return False
+
+        msg_type = message.get("type")
+        if msg_type in MessageFilter.CALL_ID_CALL_TYPES:
+            self._link(
+                message.get("call_id"),
+                self._call_ids,
+                self._output_call_ids,
+                self._unmatched_call_ids,
+                self._unmatched_output_call_ids,
+            )
+        elif msg_type in MessageFilter.CALL_ID_OUTPUT_TYPES:
+            self._link(
+                message.get("call_id"),
+                self._output_call_ids,
+                self._call_ids,
+                self._unmatched_output_call_ids,
+                self._unmatched_call_ids,
+            )
+        elif msg_type in MessageFilter.MCP_APPROVAL_REQUEST_TYPES:
+            self._link(
+                message.get("id"),
+                self._approval_request_ids,
+                self._approval_response_ids,
+                self._unmatched_request_ids,
+                self._unmatched_response_ids,
+            )
+        elif msg_type in MessageFilter.MCP_APPROVAL_RESPONSE_TYPES:
+            self._link(
+                message.get("approval_request_id"),
+                self._approval_response_ids,
+                self._approval_request_ids,
+                self._unmatched_response_ids,
+                self._unmatched_request_ids,
+            )
+
+        self._messages.append(message)
+        return True
+
+    def extend(self, messages: list[TResponseInputItem]) -> None:
+        """Track several messages in order."""
+        for message in messages:
+            self.add(message)
+
+    @property
+    def has_orphans(self) -> bool:
+        """Whether the tracked messages currently contain paired items without their counterpart."""
+        return bool(
+            self._untracked_orphans
+            or self._unmatched_call_ids
+            or self._unmatched_output_call_ids
+            or self._unmatched_request_ids
+            or self._unmatched_response_ids
+            or (self._messages and self._messages[-1].get("type") == "reasoning")
+        )
+
+    @property
+    def changed(self) -> bool:
+        """Whether `messages()` differs from the sequence of messages that was added."""
+        return bool(self._dropped) or self.has_orphans
+
+    def messages(self) -> list[TResponseInputItem]:
+        """Return the tracked messages with duplicates, filtered types and orphans removed."""
+        if not self.has_orphans:
+            return list(self._messages)
+        return MessageFilter.remove_orphaned_messages(self._messages)
+
+    def _link(
+        self,
+        ref: object,
+        own: set[str],
+        counterpart: set[str],
+        own_unmatched: set[str],
+        counterpart_unmatched: set[str],
+    ) -> None:
+        if not isinstance(ref, str) or not ref:
+            self._untracked_orphans += 1
+            return
+        own.add(ref)
+        if ref in counterpart:
+            counterpart_unmatched.discard(ref)
+        else:
+            own_unmatched.add(ref)
@@ -23,16 +23,20 @@ from openai.types.responses import (
 )
 from openai.types.responses.response_file_search_tool_call import Result as ResponseFileSearchResult
 
+from agency_swarm.messages.history_compaction import estimate_history_tokens, is_history_checkpoint
 from agency_swarm.messages.response_input_sanitizer import (
     REASONING_ENCRYPTED_CONTENT_INCLUDE,
     ensure_store_false_reasoning_encrypted_content,
     sanitize_store_false_responses_input,
 )
+from agency_swarm.utils.thread import HISTORY_CHECKPOINT_FIELD
 
 if TYPE_CHECKING:
     from agents import RunConfig
 
     from agency_swarm.agent.core import AgencyContext, Agent
+    from agency_swarm.messages.history_compaction import HistoryCompaction
+    from agency_swarm.utils.thread import ThreadManager
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +62,7 @@ class MessageFormatter:
         "message_origin",
         "run_trace_id",
         "history_protocol",
+        HISTORY_CHECKPOINT_FIELD,
     ]
     ephemeral_content_part_field = "_agency_swarm_ephemeral"
 
@@ -282,6 +287,19 @@ class MessageFormatter:
             agent_name=agent.name,
         )
 
+        history_compaction = getattr(agent, "history_compaction", None)
+        if history_compaction is not None:
+            existing_history = MessageFormatter._compact_history(
+                existing_history,
+                history_compaction,
+                thread_manager,
+                agent_name=agent.name,
+                caller_agent=sender_name,
+                incoming=processed_current_message_items,
+                agent_run_id=agent_run_id,
+                history_protocol=history_protocol,
+            )
+
         # Add agency metadata to incoming messages
         messages_to_save: list[TResponseInputItem] = []
         messages_for_runner: list[TResponseInputItem] = []
@@ -319,6 +337,49 @@ class MessageFormatter:
             history_for_runner = sanitize_store_false_responses_input(history_for_runner)
         return history_for_runner  # type: ignore[return-value]
 
+    @staticmethod
+    def _compact_history(
+        existing_history: list[TResponseInputItem],
+        compaction: "HistoryCompaction",
+        thread_manager: "ThreadManager",
+        *,
+        agent_name: str,
+        caller_agent: str | None,
+        incoming: list[TResponseInputItem],
+        agent_run_id: str | None,
+        history_protocol: str,
+    ) -> list[TResponseInputItem]:
+        """Apply the agent's token budget to the stored history and save any new summary checkpoint."""
+        compacted = compaction.compact(
+            existing_history,
+            reserved_tokens=estimate_history_tokens(incoming),
+            estimated_tokens=thread_manager.estimated_tokens(agent_name, caller_agent),
+        )
+        stored_ids = {id(msg) for msg in existing_history}
+        for index, msg in enumerate(compacted):
+            if id(msg) in stored_ids or not is_history_checkpoint(msg):
+                continue
+            anchor = next((item for item in compacted[index + 1 :] if id(item) in stored_ids), None)
+            anchor_timestamp = anchor.get("timestamp") if isinstance(anchor, dict) else None
+            checkpoint = MessageFormatter.add_agency_metadata(
+                msg,
+                agent=agent_name,
+                caller_agent=caller_agent,
+                agent_run_id=agent_run_id,
+                history_protocol=history_protocol,
+                # Keep timestamp order consistent with the checkpoint's position in the thread
+                timestamp=anchor_timestamp - 1 if isinstance(anchor_timestamp, int) and anchor_timestamp > 1 else None,
+            )
+            if anchor is None:
+                thread_manager.add_message(checkpoint)
+            else:
+                thread_manager.insert_message_before(anchor, checkpoint)
+            compacted[index] = checkpoint
+            logger.info(
+                "Compacted history of agent '%s' into a summary checkpoint (%d items kept)", agent_name, len(compacted)
+            )
+        return compacted
+
     @staticmethod
     def _strip_ephemeral_content(message: TResponseInputItem, *, drop_parts: bool) -> TResponseInputItem | None:
         if not isinstance(message, dict):
@@ -7,14 +7,29 @@ from sub-agents to maintain full visibility during streaming operations.
 
 import asyncio
 import logging
-from collections.abc import AsyncGenerator
+import weakref
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from typing import Any
 
+from agency_swarm.utils.metrics import MetricFamily, register_builtin_collector
+
 logger = logging.getLogger(__name__)
 
 
+_PRIMARY = "primary"
+_QUEUE = "queue"
+# Small bound keeps the primary stream close to lock-step with the consumer
+_FAN_IN_QUEUE_SIZE = 16
+_STREAM_END = object()
+
+
+@dataclass(slots=True)
+class _PumpError:
+    exc: Exception
+
+
 def add_agent_name_to_event(
     event: Any,
     agent_name: str,
@@ -123,6 +138,9 @@ class StreamingContext:
     is_streaming: bool = True
     _merge_task: asyncio.Task | None = None
 
+    def __post_init__(self) -> None:
+        _LIVE_STREAMING_CONTEXTS[id(self)] = self
+
     async def put_event(self, event: Any) -> None:
         """Add an event to the queue."""
         await self.event_queue.put(event)
@@ -136,22 +154,34 @@ class StreamingContext:
         self.event_queue.put_nowait(None)  # Sentinel value
 
 
+# Keyed by id: dataclass equality makes contexts unhashable
+_LIVE_STREAMING_CONTEXTS: weakref.WeakValueDictionary[int, StreamingContext] = weakref.WeakValueDictionary()
+
+
+@register_builtin_collector
+def _collect_streaming_metrics() -> Iterator[MetricFamily]:
+    contexts = list(_LIVE_STREAMING_CONTEXTS.values())
+    yield MetricFamily("agency_swarm_streaming_contexts", "gauge", "Live streaming contexts.").add(len(contexts))
+    yield MetricFamily(
+        "agency_swarm_streaming_queue_depth", "gauge", "Sub-agent events waiting in streaming context queues."
+    ).add(sum(context.event_queue.qsize() for context in contexts))
+
+
 class EventStreamMerger:
-    """Merges events from multiple sources during streaming operations."""
+    """Merges events from multiple sources during streaming operations.
 
-    def __init__(self):
-        self.streaming_context: StreamingContext | None = None
+    The merger holds no per-stream state, so one instance can serve any number of
+    concurrent streams; every stream gets its own `StreamingContext`.
+    """
 
     @asynccontextmanager
-    async def create_streaming_context(self):
-        """Create a new streaming context for collecting events."""
-        self.streaming_context = StreamingContext()
+    async def create_streaming_context(self) -> AsyncIterator[StreamingContext]:
+        """Create a streaming context owned by a single stream."""
+        streaming_context = StreamingContext()
         try:
-            yield self.streaming_context
+            yield streaming_context
         finally:
-            if self.streaming_context:
-                self.streaming_context.stop()
-                self.streaming_context = None
+            streaming_context.stop()
 
     async def merge_streams(
         self,
@@ -162,60 +192,47 @@ class EventStreamMerger:
         Merge events from the primary stream and the context's event queue.
 
         This allows sub-agent events to be interleaved with the main agent's events.
+        Each source is drained by one long-lived pump task into a single fan-in queue,
+        so no task is created per event. End-of-stream and errors travel through the
+        same queue as events.
         """
-        # Create tasks for both sources
-        primary_task = asyncio.create_task(self._consume_primary(primary_stream))
-        queue_task = asyncio.create_task(self._consume_queue(context))
-
-        pending = {primary_task, queue_task}
+        fan_in: asyncio.Queue[tuple[str, Any]] = asyncio.Queue(maxsize=_FAN_IN_QUEUE_SIZE)
+        primary_task = asyncio.create_task(self._pump_primary(primary_stream, fan_in))
+        queue_task = asyncio.create_task(self._pump_queue(context, fan_in))
 
         try:
-            while pending:
-                # Wait for the first task to produce an event
-                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
-
-                for task in done:
-                    try:
-                        event = task.result()
-                        if event is None:
-                            # Stream ended
-                            if task == primary_task:
-                                logger.debug("Primary stream ended")
-                                # Cancel queue task if primary is done
-                                queue_task.cancel()
-                                return
-                            else:
-                                logger.debug("Queue stream ended")
-                                # Queue ended, but primary might still have events
-                                continue
-                        else:
-                            yield event
-
-                            # Restart the task to get the next event
-                            if task == primary_task:
-                                primary_task = asyncio.create_task(self._consume_primary(primary_stream))
-                                pending.add(primary_task)
-                            else:
-                                queue_task = asyncio.create_task(self._consume_queue(context))
-                                pending.add(queue_task)
-                    except asyncio.CancelledError:
-                        pass
-                    except Exception as e:
-                        logger.error(f"Error in stream merger: {e}")
-                        raise
+            while True:
+                source, event = await fan_in.get()
+                if event is _STREAM_END:
+                    if source == _PRIMARY:
+                        logger.debug("Primary stream ended")
+                        return
+                    logger.debug("Queue stream ended")
+                    continue
+                if isinstance(event, _PumpError):
+                    logger.error(f"Error in stream merger: {event.exc}")
+                    raise event.exc
+                yield event
         finally:
-            # Clean up any remaining tasks
-            for task in pending:
+            # Clean up both pumps
+            for task in (primary_task, queue_task):
                 task.cancel()
 
-    async def _consume_primary(self, stream: AsyncGenerator[Any]) -> Any:
-        """Consume one event from the primary stream."""
+    async def _pump_primary(self, stream: AsyncGenerator[Any], fan_in: asyncio.Queue[tuple[str, Any]]) -> None:
+        """Forward every primary stream event into the fan-in queue."""
         try:
-            return await stream.__anext__()
-        except StopAsyncIteration:
-            return None
-
-    async def _consume_queue(self, context: StreamingContext) -> Any:
-        """Consume one event from the queue."""
-        event = await context.get_event()
-        return event  # None is sentinel for end
+            async for event in stream:
+                await fan_in.put((_PRIMARY, event))
+        except Exception as e:
+            await fan_in.put((_PRIMARY, _PumpError(e)))
+            return
+        await fan_in.put((_PRIMARY, _STREAM_END))
+
+    async def _pump_queue(self, context: StreamingContext, fan_in: asyncio.Queue[tuple[str, Any]]) -> None:
+        """Forward sub-agent events into the fan-in queue until the context is stopped."""
+        while True:
+            event = await context.get_event()
+            if event is None:
+                await fan_in.put((_QUEUE, _STREAM_END))
+                return
+            await fan_in.put((_QUEUE, event))
@@ -37,7 +37,7 @@ from .built_in import LoadFileAttachment, PersistentShellTool, PresentFiles
 from .concurrency import ToolConcurrencyManager
 from .function_tool_compat import function_tool
 from .hosted_mcp_oauth import enable_hosted_mcp_tool_oauth
-from .send_message import Handoff, SendMessage, SendMessageHandoff
+from .send_message import BroadcastSendMessage, Handoff, SendMessage, SendMessageHandoff
 from .tool_factory import ToolFactory
 from .utils import (
     tool_output_file_from_file_id,
@@ -53,6 +53,7 @@ __all__ = [
     "ToolFactory",
     "ToolConcurrencyManager",
     "SendMessage",
+    "BroadcastSendMessage",
     "Handoff",
     "SendMessageHandoff",
     "enable_hosted_mcp_tool_oauth",
@@ -7,15 +7,20 @@ are fully supported approaches for tool creation.
 """
 
 import copy
+import weakref
 from abc import ABC, abstractmethod
 from typing import Any
 
 from agents import RunContextWrapper
+from agents.strict_schema import ensure_strict_json_schema
 from docstring_parser import parse
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 from ..context import MasterContext
 
+# Validation-context key under which the tool adapter hands the run's context to a new tool instance
+TOOL_RUN_CONTEXT_KEY = "agency_swarm_run_context"
+
 
 class classproperty:
     def __init__(self, fget):
@@ -25,6 +30,13 @@ class classproperty:
         return self.fget(owner)
 
 
+def _placeholder_run_context() -> RunContextWrapper[MasterContext]:
+    """Context of a tool created outside a run; the tool adapter replaces it with the run's context."""
+    return RunContextWrapper(
+        context=MasterContext(thread_manager=None, agents={}, user_context={}, current_agent_name=None)
+    )
+
+
 class BaseToolMeta(type(BaseModel)):  # type: ignore[misc]
     """Metaclass for BaseTool that provides a nice __repr__ for the class itself."""
 
@@ -74,24 +86,27 @@ class BaseTool(BaseModel, ABC, metaclass=BaseToolMeta):
 
     _caller_agent: Any = None
     _event_handler: Any = None
-    _context: RunContextWrapper[MasterContext] | None = None
-
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-
-        # Ensure all ToolConfig variables are initialized
+    # A default factory rather than model_post_init, so subclasses overriding model_post_init still get it
+    _context: RunContextWrapper[MasterContext] | None = PrivateAttr(default_factory=_placeholder_run_context)
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        # Ensure all ToolConfig variables are initialized. Done once per class so that instances use pydantic's
+        # own __init__ and can be built straight from JSON arguments.
         config_defaults = {
             "strict": False,
         }
 
         for key, value in config_defaults.items():
-            if not hasattr(self.ToolConfig, key):
-                setattr(self.ToolConfig, key, value)
+            if not hasattr(cls.ToolConfig, key):
+                setattr(cls.ToolConfig, key, value)
 
-        if self._context is None:
-            self._context = RunContextWrapper(
-                context=MasterContext(thread_manager=None, agents={}, user_context={}, current_agent_name=None)
-            )
+    def model_post_init(self, context: Any, /) -> None:
+        # The tool adapter passes the run's context as validation context
+        run_context = context.get(TOOL_RUN_CONTEXT_KEY) if isinstance(context, dict) else None
+        if run_context is not None:
+            self._context = run_context
 
     def __repr__(self) -> str:
         """Return a detailed representation of the BaseTool instance."""
@@ -103,6 +118,9 @@ class BaseTool(BaseModel, ABC, metaclass=BaseToolMeta):
         # When True, this tool runs with a one-call-at-a-time policy per agent; any concurrent
         # tool call for the same agent will immediately error until completion.
         one_call_at_a_time: bool = False
+        # When True, identical concurrent calls (same arguments) share one execution and result
+        # instead of running the tool again.
+        deduplicate_concurrent_calls: bool = False
 
     @classproperty
     def openai_schema(cls) -> dict[str, Any]:
@@ -116,39 +134,7 @@ class BaseTool(BaseModel, ABC, metaclass=BaseToolMeta):
         Returns:
             model_json_schema (dict): A dictionary in the format of OpenAI's schema as jsonschema
         """
-        schema = cls.model_json_schema()
-        docstring = parse(cls.__doc__ or "")
-        parameters = {k: v for k, v in schema.items() if k not in ("title", "description")}
-        for param in docstring.params:
-            if (name := param.arg_name) in parameters["properties"] and (description := param.description):
-                if "description" not in parameters["properties"][name]:
-                    parameters["properties"][name]["description"] = description
-
-        parameters["required"] = sorted(k for k, v in parameters["properties"].items() if "default" not in v)
-
-        if "description" not in schema:
-            if docstring.short_description:
-                schema["description"] = docstring.short_description
-            else:
-                class_name = cls.__name__ if hasattr(cls, "__name__") else "Tool"
-                schema["description"] = f"`{class_name}` tool"
-
-        schema = {
-            "name": schema["title"],
-            "description": schema["description"],
-            "parameters": parameters,
-        }
-
-        strict = getattr(cls.ToolConfig, "strict", False)
-        if strict:
-            schema["strict"] = True
-            schema["parameters"]["additionalProperties"] = False
-            # iterate through defs and set additionalProperties to false
-            if "$defs" in schema["parameters"]:
-                for def_ in schema["parameters"]["$defs"].values():
-                    def_["additionalProperties"] = False
-
-        return schema
+        return copy.deepcopy(compiled_tool_schemas(cls).openai_schema)
 
     @property
     def context(self) -> MasterContext | None:
@@ -169,3 +155,88 @@ class BaseTool(BaseModel, ABC, metaclass=BaseToolMeta):
     @abstractmethod
     def run(self):
         pass
+
+
+class CompiledToolSchemas:
+    """Schemas of one BaseTool class, built once and reused until the class changes.
+
+    Attributes:
+        openai_schema: The value returned by `BaseTool.openai_schema`.
+        params_json_schema: The parameters schema used when the tool is adapted to a `FunctionTool`.
+    """
+
+    __slots__ = ("doc", "strict", "core_schema", "openai_schema", "params_json_schema")
+
+    def __init__(self, tool_class: type[BaseTool]) -> None:
+        self.doc = tool_class.__doc__
+        self.strict = bool(getattr(tool_class.ToolConfig, "strict", False))
+        self.core_schema = tool_class.__pydantic_core_schema__
+        self.openai_schema = _build_openai_schema(tool_class, self.strict)
+        self.params_json_schema = _build_params_json_schema(tool_class, self.strict)
+
+    def is_current(self, tool_class: type[BaseTool]) -> bool:
+        # The docstring, the strict flag and a model rebuild are the only inputs that change the schemas
+        return (
+            self.core_schema is tool_class.__pydantic_core_schema__
+            and self.doc == tool_class.__doc__
+            and self.strict == bool(getattr(tool_class.ToolConfig, "strict", False))
+        )
+
+
+_COMPILED_SCHEMAS: weakref.WeakKeyDictionary[type[BaseTool], CompiledToolSchemas] = weakref.WeakKeyDictionary()
+
+
+def compiled_tool_schemas(tool_class: type[BaseTool]) -> CompiledToolSchemas:
+    """Return the cached schemas of a BaseTool class, building them on first use.
+
+    The returned dictionaries are shared; copy them before changing anything.
+    """
+    compiled = _COMPILED_SCHEMAS.get(tool_class)
+    if compiled is None or not compiled.is_current(tool_class):
+        compiled = CompiledToolSchemas(tool_class)
+        _COMPILED_SCHEMAS[tool_class] = compiled
+    return compiled
+
+
+def _build_openai_schema(tool_class: type[BaseTool], strict: bool) -> dict[str, Any]:
+    schema = tool_class.model_json_schema()
+    docstring = parse(tool_class.__doc__ or "")
+    parameters = {k: v for k, v in schema.items() if k not in ("title", "description")}
+    for param in docstring.params:
+        if (name := param.arg_name) in parameters["properties"] and (description := param.description):
+            if "description" not in parameters["properties"][name]:
+                parameters["properties"][name]["description"] = description
+
+    parameters["required"] = sorted(k for k, v in parameters["properties"].items() if "default" not in v)
+
+    if "description" not in schema:
+        if docstring.short_description:
+            schema["description"] = docstring.short_description
+        else:
+            class_name = tool_class.__name__ if hasattr(tool_class, "__name__") else "Tool"
+            schema["description"] = f"`{class_name}` tool"
+
+    schema = {
+        "name": schema["title"],
+        "description": schema["description"],
+        "parameters": parameters,
+    }
+
+    if strict:
+        schema["strict"] = True
+        schema["parameters"]["additionalProperties"] = False
+        # iterate through defs and set additionalProperties to false
+        if "$defs" in schema["parameters"]:
+            for def_ in schema["parameters"]["$defs"].values():
+                def_["additionalProperties"] = False
+
+    return schema
+
+
+def _build_params_json_schema(tool_class: type[BaseTool], strict: bool) -> dict[str, Any]:
+    params_json_schema = tool_class.model_json_schema()
+    if strict:
+        params_json_schema = ensure_strict_json_schema(params_json_schema)
+    params_json_schema = {k: v for k, v in params_json_schema.items() if k not in ("title", "description")}
+    params_json_schema["additionalProperties"] = False
+    return params_json_schema
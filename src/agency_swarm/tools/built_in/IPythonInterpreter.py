@@ -6,12 +6,14 @@ from __future__ import annotations
 import asyncio
 import os
 import weakref
+from collections.abc import Iterator
 from dataclasses import dataclass
 from typing import Any
 
 from pydantic import Field
 
 from agency_swarm.tools.base_tool import BaseTool
+from agency_swarm.utils.metrics import MetricFamily, register_builtin_collector
 
 # Import jupyter dependencies (will fail with clear error if not installed)
 try:
@@ -284,6 +286,12 @@ class AsyncKernelPool:
 
         # Register automatic cleanup when pool is garbage collected
         weakref.finalize(self, self._cleanup_sessions_sync, self._sessions)
+        _LIVE_KERNEL_POOLS.add(self)
+
+    def occupancy(self) -> tuple[int, int]:
+        """Return ``(sessions, sessions currently executing code)``."""
+        sessions = list(self._sessions.values())
+        return len(sessions), sum(1 for session in sessions if session._lock.locked())
 
     async def get_or_create(self, client_id: str) -> AsyncKernelSession:
         if client_id not in self._sessions:
@@ -347,6 +355,24 @@ class AsyncKernelPool:
             pass  # Silent failure in cleanup
 
 
+_LIVE_KERNEL_POOLS: weakref.WeakSet[AsyncKernelPool] = weakref.WeakSet()
+
+
+@register_builtin_collector
+def _collect_kernel_pool_metrics() -> Iterator[MetricFamily]:
+    sessions = busy = 0
+    for pool in list(_LIVE_KERNEL_POOLS):
+        pool_sessions, pool_busy = pool.occupancy()
+        sessions += pool_sessions
+        busy += pool_busy
+    yield MetricFamily("agency_swarm_kernel_sessions", "gauge", "IPython kernel sessions held by kernel pools.").add(
+        sessions
+    )
+    yield MetricFamily("agency_swarm_kernel_sessions_busy", "gauge", "IPython kernel sessions executing code.").add(
+        busy
+    )
+
+
 class IPythonInterpreter(BaseTool):  # type: ignore[metaclass, misc]
     """
     A persistent IPython-style interpreter tool with access to the internet and file system.
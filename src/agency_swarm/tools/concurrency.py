@@ -2,10 +2,14 @@
 Tool concurrency management for agents.
 
 This module provides the ToolConcurrencyManager class for managing one-call-at-a-time
-tool execution constraints within individual agent instances.
+tool execution constraints within individual agent instances, and the SingleFlightGroup
+class that coalesces identical concurrent tool invocations into a single execution.
 """
 
-from typing import NamedTuple
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from typing import Any, NamedTuple
 
 
 class LockState(NamedTuple):
@@ -61,3 +65,84 @@ class ToolConcurrencyManager:
         """Decrement the active tool count, ensuring it doesn't go below zero."""
         if self._active_count > 0:
             self._active_count -= 1
+
+
+class _Flight:
+    """An in-flight invocation shared by every caller with the same key."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task[Any]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlightGroup:
+    """
+    Coalesces identical concurrent invocations into one execution.
+
+    The first caller for a key starts the invocation in its own task; concurrent callers
+    with the same key await that task instead of issuing a second call. The shared task
+    is only cancelled when every waiter has gone away, so one cancelled caller never
+    cancels the result the other callers are still waiting on.
+    """
+
+    def __init__(self) -> None:
+        self._flights: dict[str, _Flight] = {}
+
+    @staticmethod
+    def make_key(name: str, input_json: str, scope: str | None = None) -> str:
+        """
+        Build a coalescing key from a tool name and its raw JSON arguments.
+
+        Arguments are normalized so that key order and whitespace do not matter.
+        Input that is not valid JSON falls back to the raw string. ``scope`` identifies
+        the run the call belongs to, so calls from different runs (and users) never share a result.
+        """
+        try:
+            normalized = json.dumps(json.loads(input_json) if input_json else {}, sort_keys=True)
+        except (TypeError, ValueError):
+            normalized = input_json
+        prefix = name if scope is None else f"{scope}/{name}"
+        return f"{prefix}:{normalized}"
+
+    def in_flight_count(self) -> int:
+        """Get the number of distinct invocations currently running."""
+        return len(self._flights)
+
+    async def run(self, key: str, invoke: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run ``invoke`` for ``key`` or join the invocation already in flight.
+
+        Args:
+            key: Identity of the invocation, usually built with ``make_key``
+            invoke: Zero-argument factory for the awaitable to run when no flight exists
+
+        Returns:
+            The result of the shared invocation
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            task: asyncio.Task[Any] = asyncio.ensure_future(invoke())
+            flight = _Flight(task)
+            self._flights[key] = flight
+            task.add_done_callback(lambda _task, _key=key, _flight=flight: self._forget(_key, _flight))
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            # Only the last remaining waiter may cancel the shared invocation.
+            if flight.waiters == 1 and not flight.task.done():
+                flight.task.cancel()
+                self._forget(key, flight)
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if flight.task.done() and not flight.task.cancelled():
+            # Mark the exception as retrieved so abandoned flights do not log "never retrieved".
+            flight.task.exception()
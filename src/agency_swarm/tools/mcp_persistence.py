@@ -4,6 +4,8 @@ import asyncio
 import inspect
 import logging
 import threading
+import weakref
+from collections.abc import Iterator
 from concurrent.futures import Future
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, cast
@@ -18,6 +20,7 @@ from agency_swarm.tools.mcp_oauth_bridge import (
     _set_oauth_user_id,
     apply_managed_oauth_cache_dir,
 )
+from agency_swarm.utils.metrics import MetricFamily, register_builtin_collector
 
 if TYPE_CHECKING:
     from agency_swarm.mcp.oauth import MCPServerOAuth
@@ -27,6 +30,22 @@ logger = logging.getLogger(__name__)
 _OAUTH_LIST_TOOLS_TIMEOUT_SECONDS = 620.0
 _OAUTH_LIST_TOOLS_TIMEOUT_GRACE_SECONDS = 20.0
 
+_LIVE_MANAGERS: "weakref.WeakSet[PersistentMCPServerManager]" = weakref.WeakSet()
+
+
+@register_builtin_collector
+def _collect_mcp_metrics() -> Iterator[MetricFamily]:
+    backlog = MetricFamily(
+        "agency_swarm_mcp_driver_queue_depth", "gauge", "Calls waiting for a persistent MCP server driver."
+    )
+    drivers = 0
+    for manager in list(_LIVE_MANAGERS):
+        drivers += len(manager._drivers)
+        for server, depth in manager.driver_backlog().items():
+            backlog.add(depth, server=server)
+    yield MetricFamily("agency_swarm_mcp_drivers", "gauge", "Persistent MCP server drivers.").add(drivers)
+    yield backlog
+
 
 class PersistentMCPServerManager:
     """Process-level registry for MCP servers with persistent connections.
@@ -56,6 +75,15 @@ class PersistentMCPServerManager:
         }
         # Server -> driver mapping (driver runs on background loop in a single task)
         self._drivers: dict[Any, dict[str, Any]] = {}
+        _LIVE_MANAGERS.add(self)
+
+    def driver_backlog(self) -> dict[str, int]:
+        """Commands waiting in each server driver's queue, keyed by server name."""
+        backlog: dict[str, int] = {}
+        for real_server, driver in list(self._drivers.items()):
+            name = str(getattr(real_server, "name", "<unnamed>"))
+            backlog[name] = backlog.get(name, 0) + driver["queue"].qsize()
+        return backlog
 
     def _resolve_method_timeout(self, server: Any, method_name: str) -> float:
         """Resolve timeout for a method call, extending OAuth discovery waits only when needed."""
@@ -4,12 +4,15 @@ Defines the SendMessage and Handoff tools for agent communication and delegation
 This module provides the `SendMessage` class, a specialized `FunctionTool` that
 allows one agent to send a message to another registered agent within the
 Agency Swarm framework. The tool is dynamically configured with sender and
-recipient details.
+recipient details. `BroadcastSendMessage` fans one call out to several
+recipients concurrently and gathers their responses.
 """
 
 import asyncio
 import json
 import logging
+import time
+from contextlib import nullcontext
 from typing import TYPE_CHECKING, Any, Literal, cast, get_type_hints
 
 from agents import (
@@ -26,7 +29,9 @@ from pydantic import BaseModel, ValidationError
 from ..context import MasterContext
 from ..messages import MessageFormatter
 from ..streaming.utils import add_agent_name_to_event
+from ..utils.cost_ledger import get_cost_ledger
 from ..utils.model_utils import get_usage_tracking_model_name
+from ..utils.run_budget import BudgetExceededError
 
 if TYPE_CHECKING:
     from ..agent.context_types import AgentRuntimeState
@@ -89,34 +94,7 @@ class SendMessage(FunctionTool):
         recipient_enum = [agent.name for agent in recipient_names] if recipient_names else []
 
         # Rich parameter schema incorporating all field descriptions
-        params_schema: dict[str, Any] = {
-            "type": "object",
-            "properties": {
-                "recipient_agent": {
-                    "type": "string",
-                    "enum": recipient_enum,
-                    "description": "The name of the agent to send the message to.",
-                },
-                "message": {
-                    "type": "string",
-                    "description": (
-                        "Specify the task required for the recipient agent to complete. Focus on clarifying "
-                        "what the task entails, rather than providing exact instructions. Make sure to include "
-                        "all the relevant information from the conversation needed to complete the task."
-                    ),
-                },
-                "additional_instructions": {
-                    "type": "string",
-                    "description": (
-                        "Optional. Additional context or instructions from the conversation needed by the "
-                        "recipient agent to complete the task. If not needed, provide an empty string."
-                    ),
-                },
-            },
-            # OpenAI API requires all properties in 'required' array, even optional ones
-            "required": ["recipient_agent", "message", "additional_instructions"],
-            "additionalProperties": False,
-        }
+        params_schema = self._build_params_schema(recipient_enum)
 
         # Discover extra params model from subclass.
         # Three supported patterns (in priority order):
@@ -182,6 +160,42 @@ class SendMessage(FunctionTool):
             f"Initialized SendMessage tool for sender '{sender_agent.name}' with {len(self.recipients)} recipient(s)"
         )
 
+    def _build_params_schema(self, recipient_enum: list[str]) -> dict[str, Any]:
+        """Build the base parameter schema before extra params are merged in."""
+        params_schema: dict[str, Any] = {
+            "type": "object",
+            "properties": {
+                "recipient_agent": {
+                    "type": "string",
+                    "enum": recipient_enum,
+                    "description": "The name of the agent to send the message to.",
+                },
+                "message": {
+                    "type": "string",
+                    "description": (
+                        "Specify the task required for the recipient agent to complete. Focus on clarifying "
+                        "what the task entails, rather than providing exact instructions. Make sure to include "
+                        "all the relevant information from the conversation needed to complete the task."
+                    ),
+                },
+                "additional_instructions": {
+                    "type": "string",
+                    "description": (
+                        "Optional. Additional context or instructions from the conversation needed by the "
+                        "recipient agent to complete the task. If not needed, provide an empty string."
+                    ),
+                },
+            },
+            # OpenAI API requires all properties in 'required' array, even optional ones
+            "required": ["recipient_agent", "message", "additional_instructions"],
+            "additionalProperties": False,
+        }
+        return params_schema
+
+    def _recipient_schema(self) -> dict[str, Any]:
+        """Return the schema node that holds the recipient agent enum."""
+        return self.params_json_schema["properties"]["recipient_agent"]
+
     def add_recipient(self, recipient_agent: "Agent") -> None:
         """
         Adds a new recipient agent to the tool and updates the schema.
@@ -207,7 +221,7 @@ class SendMessage(FunctionTool):
         recipient_enum = [agent.name for agent in recipient_names] if recipient_names else []
 
         # Update the params schema
-        self.params_json_schema["properties"]["recipient_agent"]["enum"] = recipient_enum
+        self._recipient_schema()["enum"] = recipient_enum
 
         # Update description with all recipient roles
         description_parts = [self.__doc__ or "Send a message to another agent."]
@@ -266,12 +280,17 @@ class SendMessage(FunctionTool):
         return _create_model(f"{cls.__name__}Params", __module__=cls.__module__, **extra_field_defs)
 
     def _create_recipient_agency_context(
-        self, wrapper: ToolContext[MasterContext] | RunContextWrapper[MasterContext]
+        self,
+        wrapper: ToolContext[MasterContext] | RunContextWrapper[MasterContext],
+        recipient_agent: "Agent | None" = None,
     ) -> "AgencyContext":
         """Create agency context for the recipient agent."""
         # Avoid circular import
         from ..agent.core import AgencyContext
 
+        if recipient_agent is None:
+            recipient_agent = self.recipient_agent
+
         # Get shared instructions from the current context
         shared_instructions_from_context = wrapper.context.shared_instructions
 
@@ -290,7 +309,7 @@ class SendMessage(FunctionTool):
 
         # Retrieve the runtime state for the recipient, falling back to a local runtime state if needed
         runtime_state = None
-        target_agent_name = self.recipient_agent.name
+        target_agent_name = recipient_agent.name
         if target_agent_name:
             runtime_state = wrapper.context.agent_runtime_state.get(target_agent_name)
 
@@ -309,8 +328,59 @@ class SendMessage(FunctionTool):
             load_threads_callback=None,
             save_threads_callback=None,
             shared_instructions=shared_instructions_from_context,
+            run_timings=getattr(wrapper.context, "run_timings", None),
+            cost_ledger=getattr(wrapper.context, "cost_ledger", None),
+            record_timings=getattr(wrapper.context, "record_timings", None),
         )
 
+    def _resolve_tool_call_id(
+        self, wrapper: ToolContext[MasterContext] | RunContextWrapper[MasterContext]
+    ) -> str | None:
+        """Extract the tool_call_id used as the sub-agent's parent_run_id."""
+        # Extract tool_call_id via type narrowing: the agents SDK passes a ToolContext
+        if isinstance(wrapper, ToolContext):
+            return wrapper.tool_call_id
+        logger.warning(f"Expected ToolContext, got {type(wrapper).__name__}; falling back to _current_agent_run_id")
+        return wrapper.context._current_agent_run_id if wrapper.context else None
+
+    def _validate_extra_params(self, kwargs: dict[str, Any]) -> str | None:
+        """Validate extra params against the subclass model. Returns an error message on failure."""
+        model_cls = getattr(self, "_extra_params_model", None)
+        if model_cls is None:
+            return None
+        try:
+            # Only pass fields known to the model
+            model_fields = set(model_cls.model_fields.keys())
+            model_input = {k: v for k, v in kwargs.items() if k in model_fields}
+            # Instantiate to trigger validation; we don't use the instance further here
+            model_cls(**model_input)
+        except ValidationError as e:
+            logger.error(f"Invalid extra SendMessage parameters: {e}")
+            return f"Error: Invalid extra parameters for tool {self.name}. Details: {e}"
+        return None
+
+    def _unknown_recipient_error(self, recipient_agent_name: str) -> str:
+        logger.error(f"Tool '{self.name}' invoked with unknown recipient: '{recipient_agent_name}'")
+        available = list(self.recipients.values())
+        available_names = [a.name for a in available] if available else []
+        return (
+            f"Error: Unknown recipient agent '{recipient_agent_name}'. Available agents: {', '.join(available_names)}"
+        )
+
+    @staticmethod
+    def _thread_key(wrapper: ToolContext[MasterContext] | RunContextWrapper[MasterContext]) -> int | None:
+        thread_manager = wrapper.context.thread_manager if wrapper.context else None
+        return id(thread_manager) if thread_manager is not None else None
+
+    async def _release_pending(self, thread_key: int | None, recipient_keys: list[str]) -> None:
+        """Remove recipients from the pending set for this thread (thread-safe)."""
+        async with self._pending_lock:
+            cleanup_set = self._pending_per_thread.get(thread_key)
+            if cleanup_set is not None:
+                cleanup_set.difference_update(recipient_keys)
+                if not cleanup_set:
+                    self._pending_per_thread.pop(thread_key, None)
+
     async def on_invoke_tool(
         self,
         wrapper: ToolContext[MasterContext] | RunContextWrapper[MasterContext],
@@ -324,12 +394,7 @@ class SendMessage(FunctionTool):
         When the original request was made with get_response_stream, this will use
         get_response_stream for the sub-agent call to maintain streaming consistency.
         """
-        # Extract tool_call_id via type narrowing: the agents SDK passes a ToolContext
-        if isinstance(wrapper, ToolContext):
-            tool_call_id: str | None = wrapper.tool_call_id
-        else:
-            logger.warning(f"Expected ToolContext, got {type(wrapper).__name__}; falling back to _current_agent_run_id")
-            tool_call_id = wrapper.context._current_agent_run_id if wrapper.context else None
+        tool_call_id = self._resolve_tool_call_id(wrapper)
 
         try:
             kwargs = json.loads(arguments_json_string)
@@ -342,17 +407,9 @@ class SendMessage(FunctionTool):
         additional_instructions = kwargs.get("additional_instructions", "")
 
         # Validate extra params, if a Pydantic model was provided by subclass
-        model_cls = getattr(self, "_extra_params_model", None)
-        if model_cls is not None:
-            try:
-                # Only pass fields known to the model
-                model_fields = set(model_cls.model_fields.keys())
-                model_input = {k: v for k, v in kwargs.items() if k in model_fields}
-                # Instantiate to trigger validation; we don't use the instance further here
-                model_cls(**model_input)
-            except ValidationError as e:
-                logger.error(f"Invalid extra SendMessage parameters: {e}")
-                return f"Error: Invalid extra parameters for tool {self.name}. Details: {e}"
+        extra_params_error = self._validate_extra_params(kwargs)
+        if extra_params_error:
+            return extra_params_error
 
         if not recipient_agent_name:
             logger.error(f"Tool '{self.name}' invoked without 'recipient_agent' parameter.")
@@ -363,18 +420,9 @@ class SendMessage(FunctionTool):
         # Case-insensitive lookup for recipient agent
         recipient_key = recipient_agent_name.lower()
         if recipient_key not in self.recipients:
-            logger.error(f"Tool '{self.name}' invoked with unknown recipient: '{recipient_agent_name}'")
-            available = list(self.recipients.values())
-            available_names = [a.name for a in available] if available else []
-            return (
-                f"Error: Unknown recipient agent '{recipient_agent_name}'. "
-                f"Available agents: {', '.join(available_names)}"
-            )
+            return self._unknown_recipient_error(recipient_agent_name)
 
-        thread_manager = wrapper.context.thread_manager if wrapper.context else None
-        thread_key: int | None = None
-        if thread_manager is not None:
-            thread_key = id(thread_manager)
+        thread_key = self._thread_key(wrapper)
 
         # Thread-safe check and add for pending recipients within the same thread manager context
         async with self._pending_lock:
@@ -393,8 +441,46 @@ class SendMessage(FunctionTool):
             pending_set.add(recipient_key)
 
         self.recipient_agent = self.recipients[recipient_key]
+        try:
+            return await self._send_to_recipient(
+                wrapper,
+                self.recipient_agent,
+                message_content,
+                additional_instructions,
+                tool_call_id,
+            )
+        finally:
+            # Always remove the recipient from pending set when done (thread-safe)
+            await self._release_pending(thread_key, [recipient_key])
+
+    async def _send_to_recipient(
+        self,
+        wrapper: ToolContext[MasterContext] | RunContextWrapper[MasterContext],
+        recipient_agent: "Agent",
+        message_content: str,
+        additional_instructions: str,
+        tool_call_id: str | None,
+    ) -> str:
+        """Run one sub-agent call and return its final text, or an error message for the caller.
+
+        The call is registered with the run's cost ledger, which cancels it when another call exhausts the budget.
+        """
+        ledger = get_cost_ledger(wrapper)
+        with ledger.track_sub_agent_call() if ledger is not None else nullcontext():
+            return await self._run_recipient_call(
+                wrapper, recipient_agent, message_content, additional_instructions, tool_call_id
+            )
+
+    async def _run_recipient_call(
+        self,
+        wrapper: ToolContext[MasterContext] | RunContextWrapper[MasterContext],
+        recipient_agent: "Agent",
+        message_content: str,
+        additional_instructions: str,
+        tool_call_id: str | None,
+    ) -> str:
         sender_name_for_call = self.sender_agent.name
-        recipient_name_for_call = self.recipient_agent.name
+        recipient_name_for_call = recipient_agent.name
 
         logger.info(
             f"Agent '{sender_name_for_call}' invoking tool '{self.name}'. "
@@ -417,9 +503,9 @@ class SendMessage(FunctionTool):
                 tool_calls_seen = []
 
                 # Create agency context for the recipient agent
-                recipient_agency_context = self._create_recipient_agency_context(wrapper)
+                recipient_agency_context = self._create_recipient_agency_context(wrapper, recipient_agent)
 
-                stream = self.recipient_agent.get_response_stream(
+                stream = recipient_agent.get_response_stream(
                     message=message_content,
                     sender_name=self.sender_agent.name,
                     additional_instructions=additional_instructions or None,
@@ -431,14 +517,15 @@ class SendMessage(FunctionTool):
                     # Non-destructively add agent/caller and attach IDs
                     event = add_agent_name_to_event(
                         event,
-                        self.recipient_agent.name,
+                        recipient_agent.name,
                         self.sender_agent.name,
                         agent_run_id=None,
                         parent_run_id=tool_call_id,
                     )
 
-                    # Forward event to streaming context if available
-                    if streaming_context:
+                    # Forward event to streaming context if available. A budget stop is reported once, by the
+                    # top-level stream, after it is re-raised below.
+                    if streaming_context and not _is_budget_error_event(event):
                         try:
                             await streaming_context.put_event(event)
                         except Exception as e:
@@ -472,6 +559,11 @@ class SendMessage(FunctionTool):
                             f"Error getting response from the agent: {event.get('content', 'Unknown error')}"
                         )
 
+                # The sub-agent's stream reports errors as events; a budget stop must end the caller's run too
+                budget_error = getattr(getattr(wrapper.context, "cost_ledger", None), "budget_error", None)
+                if budget_error is not None:
+                    raise budget_error
+
                 # Get final result from stream after it completes.
                 final_result = stream.final_result
 
@@ -480,16 +572,7 @@ class SendMessage(FunctionTool):
 
                 # Merge sub-agent raw_responses into parent's raw_responses for per-response cost calculation
                 if final_result and wrapper and wrapper.context:
-                    try:
-                        sub_raw_responses = final_result.raw_responses
-                        if sub_raw_responses:
-                            # Get sub-agent's model name for accurate per-response pricing
-                            sub_agent_model_name = get_usage_tracking_model_name(self.recipient_agent.model)
-                            # Store tuples of (model_name, response) for per-model cost calculation
-                            for resp in sub_raw_responses:
-                                wrapper.context._sub_agent_raw_responses.append((sub_agent_model_name, resp))
-                    except Exception as e:
-                        logger.debug(f"Could not store sub-agent raw_responses: {e}")
+                    self._store_sub_agent_raw_responses(wrapper, recipient_agent, final_result.raw_responses)
 
                 logger.info(
                     f"Received response via tool '{self.name}' from '{recipient_name_for_call}': "
@@ -500,9 +583,9 @@ class SendMessage(FunctionTool):
                 logger.debug(f"Calling target agent '{recipient_name_for_call}'.get_response...")
 
                 # Create agency context for the recipient agent
-                recipient_agency_context = self._create_recipient_agency_context(wrapper)
+                recipient_agency_context = self._create_recipient_agency_context(wrapper, recipient_agent)
 
-                response = await self.recipient_agent.get_response(
+                response = await recipient_agent.get_response(
                     message=message_content,
                     sender_name=self.sender_agent.name,
                     additional_instructions=additional_instructions or None,
@@ -512,16 +595,7 @@ class SendMessage(FunctionTool):
 
                 # Merge sub-agent raw_responses into parent's raw_responses for per-response cost calculation
                 if response and wrapper and wrapper.context:
-                    try:
-                        sub_raw_responses = response.raw_responses
-                        if sub_raw_responses:
-                            # Get sub-agent's model name for accurate per-response pricing
-                            sub_agent_model_name = get_usage_tracking_model_name(self.recipient_agent.model)
-                            # Store tuples of (model_name, response) for per-model cost calculation
-                            for resp in sub_raw_responses:
-                                wrapper.context._sub_agent_raw_responses.append((sub_agent_model_name, resp))
-                    except Exception as e:
-                        logger.debug(f"Could not store sub-agent raw_responses: {e}")
+                    self._store_sub_agent_raw_responses(wrapper, recipient_agent, response.raw_responses)
 
             current_final_output = response.final_output
             if current_final_output is None:
@@ -545,11 +619,14 @@ class SendMessage(FunctionTool):
                 f"Input guardrail triggered during sub-call via tool '{self.name}' from "
                 f"'{sender_name_for_call}' to '{recipient_name_for_call}': {message}"
             )
-            if self.recipient_agent.raise_input_guardrail_error:
+            if recipient_agent.raise_input_guardrail_error:
                 return f"Error getting response from the agent: {message}"
             else:
                 return message
 
+        except BudgetExceededError:
+            raise
+
         except Exception as e:
             logger.error(
                 f"Error occurred during sub-call via tool '{self.name}' "
@@ -557,14 +634,162 @@ class SendMessage(FunctionTool):
                 exc_info=True,
             )
             return f"Error: Failed to get response from agent '{recipient_name_for_call}'. Reason: {e}"
+
+    @staticmethod
+    def _store_sub_agent_raw_responses(
+        wrapper: ToolContext[MasterContext] | RunContextWrapper[MasterContext],
+        recipient_agent: "Agent",
+        sub_raw_responses: Any,
+    ) -> None:
+        try:
+            if sub_raw_responses:
+                # Get sub-agent's model name for accurate per-response pricing
+                sub_agent_model_name = get_usage_tracking_model_name(recipient_agent.model)
+                # Store tuples of (model_name, response) for per-model cost calculation
+                for resp in sub_raw_responses:
+                    wrapper.context._sub_agent_raw_responses.append((sub_agent_model_name, resp))
+        except Exception as e:
+            logger.debug(f"Could not store sub-agent raw_responses: {e}")
+
+
+def _is_budget_error_event(event: Any) -> bool:
+    return isinstance(event, dict) and event.get("error_type") == "budget_exceeded"
+
+
+class BroadcastSendMessage(SendMessage):
+    """
+    Use this tool to send messages to several specialized agents at once and wait for all of their responses.
+
+    Each entry in `messages` targets one recipient agent. The messages are processed concurrently, and you receive
+    every recipient's response together once all of them have finished. Use this tool when the tasks are independent
+    of each other; use separate sequential messages when one recipient needs another recipient's answer.
+
+    You are responsible for relaying the recipient agents' responses back to the user, as the user does not have
+    direct access to these replies. Include each recipient agent at most once per call.
+    """
+
+    tool_name = "send_message_broadcast"
+    # Maximum number of sub-agent calls that run at the same time within one broadcast.
+    max_concurrency: int = 4
+
+    def _build_params_schema(self, recipient_enum: list[str]) -> dict[str, Any]:
+        message_schema = super()._build_params_schema(recipient_enum)
+        return {
+            "type": "object",
+            "properties": {
+                "messages": {
+                    "type": "array",
+                    "description": "The messages to send, one entry per recipient agent.",
+                    "items": message_schema,
+                },
+            },
+            "required": ["messages"],
+            "additionalProperties": False,
+        }
+
+    def _recipient_schema(self) -> dict[str, Any]:
+        return self.params_json_schema["properties"]["messages"]["items"]["properties"]["recipient_agent"]
+
+    async def on_invoke_tool(
+        self,
+        wrapper: ToolContext[MasterContext] | RunContextWrapper[MasterContext],
+        arguments_json_string: str,
+    ) -> str:
+        """
+        Sends every message concurrently (bounded by `max_concurrency`) and returns the responses as
+        a JSON list of `{"recipient_agent": ..., "response": ...}` objects, in request order.
+
+        In streaming mode all sub-agent events are forwarded through the shared streaming context,
+        tagged with their recipient agent name.
+        """
+        tool_call_id = self._resolve_tool_call_id(wrapper)
+
+        try:
+            kwargs = json.loads(arguments_json_string)
+        except json.JSONDecodeError as e:
+            logger.error(f"Tool '{self.name}' invoked with invalid JSON arguments: {arguments_json_string}. Error: {e}")
+            return f"Error: Invalid arguments format for tool {self.name}. Expected a valid JSON string."
+
+        extra_params_error = self._validate_extra_params(kwargs)
+        if extra_params_error:
+            return extra_params_error
+
+        entries = kwargs.get("messages")
+        if not isinstance(entries, list) or not entries:
+            logger.error(f"Tool '{self.name}' invoked without 'messages' parameter.")
+            return f"Error: Missing required parameter 'messages' for tool {self.name}."
+
+        requests: list[tuple[str, str, str]] = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                return f"Error: Each entry in 'messages' for tool {self.name} must be an object."
+            recipient_agent_name = entry.get("recipient_agent")
+            message_content = entry.get("message")
+            if not recipient_agent_name:
+                return f"Error: Missing required parameter 'recipient_agent' for tool {self.name}."
+            if not message_content:
+                return f"Error: Missing required parameter 'message' for tool {self.name}."
+            recipient_key = recipient_agent_name.lower()
+            if recipient_key not in self.recipients:
+                return self._unknown_recipient_error(recipient_agent_name)
+            if any(key == recipient_key for key, _, _ in requests):
+                return (
+                    f"Error: Recipient agent '{recipient_agent_name}' appears more than once. "
+                    "Combine the tasks for the same agent into a single message."
+                )
+            requests.append((recipient_key, message_content, entry.get("additional_instructions", "")))
+
+        recipient_keys = [key for key, _, _ in requests]
+        thread_key = self._thread_key(wrapper)
+
+        # Reserve every recipient in one pass so the whole broadcast is accepted or rejected together
+        async with self._pending_lock:
+            pending_set = self._pending_per_thread.setdefault(thread_key, set())
+            busy = [self.recipients[key].name for key in recipient_keys if key in pending_set]
+            if busy:
+                logger.warning(f"Attempted to broadcast to {busy} while previous messages are still pending")
+                return (
+                    f"Error: Cannot send another message to {', '.join(repr(name) for name in busy)} "
+                    f"while the previous message is still being processed. "
+                    f"Please wait for the agent to respond before sending another message."
+                )
+            pending_set.update(recipient_keys)
+
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        run_timings = getattr(wrapper.context, "run_timings", None)
+        caller_run_id = getattr(wrapper.context, "_current_agent_run_id", None)
+
+        async def _send(recipient_key: str, message_content: str, additional_instructions: str) -> str:
+            wait_started = time.perf_counter()
+            async with semaphore:
+                if run_timings is not None:
+                    run_timings.add_duration("queueing", time.perf_counter() - wait_started, agent_run_id=caller_run_id)
+                return await self._send_to_recipient(
+                    wrapper,
+                    self.recipients[recipient_key],
+                    message_content,
+                    additional_instructions,
+                    tool_call_id,
+                )
+
+        try:
+            # A failing recipient cancels its siblings, and every run has finished before the reservations go
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(_send(*request)) for request in requests]
+        except BaseExceptionGroup as errors:
+            # Re-raise the recipient's own error so callers can still catch e.g. BudgetExceededError
+            raise errors.exceptions[0] from None
         finally:
-            # Always remove the recipient from pending set when done (thread-safe)
-            async with self._pending_lock:
-                cleanup_set = self._pending_per_thread.get(thread_key)
-                if cleanup_set is not None:
-                    cleanup_set.discard(recipient_key)
-                    if not cleanup_set:
-                        self._pending_per_thread.pop(thread_key, None)
+            await self._release_pending(thread_key, recipient_keys)
+        responses = [task.result() for task in tasks]
+
+        return json.dumps(
+            [
+                {"recipient_agent": self.recipients[key].name, "response": response}
+                for key, response in zip(recipient_keys, responses, strict=True)
+            ],
+            ensure_ascii=False,
+        )
 
 
 class Handoff:
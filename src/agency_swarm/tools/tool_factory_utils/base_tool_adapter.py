@@ -1,19 +1,19 @@
 from __future__ import annotations
 
 import asyncio
+import copy
 import inspect
 import json
 import logging
-from typing import cast
+from typing import Any, cast
 
 from agents import FunctionTool
 from agents.exceptions import ModelBehaviorError
-from agents.strict_schema import ensure_strict_json_schema
 from agents.tool import default_tool_error_function
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 from pydantic_core import InitErrorDetails
 
-from agency_swarm.tools.base_tool import BaseTool
+from agency_swarm.tools.base_tool import TOOL_RUN_CONTEXT_KEY, BaseTool, compiled_tool_schemas
 
 logger = logging.getLogger(__name__)
 
@@ -29,24 +29,19 @@ def adapt_base_tool(base_tool: type[BaseTool]) -> FunctionTool:
     if description == "":
         logger.warning("Warning: Tool %s has no docstring.", name)
 
-    params_json_schema = base_tool.model_json_schema()
-    if getattr(base_tool.ToolConfig, "strict", False):
-        params_json_schema = ensure_strict_json_schema(params_json_schema)
-    params_json_schema = {k: v for k, v in params_json_schema.items() if k not in ("title", "description")}
-    params_json_schema["additionalProperties"] = False
+    # Built once per class; each FunctionTool gets its own copy
+    params_json_schema = copy.deepcopy(compiled_tool_schemas(base_tool).params_json_schema)
 
     async def on_invoke_tool(ctx, input_json: str):
         try:
-            args = json.loads(input_json) if input_json else {}
-        except Exception as e:  # pragma: no cover - defensive guard
-            return f"Error: Invalid JSON input: {e}"
-        try:
-            tool_instance = base_tool(**args)
+            tool_instance = _parse_tool_arguments(base_tool, input_json, ctx)
             if ctx is not None:
                 tool_instance._context = ctx
             if inspect.iscoroutinefunction(tool_instance.run):
                 return await tool_instance.run()
             return await asyncio.to_thread(tool_instance.run)
+        except _InvalidToolJSON as e:
+            return f"Error: Invalid JSON input: {e}"
         except ValidationError as e:
             formatted_msg = _format_value_error(e)
             if formatted_msg is not None:
@@ -69,9 +64,38 @@ def adapt_base_tool(base_tool: type[BaseTool]) -> FunctionTool:
     )
     if hasattr(base_tool.ToolConfig, "one_call_at_a_time"):
         func_tool.one_call_at_a_time = bool(base_tool.ToolConfig.one_call_at_a_time)  # type: ignore[attr-defined]
+    if getattr(base_tool.ToolConfig, "deduplicate_concurrent_calls", False):
+        func_tool.deduplicate_concurrent_calls = True  # type: ignore[attr-defined]
     return func_tool
 
 
+class _InvalidToolJSON(ValueError):
+    pass
+
+
+def _parse_tool_arguments(base_tool: type[BaseTool], input_json: str, ctx: Any) -> BaseTool:
+    """Build the tool instance from the model's JSON arguments.
+
+    Pydantic parses the JSON while validating it, so the arguments are not decoded into a dict first, and the
+    run context is handed over during validation. Inputs that are not a JSON object take the original
+    ``json.loads`` path to keep its error messages. Tools that define their own ``__init__`` also take that path,
+    because ``model_validate_json`` would skip it.
+    """
+    if not input_json:
+        return base_tool()
+    if base_tool.__init__ is BaseModel.__init__ and input_json.lstrip().startswith("{"):
+        try:
+            return base_tool.model_validate_json(input_json, context={TOOL_RUN_CONTEXT_KEY: ctx})
+        except ValidationError as e:
+            if not any(err.get("type") == "json_invalid" for err in e.errors()):
+                raise
+    try:
+        args = json.loads(input_json)
+    except ValueError as e:
+        raise _InvalidToolJSON(str(e)) from e
+    return base_tool(**args)
+
+
 def _format_value_error(validation_error: ValidationError) -> str | None:
     """
     Extract a user-facing message when every failure comes from value validators.
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import copy
 import importlib.util
 import inspect
 import logging
 import sys
+import threading
 import uuid
 from pathlib import Path
 from types import ModuleType
+from typing import NamedTuple
 
 from agents import FunctionTool
 
@@ -17,8 +20,51 @@ logger = logging.getLogger(__name__)
 
 
 def from_file(file_path: str | Path) -> list[type[BaseTool] | FunctionTool]:
-    """Dynamically imports BaseTool classes or FunctionTool instances from the provided module path."""
+    """Dynamically imports BaseTool classes or FunctionTool instances from the provided module path.
+
+    Each file is executed once per process and re-executed only when its modification time or size changes.
+    BaseTool classes are shared between callers; every call gets its own copy of each FunctionTool, because
+    agents attach per-agent guards to the tools they add.
+    """
     file = Path(file_path)
+    try:
+        resolved = file.resolve()
+        stat = resolved.stat()
+    except OSError as e:
+        logger.error("Error importing tool module %s: %s", file, e)
+        return []
+
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _module_cache_lock:
+        cached = _module_cache.get(resolved)
+        if cached is None or cached.signature != signature:
+            tools = _import_tools(file)
+            if tools is None:
+                _module_cache.pop(resolved, None)
+                return []
+            cached = _CachedToolModule(signature, tuple(tools))
+            _module_cache[resolved] = cached
+
+    return [copy.copy(tool) if isinstance(tool, FunctionTool) else tool for tool in cached.tools]
+
+
+class _CachedToolModule(NamedTuple):
+    signature: tuple[int, int]
+    tools: tuple[type[BaseTool] | FunctionTool, ...]
+
+
+_module_cache: dict[Path, _CachedToolModule] = {}
+_module_cache_lock = threading.RLock()
+
+
+def clear_tool_module_cache() -> None:
+    """Forget imported tool modules so the next load executes every file again."""
+    with _module_cache_lock:
+        _module_cache.clear()
+
+
+def _import_tools(file: Path) -> list[type[BaseTool] | FunctionTool] | None:
+    """Execute a tool module and collect its tools, or return None when the import fails."""
     tools: list[type[BaseTool] | FunctionTool] = []
 
     module_name = file.stem
@@ -43,7 +89,7 @@ def from_file(file_path: str | Path) -> list[type[BaseTool] | FunctionTool]:
         logger.error("Error importing tool module %s: %s", file, e)
 
     if not module:
-        return tools
+        return None
 
     base_tool = getattr(module, module_name, None)
     if inspect.isclass(base_tool) and issubclass(base_tool, BaseTool) and base_tool is not BaseTool:
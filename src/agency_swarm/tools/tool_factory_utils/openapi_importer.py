@@ -5,7 +5,6 @@ import logging
 from typing import Any
 
 import httpx
-import jsonref
 from agents import FunctionTool
 from agents.exceptions import ModelBehaviorError
 from agents.run_context import RunContextWrapper
@@ -53,6 +52,8 @@ def from_openapi_schema(
     """
     Converts an OpenAPI spec describing a single endpoint into FunctionTool instances.
     """
+    import jsonref  # Imported here to keep it off the package import path
+
     if isinstance(schema, dict):
         openapi = jsonref.JsonRef.replace_refs(schema)
     else:
@@ -13,13 +13,9 @@ from typing import Any, Literal, Optional, Union
 from urllib.parse import urlparse
 
 import httpx
-import jsonref
 from agents import FunctionTool, ToolOutputFileContent, ToolOutputImage
 from agents.run_context import RunContextWrapper
 from agents.strict_schema import ensure_strict_json_schema
-from datamodel_code_generator import DataModelType, PythonVersion
-from datamodel_code_generator.model import get_data_model_types
-from datamodel_code_generator.parser.jsonschema import JsonSchemaParser
 
 logger = logging.getLogger(__name__)
 
@@ -309,6 +305,7 @@ def from_openapi_schema(
     Returns:
         list[FunctionTool]: List of FunctionTool instances generated from the OpenAPI endpoint.
     """
+    import jsonref  # Imported here to keep it off the package import path
 
     if isinstance(schema, dict):
         openapi = jsonref.JsonRef.replace_refs(schema)
@@ -422,6 +419,11 @@ def validate_openapi_spec(spec: str):
 
 
 def generate_model_from_schema(schema: dict, class_name: str, strict: bool) -> type:
+    # Code generation is only needed for OpenAPI tools, so keep it off the package import path
+    from datamodel_code_generator import DataModelType, PythonVersion
+    from datamodel_code_generator.model import get_data_model_types
+    from datamodel_code_generator.parser.jsonschema import JsonSchemaParser
+
     data_model_types = get_data_model_types(
         DataModelType.PydanticV2BaseModel,
         target_python_version=PythonVersion.PY_310,
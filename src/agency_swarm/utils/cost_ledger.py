@@ -0,0 +1,189 @@
+"""Live token and cost totals for one top-level run.
+
+The outermost `get_response` / `get_response_stream` call creates a `CostLedger` and hands it to every
+sub-agent run through `AgencyContext.cost_ledger` and `MasterContext.cost_ledger`, the same way
+`RunTimings` is shared. Each model response is priced as soon as it completes, so the totals are current
+while the run is still streaming and no pass over the finished result is needed. A `RunBudget` given to the
+top-level call is enforced against these totals before every model call. `CostLedgerHooks` does both and is
+attached to every run, whether or not it records timings. The first budget stop also cancels the run's other
+sub-agent calls that are still in flight, such as the rest of a `BroadcastSendMessage` fan-out, so they do
+not keep spending until their own next model call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from agents import Agent, RunContextWrapper, RunHooks
+from agents.items import ModelResponse
+from agents.usage import Usage
+
+from agency_swarm.utils.metrics import get_metrics_registry
+from agency_swarm.utils.model_utils import get_usage_tracking_model_name
+from agency_swarm.utils.run_budget import BudgetExceededError, RunBudget
+from agency_swarm.utils.usage_tracking import (
+    UsageStats,
+    _calculate_usage_cost,
+    _usage_stats_from_sdk,
+    observe_prompt_cache_usage,
+)
+
+logger = logging.getLogger(__name__)
+
+# Sub-agent calls enclosing the current code, outermost first. Tasks created inside a call inherit it.
+_enclosing_sub_agent_calls: ContextVar[tuple[asyncio.Task[Any], ...]] = ContextVar(
+    "agency_swarm_enclosing_sub_agent_calls", default=()
+)
+
+
+class CostLedger:
+    """Running usage and cost of one top-level run, per agent and in total."""
+
+    def __init__(self, budget: RunBudget | None = None) -> None:
+        self.by_agent: dict[str, UsageStats] = {}
+        self.total = UsageStats()
+        self.budget = budget
+        # First stop raised for this run, kept so callers of a failed sub-agent can re-raise it
+        self.budget_error: BudgetExceededError | None = None
+        # Tasks running a sub-agent call, mapped to the sub-agent calls enclosing them
+        self._sub_agent_calls: dict[asyncio.Task[Any], tuple[asyncio.Task[Any], ...]] = {}
+        self._budget_cancelled: set[asyncio.Task[Any]] = set()
+
+    @property
+    def total_cost(self) -> float:
+        return self.total.total_cost
+
+    @property
+    def total_tokens(self) -> int:
+        return self.total.total_tokens
+
+    def record(self, agent_name: str, model_name: str | None, usage: Usage) -> float:
+        """Add one model response and return its cost (0.0 when the model has no known price)."""
+        stats = _usage_stats_from_sdk(usage)
+        stats.total_cost = _calculate_usage_cost(stats, model_name, None) if model_name else 0.0
+        _accumulate(self.by_agent.setdefault(agent_name, UsageStats()), stats)
+        _accumulate(self.total, stats)
+        if stats.total_cost > 0:
+            get_metrics_registry().counter(
+                "agency_swarm_model_cost_usd_total", "Estimated model spend in USD.", ("agent",)
+            ).inc(stats.total_cost, agent=agent_name)
+        return stats.total_cost
+
+    def check_budget(self, agent_name: str) -> None:
+        """Raise `BudgetExceededError` when the run's budget is used up. Called before each model call."""
+        if self.budget is None:
+            return
+        limit = self.budget.reached_limit(self.total.total_tokens, self.total.total_cost)
+        if limit is None:
+            return
+        error = BudgetExceededError(self.budget, limit, agent_name, self.total.total_tokens, self.total.total_cost)
+        if self.budget_error is None:
+            self.budget_error = error
+            logger.warning("Stopping run: %s", error)
+            get_metrics_registry().counter(
+                "agency_swarm_run_budget_exceeded_total", "Runs stopped by a RunBudget limit.", ("agent", "limit")
+            ).inc(agent=agent_name, limit=limit)
+            self._cancel_sub_agent_calls()
+        raise error
+
+    @contextmanager
+    def track_sub_agent_call(self) -> Iterator[None]:
+        """Register the current task as a sub-agent call until the block exits.
+
+        When the budget stops the run, the call is cancelled and raises the run's `BudgetExceededError`
+        instead of `CancelledError`.
+        """
+        task = asyncio.current_task()
+        if task is None or task in self._sub_agent_calls:
+            yield
+            return
+        enclosing = _enclosing_sub_agent_calls.get()
+        self._sub_agent_calls[task] = enclosing
+        token = _enclosing_sub_agent_calls.set((*enclosing, task))
+        try:
+            yield
+        except asyncio.CancelledError:
+            if task in self._budget_cancelled and self.budget_error is not None:
+                task.uncancel()
+                raise self.budget_error from None
+            raise
+        except BaseException:
+            self._withdraw_budget_cancel(task)
+            raise
+        else:
+            self._withdraw_budget_cancel(task)
+        finally:
+            _enclosing_sub_agent_calls.reset(token)
+            self._sub_agent_calls.pop(task, None)
+            self._budget_cancelled.discard(task)
+
+    def _withdraw_budget_cancel(self, task: asyncio.Task[Any]) -> None:
+        # The call finished before the budget cancellation arrived; leave no pending cancel behind
+        if task in self._budget_cancelled:
+            task.uncancel()
+
+    def _cancel_sub_agent_calls(self) -> None:
+        """Cancel the sub-agent calls still running, except the one that hit the budget and its callers."""
+        keep = {asyncio.current_task(), *_enclosing_sub_agent_calls.get()}
+        running = {
+            task: enclosing for task, enclosing in self._sub_agent_calls.items() if task not in keep and not task.done()
+        }
+        for task, enclosing in running.items():
+            # Calls nested in another cancelled call are cancelled with it
+            if any(outer in running for outer in enclosing):
+                continue
+            self._budget_cancelled.add(task)
+            task.cancel()
+
+
+def _accumulate(target: UsageStats, stats: UsageStats) -> None:
+    target.request_count += stats.request_count
+    target.cached_tokens += stats.cached_tokens
+    target.cache_write_tokens += stats.cache_write_tokens
+    target.input_tokens += stats.input_tokens
+    target.output_tokens += stats.output_tokens
+    target.total_tokens += stats.total_tokens
+    target.total_cost += stats.total_cost
+    if stats.reasoning_tokens is not None:
+        target.reasoning_tokens = (target.reasoning_tokens or 0) + stats.reasoning_tokens
+    target.request_usage_entries.extend(stats.request_usage_entries)
+
+
+def get_cost_ledger(context: Any) -> CostLedger | None:
+    """Return the ledger attached to a MasterContext (or a wrapper around one)."""
+    inner = getattr(context, "context", context)
+    ledger = getattr(inner, "cost_ledger", None)
+    return ledger if isinstance(ledger, CostLedger) else None
+
+
+def resolve_cost_ledger(agency_context: Any, budget: RunBudget | None = None) -> CostLedger:
+    """Reuse the ledger handed down by a calling agent, or start a new one for a top-level run.
+
+    ``budget`` only applies to a new ledger; sub-agent calls run under their caller's budget.
+    """
+    inherited = getattr(agency_context, "cost_ledger", None)
+    return inherited if isinstance(inherited, CostLedger) else CostLedger(budget)
+
+
+class CostLedgerHooks(RunHooks):
+    """Prices each model response into the run's ledger and enforces its budget before each model call."""
+
+    async def on_llm_start(
+        self,
+        context: RunContextWrapper[Any],
+        agent: Agent[Any],
+        system_prompt: str | None,
+        input_items: list[Any],
+    ) -> None:
+        if (ledger := get_cost_ledger(context)) is not None:
+            ledger.check_budget(agent.name)
+
+    async def on_llm_end(self, context: RunContextWrapper[Any], agent: Agent[Any], response: ModelResponse) -> None:
+        observe_prompt_cache_usage(agent.name, response.usage)
+        if (ledger := get_cost_ledger(context)) is not None:
+            ledger.record(agent.name, get_usage_tracking_model_name(agent.model), response.usage)
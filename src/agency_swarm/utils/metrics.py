@@ -0,0 +1,273 @@
+"""
+In-process runtime metrics with Prometheus text exposition.
+
+Hot paths update counters and histograms on the active `MetricsRegistry` (one dict lookup and a short
+lock per update). State that already lives on runtime objects (stream queues, active runs, MCP driver
+queues, kernel pools, tool executors) is read only when the registry is scraped, through collectors:
+
+- ``register_builtin_collector`` registers a collector that every registry includes (used by the
+  framework's own subsystems).
+- ``MetricsRegistry.register_collector`` adds one to a single registry.
+
+Replace the active registry with ``set_metrics_registry`` (for example a subclass that forwards
+updates to another metrics backend) or pass ``MetricsRegistry(enabled=False)`` to turn updates off.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Literal
+
+MetricType = Literal["counter", "gauge", "histogram"]
+
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@dataclass(slots=True)
+class MetricFamily:
+    """Samples of one metric, as returned by collectors.
+
+    Each sample is ``(suffix, labels, value)``; the suffix is appended to the family name (``_bucket``,
+    ``_sum`` and ``_count`` for histograms, empty otherwise).
+    """
+
+    name: str
+    type: MetricType
+    documentation: str
+    samples: list[tuple[str, dict[str, str], float]] = field(default_factory=list)
+
+    def add(self, value: float, **labels: str) -> MetricFamily:
+        self.samples.append(("", labels, value))
+        return self
+
+
+Collector = Callable[[], Iterable[MetricFamily]]
+
+_BUILTIN_COLLECTORS: list[Collector] = []
+
+
+def register_builtin_collector(collector: Collector) -> Collector:
+    """Register a collector included by every `MetricsRegistry`. Usable as a decorator."""
+    _BUILTIN_COLLECTORS.append(collector)
+    return collector
+
+
+class _Metric(ABC):
+    type: MetricType
+
+    def __init__(self, registry: MetricsRegistry, name: str, documentation: str, labelnames: Sequence[str]) -> None:
+        self._registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    @abstractmethod
+    def collect(self) -> MetricFamily:
+        """Snapshot the current samples of this metric."""
+
+
+class Counter(_Metric):
+    type: MetricType = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def collect(self) -> MetricFamily:
+        with self._lock:
+            items = list(self._values.items())
+        family = MetricFamily(self.name, self.type, self.documentation)
+        family.samples = [("", dict(zip(self.labelnames, key, strict=True)), value) for key, value in items]
+        return family
+
+
+class Gauge(Counter):
+    type: MetricType = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    type: MetricType = "histogram"
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        if not self._registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[0]) if series is not None else 0
+
+    def collect(self) -> MetricFamily:
+        family = MetricFamily(self.name, self.type, self.documentation)
+        with self._lock:
+            snapshot = [(key, list(counts), total[0]) for key, (counts, total) in self._series.items()]
+        for key, counts, total in snapshot:
+            labels = dict(zip(self.labelnames, key, strict=True))
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += bucket_count
+                family.samples.append(("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            family.samples.append(("_sum", labels, total))
+            family.samples.append(("_count", labels, cumulative))
+        return family
+
+
+class MetricsRegistry:
+    """Named counters, gauges and histograms plus scrape-time collectors.
+
+    Args:
+        enabled: When False, updates are dropped (collectors still run on scrape).
+        include_builtin_collectors: Include the framework's scrape-time collectors.
+    """
+
+    def __init__(self, *, enabled: bool = True, include_builtin_collectors: bool = True) -> None:
+        self.enabled = enabled
+        self.include_builtin_collectors = include_builtin_collectors
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Collector] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> Histogram:
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = Histogram(self, name, documentation, labelnames, buckets)
+        if not isinstance(metric, Histogram):
+            raise ValueError(f"Metric {name!r} is already registered as a {metric.type}")
+        return metric
+
+    def register_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def collect(self) -> list[MetricFamily]:
+        families = [metric.collect() for metric in list(self._metrics.values())]
+        collectors = [*(_BUILTIN_COLLECTORS if self.include_builtin_collectors else ()), *self._collectors]
+        for collector in collectors:
+            families.extend(collector())
+        return families
+
+    def render_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {_escape_help(family.documentation)}")
+            lines.append(f"# TYPE {family.name} {family.type}")
+            for suffix, labels, value in family.samples:
+                lines.append(f"{family.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, cls: type[Counter], name: str, documentation: str, labelnames: Sequence[str]):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(self, name, documentation, labelnames)
+        if type(metric) is not cls:
+            raise ValueError(f"Metric {name!r} is already registered as a {metric.type}")
+        return metric
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Return the registry that framework instrumentation writes to."""
+    return _registry
+
+
+def set_metrics_registry(registry: MetricsRegistry) -> MetricsRegistry:
+    """Replace the active registry and return the previous one."""
+    global _registry
+    previous, _registry = _registry, registry
+    return previous
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    rendered = ",".join(f'{name}="{_escape_label(str(value))}"' for name, value in labels.items())
+    return "{" + rendered + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n")
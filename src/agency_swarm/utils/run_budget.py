@@ -0,0 +1,90 @@
+"""Token and cost ceilings for one top-level run.
+
+Pass ``run_budget=RunBudget(...)`` to ``get_response`` / ``get_response_stream``. The budget is attached to the
+run's `CostLedger`, which every sub-agent reached through ``send_message`` shares, and it is checked before each
+model call. Once a limit is reached, the next model call anywhere in the run raises `BudgetExceededError` instead
+of being sent. Calls already in flight finish and are still counted.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from agents.exceptions import AgentsException
+
+BudgetLimit = Literal["tokens", "cost"]
+
+
+@dataclass(frozen=True)
+class RunBudget:
+    """Limits for one top-level run, including every sub-agent call it makes.
+
+    Args:
+        max_tokens: Stop once the run has used this many tokens (input plus output).
+        max_cost_usd: Stop once the estimated spend reaches this many US dollars. Responses from models
+            without a known price count as free.
+    """
+
+    max_tokens: int | None = None
+    max_cost_usd: float | None = None
+
+    def __post_init__(self) -> None:
+        if self.max_tokens is None and self.max_cost_usd is None:
+            raise ValueError("RunBudget needs max_tokens, max_cost_usd, or both.")
+        if self.max_tokens is not None and self.max_tokens <= 0:
+            raise ValueError("RunBudget.max_tokens must be positive.")
+        if self.max_cost_usd is not None and self.max_cost_usd <= 0:
+            raise ValueError("RunBudget.max_cost_usd must be positive.")
+
+    def reached_limit(self, total_tokens: int, total_cost: float) -> BudgetLimit | None:
+        """Return which limit the given usage has reached, if any."""
+        if self.max_tokens is not None and total_tokens >= self.max_tokens:
+            return "tokens"
+        if self.max_cost_usd is not None and total_cost >= self.max_cost_usd:
+            return "cost"
+        return None
+
+
+class BudgetExceededError(AgentsException):
+    """Raised when a run reaches a `RunBudget` limit. It stops the whole run, including sub-agent calls."""
+
+    def __init__(
+        self,
+        budget: RunBudget,
+        limit: BudgetLimit,
+        agent_name: str,
+        total_tokens: int,
+        total_cost: float,
+    ) -> None:
+        self.budget = budget
+        self.limit = limit
+        self.agent_name = agent_name
+        self.total_tokens = total_tokens
+        self.total_cost = total_cost
+        if limit == "tokens":
+            detail = f"{total_tokens} of {budget.max_tokens} tokens used"
+        else:
+            detail = f"${total_cost:.6f} of ${budget.max_cost_usd:.6f} spent"
+        super().__init__(f"Run budget exceeded before a model call by agent '{agent_name}': {detail}.")
+
+    def to_event(self) -> dict[str, Any]:
+        """Stream error event describing the stop."""
+        return {
+            "type": "error",
+            "error_type": "budget_exceeded",
+            "content": str(self),
+            "agent": self.agent_name,
+            "limit": self.limit,
+            "total_tokens": self.total_tokens,
+            "total_cost": self.total_cost,
+            "max_tokens": self.budget.max_tokens,
+            "max_cost_usd": self.budget.max_cost_usd,
+        }
+
+
+def normalize_run_budget(value: object) -> RunBudget | None:
+    """Validate the ``run_budget`` keyword of ``get_response`` / ``get_response_stream``."""
+    if value is None or isinstance(value, RunBudget):
+        return value
+    raise TypeError("run_budget must be a RunBudget or None.")
@@ -0,0 +1,23 @@
+"""Framework run hooks attached to every agent run.
+
+`CostLedgerHooks` always runs, so the cost ledger and any `RunBudget` keep working when timings are off.
+`RunTimingHooks` is only added when the run records timings.
+"""
+
+from __future__ import annotations
+
+from agents import RunHooks
+
+from agency_swarm.utils.cost_ledger import CostLedgerHooks
+from agency_swarm.utils.run_timings import RunTimingHooks
+
+_COST_LEDGER_HOOKS = CostLedgerHooks()
+_RUN_TIMING_HOOKS = RunTimingHooks()
+
+
+def with_run_hooks(hooks: RunHooks | None, *, timing: bool) -> RunHooks:
+    """Compose the framework hooks with any caller-provided run hooks."""
+    from agency_swarm.hooks import CompositeRunHooks
+
+    framework: list[RunHooks] = [_COST_LEDGER_HOOKS, _RUN_TIMING_HOOKS] if timing else [_COST_LEDGER_HOOKS]
+    return CompositeRunHooks(framework if hooks is None else [*framework, hooks])
@@ -0,0 +1,303 @@
+"""
+Per-hop latency tracing for agent runs and SendMessage delegation chains.
+
+A single `RunTimings` recorder is created by the outermost `get_response` /
+`get_response_stream` call and handed down to every sub-agent run through
+`AgencyContext.run_timings` and `MasterContext.run_timings`. Spans are keyed by
+``agent_run_id`` and ``parent_run_id`` so a delegation tree can be rebuilt from
+the flat span list. Pass ``record_timings=False`` to the top-level call to skip recording (and the
+timing metrics derived from it) for that run.
+
+Recorded span names:
+
+- ``history_preparation``: building the model input for a run
+- ``model``: one model call, with ``time_to_first_token`` (first delta seen by the stream consumer)
+  for streamed calls
+- ``tool``: one tool execution (including ``send_message`` hops)
+- ``persistence``: saving run items to the thread manager
+- ``queueing``: time spent waiting on stream back-pressure or concurrency slots
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import Agent, RunContextWrapper, RunHooks
+from agents.items import ModelResponse
+from agents.tool import Tool
+
+from agency_swarm.utils.metrics import get_metrics_registry
+
+
+@dataclass(slots=True)
+class TimingSpan:
+    """One timed operation within a run. Times are seconds relative to the recorder start."""
+
+    name: str
+    start: float
+    duration: float
+    agent: str | None = None
+    agent_run_id: str | None = None
+    parent_run_id: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration": round(self.duration, 6),
+            "agent": self.agent,
+            "agent_run_id": self.agent_run_id,
+            "parent_run_id": self.parent_run_id,
+        }
+        if self.attributes:
+            data["attributes"] = self.attributes
+        return data
+
+
+@dataclass(slots=True)
+class _RunInfo:
+    agent: str | None
+    parent_run_id: str | None
+    totals: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _OpenModelCall:
+    started_at: float
+    first_token_at: float | None = None
+    span: TimingSpan | None = None
+
+
+class RunTimings:
+    """Lightweight span recorder shared by every hop of one top-level run."""
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self.spans: list[TimingSpan] = []
+        self._runs: dict[str | None, _RunInfo] = {}
+        self._open_model_calls: dict[int, _OpenModelCall] = {}
+        self._open_tool_calls: dict[tuple[int, str], float] = {}
+        self._unstreamed_calls: dict[int, deque[_OpenModelCall]] = {}
+        self._streaming_calls: dict[int, _OpenModelCall] = {}
+
+    def register_run(self, agent_run_id: str | None, *, agent: str | None, parent_run_id: str | None) -> None:
+        """Record which agent owns ``agent_run_id`` and which run or tool call started it."""
+        run = self._runs.get(agent_run_id)
+        if run is None:
+            self._runs[agent_run_id] = _RunInfo(agent=agent, parent_run_id=parent_run_id)
+        elif run.agent is None:
+            run.agent = agent
+            run.parent_run_id = parent_run_id
+
+    def record(
+        self,
+        name: str,
+        started_at: float,
+        ended_at: float,
+        *,
+        agent_run_id: str | None = None,
+        **attributes: Any,
+    ) -> TimingSpan:
+        """Record a span from two ``time.perf_counter()`` readings."""
+        run = self._runs.get(agent_run_id)
+        span = TimingSpan(
+            name=name,
+            start=started_at - self._origin,
+            duration=max(0.0, ended_at - started_at),
+            agent=run.agent if run else None,
+            agent_run_id=agent_run_id,
+            parent_run_id=run.parent_run_id if run else None,
+            attributes={k: v for k, v in attributes.items() if v is not None},
+        )
+        self.spans.append(span)
+        self._add_total(agent_run_id, name, span.duration)
+        return span
+
+    def add_duration(self, name: str, duration: float, *, agent_run_id: str | None = None) -> None:
+        """Accumulate time into a run's totals without creating a span (for high-frequency work)."""
+        if duration > 0:
+            self._add_total(agent_run_id, name, duration)
+
+    @contextmanager
+    def span(self, name: str, *, agent_run_id: str | None = None, **attributes: Any) -> Iterator[None]:
+        """Time the enclosed block as a span."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, started_at, time.perf_counter(), agent_run_id=agent_run_id, **attributes)
+
+    # Open model and tool calls are keyed by ``scope`` (the run's MasterContext id) rather than by
+    # agent_run_id, because streamed runs re-assign the run id when the agent_updated event is consumed.
+
+    def model_started(self, scope: int, *, streaming: bool = False) -> None:
+        call = _OpenModelCall(started_at=time.perf_counter())
+        self._open_model_calls[scope] = call
+        if streaming:
+            self._unstreamed_calls.setdefault(scope, deque()).append(call)
+
+    def observe_stream_event(self, scope: int, event_type: str) -> None:
+        """Attribute a raw model stream event, as seen by the stream consumer, to its model call.
+
+        Each model call emits exactly one ``response.created`` event before its deltas, so calls are
+        matched in order even when the consumer lags behind the SDK and the call has already ended.
+        """
+        if event_type == "response.created":
+            pending = self._unstreamed_calls.get(scope)
+            if pending:
+                self._streaming_calls[scope] = pending.popleft()
+            return
+        if not event_type.endswith(".delta"):
+            return
+        call = self._streaming_calls.pop(scope, None)
+        if call is None:
+            return
+        call.first_token_at = time.perf_counter()
+        get_metrics_registry().histogram(
+            "agency_swarm_time_to_first_token_seconds", "Time from model call start to its first streamed delta."
+        ).observe(call.first_token_at - call.started_at)
+        if call.span is not None:
+            call.span.attributes["time_to_first_token"] = round(call.first_token_at - call.started_at, 6)
+
+    def model_finished(self, scope: int, agent_run_id: str | None) -> None:
+        call = self._open_model_calls.pop(scope, None)
+        if call is None:
+            return
+        ttft = call.first_token_at - call.started_at if call.first_token_at is not None else None
+        call.span = self.record(
+            "model",
+            call.started_at,
+            time.perf_counter(),
+            agent_run_id=agent_run_id,
+            time_to_first_token=round(ttft, 6) if ttft is not None else None,
+        )
+        get_metrics_registry().histogram("agency_swarm_model_call_seconds", "Model call duration.", ("agent",)).observe(
+            call.span.duration, agent=call.span.agent or ""
+        )
+
+    def tool_started(self, scope: int, call_key: str) -> None:
+        self._open_tool_calls[(scope, call_key)] = time.perf_counter()
+
+    def tool_finished(
+        self, scope: int, call_key: str, agent_run_id: str | None, *, tool_name: str | None = None
+    ) -> None:
+        started_at = self._open_tool_calls.pop((scope, call_key), None)
+        if started_at is None:
+            return
+        span = self.record(
+            "tool", started_at, time.perf_counter(), agent_run_id=agent_run_id, tool=tool_name, call_id=call_key
+        )
+        get_metrics_registry().histogram(
+            "agency_swarm_tool_call_seconds", "Tool execution duration inside agent runs.", ("tool",)
+        ).observe(span.duration, tool=tool_name or "")
+
+    def totals(self) -> dict[str, float]:
+        """Sum durations per span name across every run."""
+        combined: dict[str, float] = {}
+        for run in self._runs.values():
+            for name, duration in run.totals.items():
+                combined[name] = combined.get(name, 0.0) + duration
+        return {name: round(duration, 6) for name, duration in combined.items()}
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize spans plus a per-run breakdown keyed by ``agent_run_id``."""
+        return {
+            "total_seconds": round(time.perf_counter() - self._origin, 6),
+            "totals": self.totals(),
+            "runs": {
+                run_id: {
+                    "agent": run.agent,
+                    "parent_run_id": run.parent_run_id,
+                    "totals": {name: round(duration, 6) for name, duration in run.totals.items()},
+                }
+                for run_id, run in self._runs.items()
+                if run_id is not None
+            },
+            "spans": [span.to_dict() for span in self.spans],
+        }
+
+    def _add_total(self, agent_run_id: str | None, name: str, duration: float) -> None:
+        run = self._runs.get(agent_run_id)
+        if run is None:
+            run = self._runs[agent_run_id] = _RunInfo(agent=None, parent_run_id=None)
+        run.totals[name] = run.totals.get(name, 0.0) + duration
+
+
+def get_run_timings(context: Any) -> RunTimings | None:
+    """Return the recorder attached to a MasterContext (or a wrapper around one)."""
+    inner = getattr(context, "context", context)
+    timings = getattr(inner, "run_timings", None)
+    return timings if isinstance(timings, RunTimings) else None
+
+
+def _register_current_run(timings: RunTimings, context: RunContextWrapper[Any], agent: Agent[Any]) -> str | None:
+    master_context = context.context
+    agent_run_id = getattr(master_context, "_current_agent_run_id", None)
+    timings.register_run(agent_run_id, agent=agent.name, parent_run_id=getattr(master_context, "_parent_run_id", None))
+    return agent_run_id
+
+
+class RunTimingHooks(RunHooks):
+    """Feeds model and tool timings from SDK lifecycle hooks into the run's recorder."""
+
+    async def on_llm_start(
+        self,
+        context: RunContextWrapper[Any],
+        agent: Agent[Any],
+        system_prompt: str | None,
+        input_items: list[Any],
+    ) -> None:
+        if (timings := get_run_timings(context)) is not None:
+            timings.model_started(id(context.context), streaming=bool(getattr(context.context, "_is_streaming", False)))
+
+    async def on_llm_end(self, context: RunContextWrapper[Any], agent: Agent[Any], response: ModelResponse) -> None:
+        if (timings := get_run_timings(context)) is not None:
+            timings.model_finished(id(context.context), _register_current_run(timings, context, agent))
+
+    async def on_tool_start(self, context: RunContextWrapper[Any], agent: Agent[Any], tool: Tool) -> None:
+        if (timings := get_run_timings(context)) is not None:
+            timings.tool_started(id(context.context), _tool_call_key(context, tool))
+
+    async def on_tool_end(self, context: RunContextWrapper[Any], agent: Agent[Any], tool: Tool, result: object) -> None:
+        if (timings := get_run_timings(context)) is not None:
+            timings.tool_finished(
+                id(context.context),
+                _tool_call_key(context, tool),
+                _register_current_run(timings, context, agent),
+                tool_name=tool.name,
+            )
+
+
+def _tool_call_key(context: RunContextWrapper[Any], tool: Tool) -> str:
+    tool_call_id = getattr(context, "tool_call_id", None)
+    return tool_call_id if isinstance(tool_call_id, str) and tool_call_id else tool.name
+
+
+def resolve_run_timings(agency_context: Any, enabled: bool = True) -> RunTimings | None:
+    """Reuse the recorder handed down by a calling agent, or start a new one for a top-level run.
+
+    Returns None when timings are off. ``enabled`` (the ``record_timings`` run keyword) only applies to a
+    top-level run; sub-agent runs follow the ``record_timings`` flag their caller set on the agency context.
+    """
+    inherited = getattr(agency_context, "run_timings", None)
+    if isinstance(inherited, RunTimings):
+        return inherited
+    caller_records_timings = getattr(agency_context, "record_timings", None)
+    if caller_records_timings is not None:
+        enabled = bool(caller_records_timings)
+    return RunTimings() if enabled else None
+
+
+def optional_span(
+    run_timings: RunTimings | None, name: str, agent_run_id: str | None, **attributes: Any
+) -> AbstractContextManager[None]:
+    """Return ``run_timings.span(...)`` or a no-op context when timing is disabled."""
+    if run_timings is None:
+        return nullcontext()
+    return run_timings.span(name, agent_run_id=agent_run_id, **attributes)
@@ -1,12 +1,45 @@
 import logging
 from collections.abc import Callable
 from dataclasses import dataclass, field
+from itertools import islice
 from typing import Any
 
 from agents import TResponseInputItem
+from agents.models.fake_id import FAKE_RESPONSES_ID
 
 logger = logging.getLogger(__name__)
 
+# Marks stored summary messages that stand in for every earlier message of their thread
+HISTORY_CHECKPOINT_FIELD = "history_checkpoint"
+
+# Rough characters-per-token ratio and per-item framing overhead used by `estimate_item_tokens`
+_CHARS_PER_TOKEN = 4
+_ITEM_OVERHEAD_TOKENS = 4
+
+ThreadKey = tuple[str | None, ...]
+
+
+def estimate_item_tokens(item: object) -> int:
+    """Cheap, deterministic token estimate for one input item: the characters of its string values / 4."""
+    chars = 0
+    stack = [item]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            chars += len(value)
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list | tuple):
+            stack.extend(value)
+    return chars // _CHARS_PER_TOKEN + _ITEM_OVERHEAD_TOKENS
+
+
+def thread_key(agent: str | None, caller_agent: str | None) -> ThreadKey:
+    """Identify the thread `ThreadManager.get_conversation_history` returns for an agent pair."""
+    if caller_agent is None:
+        return (None,)
+    return tuple(sorted((agent or "", caller_agent)))
+
 
 @dataclass
 class MessageStore:
@@ -22,6 +55,10 @@ class MessageStore:
 
     messages: list[TResponseInputItem] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Running token estimate per thread, counted since the thread's latest history checkpoint
+    _thread_tokens: dict[ThreadKey, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _counted_messages: list[TResponseInputItem] | None = field(default=None, init=False, repr=False, compare=False)
+    _counted_upto: int = field(default=0, init=False, repr=False, compare=False)
 
     def add_message(self, message: TResponseInputItem) -> None:
         """Add a single message to the store.
@@ -99,9 +136,37 @@ class MessageStore:
 
         return conversation
 
+    def estimated_tokens(self, agent: str | None, caller_agent: str | None) -> int:
+        """Estimated tokens in one thread since its latest history checkpoint.
+
+        Appended messages are counted once; the estimate is rebuilt only after the list is replaced
+        or edited in place (see `invalidate_token_estimates`).
+        """
+        messages = self.messages
+        if self._counted_messages is not messages or self._counted_upto > len(messages):
+            self._thread_tokens.clear()
+            self._counted_messages = messages
+            self._counted_upto = 0
+        for message in messages[self._counted_upto :]:
+            if not isinstance(message, dict):
+                continue
+            key = thread_key(message.get("agent"), message.get("callerAgent"))
+            tokens = estimate_item_tokens(message)
+            if message.get(HISTORY_CHECKPOINT_FIELD):
+                self._thread_tokens[key] = tokens
+            else:
+                self._thread_tokens[key] = self._thread_tokens.get(key, 0) + tokens
+        self._counted_upto = len(messages)
+        return self._thread_tokens.get(thread_key(agent, caller_agent), 0)
+
+    def invalidate_token_estimates(self) -> None:
+        """Recount token estimates on the next query, after messages were edited in place."""
+        self._counted_messages = None
+
     def clear(self) -> None:
         """Remove all messages from the store."""
         self.messages.clear()
+        self.invalidate_token_estimates()
         logger.info("Cleared all messages from store")
 
     def __len__(self) -> int:
@@ -170,6 +235,63 @@ class ThreadManager:
         """Replace all stored messages without invoking the save callback."""
         self._store.messages = list(messages)
 
+    def message_count(self) -> int:
+        """Return the number of stored messages without copying them."""
+        return len(self._store)
+
+    def get_messages_since(self, start: int) -> list[TResponseInputItem]:
+        """Return the messages stored at or after index ``start`` without copying the earlier history."""
+        return self._store.messages[max(start, 0) :]
+
+    def replace_messages_since(self, start: int, messages: list[TResponseInputItem]) -> None:
+        """Replace the messages stored at or after index ``start`` without invoking the save callback."""
+        self._store.messages[max(start, 0) :] = messages
+        self._store.invalidate_token_estimates()
+
+    def find_message_index(self, message: TResponseInputItem) -> int | None:
+        """Return the current index of a stored message, searching from the newest one.
+
+        The message is matched by identity, or by its ``id`` when a rewrite stored a copy of it. Returns None
+        when it is no longer stored.
+        """
+        messages = self._store.messages
+        message_id = message.get("id")
+        if not isinstance(message_id, str) or not message_id or message_id == FAKE_RESPONSES_ID:
+            message_id = None
+        for index in range(len(messages) - 1, -1, -1):
+            stored = messages[index]
+            if stored is message or (message_id is not None and stored.get("id") == message_id):
+                return index
+        return None
+
+    def find_message_ids(self, ids: set[str], end: int) -> set[str]:
+        """Return which of ``ids`` belong to messages stored before index ``end``, without copying them."""
+        found: set[str] = set()
+        if not ids:
+            return found
+        for stored in islice(self._store.messages, max(end, 0)):
+            stored_id = stored.get("id")
+            if stored_id in ids:
+                found.add(stored_id)
+                if len(found) == len(ids):
+                    break
+        return found
+
+    def insert_message_before(self, anchor: TResponseInputItem, message: TResponseInputItem) -> None:
+        """Insert ``message`` right before the stored ``anchor`` item (matched by identity) and trigger save.
+
+        The message is appended when ``anchor`` is not stored.
+        """
+        messages = self._store.messages
+        index = next((i for i, stored in enumerate(messages) if stored is anchor), len(messages))
+        messages.insert(index, message)
+        self._store.invalidate_token_estimates()
+        self._save_messages()
+
+    def estimated_tokens(self, agent: str, caller_agent: str | None = None) -> int:
+        """Estimated tokens of the thread `get_conversation_history` returns, since its latest checkpoint."""
+        return self._store.estimated_tokens(agent, caller_agent)
+
     def persist(self) -> None:
         """Manually trigger the save callback with current messages, if configured."""
         self._save_messages()
@@ -13,6 +13,8 @@ from agents.result import RunResultBase
 from agents.usage import RequestUsage, Usage
 from openai.types.responses.response_usage import InputTokensDetails
 
+from agency_swarm.utils.metrics import get_metrics_registry
+
 logger = logging.getLogger(__name__)
 
 PRICING_FILE_PATH = Path(__file__).parent.parent / "data" / "model_prices_and_context_window.json"
@@ -117,6 +119,11 @@ class UsageStats:
             request_usage_entries=self.request_usage_entries + other.request_usage_entries,
         )
 
+    @property
+    def cache_hit_ratio(self) -> float:
+        """Share of input tokens served from the provider prompt cache."""
+        return self.cached_tokens / self.input_tokens if self.input_tokens > 0 else 0.0
+
     def to_dict(self) -> UsageStatsDict:
         result: UsageStatsDict = {
             "request_count": self.request_count,
@@ -176,10 +183,70 @@ def load_pricing_data() -> PricingData:
         return _PRICING_DATA_CACHE
 
 
-def get_model_pricing(model_name: str, pricing_data: PricingData | None = None) -> dict[str, float] | None:
+class PricingIndex:
+    """Pricing table compiled for repeated lookups.
+
+    Model names are resolved once (exact name, then the provider and version fallbacks of
+    `get_model_pricing`) and each model's tiered prices are parsed once into sorted thresholds.
+    """
+
+    def __init__(self, pricing_data: PricingData) -> None:
+        self.pricing_data = pricing_data
+        self._resolved: dict[str, dict[str, float] | None] = {}
+        self._tiers: dict[int, dict[str, tuple[tuple[int, float], ...]]] = {}
+
+    def lookup(self, model_name: str) -> dict[str, float] | None:
+        try:
+            return self._resolved[model_name]
+        except KeyError:
+            pricing = _resolve_model_pricing(model_name, self.pricing_data)
+            self._resolved[model_name] = pricing
+            return pricing
+
+    def token_price(
+        self, model_pricing: dict[str, float], price_key: str, input_tokens: int, default: float = 0.0
+    ) -> float:
+        """Price per token of ``price_key`` for a request with ``input_tokens`` prompt tokens."""
+        tiers = self._tiers.get(id(model_pricing))
+        if tiers is None:
+            tiers = self._tiers[id(model_pricing)] = _compile_tiers(model_pricing)
+        selected_price = model_pricing.get(price_key, default)
+        for threshold, tier_price in tiers.get(price_key, ()):
+            if threshold >= input_tokens:
+                break
+            selected_price = tier_price
+        return selected_price
+
+
+_PRICING_INDEX: PricingIndex | None = None
+
+
+def get_pricing_index(pricing_data: PricingData | None = None) -> PricingIndex:
+    """Return the compiled index of ``pricing_data`` (the bundled table by default), reusing the last one built."""
+    global _PRICING_INDEX
     if pricing_data is None:
         pricing_data = load_pricing_data()
+    index = _PRICING_INDEX
+    if index is None or index.pricing_data is not pricing_data:
+        index = _PRICING_INDEX = PricingIndex(pricing_data)
+    return index
+
+
+def _compile_tiers(model_pricing: dict[str, float]) -> dict[str, tuple[tuple[int, float], ...]]:
+    tiers: dict[str, dict[int, float]] = {}
+    for tier_key, tier_price in model_pricing.items():
+        match = _TIERED_PRICING_KEY.fullmatch(tier_key)
+        threshold = int(match.group("threshold")) * 1000 if match is not None else 0
+        if match is not None and threshold > 0:
+            tiers.setdefault(match.group("base_key"), {}).setdefault(threshold, tier_price)
+    return {base_key: tuple(sorted(entries.items())) for base_key, entries in tiers.items()}
+
+
+def get_model_pricing(model_name: str, pricing_data: PricingData | None = None) -> dict[str, float] | None:
+    return get_pricing_index(pricing_data).lookup(model_name)
 
+
+def _resolve_model_pricing(model_name: str, pricing_data: PricingData) -> dict[str, float] | None:
     if model_name in pricing_data:
         return pricing_data[model_name]
 
@@ -206,25 +273,6 @@ def get_model_pricing(model_name: str, pricing_data: PricingData | None = None)
     return None
 
 
-def _get_token_price(
-    model_pricing: dict[str, float],
-    price_key: str,
-    input_tokens: int,
-    default: float = 0.0,
-) -> float:
-    selected_threshold = 0
-    selected_price = model_pricing.get(price_key, default)
-    for tier_key, tier_price in model_pricing.items():
-        match = _TIERED_PRICING_KEY.fullmatch(tier_key)
-        if match is None or match.group("base_key") != price_key:
-            continue
-        threshold = int(match.group("threshold")) * 1000
-        if selected_threshold < threshold < input_tokens:
-            selected_threshold = threshold
-            selected_price = tier_price
-    return selected_price
-
-
 def calculate_openai_cost(
     model_name: str,
     input_tokens: int,
@@ -235,20 +283,18 @@ def calculate_openai_cost(
     cache_write_tokens: int = 0,
 ) -> float:
     """Price one model request, selecting tiers by that request's input size."""
-    if pricing_data is None:
-        pricing_data = load_pricing_data()
-
-    model_pricing = get_model_pricing(model_name, pricing_data)
+    index = get_pricing_index(pricing_data)
+    model_pricing = index.lookup(model_name)
     if not model_pricing:
         logger.debug(f"No pricing data found for model {model_name}")
         return 0.0
 
-    input_cost_per_token = _get_token_price(model_pricing, "input_cost_per_token", input_tokens)
-    output_cost_per_token = _get_token_price(model_pricing, "output_cost_per_token", input_tokens)
+    input_cost_per_token = index.token_price(model_pricing, "input_cost_per_token", input_tokens)
+    output_cost_per_token = index.token_price(model_pricing, "output_cost_per_token", input_tokens)
     non_cached_input = max(0, input_tokens - cached_tokens - cache_write_tokens)
     cost = non_cached_input * input_cost_per_token
 
-    cache_read_cost_per_token = _get_token_price(
+    cache_read_cost_per_token = index.token_price(
         model_pricing,
         "cache_read_input_token_cost",
         input_tokens,
@@ -257,7 +303,7 @@ def calculate_openai_cost(
     if cached_tokens > 0:
         cost += cached_tokens * cache_read_cost_per_token
 
-    cache_write_cost_per_token = _get_token_price(
+    cache_write_cost_per_token = index.token_price(
         model_pricing,
         "cache_creation_input_token_cost",
         input_tokens,
@@ -269,7 +315,7 @@ def calculate_openai_cost(
     cost += output_tokens * output_cost_per_token
 
     if reasoning_tokens is not None and reasoning_tokens > 0:
-        reasoning_cost_per_token = _get_token_price(
+        reasoning_cost_per_token = index.token_price(
             model_pricing,
             "output_cost_per_reasoning_token",
             input_tokens,
@@ -295,6 +341,23 @@ def _request_usage_stats(usage: RequestUsage) -> RequestUsageStats:
     )
 
 
+def observe_prompt_cache_usage(agent_name: str, usage: Usage) -> None:
+    """Record one model response's prompt tokens and how many were read from the provider prompt cache."""
+    if usage.input_tokens <= 0:
+        return
+    cached_tokens = usage.input_tokens_details.cached_tokens or 0
+    registry = get_metrics_registry()
+    registry.counter("agency_swarm_prompt_input_tokens_total", "Prompt tokens sent to the model.", ("agent",)).inc(
+        usage.input_tokens, agent=agent_name
+    )
+    registry.counter(
+        "agency_swarm_prompt_cached_tokens_total", "Prompt tokens read from the provider prompt cache.", ("agent",)
+    ).inc(cached_tokens, agent=agent_name)
+    registry.counter(
+        "agency_swarm_prompt_cache_hits_total", "Model calls that reused a cached prompt prefix.", ("agent",)
+    ).inc(1 if cached_tokens > 0 else 0, agent=agent_name)
+
+
 def _usage_stats_from_sdk(usage: Usage) -> UsageStats:
     return UsageStats(
         request_count=usage.requests,
@@ -413,10 +476,26 @@ def calculate_usage_with_cost(
     run_result: RunResultBase | None = None,
 ) -> UsageStats:
     """Add per-request cost to usage statistics."""
+    explicit_model_name = model_name is not None
     if model_name is None and run_result is not None and hasattr(run_result, "_main_agent_model"):
         model_name = cast(_HasMainAgentModel, run_result)._main_agent_model
 
     if run_result:
+        from agency_swarm.utils.cost_ledger import CostLedger
+
+        # Agent runs price each response as it completes. Reuse that total when it was priced the same way
+        # (bundled table, each agent's own model) and covers exactly this result's requests.
+        ledger = getattr(run_result, "cost_ledger", None)
+        if (
+            isinstance(ledger, CostLedger)
+            and pricing_data is None
+            and not explicit_model_name
+            and ledger.total_cost > 0
+            and ledger.total.request_count == usage_stats.request_count
+        ):
+            usage_stats.total_cost = ledger.total_cost
+            return usage_stats
+
         total_cost = 0.0
         calculated_any = False
 
@@ -481,7 +560,7 @@ def format_usage_for_display(usage_stats: UsageStats, model_name: str | None = N
     if model_name:
         lines.insert(0, f"Model: {model_name}")
     if usage_stats.cached_tokens > 0:
-        lines.append(f"  Cached: {usage_stats.cached_tokens:,}")
+        lines.append(f"  Cached: {usage_stats.cached_tokens:,} ({usage_stats.cache_hit_ratio:.0%} of input)")
     lines.append(f"  Output: {usage_stats.output_tokens:,}")
     lines.append(f"  Total: {usage_stats.total_tokens:,}")
 
@@ -0,0 +1,106 @@
+"""Cold-start benchmark for ``import agency_swarm``.
+
+Every sample imports the package in a fresh interpreter and records wall time, peak resident memory and which
+heavy optional dependencies ended up loaded. Run it from the repository root:
+
+    python -m tests.benchmarks.cold_start --runs 5
+    python -m tests.benchmarks.cold_start --max-seconds 4 --max-rss-mb 150
+
+It prints a JSON report and exits with status 1 when a threshold is exceeded or a heavy module is imported.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+# Modules that only the server, realtime and tool-generation features need. None of them may be loaded by a
+# bare ``import agency_swarm``. starlette, uvicorn and mcp are not listed: the agents SDK imports them itself.
+HEAVY_MODULES = (
+    "fastapi",
+    "fastmcp",
+    "jsonref",
+    "datamodel_code_generator",
+    "agents.realtime",
+    "agency_swarm.integrations.fastapi",
+    "agency_swarm.integrations.mcp_server",
+    "agency_swarm.integrations.realtime",
+)
+
+# Peak RSS of a bare import was 113 MB with the integrations loaded eagerly and is about 90 MB without them.
+DEFAULT_MAX_RSS_MB = 128.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import agency_swarm
+seconds = time.perf_counter() - start
+rss_mb = None
+try:
+    # VmHWM resets on exec; ru_maxrss on Linux also counts the parent that forked us (e.g. pytest)
+    with open("/proc/self/status") as status:
+        rss_mb = next(int(line.split()[1]) / 1024 for line in status if line.startswith("VmHWM:"))
+except (OSError, StopIteration):
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+    except ImportError:
+        pass
+print(json.dumps({"seconds": seconds, "rss_mb": rss_mb, "modules": sorted(sys.modules)}))
+"""
+
+
+def measure_import() -> dict[str, Any]:
+    """Import agency_swarm once in a new interpreter and return its timing, memory and loaded modules."""
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def heavy_modules_loaded(modules: list[str]) -> list[str]:
+    """Return the entries of HEAVY_MODULES (or their submodules) present in ``modules``."""
+    return sorted(heavy for heavy in HEAVY_MODULES if any(m == heavy or m.startswith(f"{heavy}.") for m in modules))
+
+
+def run_benchmark(runs: int = 3) -> dict[str, Any]:
+    """Measure ``runs`` cold imports and summarize them."""
+    samples = [measure_import() for _ in range(runs)]
+    rss_values = [sample["rss_mb"] for sample in samples if sample["rss_mb"] is not None]
+    return {
+        "runs": runs,
+        "median_seconds": round(statistics.median(sample["seconds"] for sample in samples), 3),
+        "max_rss_mb": round(max(rss_values), 1) if rss_values else None,
+        "module_count": len(samples[-1]["modules"]),
+        "heavy_modules": heavy_modules_loaded(samples[-1]["modules"]),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="number of fresh interpreters to sample")
+    parser.add_argument("--max-seconds", type=float, default=None, help="fail when the median import is slower")
+    parser.add_argument("--max-rss-mb", type=float, default=DEFAULT_MAX_RSS_MB, help="fail above this peak RSS")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.runs)
+    failures = [f"heavy modules imported: {', '.join(report['heavy_modules'])}"] if report["heavy_modules"] else []
+    if args.max_seconds is not None and report["median_seconds"] > args.max_seconds:
+        failures.append(f"median import {report['median_seconds']}s exceeds {args.max_seconds}s")
+    if report["max_rss_mb"] is not None and report["max_rss_mb"] > args.max_rss_mb:
+        failures.append(f"peak RSS {report['max_rss_mb']} MB exceeds {args.max_rss_mb} MB")
+    report["failures"] = failures
+    print(json.dumps(report, indent=2))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,158 @@
+"""Throughput benchmark for the streaming fan-in path.
+
+Measures events/sec and task creations per event for ``EventStreamMerger.merge_streams`` on its own and for a
+full ``Agency.get_response_stream`` run whose model streams many text deltas. Run it from the repository root:
+
+    python -m tests.benchmarks.stream_fan_in --events 2000 --runs 5
+    python -m tests.benchmarks.stream_fan_in --min-events-per-sec 20000 --max-tasks-per-event 0.05
+
+It prints a JSON report and exits with status 1 when a threshold is exceeded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from agents import ModelSettings
+
+from agency_swarm import Agency, Agent
+from agency_swarm.streaming.utils import EventStreamMerger, StreamingContext
+from tests.deterministic_model import DeterministicModel, _stream_text_events
+
+DEFAULT_EVENTS = 2000
+
+
+@contextmanager
+def _count_task_creations() -> Iterator[list[int]]:
+    loop = asyncio.get_running_loop()
+    previous_factory = loop.get_task_factory()
+    counter = [0]
+
+    def factory(loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any) -> asyncio.Task[Any]:
+        counter[0] += 1
+        if previous_factory is not None:
+            return previous_factory(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    loop.set_task_factory(factory)
+    try:
+        yield counter
+    finally:
+        loop.set_task_factory(previous_factory)
+
+
+class _ManyDeltasModel(DeterministicModel):
+    """Streams ``delta_count`` text deltas per response."""
+
+    def __init__(self, delta_count: int) -> None:
+        super().__init__(default_response="done")
+        self._delta_count = delta_count
+
+    def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        async def _events() -> AsyncIterator[Any]:
+            async for event in _stream_text_events(self._default_response, self.model):
+                if event.type != "response.output_text.delta":
+                    yield event
+                    continue
+                for _ in range(self._delta_count):
+                    yield event
+
+        return _events()
+
+
+async def measure_merge_streams(events: int) -> dict[str, float]:
+    """Merge ``events`` primary events with as many queued sub-agent events and time the fan-in."""
+
+    async def primary() -> AsyncGenerator[int]:
+        for index in range(events):
+            yield index
+            if index % 100 == 0:
+                await asyncio.sleep(0)
+
+    context = StreamingContext()
+    for index in range(events):
+        context.event_queue.put_nowait(-index - 1)
+
+    received = 0
+    with _count_task_creations() as tasks:
+        started = time.perf_counter()
+        async for _ in EventStreamMerger().merge_streams(primary(), context):
+            received += 1
+        elapsed = time.perf_counter() - started
+    return {"events": received, "seconds": elapsed, "tasks": tasks[0]}
+
+
+async def measure_response_stream(events: int) -> dict[str, float]:
+    """Stream one agency response of ``events`` text deltas and time it end to end."""
+    agent = Agent(
+        name="Streamer",
+        instructions="Stream.",
+        model=_ManyDeltasModel(events),
+        model_settings=ModelSettings(temperature=0.0),
+    )
+    agency = Agency(agent)
+
+    deltas = 0
+    with _count_task_creations() as tasks:
+        started = time.perf_counter()
+        async for event in agency.get_response_stream("Hello"):
+            if getattr(getattr(event, "data", None), "type", None) == "response.output_text.delta":
+                deltas += 1
+        elapsed = time.perf_counter() - started
+    return {"events": deltas, "seconds": elapsed, "tasks": tasks[0]}
+
+
+def _summarize(samples: list[dict[str, float]]) -> dict[str, Any]:
+    events = samples[-1]["events"]
+    return {
+        "events": events,
+        "median_events_per_sec": round(statistics.median(sample["events"] / sample["seconds"] for sample in samples)),
+        "max_tasks_per_event": round(max(sample["tasks"] / sample["events"] for sample in samples), 4),
+    }
+
+
+def run_benchmark(events: int = DEFAULT_EVENTS, runs: int = 3) -> dict[str, Any]:
+    """Measure ``runs`` samples of both fan-in paths and summarize them."""
+
+    async def _run() -> dict[str, Any]:
+        merge = [await measure_merge_streams(events) for _ in range(runs)]
+        stream = [await measure_response_stream(events) for _ in range(runs)]
+        return {"runs": runs, "merge_streams": _summarize(merge), "get_response_stream": _summarize(stream)}
+
+    return asyncio.run(_run())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=DEFAULT_EVENTS, help="events streamed per sample")
+    parser.add_argument("--runs", type=int, default=3, help="number of samples per path")
+    parser.add_argument("--min-events-per-sec", type=float, default=None, help="fail when a path is slower")
+    parser.add_argument(
+        "--max-tasks-per-event", type=float, default=None, help="fail when task creation grows with events"
+    )
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.events, args.runs)
+    failures = []
+    for label in ("merge_streams", "get_response_stream"):
+        result = report[label]
+        if args.min_events_per_sec is not None and result["median_events_per_sec"] < args.min_events_per_sec:
+            failures.append(f"{label} {result['median_events_per_sec']} events/sec below {args.min_events_per_sec}")
+        if args.max_tasks_per_event is not None and result["max_tasks_per_event"] > args.max_tasks_per_event:
+            failures.append(
+                f"{label} {result['max_tasks_per_event']} task creations per event exceeds {args.max_tasks_per_event}"
+            )
+    report["failures"] = failures
+    print(json.dumps(report, indent=2))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+"""Benchmark for persisting a streamed turn on top of a long thread history.
+
+Each sample emits a 1k-item turn of placeholder-id reasoning/tool/message items, runs final persistence and the
+end-of-stream cleanup, and records the wall time. Two paths are compared on identical input:
+
+- ``tail``: the default ThreadManager, which reads and rewrites only the messages stored since the run started.
+- ``full_history``: a thread manager without the tail methods, which copies and rewrites the whole history.
+  This is the path custom thread managers still take.
+
+Run it from the repository root:
+
+    python -m tests.benchmarks.stream_reconciliation --runs 5
+    python -m tests.benchmarks.stream_reconciliation --history 50000 --max-ms 100 --min-speedup 1.0
+
+It prints a JSON report and exits with status 1 when a threshold is exceeded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from agents.items import MessageOutputItem, ReasoningItem, ToolCallItem, ToolCallOutputItem
+from agents.models.fake_id import FAKE_RESPONSES_ID
+from openai.types.responses import ResponseFunctionToolCall, ResponseOutputMessage, ResponseOutputText
+from openai.types.responses.response_reasoning_item import ResponseReasoningItem, Summary
+
+from agency_swarm import Agent
+from agency_swarm.agent.core import AgencyContext
+from agency_swarm.agent.execution_stream_persistence import (
+    StreamMetadataStore,
+    _clean_up_run_tail,
+    _persist_run_item_if_needed,
+    _persist_streamed_items,
+    _run_tail_anchor,
+)
+from agency_swarm.utils.thread import ThreadManager
+
+DEFAULT_TURN_ITEMS = 1000
+DEFAULT_HISTORY = 20_000
+
+
+class FullHistoryThreadManager(ThreadManager):
+    """ThreadManager without the tail accessors, so persistence falls back to full-history copies."""
+
+    get_messages_since = None  # type: ignore[assignment]
+    replace_messages_since = None  # type: ignore[assignment]
+    message_count = None  # type: ignore[assignment]
+    find_message_index = None  # type: ignore[assignment]
+    find_message_ids = None  # type: ignore[assignment]
+
+
+def _turn_items(agent: Agent, turn_items: int) -> list:
+    """Reasoning -> tool call -> tool output -> message groups, all with placeholder ids."""
+    items: list = []
+    for index in range(turn_items // 4):
+        reasoning = ResponseReasoningItem(
+            id=FAKE_RESPONSES_ID, type="reasoning", summary=[Summary(text=f"think {index}", type="summary_text")]
+        )
+        call = ResponseFunctionToolCall(
+            id=FAKE_RESPONSES_ID, call_id=f"call_{index}", name="tool", arguments="{}", type="function_call"
+        )
+        output = {"type": "function_call_output", "call_id": f"call_{index}", "output": f"result {index}"}
+        message = ResponseOutputMessage(
+            id=FAKE_RESPONSES_ID,
+            type="message",
+            role="assistant",
+            status="completed",
+            content=[ResponseOutputText(type="output_text", text=f"step {index}", annotations=[])],
+        )
+        items.extend(
+            [
+                ReasoningItem(agent=agent, raw_item=reasoning),
+                ToolCallItem(agent=agent, raw_item=call),
+                ToolCallOutputItem(agent=agent, raw_item=output, output=f"result {index}"),
+                MessageOutputItem(agent=agent, raw_item=message),
+            ]
+        )
+    return items
+
+
+def _history(size: int) -> list[dict]:
+    return [
+        {"type": "message", "role": "user", "content": f"old {index}", "agent": "Runner", "callerAgent": None}
+        for index in range(size)
+    ]
+
+
+def measure_turn(thread_manager: ThreadManager, history: int, turn_items: int) -> float:
+    """Stream, persist and clean up one turn on top of ``history`` messages and return the elapsed seconds."""
+    agent = Agent(name="Runner", instructions="noop")
+    thread_manager.replace_messages(_history(history))
+    items = _turn_items(agent, turn_items)
+    agency_context = AgencyContext(agency_instance=None, thread_manager=thread_manager)
+    metadata_store = StreamMetadataStore()
+    run_anchor = _run_tail_anchor(thread_manager, history)
+
+    started = time.perf_counter()
+    for run_item in items:
+        _persist_run_item_if_needed(
+            SimpleNamespace(type="run_item_stream_event", item=run_item),
+            agent=agent,
+            sender_name=None,
+            parent_run_id=None,
+            run_trace_id="trace",
+            current_stream_agent_name=agent.name,
+            current_agent_run_id="agent_run_1",
+            agency_context=agency_context,
+            metadata_store=metadata_store,
+        )
+    _persist_streamed_items(
+        streaming_result=SimpleNamespace(new_items=items),
+        metadata_store=metadata_store,
+        collected_items=items,
+        agent=agent,
+        sender_name=None,
+        parent_run_id=None,
+        run_trace_id="trace",
+        fallback_agent_run_id="agent_run_1",
+        agency_context=agency_context,
+        initial_saved_count=history,
+        run_anchor=run_anchor,
+    )
+    _clean_up_run_tail(thread_manager, history, run_anchor)
+    elapsed = time.perf_counter() - started
+
+    persisted = thread_manager.get_all_messages()
+    if len(persisted) != history + turn_items:
+        raise RuntimeError(f"expected {history + turn_items} persisted messages, found {len(persisted)}")
+    return elapsed
+
+
+def run_benchmark(
+    runs: int = 3, history: int = DEFAULT_HISTORY, turn_items: int = DEFAULT_TURN_ITEMS
+) -> dict[str, Any]:
+    """Measure ``runs`` turns on each path and summarize them."""
+    tail = [measure_turn(ThreadManager(), history, turn_items) for _ in range(runs)]
+    full_history = [measure_turn(FullHistoryThreadManager(), history, turn_items) for _ in range(runs)]
+    tail_ms = statistics.median(tail) * 1000
+    full_history_ms = statistics.median(full_history) * 1000
+    return {
+        "runs": runs,
+        "history": history,
+        "turn_items": turn_items,
+        "tail_median_ms": round(tail_ms, 1),
+        "full_history_median_ms": round(full_history_ms, 1),
+        "speedup": round(full_history_ms / tail_ms, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="number of turns sampled per path")
+    parser.add_argument("--history", type=int, default=DEFAULT_HISTORY, help="messages stored before the turn")
+    parser.add_argument("--turn-items", type=int, default=DEFAULT_TURN_ITEMS, help="streamed items per turn")
+    parser.add_argument("--max-ms", type=float, default=None, help="fail when the tail path median is slower")
+    parser.add_argument("--min-speedup", type=float, default=None, help="fail below this full-history/tail ratio")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.runs, args.history, args.turn_items)
+    failures = []
+    if args.max_ms is not None and report["tail_median_ms"] > args.max_ms:
+        failures.append(f"tail path median {report['tail_median_ms']}ms exceeds {args.max_ms}ms")
+    if args.min_speedup is not None and report["speedup"] < args.min_speedup:
+        failures.append(f"speedup {report['speedup']}x below {args.min_speedup}x")
+    report["failures"] = failures
+    print(json.dumps(report, indent=2))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
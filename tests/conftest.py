@@ -42,11 +42,31 @@ def mock_thread_manager():
         messages.clear()
         messages.extend(new_messages)
 
+    def get_messages_since_side_effect(start):
+        """Return the stored messages from index ``start`` onwards."""
+        return messages[max(start, 0) :]
+
+    def replace_messages_since_side_effect(start, new_messages):
+        """Replace the stored messages from index ``start`` onwards."""
+        messages[max(start, 0) :] = new_messages
+
+    def find_message_index_side_effect(message):
+        """Return the index of the newest stored message that is ``message``."""
+        return next((i for i in range(len(messages) - 1, -1, -1) if messages[i] is message), None)
+
+    def find_message_ids_side_effect(ids, end):
+        """Return which of ``ids`` belong to messages stored before index ``end``."""
+        return {message.get("id") for message in messages[: max(end, 0)]} & set(ids)
+
     manager.add_message.side_effect = add_message_side_effect
     manager.add_messages.side_effect = add_messages_side_effect
     manager.get_conversation_history.side_effect = get_conversation_history_side_effect
     manager.get_all_messages.side_effect = get_all_messages_side_effect
     manager.replace_messages.side_effect = replace_messages_side_effect
+    manager.get_messages_since.side_effect = get_messages_since_side_effect
+    manager.replace_messages_since.side_effect = replace_messages_since_side_effect
+    manager.find_message_index.side_effect = find_message_index_side_effect
+    manager.find_message_ids.side_effect = find_message_ids_side_effect
 
     # Legacy compatibility - these should not be used but may be called
     manager.get_thread = MagicMock()
@@ -246,7 +246,7 @@ def test_client_config_passes_request_scoped_upload_client(
     """file_urls uploads should receive request-level OpenAI client overrides."""
     captured: dict[str, object] = {}
 
-    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None):
+    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None, upload_cache=None):
         del allowed_local_dirs
         assert openai_client is not None
         captured["api_key"] = openai_client.api_key
@@ -317,7 +317,7 @@ def test_default_headers_only_uses_existing_upload_auth(
     """default_headers-only client_config should preserve baseline upload auth."""
     captured: dict[str, object] = {}
 
-    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None):
+    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None, upload_cache=None):
         del allowed_local_dirs
         assert openai_client is not None
         captured["api_key"] = openai_client.api_key
@@ -10,6 +10,7 @@ import json
 import logging
 import os
 import tempfile
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -243,6 +244,7 @@ class TestConditionalFileHandler:
         # Enable file logging and set request ID
         with set_context(log_to_file_context, True), set_context(request_id_context, "test-id-123"):
             handler.emit(record)
+        handler.flush()
 
         # Check that log file was created
         log_file = Path(temp_logs_dir) / "test-id-123.jsonl"
@@ -271,6 +273,7 @@ class TestConditionalFileHandler:
         # Disable file logging
         with set_context(log_to_file_context, False), set_context(request_id_context, "test-id-456"):
             handler.emit(record)
+        handler.flush()
 
         # Check that no log file was created
         log_file = Path(temp_logs_dir) / "test-id-456.jsonl"
@@ -297,6 +300,90 @@ class TestConditionalFileHandler:
                 handler.emit(record)
 
 
+class TestBatchedFileWriter:
+    """Records are written by a background thread and retrieved through the writer's offset index."""
+
+    @staticmethod
+    def _record(message: str) -> logging.LogRecord:
+        return logging.LogRecord(
+            name="test", level=logging.INFO, pathname="test.py", lineno=1, msg=message, args=(), exc_info=None
+        )
+
+    def test_emit_does_not_touch_files_on_logging_thread(self, temp_logs_dir):
+        handler = ConditionalFileHandler(temp_logs_dir)
+        handler.setFormatter(FileFormatter())
+
+        real_open = open
+        opening_threads: set[str] = set()
+
+        def tracking_open(*args, **kwargs):
+            opening_threads.add(threading.current_thread().name)
+            return real_open(*args, **kwargs)
+
+        with set_context(log_to_file_context, True), set_context(request_id_context, "queued"):
+            with patch("builtins.open", side_effect=tracking_open):
+                for index in range(500):
+                    handler.emit(self._record(f"entry {index}"))
+                handler.flush()
+
+        assert opening_threads == {"agency-log-writer"}
+
+        lines = (Path(temp_logs_dir) / "queued.jsonl").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["message"] for line in lines] == [f"entry {index}" for index in range(500)]
+        handler.close()
+
+    @pytest.mark.asyncio
+    async def test_logs_endpoint_reads_indexed_entries_without_parsing(self, temp_logs_dir):
+        handler = ConditionalFileHandler(temp_logs_dir)
+        handler.setFormatter(FileFormatter())
+        with set_context(log_to_file_context, True), set_context(request_id_context, "indexed"):
+            handler.emit(self._record("first"))
+            handler.emit(self._record("second"))
+
+        # Records still queued for the writer are flushed before retrieval
+        with patch("agency_swarm.integrations.fastapi_utils.logging_middleware.json.loads") as loads:
+            response = await get_logs_endpoint_impl("indexed", temp_logs_dir)
+        loads.assert_not_called()
+
+        assert response.status_code == 200
+        assert [entry["message"] for entry in json.loads(response.body)] == ["first", "second"]
+        assert not (Path(temp_logs_dir) / "indexed.jsonl").exists()
+        handler.close()
+
+    @pytest.mark.asyncio
+    async def test_logs_endpoint_parses_files_changed_outside_the_writer(self, temp_logs_dir):
+        handler = ConditionalFileHandler(temp_logs_dir)
+        handler.setFormatter(FileFormatter())
+        with set_context(log_to_file_context, True), set_context(request_id_context, "shared"):
+            handler.emit(self._record("from handler"))
+        handler.flush()
+        with (Path(temp_logs_dir) / "shared.jsonl").open("a", encoding="utf-8") as f:
+            f.write('{"message": "from another worker"}\nnot json\n')
+
+        response = await get_logs_endpoint_impl("shared", temp_logs_dir)
+
+        assert [entry["message"] for entry in json.loads(response.body)] == ["from handler", "from another worker"]
+        handler.close()
+
+    @pytest.mark.asyncio
+    async def test_indexed_and_parsed_responses_use_one_format(self, temp_logs_dir):
+        handler = ConditionalFileHandler(temp_logs_dir)
+        handler.setFormatter(FileFormatter())
+        for request_id in ("indexed", "parsed"):
+            with set_context(log_to_file_context, True), set_context(request_id_context, request_id):
+                handler.emit(self._record("first"))
+                handler.emit(self._record("second"))
+        handler.flush()
+        handler._written_bytes.pop("parsed")  # force the line-by-line fallback for one request
+
+        indexed = await get_logs_endpoint_impl("indexed", temp_logs_dir)
+        parsed = await get_logs_endpoint_impl("parsed", temp_logs_dir)
+
+        for response in (indexed, parsed):
+            assert response.body == json.dumps(json.loads(response.body), ensure_ascii=False).encode()
+        handler.close()
+
+
 class TestSetupEnhancedLogging:
     """Test the logging setup function."""
 
@@ -329,6 +416,23 @@ class TestSetupEnhancedLogging:
         assert isinstance(console_handler.formatter, ConsoleFormatter)
         assert isinstance(file_handler.formatter, FileFormatter)
 
+    def test_repeated_setup_closes_the_previous_file_handler(self, temp_logs_dir):
+        """Re-running setup writes out the old handler's queued records and stops its writer thread."""
+        logger = setup_enhanced_logging(temp_logs_dir)
+        previous = next(h for h in logger.handlers if h.name == "custom_file")
+        with set_context(log_to_file_context, True), set_context(request_id_context, "resetup"):
+            logging.getLogger("resetup").info("queued before re-setup")
+        writer = previous._writer
+
+        logger = setup_enhanced_logging(temp_logs_dir)
+
+        assert writer is not None and not writer.is_alive()
+        lines = (Path(temp_logs_dir) / "resetup.jsonl").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["message"] for line in lines] == ["queued before re-setup"]
+        current = next(h for h in logger.handlers if h.name == "custom_file")
+        assert current is not previous
+        current.close()
+
 
 class TestGetLogIdFromHeaders:
     """Test request header processing for log IDs."""
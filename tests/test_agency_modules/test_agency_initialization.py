@@ -12,6 +12,7 @@ import agency_swarm
 from agency_swarm import Agency, Agent, Handoff, SDKHandoff
 from agency_swarm.agent.constants import AGENT_OPENAI_REALTIME_VOICES
 from agency_swarm.agent.conversation_starters_cache import load_cached_starter
+from agency_swarm.agent.starter_cache_store import flush_starter_cache_writes
 from agency_swarm.tools import Handoff as ToolHandoff
 from agency_swarm.tools.send_message import SendMessage
 from tests.deterministic_model import DeterministicModel
@@ -233,6 +234,7 @@ def test_agency_warmup_supports_quick_replies_without_starter_cache_flag(tmp_pat
 
     Agency(agent)
 
+    flush_starter_cache_writes()
     cached = load_cached_starter(
         agent.name,
         quick_reply,
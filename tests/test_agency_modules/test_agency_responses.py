@@ -318,9 +318,8 @@ async def test_agency_get_response_stream_does_not_mutate_context_override(mock_
     assert stream.final_result is not None
     assert context_override == {"test_key": "test_value"}
     assert "streaming_context" not in context_override
-    assert capturing_agent.last_context_override is not None
-    assert capturing_agent.last_context_override is not context_override
-    assert "streaming_context" in capturing_agent.last_context_override
+    # The per-stream StreamingContext travels on MasterContext, not through user context
+    assert capturing_agent.last_context_override == {"test_key": "test_value"}
     assert isinstance(events, list)
 
 
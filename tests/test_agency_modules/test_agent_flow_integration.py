@@ -184,13 +184,13 @@ def test_runtime_handoff_variant_is_preserved_with_static_handoff() -> None:
 
     context = agency.get_agent_context("Agent1")
     master_context = prepare_master_context(agent1, None, context)
-    original_instructions = setup_execution(agent1, None, context, None)
+    setup_execution(agent1, None, context, None)
 
     try:
         handoff_names = [handoff.tool_name for handoff in agent1.handoffs]
         assert handoff_names == ["transfer_to_Agent2", "custom_transfer_to_Agent2"]
     finally:
-        cleanup_execution(agent1, original_instructions, None, context, master_context)
+        cleanup_execution(agent1, None, context, master_context)
 
 
 def test_same_name_handoff_variants_are_preserved_with_static_handoff() -> None:
@@ -208,13 +208,13 @@ def test_same_name_handoff_variants_are_preserved_with_static_handoff() -> None:
 
     context = agency.get_agent_context("Agent1")
     master_context = prepare_master_context(agent1, None, context)
-    original_instructions = setup_execution(agent1, None, context, None)
+    setup_execution(agent1, None, context, None)
 
     try:
         handoff_names = [handoff.tool_name for handoff in agent1.handoffs]
         assert handoff_names == ["transfer_to_Agent2", "transfer_to_Agent2", "transfer_to_Agent2"]
     finally:
-        cleanup_execution(agent1, original_instructions, None, context, master_context)
+        cleanup_execution(agent1, None, context, master_context)
 
 
 def test_same_base_handoff_is_deduplicated_with_static_handoff() -> None:
@@ -232,13 +232,13 @@ def test_same_base_handoff_is_deduplicated_with_static_handoff() -> None:
 
     context = agency.get_agent_context("Agent1")
     master_context = prepare_master_context(agent1, None, context)
-    original_instructions = setup_execution(agent1, None, context, None)
+    setup_execution(agent1, None, context, None)
 
     try:
         handoff_names = [handoff.tool_name for handoff in agent1.handoffs]
         assert handoff_names == ["transfer_to_Agent2"]
     finally:
-        cleanup_execution(agent1, original_instructions, None, context, master_context)
+        cleanup_execution(agent1, None, context, master_context)
 
 
 def test_later_communication_tool_is_wired_after_handoff_failure() -> None:
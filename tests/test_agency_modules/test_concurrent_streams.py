@@ -0,0 +1,115 @@
+"""Many concurrent streams multiplexed over one long-lived Agency."""
+
+import asyncio
+import re
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from agents import ModelSettings
+from agents.stream_events import RunItemStreamEvent
+
+from agency_swarm import Agency, Agent
+from agency_swarm.utils.thread import ThreadManager
+from tests.deterministic_model import DeterministicModel, _stream_output_item_events
+
+STREAM_COUNT = 100
+_TASK_RE = re.compile(r"task-\d{3}")
+_BRIEF_RE = re.compile(r"brief-\d{3}")
+
+
+class _StreamingDeterministicModel(DeterministicModel):
+    """Streams whatever DeterministicModel.get_response would return, including tool calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: list[tuple[str, str]] = []
+
+    def stream_response(self, system_instructions: Any, input: Any, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        self.calls.append((str(system_instructions), str(input)))
+
+        async def _events() -> AsyncIterator[Any]:
+            response = await self.get_response(system_instructions, input, *args, **kwargs)
+            async for event in _stream_output_item_events(response.output, self.model):
+                yield event
+
+        return _events()
+
+
+def _make_agency(stable_prompt_prefix: bool = False) -> Agency:
+    coordinator = Agent(
+        name="Coordinator",
+        instructions="Delegate work to Worker when asked.",
+        model=_StreamingDeterministicModel(),
+        model_settings=ModelSettings(temperature=0.0),
+        stable_prompt_prefix=stable_prompt_prefix,
+    )
+    worker = Agent(
+        name="Worker",
+        instructions="Handle delegated tasks.",
+        model=_StreamingDeterministicModel(),
+        model_settings=ModelSettings(temperature=0.0),
+    )
+    return Agency(coordinator, worker, communication_flows=[coordinator > worker])
+
+
+async def _run_stream(agency: Agency, task_id: str, thread_manager: ThreadManager) -> tuple[set[str], set[str], Any]:
+    stream = agency.get_response_stream(
+        f"Ask Worker to handle {task_id}",
+        additional_instructions=f"Follow {_brief_for(task_id)}.",
+        thread_manager_override=thread_manager,
+    )
+    seen_tasks: set[str] = set()
+    agents: set[str] = set()
+    async for event in stream:
+        if isinstance(event, RunItemStreamEvent):
+            seen_tasks.update(_TASK_RE.findall(str(event.item.raw_item)))
+            agents.add(getattr(event, "agent", ""))
+    return seen_tasks, agents, stream.final_result
+
+
+def _brief_for(task_id: str) -> str:
+    return task_id.replace("task", "brief")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stable_prompt_prefix", [False, True])
+async def test_one_agency_serves_100_concurrent_streams(stable_prompt_prefix: bool) -> None:
+    agency = _make_agency(stable_prompt_prefix)
+    task_ids = [f"task-{index:03d}" for index in range(STREAM_COUNT)]
+    thread_managers = [ThreadManager() for _ in task_ids]
+
+    results = await asyncio.wait_for(
+        asyncio.gather(
+            *(
+                _run_stream(agency, task_id, thread_manager)
+                for task_id, thread_manager in zip(task_ids, thread_managers, strict=True)
+            )
+        ),
+        timeout=60,
+    )
+
+    for task_id, thread_manager, (seen_tasks, agents, final_result) in zip(
+        task_ids, thread_managers, results, strict=True
+    ):
+        # Every stream sees its own sub-agent events and nobody else's
+        assert seen_tasks == {task_id}
+        assert agents == {"Coordinator", "Worker"}
+        assert task_id in str(final_result.final_output)
+        stored = {task for message in thread_manager.get_all_messages() for task in _TASK_RE.findall(str(message))}
+        assert stored == {task_id}
+
+    # Every Coordinator call saw its own stream's additional_instructions and no other stream's
+    coordinator_model = agency.agents["Coordinator"].model
+    assert isinstance(coordinator_model, _StreamingDeterministicModel)
+    assert len(coordinator_model.calls) == 2 * STREAM_COUNT
+    for system_instructions, model_input in coordinator_model.calls:
+        (task_id,) = set(_TASK_RE.findall(model_input))
+        assert set(_BRIEF_RE.findall(system_instructions + model_input)) == {_brief_for(task_id)}
+    assert agency.agents["Coordinator"].instructions == "Delegate work to Worker when asked."
+    worker_model = agency.agents["Worker"].model
+    assert isinstance(worker_model, _StreamingDeterministicModel)
+    assert not any(_BRIEF_RE.search(prompt + model_input) for prompt, model_input in worker_model.calls)
+
+    # The shared agency conversation was not touched by the multiplexed runs
+    assert agency.thread_manager.get_all_messages() == []
@@ -0,0 +1,166 @@
+import asyncio
+import json
+
+import pytest
+from agents import ModelSettings, RunContextWrapper
+
+from agency_swarm import Agent, BroadcastSendMessage
+from agency_swarm.context import MasterContext
+from agency_swarm.streaming.utils import StreamingContext
+from agency_swarm.utils.thread import ThreadManager
+from tests.deterministic_model import DeterministicModel
+
+
+def _make_stub_agent(name: str, response: str = "ack") -> Agent:
+    return Agent(
+        name=name,
+        instructions="stub",
+        model=DeterministicModel(default_response=response),
+        model_settings=ModelSettings(temperature=0.0),
+    )
+
+
+def _wrapper(*agents: Agent, streaming: bool = False) -> RunContextWrapper[MasterContext]:
+    ctx = MasterContext(
+        thread_manager=ThreadManager(),
+        agents={agent.name: agent for agent in agents},
+        user_context={},
+        agent_runtime_state={},
+        shared_instructions=None,
+    )
+    if streaming:
+        ctx._is_streaming = True
+        ctx.streaming_context = StreamingContext()
+    return RunContextWrapper(context=ctx)
+
+
+def _broadcast_args(*pairs: tuple[str, str]) -> str:
+    return json.dumps(
+        {
+            "messages": [
+                {"recipient_agent": recipient, "message": message, "additional_instructions": ""}
+                for recipient, message in pairs
+            ]
+        }
+    )
+
+
+def test_broadcast_schema_lists_recipients_per_message() -> None:
+    sender = _make_stub_agent("Sender")
+    tool = BroadcastSendMessage(sender, recipients={"A": _make_stub_agent("A")})
+    tool.add_recipient(_make_stub_agent("B"))
+
+    assert tool.name == "send_message_broadcast"
+    item_schema = tool.params_json_schema["properties"]["messages"]["items"]
+    assert item_schema["properties"]["recipient_agent"]["enum"] == ["A", "B"]
+    assert tool.params_json_schema["required"] == ["messages"]
+
+
+@pytest.mark.asyncio
+async def test_broadcast_returns_responses_in_request_order() -> None:
+    sender = _make_stub_agent("Sender")
+    alpha = _make_stub_agent("Alpha", response="from alpha")
+    beta = _make_stub_agent("Beta", response="from beta")
+    tool = BroadcastSendMessage(sender, recipients={"Alpha": alpha, "Beta": beta})
+
+    result = await tool.on_invoke_tool(_wrapper(alpha, beta), _broadcast_args(("Beta", "b"), ("alpha", "a")))
+
+    assert json.loads(result) == [
+        {"recipient_agent": "Beta", "response": "from beta"},
+        {"recipient_agent": "Alpha", "response": "from alpha"},
+    ]
+    assert tool._pending_per_thread == {}
+
+
+@pytest.mark.asyncio
+async def test_broadcast_runs_recipients_concurrently_within_limit() -> None:
+    sender = _make_stub_agent("Sender")
+    recipients = {f"R{i}": _make_stub_agent(f"R{i}") for i in range(4)}
+    tool = BroadcastSendMessage(sender, recipients=recipients)
+    tool.max_concurrency = 2
+
+    active = 0
+    peak = 0
+
+    async def fake_send(wrapper, recipient_agent, message, additional_instructions, tool_call_id):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return recipient_agent.name
+
+    tool._send_to_recipient = fake_send  # type: ignore[method-assign]
+    result = await tool.on_invoke_tool(
+        _wrapper(*recipients.values()), _broadcast_args(*((name, "task") for name in recipients))
+    )
+
+    assert [entry["response"] for entry in json.loads(result)] == list(recipients)
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_broadcast_rejects_duplicate_unknown_and_pending_recipients() -> None:
+    sender = _make_stub_agent("Sender")
+    alpha = _make_stub_agent("Alpha")
+    tool = BroadcastSendMessage(sender, recipients={"Alpha": alpha})
+    wrapper = _wrapper(alpha)
+
+    duplicate = await tool.on_invoke_tool(wrapper, _broadcast_args(("Alpha", "a"), ("ALPHA", "b")))
+    assert duplicate.startswith("Error: Recipient agent 'ALPHA' appears more than once")
+
+    unknown = await tool.on_invoke_tool(wrapper, _broadcast_args(("Ghost", "a")))
+    assert unknown.startswith("Error: Unknown recipient agent 'Ghost'")
+
+    empty = await tool.on_invoke_tool(wrapper, json.dumps({"messages": []}))
+    assert empty.startswith("Error: Missing required parameter 'messages'")
+
+    tool._pending_per_thread[id(wrapper.context.thread_manager)] = {"alpha"}
+    pending = await tool.on_invoke_tool(wrapper, _broadcast_args(("Alpha", "a")))
+    assert pending.startswith("Error: Cannot send another message to 'Alpha'")
+
+
+@pytest.mark.asyncio
+async def test_broadcast_streams_sub_agent_events_through_shared_context() -> None:
+    sender = _make_stub_agent("Sender")
+    alpha = _make_stub_agent("Alpha", response="from alpha")
+    beta = _make_stub_agent("Beta", response="from beta")
+    tool = BroadcastSendMessage(sender, recipients={"Alpha": alpha, "Beta": beta})
+    wrapper = _wrapper(alpha, beta, streaming=True)
+
+    result = await tool.on_invoke_tool(wrapper, _broadcast_args(("Alpha", "a"), ("Beta", "b")))
+
+    assert [entry["response"] for entry in json.loads(result)] == ["from alpha", "from beta"]
+    queue = wrapper.context.streaming_context.event_queue
+    forwarded_agents = set()
+    while not queue.empty():
+        event = queue.get_nowait()
+        forwarded_agents.add(getattr(event, "agent", None))
+    assert {"Alpha", "Beta"} <= forwarded_agents
+
+
+@pytest.mark.asyncio
+async def test_broadcast_failure_cancels_siblings_before_releasing_them() -> None:
+    sender = _make_stub_agent("Sender")
+    alpha, beta = _make_stub_agent("Alpha"), _make_stub_agent("Beta")
+    tool = BroadcastSendMessage(sender, recipients={"Alpha": alpha, "Beta": beta})
+    wrapper = _wrapper(alpha, beta)
+    pending_when_cancelled: list[set[str]] = []
+
+    async def fake_send(wrapper, recipient_agent, message, additional_instructions, tool_call_id):
+        if recipient_agent.name == "Alpha":
+            await asyncio.sleep(0)
+            raise RuntimeError("alpha failed")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            pending_when_cancelled.append(set(tool._pending_per_thread[id(wrapper.context.thread_manager)]))
+            raise
+        return "unreachable"
+
+    tool._send_to_recipient = fake_send  # type: ignore[method-assign]
+    with pytest.raises(RuntimeError, match="alpha failed"):
+        await tool.on_invoke_tool(wrapper, _broadcast_args(("Alpha", "a"), ("Beta", "b")))
+
+    assert pending_when_cancelled == [{"alpha", "beta"}]
+    assert tool._pending_per_thread == {}
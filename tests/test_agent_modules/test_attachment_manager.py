@@ -205,3 +205,27 @@ class TestAttachmentManager:
 
         # Verify tool configuration wasn't modified
         assert mock_code_tool.tool_config["container"] == "some_container_id"
+
+    @pytest.mark.asyncio
+    async def test_attachments_cleanup_only_releases_the_finishing_runs_files(self):
+        """A run finishing must not strip files that a concurrent run on the same agent still uses."""
+        mock_agent = Mock()
+        mock_agent.name = "TestAgent"
+        mock_agent.file_manager = Mock()
+        mock_code_tool = Mock(spec=CodeInterpreterTool)
+        mock_code_tool.tool_config = {"container": {"file_ids": ["file-shared", "file-first", "file-second"]}}
+        mock_agent.tools = [mock_code_tool]
+
+        attachment_manager = AttachmentManager(mock_agent)
+        attachment_manager._get_filename_by_id = Mock(return_value="report.txt")
+        first_run: list[str] = []
+        second_run: list[str] = []
+        await attachment_manager.process_message_and_files("a", ["file-shared", "file-first"], {}, "test", first_run)
+        await attachment_manager.process_message_and_files("b", ["file-shared", "file-second"], {}, "test", second_run)
+        assert first_run == ["file-shared", "file-first"]
+
+        attachment_manager.attachments_cleanup(first_run)
+        assert mock_code_tool.tool_config["container"]["file_ids"] == ["file-shared", "file-second"]
+
+        attachment_manager.attachments_cleanup(second_run)
+        assert mock_code_tool not in mock_agent.tools
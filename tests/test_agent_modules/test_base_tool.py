@@ -152,3 +152,115 @@ def test_base_tool_context_property_and_removed_shared_state() -> None:
 
     with pytest.raises(AttributeError, match=r"_shared_state"):
         _ = tool._shared_state
+
+
+def test_context_placeholder_survives_a_model_post_init_that_skips_super() -> None:
+    """Tools overriding model_post_init without calling super() should still get a placeholder context."""
+
+    class PostInitTool(BaseTool):
+        query: str
+        normalized: str = ""
+
+        def model_post_init(self, context, /) -> None:
+            self.normalized = self.query.strip().lower()
+
+        def run(self) -> str:
+            return self.normalized
+
+    tool = PostInitTool(query="  Hello ")
+
+    assert tool.normalized == "hello"
+    assert isinstance(tool.context, MasterContext)
+    assert tool.context is not PostInitTool(query="other").context
+
+
+def test_schemas_are_compiled_once_per_class_and_rebuilt_when_the_class_changes(monkeypatch) -> None:
+    """openai_schema and the adapter schema should reuse one build until the docstring or strict flag changes."""
+    from agency_swarm.tools.tool_factory_utils.base_tool_adapter import adapt_base_tool
+
+    class CachedTool(BaseTool):
+        """Original description."""
+
+        class ToolConfig:
+            strict = False
+
+        query: str
+
+        def run(self) -> str:
+            return self.query
+
+    builds: list[str] = []
+    original = CachedTool.model_json_schema.__func__
+
+    def counting_schema(cls, *args, **kwargs):
+        builds.append(cls.__name__)
+        return original(cls, *args, **kwargs)
+
+    monkeypatch.setattr(CachedTool, "model_json_schema", classmethod(counting_schema))
+
+    first = CachedTool.openai_schema
+    first["parameters"]["properties"].clear()
+    assert CachedTool.openai_schema["parameters"]["properties"]["query"]["type"] == "string"
+    adapt_base_tool(CachedTool)
+    adapt_base_tool(CachedTool)
+    assert len(builds) == 2  # one build each for the OpenAI schema and the FunctionTool parameters
+
+    CachedTool.__doc__ = "Changed description."
+    assert CachedTool.openai_schema["description"] == "Changed description."
+    CachedTool.ToolConfig.strict = True
+    assert CachedTool.openai_schema["strict"] is True
+    assert len(builds) == 6
+
+
+@pytest.mark.asyncio
+async def test_adapted_tool_builds_instances_with_the_run_context() -> None:
+    """Invocations should validate JSON directly and attach the caller's context."""
+    from agency_swarm.tools.tool_factory_utils.base_tool_adapter import adapt_base_tool
+
+    seen: list[RunContextWrapper | None] = []
+
+    class EchoTool(BaseTool):
+        text: str
+
+        def run(self) -> str:
+            seen.append(self._context)
+            return self.text
+
+    function_tool = adapt_base_tool(EchoTool)
+    run_context = RunContextWrapper(
+        context=MasterContext(thread_manager=None, agents={}, user_context={}, current_agent_name="Caller")
+    )
+
+    assert await function_tool.on_invoke_tool(run_context, '{"text": "hi"}') == "hi"
+    assert seen == [run_context]
+    assert (await function_tool.on_invoke_tool(run_context, '{"text": ')).startswith("Error: Invalid JSON input")
+    assert "text" in await function_tool.on_invoke_tool(run_context, '{"text": 1}')
+
+
+@pytest.mark.asyncio
+async def test_adapted_tool_runs_a_custom_init() -> None:
+    """Tools overriding __init__ should have it called with the decoded arguments and still get the run context."""
+    from agency_swarm.tools.tool_factory_utils.base_tool_adapter import adapt_base_tool
+
+    init_calls: list[dict] = []
+
+    class GreetingTool(BaseTool):
+        name: str
+        greeting: str = ""
+
+        def __init__(self, **data) -> None:
+            init_calls.append(dict(data))
+            super().__init__(**data)
+            self.greeting = f"Hello, {self.name}!"
+
+        def run(self) -> str:
+            assert self._context is run_context
+            return self.greeting
+
+    function_tool = adapt_base_tool(GreetingTool)
+    run_context = RunContextWrapper(
+        context=MasterContext(thread_manager=None, agents={}, user_context={}, current_agent_name="Caller")
+    )
+
+    assert await function_tool.on_invoke_tool(run_context, '{"name": "Ada"}') == "Hello, Ada!"
+    assert init_calls == [{"name": "Ada"}]
@@ -0,0 +1,89 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agency_swarm import Agency, Agent
+from agency_swarm.agent.context_assembly import order_tools_for_prompt_cache
+from agency_swarm.utils.thread import ThreadManager
+from tests.test_agent_modules.test_system_reminders_lifecycle_regressions import _InstructionRecordingModel
+from tests.test_agent_modules.test_system_reminders_review_regressions import _contains
+
+
+def _roles_and_text(items: list) -> list[tuple[str, str]]:
+    return [(str(item.get("role")), str(item.get("content"))) for item in items if isinstance(item, dict)]
+
+
+@pytest.mark.asyncio
+async def test_reminders_and_run_instructions_follow_the_history() -> None:
+    model = _InstructionRecordingModel()
+    agent = Agent(
+        name="Cached",
+        instructions="base instructions",
+        model=model,
+        system_reminders="stay brief",
+        stable_prompt_prefix=True,
+    )
+    agency = Agency(agent)
+
+    await agency.get_response("first", additional_instructions="run one")
+    await agency.get_response("second", additional_instructions="run two")
+
+    assert model.system_prompts == ["base instructions", "base instructions"]
+    assert _roles_and_text(model.inputs[0][-2:]) == [("system", "run one"), ("system", "stay brief")]
+    assert _roles_and_text(model.inputs[1][-2:]) == [("system", "run two"), ("system", "stay brief")]
+    # The first call's history is an unchanged prefix of the second call's input
+    first_history = model.inputs[0][:-2]
+    assert _roles_and_text(model.inputs[1][: len(first_history)]) == _roles_and_text(first_history)
+    assert ("system", "run one") not in _roles_and_text(model.inputs[1])
+    assert agent.instructions == "base instructions"
+
+
+@pytest.mark.asyncio
+async def test_additional_instructions_stay_in_system_prompt_by_default() -> None:
+    model = _InstructionRecordingModel()
+    agent = Agent(name="Default", instructions="base instructions", model=model, system_reminders="stay brief")
+
+    await agent.get_response("hello", additional_instructions="run one")
+
+    assert model.system_prompts == ["base instructions\n\nrun one"]
+    assert not _contains(model.inputs[0], "run one")
+    # Without stable_prompt_prefix, reminders keep their place before the history
+    assert _roles_and_text(model.inputs[0]) == [("system", "stay brief"), ("user", "hello")]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_keep_their_own_volatile_instructions() -> None:
+    model = _InstructionRecordingModel()
+    agent = Agent(name="Cached", instructions="base instructions", model=model, stable_prompt_prefix=True)
+    agency = Agency(agent)
+
+    await asyncio.gather(
+        *(
+            agency.get_response(
+                f"message {index}", additional_instructions=f"run {index}", thread_manager_override=ThreadManager()
+            )
+            for index in range(5)
+        )
+    )
+
+    assert len(model.inputs) == 5
+    for model_input in model.inputs:
+        texts = _roles_and_text(model_input)
+        index = next(text for role, text in texts if role == "user").split()[-1]
+        assert [text for role, text in texts if role == "system"] == [f"run {index}"]
+    assert model.system_prompts == ["base instructions"] * 5
+
+
+def test_mcp_tools_are_listed_in_a_fixed_order() -> None:
+    declared_b = SimpleNamespace(name="b")
+    declared_a = SimpleNamespace(name="a")
+    mcp_tools = [
+        SimpleNamespace(name="search", _agency_swarm_mcp_server_name="notion"),
+        SimpleNamespace(name="write", _agency_swarm_mcp_server_name="drive"),
+        SimpleNamespace(name="read", _agency_swarm_mcp_server_name="drive"),
+    ]
+
+    ordered = order_tools_for_prompt_cache([mcp_tools[0], declared_b, mcp_tools[1], declared_a, mcp_tools[2]])
+
+    assert [tool.name for tool in ordered] == ["b", "a", "read", "write", "search"]
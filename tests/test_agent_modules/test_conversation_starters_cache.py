@@ -58,6 +58,7 @@ from agency_swarm.agent.conversation_starters_cache import (
     reorder_cached_items_for_tools,
     save_cached_starter,
 )
+from agency_swarm.agent.starter_cache_store import flush_starter_cache_writes
 from agency_swarm.context import MasterContext
 from agency_swarm.tools.send_message import Handoff
 from agency_swarm.utils.thread import ThreadManager
@@ -170,6 +171,7 @@ async def test_quick_replies_are_cached_without_conversation_starters(tmp_path,
     context = _build_minimal_context(agent, None)
     await agent.get_response(quick_reply, agency_context=context)
 
+    flush_starter_cache_writes()
     cached = load_cached_starter(
         agent.name,
         quick_reply,
@@ -198,6 +200,7 @@ async def test_quick_replies_cache_and_replay_when_starter_cache_flag_is_disable
     first_result = await agent.get_response(quick_reply, agency_context=first_context)
     assert isinstance(first_result.final_output, str)
 
+    flush_starter_cache_writes()
     cached = load_cached_starter(agent.name, quick_reply)
     assert cached is not None
     expected_output = extract_final_output_text(cached.items)
@@ -231,6 +234,7 @@ async def test_quick_replies_stream_replay_when_starter_cache_flag_is_disabled(
 
     first_context = _build_minimal_context(agent, None)
     await agent.get_response(quick_reply, agency_context=first_context)
+    flush_starter_cache_writes()
     cached = load_cached_starter(agent.name, quick_reply)
     assert cached is not None
     expected_output = extract_final_output_text(cached.items)
@@ -266,6 +270,7 @@ async def test_conversation_starter_not_cached_when_starter_cache_flag_is_disabl
     context = _build_minimal_context(agent, None)
     await agent.get_response(starter, agency_context=context)
 
+    flush_starter_cache_writes()
     cached = load_cached_starter(agent.name, starter)
     assert cached is None
 
@@ -295,6 +300,7 @@ async def test_starter_cache_reload_keeps_shared_instructions(tmp_path, monkeypa
     )
     reloaded.refresh_conversation_starters_cache(shared_instructions=shared)
 
+    flush_starter_cache_writes()
     cached = load_cached_starter(
         reloaded.name,
         starter,
@@ -364,6 +370,7 @@ async def test_warm_conversation_starters_cache_uses_runtime_tools(tmp_path, mon
     sender.refresh_conversation_starters_cache(runtime_state=agency.get_agent_runtime_state(sender.name))
     await sender.warm_conversation_starters_cache(agency.get_agent_context(sender.name))
 
+    flush_starter_cache_writes()
     cached = load_cached_starter(
         sender.name,
         starter,
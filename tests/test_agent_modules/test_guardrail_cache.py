@@ -0,0 +1,177 @@
+import dataclasses
+
+import pytest
+
+from agency_swarm import (
+    Agent,
+    GuardrailCache,
+    GuardrailFunctionOutput,
+    InMemoryVerdictStore,
+    input_guardrail,
+    output_guardrail,
+)
+from agency_swarm.agent.conversation_starters_cache import compute_guardrail_fingerprint
+from agency_swarm.agent.guardrail_cache import CachedVerdict, VerdictStore, guardrail_cache_key
+from tests.deterministic_model import DeterministicModel
+
+
+def _counting_input_guardrail(calls: list[str]):
+    @input_guardrail(name="TopicCheck")
+    async def topic_check(context, agent, user_input):
+        calls.append(user_input)
+        blocked = "refund" in user_input.lower()
+        return GuardrailFunctionOutput(output_info="No refunds here." if blocked else "", tripwire_triggered=blocked)
+
+    return topic_check
+
+
+@pytest.mark.asyncio
+async def test_repeated_inputs_reuse_the_cached_verdict() -> None:
+    calls: list[str] = []
+    agent = Agent(
+        name="Support",
+        model=DeterministicModel(),
+        input_guardrails=[_counting_input_guardrail(calls)],
+        guardrail_cache=True,
+    )
+
+    await agent.get_response("Hello there")
+    await agent.get_response("  hello THERE ")
+    blocked = await agent.get_response("I want a refund")
+    await agent.get_response("i want a REFUND")
+
+    assert calls == ["Hello there", "I want a refund"]
+    assert blocked.final_output == "No refunds here."
+    assert len(agent.guardrail_cache.store) == 2
+
+
+@pytest.mark.asyncio
+async def test_output_guardrail_verdicts_are_cached() -> None:
+    calls: list[str] = []
+
+    @output_guardrail
+    async def no_secrets(context, agent, agent_output):
+        calls.append(agent_output)
+        return GuardrailFunctionOutput(output_info="", tripwire_triggered=False)
+
+    agent = Agent(
+        name="Writer",
+        model=DeterministicModel(default_response="Same answer"),
+        output_guardrails=[no_secrets],
+        guardrail_cache=GuardrailCache(ttl_seconds=60),
+    )
+
+    await agent.get_response("first")
+    await agent.get_response("second")
+
+    assert calls == ["Same answer"]
+
+
+@pytest.mark.asyncio
+async def test_key_fn_scopes_verdicts_to_the_run_context() -> None:
+    calls: list[str] = []
+    agent = Agent(
+        name="Support",
+        model=DeterministicModel(),
+        input_guardrails=[_counting_input_guardrail(calls)],
+        guardrail_cache=GuardrailCache(key_fn=lambda ctx: ctx.context.get("tenant")),
+    )
+
+    await agent.get_response("Hello", context_override={"tenant": "a"})
+    await agent.get_response("Hello", context_override={"tenant": "a"})
+    await agent.get_response("Hello", context_override={"tenant": "b"})
+    # Without a scope the check is never cached
+    await agent.get_response("Hello")
+    await agent.get_response("Hello")
+
+    assert calls == ["Hello"] * 4
+    assert len(agent.guardrail_cache.store) == 2
+
+
+def test_guardrail_changes_invalidate_the_key() -> None:
+    guardrail = _counting_input_guardrail([])
+    renamed = dataclasses.replace(guardrail, name="StricterTopicCheck")
+    rescheduled = dataclasses.replace(guardrail, run_in_parallel=False)
+
+    assert compute_guardrail_fingerprint(renamed) != compute_guardrail_fingerprint(guardrail)
+    assert compute_guardrail_fingerprint(rescheduled) == compute_guardrail_fingerprint(guardrail)
+    fingerprint = compute_guardrail_fingerprint(guardrail)
+    assert guardrail_cache_key("A", fingerprint, "input", "Hi") == guardrail_cache_key("A", fingerprint, "input", " hi")
+    assert guardrail_cache_key("A", fingerprint, "input", "Hi") != guardrail_cache_key("B", fingerprint, "input", "Hi")
+
+
+def test_non_text_inputs_are_not_cached() -> None:
+    image_message = {
+        "role": "user",
+        "content": [{"type": "input_text", "text": "what is this?"}, {"type": "input_image", "image_url": "x"}],
+    }
+    assert guardrail_cache_key("A", "f", "input", [image_message]) is None
+    assert guardrail_cache_key("A", "f", "input", [{"role": "user", "content": "Hi"}]) is not None
+
+
+def test_ttl_and_size_limits(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr("agency_swarm.agent.guardrail_cache.time.time", lambda: now[0])
+    cache = GuardrailCache(ttl_seconds=10, max_entries=2)
+    passed = GuardrailFunctionOutput(output_info="", tripwire_triggered=False)
+
+    cache.set("a", passed)
+    cache.set("b", passed)
+    assert cache.get("a") is passed
+    cache.set("c", passed)
+    assert cache.get("b") is None  # least recently used entry evicted
+    now[0] += 11
+    assert cache.get("a") is None
+    assert len(cache.store) == 1
+
+
+def test_custom_store_and_tripwire_opt_out() -> None:
+    class RecordingStore(VerdictStore):
+        def __init__(self) -> None:
+            self.entries: dict[str, CachedVerdict] = {}
+
+        def get(self, key: str) -> CachedVerdict | None:
+            return self.entries.get(key)
+
+        def set(self, key: str, verdict: CachedVerdict) -> None:
+            self.entries[key] = verdict
+
+        def delete(self, key: str) -> None:
+            self.entries.pop(key, None)
+
+        def clear(self) -> None:
+            self.entries.clear()
+
+    store = RecordingStore()
+    cache = GuardrailCache(store=store, cache_tripwires=False)
+    cache.set("ok", GuardrailFunctionOutput(output_info="", tripwire_triggered=False))
+    cache.set("blocked", GuardrailFunctionOutput(output_info="no", tripwire_triggered=True))
+
+    assert list(store.entries) == ["ok"]
+    assert isinstance(GuardrailCache().store, InMemoryVerdictStore)
+
+    class IncompleteStore(VerdictStore):
+        def get(self, key: str) -> CachedVerdict | None:
+            return None
+
+    with pytest.raises(TypeError):
+        IncompleteStore()  # type: ignore[abstract]
+
+
+@pytest.mark.asyncio
+async def test_cached_verdicts_release_speculative_runs() -> None:
+    calls: list[str] = []
+    agent = Agent(
+        name="Fast",
+        model=DeterministicModel(),
+        input_guardrails=[_counting_input_guardrail(calls)],
+        guardrail_cache=True,
+        speculative_input_guardrails=True,
+    )
+
+    for _ in range(2):
+        stream = agent.get_response_stream("hello")
+        events = [event async for event in stream]
+        assert events
+        assert (await stream.wait_final_result()).final_output == "OK"
+    assert calls == ["hello"]
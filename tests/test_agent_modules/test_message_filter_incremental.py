@@ -0,0 +1,145 @@
+"""IncrementalMessageFilter must match the batch MessageFilter pipeline while tracking pairs as items arrive."""
+
+import random
+
+import pytest
+from agents.models.fake_id import FAKE_RESPONSES_ID
+
+from agency_swarm.agent.execution_stream_persistence import _clean_up_run_tail, _run_tail_anchor
+from agency_swarm.messages import IncrementalMessageFilter, MessageFilter
+from agency_swarm.utils.thread import ThreadManager
+
+
+def _batch(messages: list[dict]) -> list[dict]:
+    cleaned = MessageFilter.remove_duplicates(messages)
+    cleaned = MessageFilter.filter_messages(cleaned)
+    return MessageFilter.remove_orphaned_messages(cleaned)
+
+
+def _incremental(messages: list[dict]) -> list[dict]:
+    history_filter = IncrementalMessageFilter()
+    for message in messages:
+        history_filter.add(message)
+    return history_filter.messages()
+
+
+def _random_history(rng: random.Random, size: int) -> list[dict]:
+    refs = [f"ref_{index}" for index in range(size // 3 + 1)]
+    ids = [f"msg_{index}" for index in range(size)] + [FAKE_RESPONSES_ID]
+    factories = [
+        lambda: {"type": "message", "role": "user", "content": "hi", "id": rng.choice(ids)},
+        lambda: {"type": "function_call", "call_id": rng.choice(refs), "id": rng.choice(ids)},
+        lambda: {"type": "function_call_output", "call_id": rng.choice(refs + [""])},
+        lambda: {"type": "mcp_approval_request", "id": rng.choice(refs)},
+        lambda: {"type": "mcp_approval_response", "approval_request_id": rng.choice(refs)},
+        lambda: {"type": "reasoning", "id": rng.choice(ids)},
+        lambda: {"type": "mcp_list_tools", "id": rng.choice(ids)},
+    ]
+    return [rng.choice(factories)() for _ in range(size)]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_incremental_filter_matches_batch_pipeline(seed: int) -> None:
+    rng = random.Random(seed)
+    messages = _random_history(rng, rng.randint(0, 40))
+
+    assert _incremental(messages) == _batch(messages)
+
+
+def test_incremental_filter_reports_clean_history_as_unchanged() -> None:
+    history_filter = IncrementalMessageFilter()
+    history_filter.extend(
+        [
+            {"type": "message", "role": "user", "content": "hi", "id": "msg_1"},
+            {"type": "function_call_output", "call_id": "call_1"},
+            {"type": "reasoning", "id": "rs_1"},
+            {"type": "function_call", "call_id": "call_1", "id": "fc_1"},
+        ]
+    )
+    assert not history_filter.changed
+
+    assert not history_filter.add({"type": "message", "role": "user", "content": "hi", "id": "msg_1"})
+    history_filter.add({"type": "reasoning", "id": "rs_2"})
+    assert history_filter.changed
+    assert [message.get("id") for message in history_filter.messages()] == ["msg_1", None, "rs_1", "fc_1"]
+
+
+def test_incremental_filter_avoids_rescanning_long_turns(monkeypatch) -> None:
+    """A long multi-tool turn is cleaned while items arrive instead of in several passes at the end."""
+    messages: list[dict] = []
+    for index in range(5000):
+        messages.append({"type": "reasoning", "id": f"rs_{index}"})
+        messages.append({"type": "function_call", "call_id": f"call_{index}", "id": f"fc_{index}"})
+        messages.append({"type": "function_call_output", "call_id": f"call_{index}"})
+    batch = _batch(messages)
+
+    history_filter = IncrementalMessageFilter()
+    for message in messages:
+        history_filter.add(message)
+
+    def _no_second_pass(*_args, **_kwargs):
+        raise AssertionError("a fully paired turn must not be rescanned for orphans")
+
+    monkeypatch.setattr(MessageFilter, "remove_orphaned_messages", _no_second_pass)
+    assert not history_filter.changed
+    assert history_filter.messages() == batch
+
+
+def test_stream_cleanup_scans_only_the_run_tail(monkeypatch) -> None:
+    history = [
+        {"type": "message", "role": "user", "content": f"old {index}", "id": f"msg_{index}"} for index in range(3)
+    ]
+    tail = [
+        {"type": "function_call", "call_id": "call_1", "id": "fc_1"},
+        {"type": "function_call", "call_id": "call_1", "id": "fc_1"},
+        {"type": "function_call_output", "call_id": "call_1"},
+        {"type": "function_call", "call_id": "call_orphan", "id": "fc_2"},
+    ]
+    thread_manager = ThreadManager()
+    thread_manager.replace_messages(history + tail)
+
+    def _no_full_copy(*_args, **_kwargs):
+        raise AssertionError("cleanup must not copy the whole thread")
+
+    monkeypatch.setattr(thread_manager, "get_all_messages", _no_full_copy)
+
+    assert _clean_up_run_tail(thread_manager, len(history)) == len(tail)
+    assert thread_manager.get_messages_since(0) == history + tail[1:3]
+
+
+def test_stream_cleanup_drops_tail_items_already_in_the_history(monkeypatch) -> None:
+    history = [
+        {"type": "message", "role": "user", "content": "old", "id": "msg_0"},
+        {"type": "reasoning", "id": "rs_1", "summary": []},
+    ]
+    tail = [
+        {"type": "reasoning", "id": "rs_1", "summary": []},
+        {"type": "message", "role": "assistant", "content": "new", "id": "msg_1"},
+    ]
+    thread_manager = ThreadManager()
+    thread_manager.replace_messages(history + tail)
+    monkeypatch.setattr(thread_manager, "get_all_messages", lambda: pytest.fail("cleanup must not copy the thread"))
+
+    assert _clean_up_run_tail(thread_manager, len(history)) == len(tail)
+    assert thread_manager.get_messages_since(0) == history + tail[1:]
+
+
+def test_stream_cleanup_follows_its_anchor_when_a_sibling_rewrites_earlier_messages() -> None:
+    history = [
+        {"type": "message", "role": "user", "content": f"old {index}", "id": f"msg_{index}"} for index in range(3)
+    ]
+    thread_manager = ThreadManager()
+    thread_manager.replace_messages(history)
+    run_anchor = _run_tail_anchor(thread_manager, len(history))
+    assert run_anchor is history[-1]
+
+    tail = [
+        {"type": "function_call", "call_id": "call_orphan", "id": "fc_1"},
+        {"type": "message", "role": "assistant", "content": "done", "id": "msg_3"},
+    ]
+    thread_manager.add_messages(tail)
+    # A sibling run drops an earlier message and stores copies of the rest, shifting every position by one
+    thread_manager.replace_messages([dict(message) for message in thread_manager.get_all_messages()[1:]])
+
+    assert _clean_up_run_tail(thread_manager, len(history), run_anchor) == len(tail)
+    assert thread_manager.get_all_messages() == history[1:] + tail[1:]
@@ -0,0 +1,146 @@
+import asyncio
+import time
+
+import pytest
+
+from agency_swarm import Agency, Agent, GuardrailFunctionOutput, InputGuardrailTripwireTriggered, input_guardrail
+from agency_swarm.tools import function_tool
+from tests.deterministic_model import DeterministicModel, _stream_text_events
+
+
+class _TimedModel(DeterministicModel):
+    """Records when each model call starts; streams can be made to stall after the first events."""
+
+    def __init__(self, *, stall: float = 0.0) -> None:
+        super().__init__(default_response="streamed answer")
+        self.stall = stall
+        self.started_at: list[float] = []
+        self.stream_cancelled = False
+
+    async def get_response(self, *args, **kwargs):
+        self.started_at.append(time.perf_counter())
+        return await super().get_response(*args, **kwargs)
+
+    def stream_response(self, *args, **kwargs):
+        self.started_at.append(time.perf_counter())
+        return self._stream()
+
+    async def _stream(self):
+        async for index, event in _enumerate(_stream_text_events(self._default_response, self.model)):
+            if index == 2 and self.stall:
+                try:
+                    await asyncio.sleep(self.stall)
+                except asyncio.CancelledError:
+                    self.stream_cancelled = True
+                    raise
+            yield event
+
+
+async def _enumerate(events):
+    index = 0
+    async for event in events:
+        yield index, event
+        index += 1
+
+
+def _slow_guardrail(delay: float, *, trip: bool, verdicts: list[float]):
+    @input_guardrail(run_in_parallel=False)
+    async def slow_check(context, agent, user_input):
+        await asyncio.sleep(delay)
+        verdicts.append(time.perf_counter())
+        return GuardrailFunctionOutput(output_info="Blocked by policy." if trip else "", tripwire_triggered=trip)
+
+    return slow_check
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("buffer_size", [True, 2])
+async def test_model_starts_before_guardrail_and_events_wait_for_verdict(buffer_size: bool | int) -> None:
+    verdicts: list[float] = []
+    model = _TimedModel()
+    agent = Agent(
+        name="Speculative",
+        model=model,
+        input_guardrails=[_slow_guardrail(0.2, trip=False, verdicts=verdicts)],
+        speculative_input_guardrails=buffer_size,
+    )
+
+    received_at: list[float] = []
+    stream = agent.get_response_stream("hello")
+    async for _event in stream:
+        received_at.append(time.perf_counter())
+    result = await stream.wait_final_result()
+
+    assert result is not None and result.final_output == "streamed answer"
+    assert model.started_at[0] < verdicts[0]
+    assert received_at and min(received_at) >= verdicts[0]
+
+
+@pytest.mark.asyncio
+async def test_tripwire_cancels_stream_and_discards_held_events() -> None:
+    verdicts: list[float] = []
+    model = _TimedModel(stall=10)
+    agent = Agent(
+        name="Speculative",
+        model=model,
+        input_guardrails=[_slow_guardrail(0.1, trip=True, verdicts=verdicts)],
+        speculative_input_guardrails=True,
+    )
+
+    agency = Agency(agent)
+
+    started = time.perf_counter()
+    events = [event async for event in agency.get_response_stream("hello")]
+
+    assert time.perf_counter() - started < 5
+    assert model.stream_cancelled
+    texts = [getattr(getattr(event, "data", None), "delta", None) for event in events]
+    assert not any(texts)
+    guidance = [event for event in events if getattr(getattr(event, "item", None), "raw_item", None) is not None]
+    assert guidance[-1].item.raw_item.id == "msg_input_guardrail_guidance"
+    stored = agency.thread_manager.get_all_messages()
+    assert [message["content"] for message in stored if message.get("role") == "assistant"] == ["Blocked by policy."]
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_wait_for_the_verdict() -> None:
+    verdicts: list[float] = []
+    calls: list[float] = []
+
+    @function_tool
+    def echo_tool(message: str) -> str:
+        """Echo the message back."""
+        calls.append(time.perf_counter())
+        return message
+
+    blocked = Agent(
+        name="Blocked",
+        model=DeterministicModel(),
+        tools=[echo_tool],
+        input_guardrails=[_slow_guardrail(0.2, trip=True, verdicts=verdicts)],
+        speculative_input_guardrails=True,
+        raise_input_guardrail_error=True,
+    )
+    with pytest.raises(InputGuardrailTripwireTriggered):
+        await blocked.get_response("echo 'side effect'")
+    assert calls == []
+
+    allowed = Agent(
+        name="Allowed",
+        model=DeterministicModel(),
+        tools=[echo_tool],
+        input_guardrails=[_slow_guardrail(0.2, trip=False, verdicts=verdicts)],
+        speculative_input_guardrails=True,
+    )
+    result = await allowed.get_response("echo 'side effect'")
+    assert result.final_output == "side effect"
+    assert calls and calls[0] >= verdicts[-1]
+
+
+def test_speculative_input_guardrails_validation() -> None:
+    assert Agent(name="A", model=DeterministicModel()).speculative_input_guardrails == 0
+    assert (
+        Agent(name="B", model=DeterministicModel(), speculative_input_guardrails=32).speculative_input_guardrails == 32
+    )
+    with pytest.raises(ValueError):
+        Agent(name="C", model=DeterministicModel(), speculative_input_guardrails=-1)
@@ -0,0 +1,252 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import pytest
+
+from agency_swarm import (
+    Agent,
+    DirectoryStarterStore,
+    GuardrailFunctionOutput,
+    SQLiteStarterStore,
+    StarterCacheStore,
+    input_guardrail,
+)
+from agency_swarm.agent import conversation_starters_cache, starter_cache_store
+from agency_swarm.agent.conversation_starters_cache import memoized_starter_cache_fingerprint
+from agency_swarm.agent.starter_cache_store import flush_starter_cache_writes, get_starter_cache_index
+from agency_swarm.tools import function_tool
+from tests.deterministic_model import DeterministicModel
+
+STARTER = "Hello starter"
+
+
+class CountingModel(DeterministicModel):
+    def __init__(self) -> None:
+        super().__init__(default_response="Cached answer")
+        self.calls = 0
+
+    async def get_response(self, *args, **kwargs):
+        self.calls += 1
+        return await super().get_response(*args, **kwargs)
+
+
+def _starter_agent(model: DeterministicModel, **kwargs: Any) -> Agent:
+    return Agent(
+        name="Starter",
+        instructions="Base instructions.",
+        model=model,
+        conversation_starters=[STARTER],
+        cache_conversation_starters=True,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_hits_are_served_from_memory(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("AGENCY_SWARM_CHATS_DIR", str(tmp_path))
+    model = CountingModel()
+    agent = _starter_agent(model)
+    await agent.get_response(STARTER)
+
+    def _no_disk(*_args, **_kwargs):
+        raise AssertionError("cache hits must not touch the store")
+
+    monkeypatch.setattr(agent.starter_cache_store, "load_agent", _no_disk)
+    monkeypatch.setattr(agent.starter_cache_store, "save", _no_disk)
+    for _ in range(3):
+        assert (await agent.get_response(" hello STARTER")).final_output == "Cached answer"
+    assert model.calls == 1
+
+
+def test_fingerprint_is_memoized_per_configuration_version(monkeypatch) -> None:
+    calls: list[str] = []
+    compute = conversation_starters_cache.compute_starter_cache_fingerprint
+
+    def counting_compute(agent, **kwargs):
+        calls.append(agent.name)
+        return compute(agent, **kwargs)
+
+    monkeypatch.setattr(conversation_starters_cache, "compute_starter_cache_fingerprint", counting_compute)
+    agent = Agent(name="Memo", instructions="Base", model=DeterministicModel())
+    first = memoized_starter_cache_fingerprint(agent)
+    assert memoized_starter_cache_fingerprint(agent) == first
+    assert len(calls) == 1
+
+    @function_tool
+    def lookup(query: str) -> str:
+        """Look something up."""
+        return query
+
+    agent.add_tool(lookup)
+    assert memoized_starter_cache_fingerprint(agent) != first
+    agent.instructions = "Changed"
+    changed = memoized_starter_cache_fingerprint(agent)
+    assert memoized_starter_cache_fingerprint(agent) == changed
+    assert len(calls) == 3
+
+
+def test_fingerprint_memo_hits_for_agents_rebuilt_per_request(monkeypatch) -> None:
+    calls: list[str] = []
+    compute = conversation_starters_cache.compute_starter_cache_fingerprint
+
+    def counting_compute(agent, **kwargs):
+        calls.append(agent.name)
+        return compute(agent, **kwargs)
+
+    monkeypatch.setattr(conversation_starters_cache, "compute_starter_cache_fingerprint", counting_compute)
+
+    def build_agent(by_topic: bool = False) -> Agent:
+        # Fresh tool, guardrail and model objects on every call, like an agency_factory per request
+        def lookup(query: str) -> str:
+            return query
+
+        def lookup_topic(topic: str) -> str:
+            return topic
+
+        tool = function_tool(lookup_topic if by_topic else lookup, name_override="lookup")
+
+        @input_guardrail
+        async def allow_all(context, agent, user_input) -> GuardrailFunctionOutput:
+            return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+        return Agent(
+            name="RebuiltMemo",
+            instructions="Base",
+            model=DeterministicModel(),
+            tools=[tool],
+            input_guardrails=[allow_all],
+        )
+
+    fingerprints = {memoized_starter_cache_fingerprint(build_agent()) for _ in range(20)}
+    assert len(fingerprints) == 1
+    assert len(calls) == 1
+
+    assert memoized_starter_cache_fingerprint(build_agent(by_topic=True)) not in fingerprints
+    assert len(calls) == 2
+
+
+def test_save_cached_starter_updates_the_shared_index(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("AGENCY_SWARM_CHATS_DIR", str(tmp_path))
+    agent = _starter_agent(CountingModel())
+    index = agent._starter_cache_index
+    assert index.get(STARTER) is None
+
+    reply = {"type": "message", "role": "assistant", "content": [{"type": "output_text", "text": "Saved answer"}]}
+    conversation_starters_cache.save_cached_starter(agent.name, STARTER, [reply])
+
+    cached = index.get(STARTER)
+    assert cached is not None and cached.items == [reply]
+
+
+def test_shared_indexes_are_evicted_least_recently_used_first(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(starter_cache_store, "_indexes", OrderedDict())
+    monkeypatch.setattr(starter_cache_store, "_MAX_INDEXES", 2)
+    store = DirectoryStarterStore(tmp_path)
+
+    first = get_starter_cache_index("First", store)
+    second = get_starter_cache_index("Second", store)
+    assert get_starter_cache_index("First", store) is first
+    get_starter_cache_index("Third", store)
+
+    assert get_starter_cache_index("First", store) is first
+    assert get_starter_cache_index("Second", store) is not second
+
+
+@pytest.mark.asyncio
+async def test_writes_do_not_block_the_run(tmp_path) -> None:
+    release = threading.Event()
+
+    class SlowStore(DirectoryStarterStore):
+        def save(self, agent_name: str, starter: str, payload: dict[str, Any]) -> None:
+            release.wait(5)
+            super().save(agent_name, starter, payload)
+
+    store = SlowStore(tmp_path)
+    agent = _starter_agent(CountingModel(), starter_cache_store=store)
+
+    started = time.perf_counter()
+    await agent.get_response(STARTER)
+    assert time.perf_counter() - started < 2
+    assert not list(tmp_path.glob("*.json"))
+
+    release.set()
+    flush_starter_cache_writes()
+    assert len(list(tmp_path.glob("Starter_*.json"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_store_survives_restarts(tmp_path) -> None:
+    database = tmp_path / "starters.db"
+    first_model = CountingModel()
+    await _starter_agent(first_model, starter_cache_store=SQLiteStarterStore(database)).get_response(STARTER)
+    flush_starter_cache_writes()
+
+    restarted_model = CountingModel()
+    restarted = _starter_agent(restarted_model, starter_cache_store=SQLiteStarterStore(database))
+    # Agents in one process share the index; drop it to read the database like a new process would
+    restarted._starter_cache_index.reload()
+    result = await restarted.get_response(STARTER)
+
+    assert result.final_output == "Cached answer"
+    assert restarted_model.calls == 0
+    with sqlite3.connect(database) as connection:
+        rows = connection.execute("SELECT agent, starter FROM starter_cache").fetchall()
+    assert rows == [("Starter", "hello starter")]
+
+
+@pytest.mark.asyncio
+async def test_agents_with_the_same_name_and_store_share_one_index(tmp_path) -> None:
+    release = threading.Event()
+    load_threads: list[threading.Thread] = []
+
+    class RecordingStore(DirectoryStarterStore):
+        def load_agent(self, agent_name: str) -> list[dict[str, Any]]:
+            load_threads.append(threading.current_thread())
+            return super().load_agent(agent_name)
+
+        def save(self, agent_name: str, starter: str, payload: dict[str, Any]) -> None:
+            release.wait(5)
+            super().save(agent_name, starter, payload)
+
+    first = _starter_agent(CountingModel(), starter_cache_store=RecordingStore(tmp_path))
+    await first.get_response(STARTER)
+    assert load_threads and load_threads[0] is not threading.current_thread()
+
+    # The first write is still queued; the second agent must be served without waiting for it
+    second_model = CountingModel()
+    second = _starter_agent(second_model, starter_cache_store=RecordingStore(tmp_path))
+    started = time.perf_counter()
+    assert (await second.get_response(STARTER)).final_output == "Cached answer"
+    assert time.perf_counter() - started < 2
+    assert second_model.calls == 0
+    assert len(load_threads) == 1
+    assert second._starter_cache_index is first._starter_cache_index
+
+    other_store = _starter_agent(CountingModel(), starter_cache_store=RecordingStore(tmp_path / "other"))
+    assert other_store._starter_cache_index is not first._starter_cache_index
+    release.set()
+    flush_starter_cache_writes()
+
+
+def test_store_subclasses_must_implement_every_method() -> None:
+    class LoadOnlyStore(StarterCacheStore):
+        def load_agent(self, agent_name: str) -> list[dict[str, Any]]:
+            return []
+
+    with pytest.raises(TypeError):
+        LoadOnlyStore()  # type: ignore[abstract]
+
+
+def test_directory_store_ignores_agents_sharing_a_file_prefix(tmp_path) -> None:
+    store = DirectoryStarterStore(tmp_path)
+    reply = {"type": "message", "role": "assistant", "content": [{"type": "output_text", "text": "hi"}]}
+    store.save("A", "hello", {"prompt": "hello", "agent": "A", "items": [reply], "metadata": {}})
+    store.save("A b", "hello", {"prompt": "hello", "agent": "A b", "items": [reply], "metadata": {}})
+
+    assert [payload["agent"] for payload in store.load_agent("A")] == ["A"]
+    with pytest.raises(TypeError):
+        Agent(name="Invalid", model=DeterministicModel(), starter_cache_store=str(tmp_path))
+    assert isinstance(Agent(name="Default", model=DeterministicModel()).starter_cache_store, StarterCacheStore)
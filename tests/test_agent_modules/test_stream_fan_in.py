@@ -0,0 +1,141 @@
+"""Fan-in streaming plumbing: task churn and cancellation.
+
+Task creation is counted through the loop's task factory and must stay constant instead of growing
+with the number of events. Throughput (events/sec) is measured by ``tests/benchmarks/stream_fan_in.py``.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+from agents import ModelSettings
+
+from agency_swarm import Agency, Agent
+from agency_swarm.streaming.utils import EventStreamMerger, StreamingContext
+from tests.deterministic_model import DeterministicModel, _stream_text_events
+
+EVENT_COUNT = 2000
+
+
+@contextmanager
+def _count_task_creations() -> Iterator[list[int]]:
+    loop = asyncio.get_running_loop()
+    previous_factory = loop.get_task_factory()
+    counter = [0]
+
+    def factory(loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any) -> asyncio.Task[Any]:
+        counter[0] += 1
+        if previous_factory is not None:
+            return previous_factory(loop, coro, **kwargs)
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    loop.set_task_factory(factory)
+    try:
+        yield counter
+    finally:
+        loop.set_task_factory(previous_factory)
+
+
+class _ManyDeltasModel(DeterministicModel):
+    """Streams ``delta_count`` text deltas per response, optionally pausing between them."""
+
+    def __init__(self, delta_count: int, delay: float = 0.0) -> None:
+        super().__init__(default_response="done")
+        self._delta_count = delta_count
+        self._delay = delay
+        self.produced = 0
+
+    def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        async def _events() -> AsyncIterator[Any]:
+            async for event in _stream_text_events(self._default_response, self.model):
+                if event.type != "response.output_text.delta":
+                    yield event
+                    continue
+                for _ in range(self._delta_count):
+                    if self._delay:
+                        await asyncio.sleep(self._delay)
+                    self.produced += 1
+                    yield event
+
+        return _events()
+
+
+def _agency(model: DeterministicModel) -> Agency:
+    agent = Agent(name="Streamer", instructions="Stream.", model=model, model_settings=ModelSettings(temperature=0.0))
+    return Agency(agent)
+
+
+@pytest.mark.asyncio
+async def test_merge_streams_uses_constant_task_count() -> None:
+    async def primary() -> AsyncGenerator[int]:
+        for index in range(EVENT_COUNT):
+            yield index
+            if index % 100 == 0:
+                await asyncio.sleep(0)
+
+    context = StreamingContext()
+    for index in range(EVENT_COUNT):
+        context.event_queue.put_nowait(-index - 1)
+
+    received: list[int] = []
+    with _count_task_creations() as tasks:
+        async for event in EventStreamMerger().merge_streams(primary(), context):
+            received.append(event)
+
+    assert tasks[0] <= 2
+    # Primary events arrive complete and in order; sub-agent events are interleaved, never reordered
+    assert [event for event in received if event >= 0] == list(range(EVENT_COUNT))
+    sub_events = [event for event in received if event < 0]
+    assert sub_events == sorted(sub_events, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_merge_streams_propagates_primary_errors() -> None:
+    async def primary() -> AsyncGenerator[int]:
+        yield 1
+        raise RuntimeError("boom")
+
+    received: list[int] = []
+    with pytest.raises(RuntimeError, match="boom"):
+        async for event in EventStreamMerger().merge_streams(primary(), StreamingContext()):
+            received.append(event)
+    assert received == [1]
+
+
+@pytest.mark.asyncio
+async def test_streaming_worker_task_creation_does_not_scale_with_events() -> None:
+    agency = _agency(_ManyDeltasModel(EVENT_COUNT))
+
+    with _count_task_creations() as tasks:
+        stream = agency.get_response_stream("Hello")
+        deltas = 0
+        async for event in stream:
+            if getattr(getattr(event, "data", None), "type", None) == "response.output_text.delta":
+                deltas += 1
+
+    assert deltas == EVENT_COUNT
+    assert tasks[0] < 50
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["immediate", "after_turn"])
+async def test_streaming_cancel_stops_long_stream(mode: str) -> None:
+    model = _ManyDeltasModel(EVENT_COUNT, delay=0.005)
+    agency = _agency(model)
+
+    stream = agency.get_response_stream("Hello")
+    deltas = 0
+    async for event in stream:
+        if getattr(getattr(event, "data", None), "type", None) == "response.output_text.delta":
+            deltas += 1
+            if deltas == 5:
+                stream.cancel(mode=mode)
+
+    if mode == "immediate":
+        # The model stream itself is closed, not just the consumer side
+        assert deltas <= model.produced < EVENT_COUNT
+    else:
+        # after_turn lets the in-flight model response finish
+        assert deltas == EVENT_COUNT
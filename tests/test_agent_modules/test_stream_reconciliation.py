@@ -0,0 +1,144 @@
+"""Streamed item reconciliation: identity matching at emission time and tail-only persistence.
+
+Persisting a streamed turn and the end-of-stream cleanup only touch the run's tail, never the earlier history.
+Timings against the full-history path are measured by ``tests/benchmarks/stream_reconciliation.py``.
+"""
+
+from types import SimpleNamespace
+
+from agents.items import MessageOutputItem, ReasoningItem, ToolCallItem, ToolCallOutputItem
+from agents.models.fake_id import FAKE_RESPONSES_ID
+from openai.types.responses import ResponseFunctionToolCall, ResponseOutputMessage, ResponseOutputText
+from openai.types.responses.response_reasoning_item import ResponseReasoningItem, Summary
+
+from agency_swarm import Agent
+from agency_swarm.agent.core import AgencyContext
+from agency_swarm.agent.execution_stream_persistence import (
+    StreamMetadataStore,
+    _clean_up_run_tail,
+    _persist_run_item_if_needed,
+    _persist_streamed_items,
+)
+from agency_swarm.utils.thread import ThreadManager
+
+TURN_ITEMS = 1000
+HISTORY_SIZE = 20_000
+
+
+def _turn_items(agent: Agent) -> list:
+    """Reasoning -> tool call -> tool output -> message groups, all with placeholder ids."""
+    items: list = []
+    for index in range(TURN_ITEMS // 4):
+        reasoning = ResponseReasoningItem(
+            id=FAKE_RESPONSES_ID, type="reasoning", summary=[Summary(text=f"think {index}", type="summary_text")]
+        )
+        call = ResponseFunctionToolCall(
+            id=FAKE_RESPONSES_ID, call_id=f"call_{index}", name="tool", arguments="{}", type="function_call"
+        )
+        output = {"type": "function_call_output", "call_id": f"call_{index}", "output": f"result {index}"}
+        message = ResponseOutputMessage(
+            id=FAKE_RESPONSES_ID,
+            type="message",
+            role="assistant",
+            status="completed",
+            content=[ResponseOutputText(type="output_text", text=f"step {index}", annotations=[])],
+        )
+        items.extend(
+            [
+                ReasoningItem(agent=agent, raw_item=reasoning),
+                ToolCallItem(agent=agent, raw_item=call),
+                ToolCallOutputItem(agent=agent, raw_item=output, output=f"result {index}"),
+                MessageOutputItem(agent=agent, raw_item=message),
+            ]
+        )
+    return items
+
+
+def _history() -> list[dict]:
+    return [
+        {"type": "message", "role": "user", "content": f"old {index}", "agent": "Runner", "callerAgent": None}
+        for index in range(HISTORY_SIZE)
+    ]
+
+
+def _stream_and_persist(agent: Agent, thread_manager: ThreadManager, items: list) -> int:
+    """Run the streaming persistence path plus end-of-stream cleanup and return how many messages cleanup scanned."""
+    agency_context = AgencyContext(agency_instance=None, thread_manager=thread_manager)
+    metadata_store = StreamMetadataStore()
+    initial_saved_count = HISTORY_SIZE
+
+    for run_item in items:
+        _persist_run_item_if_needed(
+            SimpleNamespace(type="run_item_stream_event", item=run_item),
+            agent=agent,
+            sender_name=None,
+            parent_run_id=None,
+            run_trace_id="trace",
+            current_stream_agent_name=agent.name,
+            current_agent_run_id="agent_run_1",
+            agency_context=agency_context,
+            metadata_store=metadata_store,
+        )
+    _persist_streamed_items(
+        streaming_result=SimpleNamespace(new_items=items),
+        metadata_store=metadata_store,
+        collected_items=items,
+        agent=agent,
+        sender_name=None,
+        parent_run_id=None,
+        run_trace_id="trace",
+        fallback_agent_run_id="agent_run_1",
+        agency_context=agency_context,
+        initial_saved_count=initial_saved_count,
+    )
+    return _clean_up_run_tail(thread_manager, initial_saved_count)
+
+
+def test_streamed_turn_persists_and_cleans_up_only_the_tail() -> None:
+    agent = Agent(name="Runner", instructions="noop")
+    thread_manager = ThreadManager()
+    thread_manager.replace_messages(_history())
+    items = _turn_items(agent)
+
+    scanned = _stream_and_persist(agent, thread_manager, items)
+
+    assert scanned == TURN_ITEMS
+    persisted = thread_manager.get_all_messages()
+    assert len(persisted) == HISTORY_SIZE + TURN_ITEMS
+    assert persisted[HISTORY_SIZE]["type"] == "reasoning"
+    assert all(message["agent_run_id"] == "agent_run_1" for message in persisted[HISTORY_SIZE:])
+
+
+def test_identity_matched_turn_skips_hashing_and_full_history_reads(monkeypatch) -> None:
+    agent = Agent(name="Runner", instructions="noop")
+    thread_manager = ThreadManager()
+    thread_manager.replace_messages(_history())
+    items = _turn_items(agent)
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("identity-matched items must not need hashing or a full-history copy")
+
+    monkeypatch.setattr("agency_swarm.agent.execution_stream_persistence._compute_content_hash", _fail)
+    monkeypatch.setattr(thread_manager, "get_all_messages", _fail)
+
+    _stream_and_persist(agent, thread_manager, items)
+
+    assert len(thread_manager.get_messages_since(0)) == HISTORY_SIZE + TURN_ITEMS
+
+
+def test_recreated_placeholder_items_fall_back_to_lazy_content_hash() -> None:
+    agent = Agent(name="Runner", instructions="noop")
+    streamed = ReasoningItem(
+        agent=agent,
+        raw_item=ResponseReasoningItem(
+            id=FAKE_RESPONSES_ID, type="reasoning", summary=[Summary(text="same", type="summary_text")]
+        ),
+    )
+    recreated = ReasoningItem(agent=agent, raw_item=streamed.raw_item.model_copy())
+
+    metadata_store = StreamMetadataStore()
+    metadata_store.record(streamed, ("Worker", "agent_run_worker", "Runner", 1))
+    assert metadata_store.hash_queues == {}
+
+    assert metadata_store.lookup(recreated) == ("Worker", "agent_run_worker", "Runner", 1)
+    assert metadata_store.lookup(recreated) is None
@@ -3,7 +3,7 @@ import pickle
 import pytest
 from agents.models.fake_id import FAKE_RESPONSES_ID
 
-from agency_swarm.utils.thread import ThreadManager
+from agency_swarm.utils.thread import ThreadManager, estimate_item_tokens
 
 
 def test_thread_manager_initialization():
@@ -420,3 +420,24 @@ def test_messages_with_none_type_and_same_id_should_not_dedupe():
     manager.add_message(second_message)
 
     assert len(manager._store.messages) == 2
+
+
+def test_estimated_tokens_track_each_thread_since_its_latest_checkpoint():
+    manager = ThreadManager()
+    user_message = {"role": "user", "content": "x" * 400, "agent": "A", "callerAgent": None}
+    delegated = {"role": "user", "content": "y" * 800, "agent": "B", "callerAgent": "A"}
+    manager.add_messages([user_message, delegated])
+
+    user_tokens = manager.estimated_tokens("A")
+    assert user_tokens > 100
+    assert manager.estimated_tokens("A", "B") == manager.estimated_tokens("B", "A") > 200
+
+    checkpoint = {"role": "system", "content": "summary", "agent": "A", "callerAgent": None, "history_checkpoint": True}
+    manager.insert_message_before(user_message, checkpoint)
+    assert manager.estimated_tokens("A") == estimate_item_tokens(checkpoint) + user_tokens
+    assert manager._store.messages[0] is checkpoint
+
+    manager.add_message({"role": "assistant", "content": "ok", "agent": "A", "callerAgent": None})
+    manager.replace_messages([checkpoint])
+    assert manager.estimated_tokens("A") < user_tokens
+    assert manager.estimated_tokens("A", "B") == 0
@@ -1,8 +1,12 @@
 """Unit tests for tool concurrency management."""
 
+import asyncio
+from types import SimpleNamespace
+
 import pytest
+from agents import RunContextWrapper
 
-from agency_swarm.tools.concurrency import LockState, ToolConcurrencyManager
+from agency_swarm.tools.concurrency import LockState, SingleFlightGroup, ToolConcurrencyManager
 
 
 class TestLockState:
@@ -182,3 +186,167 @@ class TestToolConcurrencyManager:
         busy, owner = manager.is_lock_active()
         assert busy is False
         assert owner is None
+
+
+class TestSingleFlightGroup:
+    """Test SingleFlightGroup request coalescing."""
+
+    def test_make_key_normalizes_argument_order(self):
+        """Test that equivalent JSON arguments produce the same key."""
+        assert SingleFlightGroup.make_key("tool", '{"a": 1, "b": 2}') == SingleFlightGroup.make_key(
+            "tool", '{"b":2,"a":1}'
+        )
+        assert SingleFlightGroup.make_key("tool", "") == SingleFlightGroup.make_key("tool", "{}")
+        assert SingleFlightGroup.make_key("tool", "not json") == "tool:not json"
+        assert SingleFlightGroup.make_key("a", "{}") != SingleFlightGroup.make_key("b", "{}")
+
+    assert SingleFlightGroup.make_key("a", "{}", "run-1") != SingleFlightGroup.make_key("a", "{}", "run-2")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_share_one_invocation(self):
+        """Test that identical concurrent calls run once and share the result."""
+        group = SingleFlightGroup()
+        calls = 0
+        release = asyncio.Event()
+
+        async def invoke():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "shared"
+
+        waiters = [asyncio.create_task(group.run("k", invoke)) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert group.in_flight_count() == 1
+        release.set()
+
+        assert await asyncio.gather(*waiters) == ["shared", "shared", "shared"]
+        assert calls == 1
+        assert group.in_flight_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_coalesced(self):
+        """Test that a finished flight is not reused by later calls."""
+        group = SingleFlightGroup()
+        calls = 0
+
+        async def invoke():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await group.run("k", invoke) == 1
+        assert await group.run("k", invoke) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        """Test that the shared call survives while at least one waiter remains."""
+        group = SingleFlightGroup()
+        release = asyncio.Event()
+
+        async def invoke():
+            await release.wait()
+            return "done"
+
+        first = asyncio.create_task(group.run("k", invoke))
+        second = asyncio.create_task(group.run("k", invoke))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+        release.set()
+        assert await second == "done"
+
+    @pytest.mark.asyncio
+    async def test_last_waiter_cancellation_cancels_shared_call(self):
+        """Test that the shared call is cancelled once every waiter has left."""
+        group = SingleFlightGroup()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def invoke():
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.create_task(group.run("k", invoke))
+        await started.wait()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        assert group.in_flight_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_every_waiter(self):
+        """Test that a failing shared call raises for each waiter."""
+        group = SingleFlightGroup()
+        release = asyncio.Event()
+
+        async def invoke():
+            await release.wait()
+            raise RuntimeError("backend down")
+
+        waiters = [asyncio.create_task(group.run("k", invoke)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_base_tool_deduplicate_concurrent_calls_config():
+    """Test that ToolConfig.deduplicate_concurrent_calls coalesces calls through the agent guard."""
+    from agency_swarm import Agent, BaseTool
+    from agency_swarm.tools import ToolFactory
+
+    calls = 0
+    release = asyncio.Event()
+
+    class LookupTool(BaseTool):
+        """Look up a value."""
+
+        query: str
+
+        class ToolConfig:
+            deduplicate_concurrent_calls = True
+
+        async def run(self):
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return f"result for {self.query}"
+
+    agent = Agent(name="DedupAgent", instructions="test", tools=[LookupTool])
+    tool = next(t for t in agent.tools if t.name == "LookupTool")
+    assert ToolFactory.adapt_base_tool(LookupTool).deduplicate_concurrent_calls is True
+
+    duplicates = [
+        asyncio.create_task(tool.on_invoke_tool(None, '{"query": "x"}')),
+        asyncio.create_task(tool.on_invoke_tool(None, '{ "query":"x" }')),
+    ]
+    distinct = asyncio.create_task(tool.on_invoke_tool(None, '{"query": "y"}'))
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert await asyncio.gather(*duplicates) == ["result for x", "result for x"]
+    assert await distinct == "result for y"
+    assert calls == 2
+
+    # Identical calls from two different runs (e.g. two users) each execute under their own context
+    release.clear()
+    runs = [
+        asyncio.create_task(tool.on_invoke_tool(RunContextWrapper(context=context), '{"query": "x"}'))
+        for context in (SimpleNamespace(user_context={"user": "a"}), SimpleNamespace(user_context={"user": "b"}))
+    ]
+    await asyncio.sleep(0.01)
+    release.set()
+    assert await asyncio.gather(*runs) == ["result for x", "result for x"]
+    assert calls == 4
@@ -78,6 +78,35 @@ class TestFromFile:
         # Should return empty list when file has syntax errors
         assert result == []
 
+    def test_modules_are_executed_once_until_the_file_changes(self, tmp_path):
+        """Repeated loads should reuse the imported module and pick up edits to the file."""
+        tool_file = tmp_path / "counted_tool.py"
+        counter_file = tmp_path / "executions.txt"
+        source = (
+            "from pathlib import Path\n"
+            "from agency_swarm import function_tool\n"
+            f"_counter = Path({str(counter_file)!r})\n"
+            "_counter.write_text(_counter.read_text() + 'x' if _counter.exists() else 'x')\n"
+            "@function_tool\n"
+            "def counted_tool(text: str) -> str:\n"
+            '    """Return {label}."""\n'
+            "    return text\n"
+        )
+        tool_file.write_text(source.replace("{label}", "the text"))
+
+        first = ToolFactory.from_file(tool_file)
+        second = ToolFactory.from_file(tool_file)
+
+        assert counter_file.read_text() == "x"
+        assert first[0] is not second[0]  # agents mutate the tools they add, so each load gets a copy
+        assert first[0].description == second[0].description == "Return the text."
+
+        tool_file.write_text(source.replace("{label}", "the given text"))
+        reloaded = ToolFactory.from_file(tool_file)
+
+        assert counter_file.read_text() == "xx"
+        assert reloaded[0].description == "Return the given text."
+
 
 class TestAdaptBaseTool:
     """Test BaseTool to FunctionTool adaptation."""
@@ -0,0 +1,34 @@
+"""Keep heavy optional dependencies off the ``import agency_swarm`` path.
+
+Time and memory budgets are machine dependent and are enforced by ``tests/benchmarks/cold_start.py`` instead.
+"""
+
+import subprocess
+import sys
+
+from tests.benchmarks.cold_start import run_benchmark
+
+
+def test_bare_import_skips_heavy_modules() -> None:
+    report = run_benchmark(runs=1)
+
+    assert report["heavy_modules"] == [], (
+        "`import agency_swarm` loaded modules that only server or tool-generation features need: "
+        f"{report['heavy_modules']}. Import them inside the function that uses them, or export them lazily "
+        "from agency_swarm.__getattr__."
+    )
+
+
+def test_lazy_exports_still_resolve() -> None:
+    completed = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from agency_swarm import run_fastapi, run_mcp, run_realtime; "
+            "from agency_swarm.integrations import run_fastapi as direct; "
+            "assert run_fastapi is direct and callable(run_mcp) and callable(run_realtime)",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert completed.returncode == 0, completed.stderr
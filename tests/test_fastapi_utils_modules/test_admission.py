@@ -0,0 +1,228 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from agency_swarm.integrations.fastapi_utils.admission import (
+    DEFAULT_TENANT,
+    AdmissionController,
+    AdmissionLimits,
+    AdmissionRejectedError,
+)
+from agency_swarm.integrations.fastapi_utils.endpoint_handlers import make_response_endpoint
+from agency_swarm.integrations.fastapi_utils.request_models import BaseRequest
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_admission_caps_agency_and_tenant_concurrency() -> None:
+    controller = AdmissionController(AdmissionLimits(max_concurrent_runs=3, max_concurrent_runs_per_tenant=2))
+
+    a1 = await controller.acquire("a")
+    a2 = await controller.acquire("a")
+    a3 = asyncio.create_task(controller.acquire("a"))
+    b1 = await controller.acquire("b")
+    c1 = asyncio.create_task(controller.acquire("c"))
+    await _settle()
+
+    assert not a3.done() and not c1.done()
+    assert controller.stats()["active_by_tenant"] == {"a": 2, "b": 1}
+    assert controller.stats()["queued_by_tenant"] == {"a": 1, "c": 1}
+
+    # "a" is at its own cap, so the freed agency slot skips it for "c"
+    controller.release(b1)
+    await _settle()
+    assert c1.done() and not a3.done()
+
+    controller.release(a1)
+    await _settle()
+    assert a3.done()
+
+    for ticket in (a2, a3.result(), c1.result()):
+        controller.release(ticket)
+    assert controller.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_admission_serves_tenants_round_robin() -> None:
+    controller = AdmissionController(AdmissionLimits(max_concurrent_runs=1))
+    holder = await controller.acquire("warmup")
+
+    order: list[str] = []
+
+    async def run(tenant: str) -> None:
+        ticket = await controller.acquire(tenant)
+        order.append(tenant)
+        await asyncio.sleep(0)
+        controller.release(ticket)
+
+    # A burst from tenant "a" queued before "b" and "c" must not delay them behind all of it
+    tasks = [asyncio.create_task(run(tenant)) for tenant in ["a", "a", "a", "a", "b", "c"]]
+    await _settle()
+    controller.release(holder)
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=5)
+
+    assert order == ["a", "b", "c", "a", "a", "a"]
+
+
+@pytest.mark.asyncio
+async def test_admission_sheds_with_retry_after() -> None:
+    controller = AdmissionController(
+        AdmissionLimits(
+            max_concurrent_runs=2,
+            max_concurrent_runs_per_tenant=1,
+            max_queued_requests=1,
+            queue_timeout_seconds=0.05,
+        )
+    )
+    a1 = await controller.acquire("a")
+    b1 = await controller.acquire("b")
+
+    # Queue deadline: the tenant is over its own cap, so the client is told to back off
+    with pytest.raises(AdmissionRejectedError) as timed_out:
+        await controller.acquire("a")
+    assert timed_out.value.status_code == 429
+    assert timed_out.value.headers == {"Retry-After": "1"}
+
+    # Full queue while the agency itself is saturated
+    waiting = asyncio.create_task(controller.acquire("b"))
+    await _settle()
+    with pytest.raises(AdmissionRejectedError) as queue_full:
+        await controller.acquire("c")
+    assert queue_full.value.status_code == 503
+    assert int(queue_full.value.headers["Retry-After"]) >= 1
+
+    with pytest.raises(AdmissionRejectedError):
+        await waiting
+    stats = controller.stats()
+    assert stats["queued"] == 0
+    assert stats["rejected"] == 3
+    controller.release(a1)
+    controller.release(b1)
+    assert controller.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_the_queue() -> None:
+    controller = AdmissionController(AdmissionLimits(max_concurrent_runs=1))
+    holder = await controller.acquire()
+    waiter = asyncio.create_task(controller.acquire())
+    await _settle()
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert controller.stats()["queued"] == 0
+
+    controller.release(holder)
+    assert controller.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_waiter_cancelled_before_dispatch_leaves_the_queue_count() -> None:
+    controller = AdmissionController(AdmissionLimits(max_concurrent_runs=1))
+    holder = await controller.acquire()
+    waiter = asyncio.create_task(controller.acquire())
+    await _settle()
+
+    # The release dispatches before the cancelled waiter runs its own cleanup
+    waiter.cancel()
+    controller.release(holder)
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    assert controller.stats()["queued"] == 0
+    assert controller.stats()["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_waiter_timing_out_as_its_slot_is_granted_releases_the_slot(monkeypatch: pytest.MonkeyPatch) -> None:
+    controller = AdmissionController(AdmissionLimits(max_concurrent_runs=1, queue_timeout_seconds=60))
+    holder = await controller.acquire()
+
+    deadlines: list[asyncio.Timeout] = []
+    real_timeout = asyncio.timeout
+
+    def recording_timeout(delay: float | None) -> asyncio.Timeout:
+        deadlines.append(real_timeout(delay))
+        return deadlines[-1]
+
+    monkeypatch.setattr(asyncio, "timeout", recording_timeout)
+    waiter = asyncio.create_task(controller.acquire())
+    await _settle()
+
+    # The deadline fires in the same loop iteration in which the release grants the waiter its slot
+    deadlines[0].reschedule(asyncio.get_running_loop().time())
+    controller.release(holder)
+    with pytest.raises(AdmissionRejectedError):
+        await waiter
+
+    assert controller.stats()["queued"] == 0
+    assert controller.stats()["active"] == 0
+
+
+def test_tenant_header_is_opt_in() -> None:
+    default = AdmissionController(AdmissionLimits())
+    assert default.tenant_for(None, {"X-Tenant-ID": "acme"}) == DEFAULT_TENANT
+    assert default.tenant_for("user-1", {"X-Tenant-ID": "acme"}) == "user-1"
+
+    controller = AdmissionController(AdmissionLimits(tenant_header="X-Tenant-ID"))
+    assert controller.tenant_for(None, {"X-Tenant-ID": "acme"}) == "acme"
+    assert controller.tenant_for("user-1", {"X-Tenant-ID": "acme"}) == "user-1"
+    assert controller.tenant_for(None, None) == DEFAULT_TENANT
+
+
+class _StubThreadManager:
+    def get_all_messages(self) -> list[dict[str, Any]]:
+        return []
+
+
+class _BlockingAgency:
+    def __init__(self, release: asyncio.Event) -> None:
+        self.thread_manager = _StubThreadManager()
+        self.mcp_servers: list[Any] = []
+        self.agents: dict[str, Any] = {}
+        self.entry_points: list[Any] = []
+        self._release = release
+
+    async def get_response(self, **_kwargs: Any) -> Any:
+        await self._release.wait()
+        return type("Result", (), {"final_output": "ok", "raw_responses": [], "new_items": []})()
+
+
+@pytest.mark.asyncio
+async def test_response_endpoint_holds_admission_for_the_whole_run(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def _noop_attach(_agency: Any) -> None:
+        return None
+
+    monkeypatch.setattr(
+        "agency_swarm.integrations.fastapi_utils.endpoint_handlers.attach_persistent_mcp_servers",
+        _noop_attach,
+    )
+    release = asyncio.Event()
+    controller = AdmissionController(AdmissionLimits(max_concurrent_runs=1, queue_timeout_seconds=0.05))
+    handler = make_response_endpoint(
+        BaseRequest,
+        lambda **_kwargs: _BlockingAgency(release),
+        lambda: None,
+        admission=controller,
+    )
+
+    first = asyncio.create_task(
+        handler(http_request=SimpleNamespace(headers={}), request=BaseRequest(message="hi"), token=None)
+    )
+    await _settle()
+    assert controller.stats()["active"] == 1
+
+    with pytest.raises(AdmissionRejectedError) as rejected:
+        await handler(http_request=SimpleNamespace(headers={}), request=BaseRequest(message="hi"), token=None)
+    assert rejected.value.status_code == 503
+
+    release.set()
+    assert (await first)["response"] == "ok"
+    assert controller.stats()["active"] == 0
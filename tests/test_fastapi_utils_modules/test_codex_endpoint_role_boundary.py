@@ -1,4 +1,5 @@
 from collections.abc import AsyncGenerator
+from types import SimpleNamespace
 from typing import Any, cast
 
 import pytest
@@ -66,6 +67,7 @@ async def test_response_endpoint_keeps_runner_input_and_filters_model_call_bound
     replayed = _history()
     handler = make_response_endpoint(BaseRequest, _agency_factory, verify_token=lambda: None)
     response = await handler(
+        SimpleNamespace(headers={}),
         BaseRequest(
             message="next",
             chat_history=replayed,
@@ -122,6 +124,7 @@ async def test_response_endpoint_keeps_system_replay_for_custom_model_with_codex
     replayed = _history()
     handler = make_response_endpoint(BaseRequest, _custom_model_agency_factory, verify_token=lambda: None)
     response = await handler(
+        SimpleNamespace(headers={}),
         BaseRequest(
             message="next",
             chat_history=replayed,
@@ -212,7 +215,9 @@ async def test_response_endpoint_rewrites_codex_system_replay_for_default_openai
 
     replayed = _history()
     handler = make_response_endpoint(BaseRequest, _agency_factory, verify_token=lambda: None)
-    response = await handler(BaseRequest(message="next", chat_history=replayed), token=None)
+    response = await handler(
+        SimpleNamespace(headers={}), BaseRequest(message="next", chat_history=replayed), token=None
+    )
 
     assert response["response"] == "ok"
     assert _roles(captured["input"]) == ["system", "system", "system", "user"]
@@ -244,6 +249,7 @@ async def test_agui_endpoint_keeps_runner_input_and_filters_model_call_boundary(
     replayed = _history()
     handler = make_agui_chat_endpoint(RunAgentInputCustom, _agency_factory, verify_token=lambda: None)
     response = await handler(
+        SimpleNamespace(headers={}),
         RunAgentInputCustom(
             thread_id="thread-1",
             run_id="run-1",
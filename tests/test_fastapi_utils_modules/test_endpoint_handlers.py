@@ -3,6 +3,7 @@
 import asyncio
 import json
 from collections.abc import AsyncGenerator
+from types import SimpleNamespace
 from typing import Any
 
 import pytest
@@ -203,7 +204,7 @@ async def test_make_response_endpoint_persists_file_url_sources(monkeypatch: pyt
     async def _noop_attach(_agency):
         return None
 
-    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None):
+    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None, upload_cache=None):
         del allowed_local_dirs, openai_client
         return {"doc.txt": "file-123"}
 
@@ -233,6 +234,7 @@ async def test_make_response_endpoint_persists_file_url_sources(monkeypatch: pyt
     handler = make_response_endpoint(BaseRequest, lambda **_: agency, verify_token=lambda: None)
 
     response = await handler(
+        SimpleNamespace(headers={}),
         BaseRequest(
             message="Use the attachment.",
             file_urls={"doc.txt": "https://example.com/doc.txt"},
@@ -263,7 +265,7 @@ async def test_make_response_endpoint_excludes_file_url_context_from_chat_name(
     async def _noop_attach(_agency):
         return None
 
-    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None):
+    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None, upload_cache=None):
         del allowed_local_dirs, openai_client
         return {"doc.txt": "file-123"}
 
@@ -302,6 +304,7 @@ async def test_make_response_endpoint_excludes_file_url_context_from_chat_name(
     handler = make_response_endpoint(BaseRequest, lambda **_: _AgencyStub(), verify_token=lambda: None)
 
     response = await handler(
+        SimpleNamespace(headers={}),
         BaseRequest(
             message="Use the attachment.",
             file_urls={"doc.txt": "https://example.com/doc.txt"},
@@ -350,7 +353,7 @@ async def test_agui_file_urls_error_emits_lifecycle_events(tmp_path):
         file_ids=None,
     )
 
-    response = await handler(request, token=None)
+    response = await handler(SimpleNamespace(headers={}), request, token=None)
 
     chunks = [chunk async for chunk in response.body_iterator]
 
@@ -375,7 +378,7 @@ async def test_agui_chat_endpoint_prepends_file_url_sources(monkeypatch: pytest.
     async def _noop_attach(_agency):
         return None
 
-    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None):
+    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None, upload_cache=None):
         del allowed_local_dirs, openai_client
         return {"doc.txt": "file-123"}
 
@@ -428,7 +431,7 @@ async def test_agui_chat_endpoint_prepends_file_url_sources(monkeypatch: pytest.
         file_ids=None,
     )
 
-    response = await handler(request, token=None)
+    response = await handler(SimpleNamespace(headers={}), request, token=None)
     _ = [chunk async for chunk in response.body_iterator]
 
     assert agency.last_kwargs is not None
@@ -450,7 +453,7 @@ async def test_agui_chat_endpoint_wraps_content_arrays_before_prepending_sources
     async def _noop_attach(_agency):
         return None
 
-    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None):
+    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None, upload_cache=None):
         del allowed_local_dirs, openai_client
         return {"doc.txt": "file-123"}
 
@@ -510,7 +513,7 @@ async def test_agui_chat_endpoint_wraps_content_arrays_before_prepending_sources
         user_context = None
         additional_instructions = None
 
-    response = await handler(_RequestStub(), token=None)
+    response = await handler(SimpleNamespace(headers={}), _RequestStub(), token=None)
     _ = [chunk async for chunk in response.body_iterator]
 
     assert agency.last_kwargs is not None
@@ -533,7 +536,7 @@ async def test_agui_chat_endpoint_snapshot_includes_file_url_sources(monkeypatch
     async def _noop_attach(_agency):
         return None
 
-    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None):
+    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None, upload_cache=None):
         del allowed_local_dirs, openai_client
         return {"doc.txt": "file-123"}
 
@@ -587,6 +590,7 @@ async def test_agui_chat_endpoint_snapshot_includes_file_url_sources(monkeypatch
     )
 
     response = await handler(
+        SimpleNamespace(headers={}),
         RunAgentInputCustom(
             thread_id="thread-1",
             run_id="run-1",
@@ -618,7 +622,7 @@ async def test_agui_chat_endpoint_snapshot_includes_file_url_sources_when_messag
     async def _noop_attach(_agency):
         return None
 
-    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None):
+    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None, upload_cache=None):
         del allowed_local_dirs, openai_client
         return {"doc.txt": "file-123"}
 
@@ -672,6 +676,7 @@ async def test_agui_chat_endpoint_snapshot_includes_file_url_sources_when_messag
     )
 
     response = await handler(
+        SimpleNamespace(headers={}),
         RunAgentInputCustom(
             thread_id="thread-1",
             run_id="run-1",
@@ -741,7 +746,7 @@ async def test_agui_stream_emits_keepalive_comments_while_oauth_pending(monkeypa
         forwarded_props=None,
         chat_history=[{"role": "user", "content": "hi"}],
     )
-    response = await handler(request, token=None, user_id="u1")
+    response = await handler(SimpleNamespace(headers={}), request, token=None, user_id="u1")
     chunks = [chunk async for chunk in response.body_iterator]
 
     assert any(chunk.startswith(": keepalive ") for chunk in chunks)
@@ -868,7 +873,7 @@ async def test_agui_endpoint_cancels_stream_task_on_teardown(monkeypatch: pytest
         forwarded_props=None,
         chat_history=[{"role": "user", "content": "hi"}],
     )
-    response = await handler(request, token=None)
+    response = await handler(SimpleNamespace(headers={}), request, token=None)
 
     async def _consume_stream() -> None:
         async for _chunk in response.body_iterator:
@@ -926,7 +931,7 @@ async def test_agui_chat_history_loads_prior_history_only() -> None:
             {"role": "user", "content": "current"},
         ],
     )
-    response = await handler(request, token=None)
+    response = await handler(SimpleNamespace(headers={}), request, token=None)
     _ = [chunk async for chunk in response.body_iterator]
 
     assert captured["message"] == "current"
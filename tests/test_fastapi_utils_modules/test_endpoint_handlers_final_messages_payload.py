@@ -1,6 +1,7 @@
 import asyncio
 import json
 from collections.abc import AsyncGenerator
+from types import SimpleNamespace
 from typing import Any, cast
 
 import pytest
@@ -13,14 +14,17 @@ from openai.types.responses.response_text_delta_event import ResponseTextDeltaEv
 import agency_swarm.integrations.fastapi_utils.endpoint_handlers as endpoint_handlers_module
 from agency_swarm import Agency, Agent
 from agency_swarm.agent.execution_stream_response import StreamingRunResponse
+from agency_swarm.integrations.fastapi_utils.chat_name_cache import ChatNameCache
 from agency_swarm.integrations.fastapi_utils.endpoint_handlers import (
     ActiveRun,
     ActiveRunRegistry,
     make_cancel_endpoint,
+    make_response_endpoint,
     make_stream_endpoint,
 )
 from agency_swarm.integrations.fastapi_utils.oauth_support import FastAPIOAuthConfig, OAuthStateRegistry
 from agency_swarm.integrations.fastapi_utils.request_models import BaseRequest, CancelRequest
+from agency_swarm.utils.run_timings import RunTimings
 
 
 class _StubRequest:
@@ -100,7 +104,7 @@ async def test_stream_endpoint_excludes_file_url_context_from_chat_name(
     async def _noop_attach(_agency: Any) -> None:
         return None
 
-    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None):
+    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None, upload_cache=None):
         del allowed_local_dirs, openai_client
         return {"doc.txt": "file-123"}
 
@@ -168,7 +172,7 @@ async def test_stream_endpoint_prepends_file_url_source_context(monkeypatch: pyt
     async def _noop_attach(_agency: Any) -> None:
         return None
 
-    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None):
+    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None, upload_cache=None):
         del allowed_local_dirs, openai_client
         return {"doc.txt": "file-123"}
 
@@ -462,3 +466,171 @@ async def test_cancel_endpoint_rewrites_fake_ids(monkeypatch: pytest.MonkeyPatch
 async def _empty_stream() -> AsyncGenerator[dict[str, Any]]:
     if False:
         yield {}
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_emits_timings_event_when_requested(monkeypatch: pytest.MonkeyPatch) -> None:
+    """include_timings adds a dedicated SSE event between the messages payload and the end marker."""
+
+    async def _noop_attach(_agency: Any) -> None:
+        return None
+
+    monkeypatch.setattr(
+        "agency_swarm.integrations.fastapi_utils.endpoint_handlers.attach_persistent_mcp_servers",
+        _noop_attach,
+    )
+
+    timings = RunTimings()
+    with timings.span("history_preparation", agent_run_id="agent_run_1"):
+        pass
+
+    async def _stream() -> AsyncGenerator[dict[str, Any]]:
+        if False:
+            yield {}
+
+    stream = StreamingRunResponse(_stream())
+    stream._resolve_final_result(cast(Any, SimpleNamespace(timings=timings, raw_responses=[])))
+    agency = _StubAgency(stream, _StubThreadManager())
+
+    handler = make_stream_endpoint(BaseRequest, lambda **_kwargs: agency, lambda: None, ActiveRunRegistry())
+    response = await handler(
+        http_request=_StubRequest(),
+        request=BaseRequest(message="hello", include_timings=True),
+        token=None,
+    )
+    chunks = [chunk async for chunk in response.body_iterator]
+
+    event_names = [chunk.split("\n", 1)[0] for chunk in chunks if chunk.startswith("event: ")]
+    assert event_names[-3:] == ["event: messages", "event: timings", "event: end"]
+    timings_chunk = next(chunk for chunk in chunks if chunk.startswith("event: timings"))
+    payload = json.loads(timings_chunk.split("data: ", 1)[1])
+    assert [span["name"] for span in payload["spans"]] == ["history_preparation"]
+
+
+def _sse_event_names(chunks: list[str]) -> list[str]:
+    return [
+        line.split("event: ", 1)[1].strip()
+        for chunk in chunks
+        for line in chunk.splitlines()
+        if line.startswith("event: ")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_delivers_slow_chat_name_as_late_event(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A chat name that is not ready yet must not hold back the messages event."""
+    release_name = asyncio.Event()
+
+    async def _noop_attach(_agency: Any) -> None:
+        return None
+
+    async def _slow_generate_chat_name(messages, openai_client=None):
+        del messages, openai_client
+        await release_name.wait()
+        return "Late Title"
+
+    monkeypatch.setattr(endpoint_handlers_module, "attach_persistent_mcp_servers", _noop_attach)
+    monkeypatch.setattr(endpoint_handlers_module, "generate_chat_name", _slow_generate_chat_name)
+
+    async def _stream() -> AsyncGenerator[dict[str, Any]]:
+        if False:
+            yield {}
+
+    agency = _StubAgency(StreamingRunResponse(_stream()), _StubThreadManager())
+    handler = make_stream_endpoint(BaseRequest, lambda **_kwargs: agency, lambda: None, ActiveRunRegistry())
+    response = await handler(
+        http_request=_StubRequest(),
+        request=BaseRequest(message="hello", generate_chat_name=True),
+        token=None,
+    )
+
+    chunks: list[str] = []
+    async for chunk in response.body_iterator:
+        chunks.append(chunk)
+        if chunk.startswith("event: messages"):
+            release_name.set()
+
+    assert "chat_name" not in _parse_sse_messages_payload(chunks)
+    assert _sse_event_names(chunks)[-3:] == ["messages", "chat_name", "end"]
+    assert '"chat_name": "Late Title"' in chunks[-2]
+
+
+@pytest.mark.asyncio
+async def test_response_endpoint_names_chat_while_the_run_proceeds(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Chat naming overlaps the agency run and is memoized for later turns of the same conversation."""
+    run_started = asyncio.Event()
+    name_calls: list[Any] = []
+
+    async def _noop_attach(_agency: Any) -> None:
+        return None
+
+    async def _generate_chat_name(messages, openai_client=None):
+        del openai_client
+        name_calls.append(messages)
+        # Only resolves if the run was started without waiting for the name
+        await asyncio.wait_for(run_started.wait(), timeout=5)
+        return "Greeting Chat"
+
+    class _Agency:
+        def __init__(self) -> None:
+            self.agents: dict[str, Any] = {}
+            self.thread_manager = _StubThreadManager()
+
+        async def get_response(self, **_kwargs: Any) -> SimpleNamespace:
+            run_started.set()
+            await asyncio.sleep(0.05)
+            return SimpleNamespace(final_output="ok")
+
+    monkeypatch.setattr(endpoint_handlers_module, "attach_persistent_mcp_servers", _noop_attach)
+    monkeypatch.setattr(endpoint_handlers_module, "generate_chat_name", _generate_chat_name)
+    handler = make_response_endpoint(
+        BaseRequest, lambda **_kwargs: _Agency(), verify_token=lambda: None, chat_name_cache=ChatNameCache()
+    )
+
+    first = await handler(
+        SimpleNamespace(headers={}), BaseRequest(message="hello", chat_id="chat-1", generate_chat_name=True), token=None
+    )
+    follow_up = await handler(
+        SimpleNamespace(headers={}),
+        BaseRequest(
+            message="and another thing",
+            chat_history=[
+                {"role": "user", "content": "hello", "type": "message"},
+                {"role": "assistant", "content": "ok", "type": "message"},
+            ],
+            chat_id="chat-1",
+            generate_chat_name=True,
+        ),
+        token=None,
+    )
+
+    assert first["chat_name"] == follow_up["chat_name"] == "Greeting Chat"
+    assert name_calls == [[{"role": "user", "content": "hello"}]]
+
+
+@pytest.mark.asyncio
+async def test_chat_name_memo_is_keyed_by_chat_id_and_owner(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Names are never shared by matching message content: only the same chat ID of the same owner reuses one."""
+    name_calls = 0
+
+    async def _generate_chat_name(messages, openai_client=None):
+        nonlocal name_calls
+        del messages, openai_client
+        name_calls += 1
+        return f"Chat {name_calls}"
+
+    monkeypatch.setattr(endpoint_handlers_module, "generate_chat_name", _generate_chat_name)
+    cache = ChatNameCache()
+
+    async def chat_name(chat_id: str | None, owner: str) -> str:
+        request = BaseRequest(message="hello", chat_id=chat_id, generate_chat_name=True)
+        return await endpoint_handlers_module._start_chat_name_generation(request, None, cache, owner)
+
+    names = [
+        await chat_name("chat-1", "alice"),
+        await chat_name("chat-1", "bob"),
+        await chat_name(None, "alice"),
+        await chat_name("chat-1", "alice"),
+    ]
+
+    assert names == ["Chat 1", "Chat 2", "Chat 3", "Chat 1"]
@@ -1,11 +1,24 @@
 """Unit tests for fastapi_utils file_handler module."""
 
+import asyncio
 import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
 
 import pytest
 
-from agency_swarm.integrations.fastapi_utils.file_handler import upload_from_urls
+from agency_swarm.integrations.fastapi_utils import endpoint_handlers, file_handler
+from agency_swarm.integrations.fastapi_utils.file_handler import (
+    FileUploadCache,
+    _get_http_client,
+    _get_openai_client,
+    _wait_for_file_processed,
+    close_shared_clients,
+    upload_from_urls,
+)
 
 
 @pytest.mark.asyncio
@@ -313,3 +326,271 @@ async def test_upload_from_urls_rejects_nonexistent_local_file(tmp_path: Path) -
 
     with pytest.raises(FileNotFoundError, match="Local file not found"):
         await upload_from_urls({"doc.txt": str(file_path)}, allowed_local_dirs=[str(tmp_path)])
+
+
+def _patch_upload_and_wait(monkeypatch: pytest.MonkeyPatch, calls: dict[str, int]) -> None:
+    async def fake_upload(path: str) -> str:
+        calls["upload"] += 1
+        return f"file-{calls['upload']}"
+
+    async def fake_wait(_file_id: str) -> None:
+        calls["wait"] += 1
+        await asyncio.sleep(0.01)
+
+    async def fake_exists(_file_id: str) -> bool:
+        return True
+
+    monkeypatch.setattr("agency_swarm.integrations.fastapi_utils.file_handler.upload_to_openai", fake_upload)
+    monkeypatch.setattr("agency_swarm.integrations.fastapi_utils.file_handler._wait_for_file_processed", fake_wait)
+    monkeypatch.setattr("agency_swarm.integrations.fastapi_utils.file_handler._file_exists", fake_exists)
+
+
+class _PayloadHandler(BaseHTTPRequestHandler):
+    payload = b"remote attachment"
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.payload)))
+        self.end_headers()
+        self.wfile.write(self.payload)
+
+    def log_message(self, _format: str, *_args: object) -> None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_upload_cache_reuses_file_id_for_same_local_content(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Identical content is uploaded once, including when two concurrent requests attach it."""
+    first = tmp_path / "a.txt"
+    first.write_text("same bytes", encoding="utf-8")
+    second = tmp_path / "b.txt"
+    second.write_text("same bytes", encoding="utf-8")
+    calls = {"upload": 0, "wait": 0}
+    _patch_upload_and_wait(monkeypatch, calls)
+    cache = FileUploadCache()
+
+    results = await asyncio.gather(
+        upload_from_urls({"a.txt": str(first)}, allowed_local_dirs=[tmp_path], upload_cache=cache),
+        upload_from_urls({"b.txt": str(second)}, allowed_local_dirs=[tmp_path], upload_cache=cache),
+    )
+    again = await upload_from_urls({"a.txt": str(first)}, allowed_local_dirs=[tmp_path], upload_cache=cache)
+
+    assert results == [{"a.txt": "file-1"}, {"b.txt": "file-1"}]
+    assert again == {"a.txt": "file-1"}
+    assert calls == {"upload": 1, "wait": 1}
+
+    first.write_text("changed bytes", encoding="utf-8")
+    changed = await upload_from_urls({"a.txt": str(first)}, allowed_local_dirs=[tmp_path], upload_cache=cache)
+    assert changed == {"a.txt": "file-2"}
+
+
+@pytest.mark.asyncio
+async def test_upload_cache_revalidates_remote_url_with_etag(monkeypatch: pytest.MonkeyPatch) -> None:
+    """An unchanged URL costs one conditional request: no body download, upload or processing wait."""
+    payload = b"remote attachment"
+    requests: list[str | None] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            requests.append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, _format: str, *_args: object) -> None:
+            return None
+
+    calls = {"upload": 0, "wait": 0}
+    _patch_upload_and_wait(monkeypatch, calls)
+    cache = FileUploadCache()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/notes.txt"
+        first = await upload_from_urls({"notes.txt": url}, upload_cache=cache)
+        second = await upload_from_urls({"notes.txt": url}, upload_cache=cache)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert first == second == {"notes.txt": "file-1"}
+    assert requests == [None, '"v1"']
+    assert calls == {"upload": 1, "wait": 1}
+
+
+@pytest.mark.asyncio
+async def test_upload_cache_reuploads_file_missing_upstream(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """A cached file ID that OpenAI no longer has is evicted and the content is uploaded again."""
+    file_path = tmp_path / "doc.txt"
+    file_path.write_text("hello", encoding="utf-8")
+    calls = {"upload": 0, "wait": 0}
+    _patch_upload_and_wait(monkeypatch, calls)
+    deleted: set[str] = set()
+
+    async def fake_exists(file_id: str) -> bool:
+        return file_id not in deleted
+
+    monkeypatch.setattr("agency_swarm.integrations.fastapi_utils.file_handler._file_exists", fake_exists)
+    cache = FileUploadCache()
+
+    first = await upload_from_urls({"doc.txt": str(file_path)}, allowed_local_dirs=[tmp_path], upload_cache=cache)
+    deleted.add("file-1")
+    second = await upload_from_urls({"doc.txt": str(file_path)}, allowed_local_dirs=[tmp_path], upload_cache=cache)
+    third = await upload_from_urls({"doc.txt": str(file_path)}, allowed_local_dirs=[tmp_path], upload_cache=cache)
+
+    assert (first, second, third) == ({"doc.txt": "file-1"}, {"doc.txt": "file-2"}, {"doc.txt": "file-2"})
+    assert calls["upload"] == 2
+
+
+@pytest.mark.asyncio
+async def test_upload_cache_upload_outlives_cancelled_request(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The shared upload owns the downloaded file, so cancelling the request that started it is harmless."""
+    calls = {"upload": 0, "wait": 0}
+    _patch_upload_and_wait(monkeypatch, calls)
+    started = asyncio.Event()
+    proceed = asyncio.Event()
+    read: list[tuple[Path, bytes]] = []
+
+    async def fake_upload(path: str) -> str:
+        calls["upload"] += 1
+        started.set()
+        await proceed.wait()
+        read.append((Path(path), Path(path).read_bytes()))
+        return "file-1"
+
+    monkeypatch.setattr("agency_swarm.integrations.fastapi_utils.file_handler.upload_to_openai", fake_upload)
+    cache = FileUploadCache()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PayloadHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/notes.txt"
+        first = asyncio.create_task(upload_from_urls({"notes.txt": url}, upload_cache=cache))
+        await started.wait()
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        proceed.set()
+        second = await upload_from_urls({"notes.txt": url}, upload_cache=cache)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert second == {"notes.txt": "file-1"}
+    assert calls["upload"] == 1
+    [(path, content)] = read
+    assert content == _PayloadHandler.payload
+    assert not path.parent.exists()
+
+
+@pytest.mark.asyncio
+async def test_upload_cache_is_scoped_to_openai_account(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """File IDs from one API key are never handed to a request that uploads with another key."""
+    file_path = tmp_path / "doc.txt"
+    file_path.write_text("hello", encoding="utf-8")
+    uploads: list[str] = []
+
+    async def fake_upload(path: str, openai_client: Any = None) -> str:
+        uploads.append(openai_client.api_key)
+        return f"file-{openai_client.api_key}"
+
+    async def fake_wait(_file_id: str, openai_client: Any = None) -> None:
+        return None
+
+    async def fake_exists(_file_id: str, openai_client: Any = None) -> bool:
+        return True
+
+    monkeypatch.setattr("agency_swarm.integrations.fastapi_utils.file_handler.upload_to_openai", fake_upload)
+    monkeypatch.setattr("agency_swarm.integrations.fastapi_utils.file_handler._wait_for_file_processed", fake_wait)
+    monkeypatch.setattr("agency_swarm.integrations.fastapi_utils.file_handler._file_exists", fake_exists)
+    cache = FileUploadCache()
+
+    results = [
+        await upload_from_urls(
+            {"doc.txt": str(file_path)},
+            allowed_local_dirs=[tmp_path],
+            openai_client=SimpleNamespace(api_key=key, base_url="https://api.openai.com/v1/"),
+            upload_cache=cache,
+        )
+        for key in ("key-a", "key-b", "key-a")
+    ]
+
+    assert results == [{"doc.txt": "file-key-a"}, {"doc.txt": "file-key-b"}, {"doc.txt": "file-key-a"}]
+    assert uploads == ["key-a", "key-b"]
+
+
+@pytest.mark.asyncio
+async def test_wait_for_file_processed_shares_one_poller_with_backoff() -> None:
+    """Concurrent waiters for one file share a poller that backs off instead of polling every second."""
+    retrieved: list[float] = []
+    loop = asyncio.get_running_loop()
+
+    async def retrieve(file_id: str) -> SimpleNamespace:
+        retrieved.append(loop.time())
+        return SimpleNamespace(status="processed" if len(retrieved) >= 4 else "uploaded")
+
+    client = SimpleNamespace(files=SimpleNamespace(retrieve=retrieve))
+
+    started = loop.time()
+    await asyncio.gather(*(_wait_for_file_processed("file-1", openai_client=client) for _ in range(5)))
+    elapsed = loop.time() - started
+
+    assert len(retrieved) == 4
+    # 0.1 + 0.2 + 0.4 seconds of backoff, well under the previous fixed one-second interval
+    assert elapsed < 1.5
+    gaps = [later - earlier for earlier, later in zip(retrieved, retrieved[1:], strict=False)]
+    assert gaps == sorted(gaps)
+
+
+@pytest.mark.asyncio
+async def test_close_shared_clients_closes_the_running_loops_clients(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    http_client = _get_http_client()
+    openai_client = _get_openai_client()
+    assert _get_http_client() is http_client
+
+    await close_shared_clients()
+
+    assert http_client.is_closed
+    assert openai_client.is_closed()
+    replacement = _get_http_client()
+    assert replacement is not http_client
+    await close_shared_clients()
+
+
+def test_run_fastapi_leaves_upload_cache_off_and_closes_clients_on_shutdown(monkeypatch: pytest.MonkeyPatch) -> None:
+    from fastapi.testclient import TestClient
+
+    from agency_swarm import Agency, Agent
+    from agency_swarm.integrations.fastapi import run_fastapi
+
+    upload_caches: list[Any] = []
+    make_response_endpoint = endpoint_handlers.make_response_endpoint
+
+    def recording_make_response_endpoint(*args: Any, **kwargs: Any) -> Any:
+        upload_caches.append(kwargs.get("upload_cache"))
+        return make_response_endpoint(*args, **kwargs)
+
+    closed: list[bool] = []
+
+    async def recording_close() -> None:
+        closed.append(True)
+
+    monkeypatch.setattr(endpoint_handlers, "make_response_endpoint", recording_make_response_endpoint)
+    monkeypatch.setattr(file_handler, "close_shared_clients", recording_close)
+    agent = Agent(name="TestAgent", model="gpt-5.6-luna")
+    app = run_fastapi(agencies={"test": lambda **kwargs: Agency(agent)}, return_app=True)
+
+    assert upload_caches == [None]
+    with TestClient(app):
+        assert closed == []
+    assert closed == [True]
@@ -0,0 +1,48 @@
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agency_swarm import Agency, Agent
+from agency_swarm.integrations.fastapi import run_fastapi
+from agency_swarm.utils.metrics import MetricsRegistry, get_metrics_registry, set_metrics_registry
+
+
+@pytest.fixture
+def restore_registry() -> Iterator[None]:
+    previous = get_metrics_registry()
+    try:
+        yield
+    finally:
+        set_metrics_registry(previous)
+
+
+def test_metrics_endpoint_reports_route_latency_and_runtime_gauges(restore_registry: None) -> None:
+    agent = Agent(name="TestAgent", model="gpt-5.6-luna")
+    app = run_fastapi(
+        agencies={"test": lambda **kwargs: Agency(agent)},
+        return_app=True,
+        enable_metrics=True,
+        metrics_registry=MetricsRegistry(),
+    )
+    client = TestClient(app)
+
+    assert client.get("/test/get_metadata").status_code == 200
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert 'agency_swarm_http_requests_total{method="GET",route="/test/get_metadata",status="200"} 1' in lines
+    assert any(
+        line.startswith('agency_swarm_http_request_seconds_count{method="GET",route="/test/get_metadata"')
+        for line in lines
+    )
+    assert "# TYPE agency_swarm_active_runs gauge" in lines
+    assert "# TYPE agency_swarm_mcp_drivers gauge" in lines
+
+
+def test_metrics_endpoint_is_opt_in() -> None:
+    agent = Agent(name="TestAgent", model="gpt-5.6-luna")
+    app = run_fastapi(agencies={"test": lambda **kwargs: Agency(agent)}, return_app=True)
+    assert TestClient(app).get("/metrics").status_code == 404
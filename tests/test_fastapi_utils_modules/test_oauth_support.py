@@ -916,7 +916,7 @@ async def test_fastapi_oauth_runtime_installs_handlers_after_request_lease(monke
     )
 
     with pytest.raises(HTTPException) as excinfo:
-        await endpoint(DummyRequest(), token=None, user_id="user-1")
+        await endpoint(SimpleNamespace(headers={}), DummyRequest(), token=None, user_id="user-1")
 
     assert excinfo.value.status_code == 400
     assert order[:2] == ["lease", "install"]
@@ -1093,7 +1093,7 @@ async def test_get_response_rejects_oauth_servers_without_streaming() -> None:
 
     req = DummyRequest()
     with pytest.raises(HTTPException) as excinfo:
-        await endpoint(req, token=None, user_id="user-1")
+        await endpoint(SimpleNamespace(headers={}), req, token=None, user_id="user-1")
     assert excinfo.value.status_code == 400
     assert "get_response_stream" in excinfo.value.detail
 
@@ -1158,7 +1158,7 @@ async def test_get_response_allows_hosted_mcp_tool_without_streaming_when_hosted
     )
 
     req = DummyRequest()
-    response = await endpoint(req, token=None, user_id="user-1")
+    response = await endpoint(SimpleNamespace(headers={}), req, token=None, user_id="user-1")
     assert response == {"response": "ok", "new_messages": []}
 
 
@@ -1214,8 +1214,8 @@ async def test_get_response_authenticated_user_id_does_not_mutate_shared_agency_
         oauth_config=FastAPIOAuthConfig(OAuthStateRegistry(), user_id_dependency=lambda: "test-user"),
     )
 
-    await endpoint(DummyRequest(), token=None, user_id="authenticated-user")
-    await endpoint(DummyRequest(), token=None, user_id="second-user")
+    await endpoint(SimpleNamespace(headers={}), DummyRequest(), token=None, user_id="authenticated-user")
+    await endpoint(SimpleNamespace(headers={}), DummyRequest(), token=None, user_id="second-user")
 
     assert shared_agency.user_context == {"plan": "base"}
     assert shared_agency.seen_contexts == [{"user_id": "authenticated-user"}, {"user_id": "second-user"}]
@@ -1389,7 +1389,7 @@ async def test_get_response_without_oauth_config_marks_public_hosted_mcp_as_disa
     )
 
     req = DummyRequest()
-    response = await endpoint(req, token=None, user_id="user-1")
+    response = await endpoint(SimpleNamespace(headers={}), req, token=None, user_id="user-1")
     assert response == {"response": "ok", "new_messages": []}
     assert seen_flags == [False]
 
@@ -1457,7 +1457,7 @@ async def test_get_response_rejects_hosted_mcp_tool_without_streaming() -> None:
 
     req = DummyRequest()
     with pytest.raises(HTTPException) as excinfo:
-        await endpoint(req, token=None, user_id="user-1")
+        await endpoint(SimpleNamespace(headers={}), req, token=None, user_id="user-1")
     assert excinfo.value.status_code == 400
     assert "get_response_stream" in excinfo.value.detail
 
@@ -1529,7 +1529,7 @@ async def test_agui_endpoint_enables_hosted_mcp_oauth_when_opted_in(monkeypatch)
         ),
     )
 
-    response = await endpoint(DummyRequest(), token=None, user_id="user-1")
+    response = await endpoint(SimpleNamespace(headers={}), DummyRequest(), token=None, user_id="user-1")
     async for _ in response.body_iterator:
         pass
 
@@ -1572,7 +1572,7 @@ async def test_agui_endpoint_clears_oauth_user_context_after_stream() -> None:
         oauth_config=FastAPIOAuthConfig(OAuthStateRegistry(), user_id_dependency=lambda: "test-user"),
     )
 
-    response = await endpoint(DummyRequest(), token=None, user_id="user-1")
+    response = await endpoint(SimpleNamespace(headers={}), DummyRequest(), token=None, user_id="user-1")
     async for _ in response.body_iterator:
         pass
 
@@ -1630,6 +1630,6 @@ async def test_get_response_rejects_deferred_oauth_servers_without_streaming() -
 
     req = DummyRequest()
     with pytest.raises(HTTPException) as excinfo:
-        await endpoint(req, token=None, user_id="user-1")
+        await endpoint(SimpleNamespace(headers={}), req, token=None, user_id="user-1")
     assert excinfo.value.status_code == 400
     assert "get_response_stream" in excinfo.value.detail
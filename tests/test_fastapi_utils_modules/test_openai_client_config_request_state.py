@@ -4,6 +4,7 @@ The end-to-end behavior is covered in integration tests under `tests/integration
 """
 
 import asyncio
+from types import SimpleNamespace
 
 import pytest
 from pydantic import ValidationError
@@ -64,7 +65,7 @@ async def test_make_response_endpoint_builds_upload_client_after_lease(monkeypat
         assert lease_acquired is True
         return upload_client
 
-    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None):
+    async def _fake_upload_from_urls(_file_urls, allowed_local_dirs=None, openai_client=None, upload_cache=None):
         del allowed_local_dirs
         assert openai_client is upload_client
         return {"doc.txt": "file-123"}
@@ -78,6 +79,7 @@ async def test_make_response_endpoint_builds_upload_client_after_lease(monkeypat
 
     handler = make_response_endpoint(BaseRequest, _agency_factory, verify_token=lambda: None)
     response = await handler(
+        SimpleNamespace(headers={}),
         BaseRequest(
             message="hello",
             file_urls={"doc.txt": "https://example.com/doc.txt"},
@@ -141,7 +143,7 @@ async def test_make_response_endpoint_forwards_structured_message_without_file_u
     monkeypatch.setattr(endpoint_handlers, "upload_from_urls", _unexpected_upload)
 
     handler = make_response_endpoint(BaseRequest, lambda **_: _Agency(), verify_token=lambda: None)
-    response = await handler(BaseRequest(message=structured_message), token=None)
+    response = await handler(SimpleNamespace(headers={}), BaseRequest(message=structured_message), token=None)
 
     assert response["response"] == "ok"
     assert seen_message == structured_message
@@ -254,7 +256,10 @@ async def test_make_response_endpoint_serializes_singleton_agency_requests(monke
     # No client_config on the second request to verify mixed traffic is still serialized.
     request_b = BaseRequest(message="b")
 
-    await asyncio.gather(handler(request_a, token=None), handler(request_b, token=None))
+    await asyncio.gather(
+        handler(SimpleNamespace(headers={}), request_a, token=None),
+        handler(SimpleNamespace(headers={}), request_b, token=None),
+    )
 
     assert agency.max_in_flight == 1
 
@@ -309,7 +314,10 @@ async def test_make_response_endpoint_allows_concurrency_without_client_config(m
     request_a = BaseRequest(message="a")
     request_b = BaseRequest(message="b")
 
-    await asyncio.gather(handler(request_a, token=None), handler(request_b, token=None))
+    await asyncio.gather(
+        handler(SimpleNamespace(headers={}), request_a, token=None),
+        handler(SimpleNamespace(headers={}), request_b, token=None),
+    )
 
     assert agency.max_in_flight == 2
 
@@ -365,7 +373,7 @@ async def test_make_response_endpoint_does_not_release_unacquired_lock(monkeypat
     request = BaseRequest(message="a", client_config=ClientConfig(default_headers={"x-request": "a"}))
 
     with pytest.raises(RuntimeError, match="acquire failed"):
-        await handler(request, token=None)
+        await handler(SimpleNamespace(headers={}), request, token=None)
 
     assert released is False
 
@@ -766,11 +774,11 @@ async def test_make_response_endpoint_blocks_new_regular_requests_while_override
     request_override = BaseRequest(message="o", client_config=ClientConfig(default_headers={"x-request": "o"}))
     request_regular_b = BaseRequest(message="b")
 
-    regular_a_task = asyncio.create_task(handler(request_regular_a, token=None))
+    regular_a_task = asyncio.create_task(handler(SimpleNamespace(headers={}), request_regular_a, token=None))
     await asyncio.wait_for(agency.first_request_started.wait(), timeout=0.2)
-    override_task = asyncio.create_task(handler(request_override, token=None))
+    override_task = asyncio.create_task(handler(SimpleNamespace(headers={}), request_override, token=None))
     await asyncio.sleep(0)
-    regular_b_task = asyncio.create_task(handler(request_regular_b, token=None))
+    regular_b_task = asyncio.create_task(handler(SimpleNamespace(headers={}), request_regular_b, token=None))
     agency.allow_first_request_to_finish.set()
 
     await asyncio.gather(regular_a_task, override_task, regular_b_task)
@@ -3,6 +3,8 @@
 The end-to-end behavior is covered in integration tests under `tests/integration/fastapi/`.
 """
 
+from types import SimpleNamespace
+
 import pytest
 
 
@@ -139,6 +141,7 @@ async def test_make_response_endpoint_applies_client_config_to_agent_client_sync
     handler = make_response_endpoint(BaseRequest, _agency_factory, verify_token=lambda: None)
 
     response = await handler(
+        SimpleNamespace(headers={}),
         BaseRequest(
             message="hi",
             client_config=ClientConfig(api_key="sk-request-key", base_url="https://api.openai.com/v1"),
@@ -205,13 +208,14 @@ async def test_make_response_endpoint_restores_agent_client_sync_after_override(
     handler = make_response_endpoint(BaseRequest, _agency_factory, verify_token=lambda: None)
 
     await handler(
+        SimpleNamespace(headers={}),
         BaseRequest(
             message="first",
             client_config=ClientConfig(api_key="sk-request-key", base_url="https://api.openai.com/v1"),
         ),
         token=None,
     )
-    await handler(BaseRequest(message="second"), token=None)
+    await handler(SimpleNamespace(headers={}), BaseRequest(message="second"), token=None)
 
     assert seen_api_keys == ["sk-request-key", "sk-env-default"]
 
@@ -260,6 +264,7 @@ async def test_make_response_endpoint_passes_request_client_to_chat_name_generat
 
     handler = make_response_endpoint(BaseRequest, _agency_factory, verify_token=lambda: None)
     response = await handler(
+        SimpleNamespace(headers={}),
         BaseRequest(
             message="hello",
             generate_chat_name=True,
@@ -335,6 +340,7 @@ async def test_make_response_endpoint_uses_existing_client_for_chat_name_headers
 
     handler = make_response_endpoint(BaseRequest, _agency_factory, verify_token=lambda: None)
     response = await handler(
+        SimpleNamespace(headers={}),
         BaseRequest(
             message="hello",
             generate_chat_name=True,
@@ -0,0 +1,120 @@
+"""Cancellation across workers that share a run registry backend."""
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+
+from agency_swarm.integrations.fastapi_utils.endpoint_handlers import (
+    ActiveRun,
+    ActiveRunRegistry,
+    make_cancel_endpoint,
+)
+from agency_swarm.integrations.fastapi_utils.request_models import CancelRequest
+from agency_swarm.integrations.fastapi_utils.run_registry import RunRegistryBackend, SQLiteRunRegistryBackend
+
+POLL_INTERVAL = 0.05
+
+
+class _StubThreadManager:
+    def __init__(self) -> None:
+        self.messages: list[dict[str, Any]] = [{"type": "message", "role": "user", "content": "earlier"}]
+
+    def get_all_messages(self) -> list[dict[str, Any]]:
+        return list(self.messages)
+
+
+class _StubAgency:
+    def __init__(self) -> None:
+        self.thread_manager = _StubThreadManager()
+
+
+class _StubStream:
+    def __init__(self) -> None:
+        self.cancelled_at: float | None = None
+        self.cancel_mode: str | None = None
+
+    def cancel(self, mode: str = "immediate") -> None:
+        self.cancelled_at = time.monotonic()
+        self.cancel_mode = mode
+
+
+async def _serve_run(registry: ActiveRunRegistry, run_id: str, active_run: ActiveRun) -> None:
+    """Owner worker: stream until cancelled, then persist a partial answer and finish."""
+    await registry.register(run_id, active_run)
+    await active_run.cancel_event.wait()
+    active_run.agency.thread_manager.messages.append(
+        {"type": "message", "role": "assistant", "content": [{"type": "output_text", "text": "partial"}]}
+    )
+    await registry.finish(run_id)
+
+
+@pytest.mark.asyncio
+async def test_cancel_reaches_run_owned_by_another_worker(tmp_path) -> None:
+    backend_path = tmp_path / "runs.sqlite"
+    owner = ActiveRunRegistry(SQLiteRunRegistryBackend(backend_path), cancel_poll_interval=POLL_INTERVAL)
+    other = ActiveRunRegistry(SQLiteRunRegistryBackend(backend_path), cancel_poll_interval=POLL_INTERVAL)
+    stream = _StubStream()
+    active_run = ActiveRun(stream=stream, agency=_StubAgency(), initial_message_count=1)  # type: ignore[arg-type]
+
+    serve_task = asyncio.create_task(_serve_run(owner, "run_1", active_run))
+    while await owner.get("run_1") is None:
+        await asyncio.sleep(0)
+
+    cancel = make_cancel_endpoint(CancelRequest, lambda: None, other)
+    requested_at = time.monotonic()
+    result = await cancel(CancelRequest(run_id="run_1", cancel_mode="after_turn"), token=None)
+    await serve_task
+
+    # The owner applied the cancel within the polling bound (generous margin for slow CI machines)
+    assert stream.cancel_mode == "after_turn"
+    assert stream.cancelled_at is not None and stream.cancelled_at - requested_at < POLL_INTERVAL * 10
+    assert result["ok"] and result["cancelled"] and not result["timed_out"]
+    assert [message["role"] for message in result["new_messages"]] == ["assistant"]
+    assert await owner.get("run_1") is None
+
+
+@pytest.mark.asyncio
+async def test_cancel_of_unknown_or_finished_run_is_not_found(tmp_path) -> None:
+    backend = SQLiteRunRegistryBackend(tmp_path / "runs.sqlite")
+    owner = ActiveRunRegistry(backend, cancel_poll_interval=POLL_INTERVAL)
+    other = ActiveRunRegistry(backend, cancel_poll_interval=POLL_INTERVAL)
+    active_run = ActiveRun(stream=_StubStream(), agency=_StubAgency(), initial_message_count=1)  # type: ignore[arg-type]
+    await owner.register("run_done", active_run)
+    await owner.finish("run_done")
+
+    cancel = make_cancel_endpoint(CancelRequest, lambda: None, other)
+    for run_id in ("run_done", "run_missing"):
+        with pytest.raises(HTTPException) as exc_info:
+            await cancel(CancelRequest(run_id=run_id), token=None)
+        assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_sqlite_backend_delivers_each_cancel_request_once(tmp_path) -> None:
+    backend = SQLiteRunRegistryBackend(tmp_path / "runs.sqlite")
+    await backend.add_run("run_a")
+    await backend.add_run("run_b")
+
+    assert await backend.request_cancel("run_a", "immediate")
+    assert await backend.request_cancel("run_a", "after_turn")  # the first mode wins
+    assert await backend.pop_cancel_requests(["run_a", "run_b"]) == {"run_a": "immediate"}
+    assert await backend.pop_cancel_requests(["run_a", "run_b"]) == {}
+
+    assert await backend.finish_run("run_a")
+    assert not await backend.finish_run("run_b")
+    assert not await backend.request_cancel("run_b", "immediate")
+    await backend.set_cancel_result("run_a", {"ok": True})
+    assert await backend.pop_cancel_result("run_a") == {"ok": True}
+    assert await backend.pop_cancel_result("run_a") is None
+
+
+def test_incomplete_backend_fails_at_construction() -> None:
+    class AddOnlyBackend(RunRegistryBackend):
+        async def add_run(self, run_id: str) -> None:
+            return None
+
+    with pytest.raises(TypeError):
+        AddOnlyBackend()  # type: ignore[abstract]
@@ -0,0 +1,162 @@
+import json
+import zlib
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+
+from agency_swarm.agent.execution_stream_response import StreamingRunResponse
+from agency_swarm.integrations.fastapi_utils.endpoint_handlers import ActiveRunRegistry, make_stream_endpoint
+from agency_swarm.integrations.fastapi_utils.request_models import BaseRequest
+from agency_swarm.integrations.fastapi_utils.stream_transport import (
+    MSGPACK_MEDIA_TYPE,
+    SSE_MEDIA_TYPE,
+    StreamEncoder,
+)
+
+
+class _HeaderRequest:
+    def __init__(self, headers: dict[str, str]) -> None:
+        self.headers = headers
+
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+class _StubThreadManager:
+    def get_all_messages(self) -> list[dict[str, Any]]:
+        return [{"role": "assistant", "content": "ok", "type": "message"}]
+
+
+class _StubAgency:
+    def __init__(self) -> None:
+        self.thread_manager = _StubThreadManager()
+        self.mcp_servers: list[Any] = []
+        self.agents = {}
+        self.entry_points = []
+
+    def get_response_stream(self, **_kwargs: Any) -> StreamingRunResponse:
+        async def _events() -> AsyncGenerator[dict[str, Any]]:
+            for index in range(3):
+                yield {"type": "test", "index": index}
+
+        return StreamingRunResponse(_events())
+
+
+async def _frames(*frames: str | bytes) -> AsyncGenerator[str | bytes]:
+    for frame in frames:
+        yield frame
+
+
+def test_negotiate_defaults_to_plain_sse() -> None:
+    for headers in (None, {}, {"Accept": "text/event-stream"}):
+        transport = StreamEncoder.negotiate(headers)
+        assert transport.compression is None
+        assert transport.binary is False
+        assert transport.media_type == SSE_MEDIA_TYPE
+        assert "Content-Encoding" not in transport.headers
+
+
+def test_negotiate_ignores_accept_encoding_unless_compression_is_allowed() -> None:
+    assert StreamEncoder.negotiate({"Accept-Encoding": "gzip, deflate, br"}).compression is None
+
+
+def test_negotiate_prefers_gzip_and_honours_refusals() -> None:
+    def negotiate(accept_encoding: str) -> StreamEncoder:
+        return StreamEncoder.negotiate({"Accept-Encoding": accept_encoding}, allow_compression=True)
+
+    assert StreamEncoder.negotiate({"accept-encoding": "deflate, gzip;q=0.5"}, allow_compression=True).compression == (
+        "gzip"
+    )
+    assert negotiate("gzip;q=0, deflate").compression == "deflate"
+    assert negotiate("br").compression is None
+    assert negotiate("gzip").headers["Content-Encoding"] == "gzip"
+
+
+def test_sse_frames_keep_the_existing_wire_format() -> None:
+    transport = StreamEncoder()
+    assert transport.event({"data": {"a": 1}}) == 'data: {"data": {"a": 1}}\n\n'
+    assert transport.event({"run_id": "r"}, "meta") == 'event: meta\ndata: {"run_id": "r"}\n\n'
+    assert transport.event("[DONE]", "end") == "event: end\ndata: [DONE]\n\n"
+    assert transport.comment("keepalive 1") == ": keepalive 1\n\n"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compression", ["gzip", "deflate"])
+async def test_compressed_stream_decodes_frame_by_frame(compression: str) -> None:
+    transport = StreamEncoder(compression=compression)
+    frames = [transport.event({"data": {"type": "delta", "index": index}}) for index in range(20)]
+
+    decompressor = zlib.decompressobj(wbits=31 if compression == "gzip" else 15)
+    chunks = [chunk async for chunk in transport.stream(_frames(*frames))]
+    # Every frame is flushed, so it decodes as soon as its chunk arrives
+    for frame, chunk in zip(frames, chunks, strict=False):
+        assert decompressor.decompress(chunk).decode() == frame
+    assert decompressor.decompress(chunks[-1]) + decompressor.flush() == b""
+    assert decompressor.eof
+    # Repeated keys compress against earlier frames
+    assert sum(len(chunk) for chunk in chunks) < sum(len(frame) for frame in frames)
+
+
+@pytest.mark.asyncio
+async def test_stream_endpoint_negotiates_gzip(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def _noop_attach(_agency: Any) -> None:
+        return None
+
+    monkeypatch.setattr(
+        "agency_swarm.integrations.fastapi_utils.endpoint_handlers.attach_persistent_mcp_servers",
+        _noop_attach,
+    )
+
+    default_handler = make_stream_endpoint(
+        BaseRequest, lambda **_kwargs: _StubAgency(), lambda: None, ActiveRunRegistry()
+    )
+    plain = await default_handler(
+        http_request=_HeaderRequest({"Accept-Encoding": "gzip"}),
+        request=BaseRequest(message="hi"),
+        token=None,
+    )
+    assert "content-encoding" not in plain.headers
+    await plain.body_iterator.aclose()
+
+    handler = make_stream_endpoint(
+        BaseRequest, lambda **_kwargs: _StubAgency(), lambda: None, ActiveRunRegistry(), stream_compression=True
+    )
+    response = await handler(
+        http_request=_HeaderRequest({"Accept-Encoding": "gzip"}),
+        request=BaseRequest(message="hi"),
+        token=None,
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.media_type == SSE_MEDIA_TYPE
+
+    chunks = [chunk async for chunk in response.body_iterator]
+    text = zlib.decompress(b"".join(chunks), wbits=31).decode()
+    data_lines = [json.loads(line[6:]) for line in text.splitlines() if line.startswith("data: {")]
+    assert [str(payload["data"]["index"]) for payload in data_lines if "data" in payload] == ["0", "1", "2"]
+    assert text.endswith("event: end\ndata: [DONE]\n\n")
+
+
+@pytest.mark.asyncio
+async def test_msgpack_framing_round_trips() -> None:
+    msgpack = pytest.importorskip("msgpack")
+
+    transport = StreamEncoder.negotiate(
+        {"Accept": MSGPACK_MEDIA_TYPE, "Accept-Encoding": "gzip"}, allow_compression=True
+    )
+    assert transport.binary is True
+    assert transport.media_type == MSGPACK_MEDIA_TYPE
+
+    frames = [
+        transport.event({"run_id": "r"}, "meta"),
+        transport.event({"data": {"x": 1}}),
+        transport.event("[DONE]", "end"),
+    ]
+    body = b"".join([chunk async for chunk in transport.stream(_frames(*frames))])
+    unpacker = msgpack.Unpacker()
+    unpacker.feed(zlib.decompress(body, wbits=31))
+    assert list(unpacker) == [
+        {"event": "meta", "data": {"run_id": "r"}},
+        {"event": "message", "data": {"data": {"x": 1}}},
+        {"event": "end", "data": "[DONE]"},
+    ]
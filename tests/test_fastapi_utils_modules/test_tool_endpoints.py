@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import threading
+import time
 from datetime import datetime
 from types import SimpleNamespace
 from typing import Any, cast
@@ -11,7 +14,7 @@ from agents.tool_context import ToolContext
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
-from agency_swarm.integrations.fastapi_utils.tool_endpoints import make_tool_endpoint
+from agency_swarm.integrations.fastapi_utils.tool_endpoints import ToolExecutor, make_tool_endpoint
 from agency_swarm.tools import BaseTool
 
 
@@ -253,3 +256,79 @@ async def test_make_tool_endpoint_invokes_sdk_agent_tool_with_manual_tool_contex
     assert seen_contexts[0].tool_name == "nested_tool"
     assert seen_contexts[0].tool_arguments == '{"input":"ok"}'
     assert seen_contexts[0].tool_call_id == "agency_swarm_manual_nested_tool"
+
+
+class SlowTool(BaseTool):
+    delay: float
+
+    def run(self) -> str:
+        time.sleep(self.delay)
+        return threading.current_thread().name
+
+
+class SequentialSlowTool(SlowTool):
+    class ToolConfig:
+        one_call_at_a_time = True
+
+
+@pytest.mark.asyncio
+async def test_sync_tool_runs_off_the_event_loop() -> None:
+    executor = ToolExecutor(max_workers=2)
+    handler = make_tool_endpoint(SlowTool, verify_token=_fake_verify_token, executor=executor)
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        response = await handler(request_data=SlowTool(delay=0.3), token="ignored")
+    finally:
+        ticker_task.cancel()
+        executor.shutdown()
+
+    assert response["response"].startswith("agency-tool")
+    # The loop kept serving other work while the tool slept in a worker thread
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_tool_limit_queues_calls_and_reports_metrics() -> None:
+    executor = ToolExecutor(max_workers=4, tool_limits={"SlowTool": 1})
+    handler = make_tool_endpoint(SlowTool, verify_token=_fake_verify_token, executor=executor)
+
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(handler(request_data=SlowTool(delay=0.1), token="ignored") for _ in range(3)))
+    elapsed = time.perf_counter() - started
+    executor.shutdown()
+
+    assert all("response" in response for response in responses)
+    assert elapsed >= 0.28
+    metrics = executor.metrics()["SlowTool"]
+    assert metrics["completed"] == 3
+    assert metrics["queued"] == 0
+    assert metrics["active"] == 0
+    assert metrics["max_wait_seconds"] >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_one_call_at_a_time_tool_rejects_overlapping_calls() -> None:
+    executor = ToolExecutor(max_workers=2)
+    handler = make_tool_endpoint(SequentialSlowTool, verify_token=_fake_verify_token, executor=executor)
+
+    first, second = await asyncio.gather(
+        handler(request_data=SequentialSlowTool(delay=0.2), token="ignored"),
+        handler(request_data=SequentialSlowTool(delay=0.0), token="ignored"),
+    )
+    third = await handler(request_data=SequentialSlowTool(delay=0.0), token="ignored")
+    executor.shutdown()
+
+    assert "response" in first
+    assert isinstance(second, JSONResponse)
+    assert second.status_code == 409
+    assert b"Tool concurrency violation" in second.body
+    assert "response" in third
+    assert executor.metrics()["SequentialSlowTool"]["rejected"] == 1
@@ -0,0 +1,106 @@
+from typing import Any
+
+import pytest
+from agents import TResponseInputItem
+
+from agency_swarm import Agency, Agent, HistoryCompaction, SlidingWindow, SummaryCheckpoint, TruncateToolOutputs
+from agency_swarm.messages import MessageFilter
+from agency_swarm.messages.history_compaction import estimate_history_tokens, is_history_checkpoint
+from agency_swarm.tools import function_tool
+from tests.deterministic_model import DeterministicModel
+
+
+def _turn(index: int, *, output: str = "done") -> list[dict[str, Any]]:
+    call_id = f"call_{index}"
+    return [
+        {"role": "user", "type": "message", "content": f"question {index}"},
+        {"type": "function_call", "call_id": call_id, "name": "lookup", "arguments": "{}"},
+        {"type": "function_call_output", "call_id": call_id, "output": output},
+        {"role": "assistant", "type": "message", "content": f"answer {index}"},
+    ]
+
+
+def _history(turns: int, **kwargs: Any) -> list[TResponseInputItem]:
+    return [item for index in range(turns) for item in _turn(index, **kwargs)]  # type: ignore[misc]
+
+
+def test_history_under_budget_is_returned_unchanged() -> None:
+    history = _history(3)
+    assert HistoryCompaction(max_tokens=10_000).compact(history) is history
+
+
+def test_sliding_window_cuts_at_turn_boundaries() -> None:
+    history = _history(50)
+    compacted = HistoryCompaction(max_tokens=400, policies=(SlidingWindow(),)).compact(history)
+
+    assert estimate_history_tokens(compacted) <= 300
+    assert compacted[0]["role"] == "user"
+    assert compacted[-4:] == history[-4:]
+    assert MessageFilter.remove_orphaned_messages(compacted) == compacted
+
+
+def test_tool_outputs_are_truncated_before_turns_are_dropped() -> None:
+    history = _history(4, output="x" * 5000)
+    compacted = HistoryCompaction(
+        max_tokens=3000, policies=(TruncateToolOutputs(max_chars=100), SlidingWindow())
+    ).compact(history)
+
+    assert len(compacted) == len(history)
+    outputs = [item["output"] for item in compacted if item.get("type") == "function_call_output"]
+    assert outputs[-1] == "x" * 5000
+    assert outputs[0].startswith("x" * 100 + "\n...[truncated 4900 characters]")
+    assert history[2]["output"] == "x" * 5000
+
+
+def test_summary_checkpoint_supersedes_earlier_history() -> None:
+    history = _history(40)
+    compaction = HistoryCompaction(max_tokens=500, policies=(SummaryCheckpoint(keep_last_turns=2),))
+
+    compacted = compaction.compact(history)
+
+    assert is_history_checkpoint(compacted[0])
+    assert "user: question 0" in compacted[0]["content"]
+    assert compacted[1:] == history[-len(compacted) + 1 :]
+    # A stored checkpoint hides everything before it on the next run
+    assert compaction.compact(history[:-8] + compacted) == compacted
+
+
+@pytest.mark.asyncio
+async def test_input_stays_bounded_over_a_thousand_turns() -> None:
+    recorded_inputs: list[list[TResponseInputItem]] = []
+
+    class RecordingModel(DeterministicModel):
+        async def get_response(self, system_instructions, input, *args, **kwargs):
+            recorded_inputs.append(list(input) if isinstance(input, list) else [])
+            return await super().get_response(system_instructions, input, *args, **kwargs)
+
+    @function_tool
+    def echo_tool(message: str) -> str:
+        """Echo the message back."""
+        return message * 20
+
+    agent = Agent(
+        name="LongThread",
+        model=RecordingModel(),
+        tools=[echo_tool],
+        history_compaction=HistoryCompaction(
+            max_tokens=2000,
+            policies=(TruncateToolOutputs(max_chars=200), SummaryCheckpoint(max_summary_chars=1200)),
+        ),
+    )
+    agency = Agency(agent)
+
+    for turn in range(1000):
+        message = f"echo 'payload {turn} {'y' * 40}'" if turn % 5 == 0 else f"task number {turn}"
+        await agency.get_response(message)
+
+    sizes = [estimate_history_tokens(items) for items in recorded_inputs]
+    assert max(sizes) < 3000
+    assert max(sizes[-200:]) <= max(sizes[:200]) + 1000
+    for items in recorded_inputs:
+        assert MessageFilter.remove_orphaned_messages(items) == items
+
+    stored = agency.thread_manager.get_all_messages()
+    assert sum(1 for message in stored if is_history_checkpoint(message)) > 10
+    assert not any("history_checkpoint" in item for items in recorded_inputs for item in items)
+    assert agency.thread_manager.estimated_tokens("LongThread") < 2000
@@ -0,0 +1,83 @@
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from agents.stream_events import RunItemStreamEvent
+
+from agency_swarm import Agency, Agent
+from agency_swarm.utils.cost_ledger import CostLedger
+from agency_swarm.utils.usage_tracking import (
+    calculate_openai_cost,
+    calculate_usage_with_cost,
+    extract_usage_from_run_result,
+)
+from tests.deterministic_model import DeterministicModel, _stream_output_item_events
+
+PRICED_MODEL = "gpt-4o"
+
+
+class _PricedStreamingModel(DeterministicModel):
+    """Streams what DeterministicModel.get_response returns and is priced as a real model."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._agency_swarm_usage_model_name = PRICED_MODEL
+
+    def stream_response(self, system_instructions: Any, input: Any, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        async def _events() -> AsyncIterator[Any]:
+            response = await self.get_response(system_instructions, input, *args, **kwargs)
+            async for event in _stream_output_item_events(response.output, self.model):
+                yield event
+
+        return _events()
+
+
+def _make_agency() -> Agency:
+    coordinator = Agent(name="Coordinator", instructions="Delegate to Worker.", model=_PricedStreamingModel())
+    worker = Agent(name="Worker", instructions="Handle tasks.", model=_PricedStreamingModel())
+    return Agency(coordinator, worker, communication_flows=[coordinator > worker])
+
+
+@pytest.mark.asyncio
+async def test_ledger_is_updated_while_the_stream_runs() -> None:
+    stream = _make_agency().get_response_stream("Ask Worker to handle task-001")
+    seen_mid_stream: list[dict[str, int]] = []
+    async for event in stream:
+        if isinstance(event, RunItemStreamEvent) and event.item.type == "tool_call_output_item":
+            ledger = stream.cost_ledger
+            assert ledger is not None
+            seen_mid_stream.append({agent: stats.request_count for agent, stats in ledger.by_agent.items()})
+
+    result = stream.final_result
+    ledger = stream.cost_ledger
+    assert seen_mid_stream and seen_mid_stream[0]["Coordinator"] == 1 and seen_mid_stream[0]["Worker"] >= 1
+    assert set(ledger.by_agent) == {"Coordinator", "Worker"}
+    assert ledger.total.request_count == sum(stats.request_count for stats in ledger.by_agent.values())
+    assert ledger.total_cost == pytest.approx(calculate_openai_cost(PRICED_MODEL, 0, ledger.total.output_tokens))
+    assert result.cost_ledger is ledger
+
+
+@pytest.mark.asyncio
+async def test_post_run_cost_matches_the_ledger() -> None:
+    result = await _make_agency().get_response("Ask Worker to handle task-002")
+
+    usage = calculate_usage_with_cost(extract_usage_from_run_result(result), run_result=result)
+    ledger = result.cost_ledger
+    del result.cost_ledger
+    repriced = calculate_usage_with_cost(extract_usage_from_run_result(result), run_result=result)
+
+    assert ledger.total_cost > 0
+    assert usage.total_cost == ledger.total_cost
+    assert repriced.total_cost == pytest.approx(ledger.total_cost)
+    assert usage.request_count == ledger.total.request_count
+
+
+@pytest.mark.asyncio
+async def test_each_top_level_run_gets_its_own_ledger() -> None:
+    agency = _make_agency()
+    first = await agency.get_response("hello")
+    second = await agency.get_response("hello again")
+
+    assert isinstance(first.cost_ledger, CostLedger)
+    assert first.cost_ledger is not second.cost_ledger
+    assert first.cost_ledger.total.request_count == 1
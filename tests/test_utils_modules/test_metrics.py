@@ -0,0 +1,87 @@
+from collections.abc import Iterator
+
+import pytest
+
+from agency_swarm.streaming.utils import StreamingContext
+from agency_swarm.utils.metrics import MetricFamily, MetricsRegistry, get_metrics_registry, set_metrics_registry
+from agency_swarm.utils.run_timings import RunTimings
+
+
+@pytest.fixture
+def registry() -> Iterator[MetricsRegistry]:
+    registry = MetricsRegistry()
+    previous = set_metrics_registry(registry)
+    try:
+        yield registry
+    finally:
+        set_metrics_registry(previous)
+
+
+def _lines(registry: MetricsRegistry) -> list[str]:
+    return registry.render_prometheus().splitlines()
+
+
+def test_render_prometheus_text_format() -> None:
+    registry = MetricsRegistry(include_builtin_collectors=False)
+    registry.counter("jobs_total", "Jobs run.", ("kind",)).inc(kind="a")
+    registry.counter("jobs_total", "Jobs run.", ("kind",)).inc(2, kind='b"x')
+    registry.gauge("depth", "Queue depth.").set(3)
+    histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    registry.register_collector(lambda: [MetricFamily("pool_size", "gauge", "Pool size.").add(4, pool="p")])
+
+    assert _lines(registry) == [
+        "# HELP jobs_total Jobs run.",
+        "# TYPE jobs_total counter",
+        'jobs_total{kind="a"} 1',
+        'jobs_total{kind="b\\"x"} 2',
+        "# HELP depth Queue depth.",
+        "# TYPE depth gauge",
+        "depth 3",
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 2.65",
+        "latency_seconds_count 4",
+        "# HELP pool_size Pool size.",
+        "# TYPE pool_size gauge",
+        'pool_size{pool="p"} 4',
+    ]
+    with pytest.raises(ValueError, match="already registered"):
+        registry.gauge("jobs_total", "Jobs run.")
+
+
+def test_disabled_registry_drops_updates() -> None:
+    registry = MetricsRegistry(enabled=False, include_builtin_collectors=False)
+    registry.counter("jobs_total", "Jobs run.").inc()
+    registry.histogram("latency_seconds", "Latency.").observe(1.0)
+    assert "jobs_total 0" not in registry.render_prometheus()
+    assert registry.histogram("latency_seconds", "Latency.").count() == 0
+
+
+def test_builtin_collectors_read_live_streaming_contexts(registry: MetricsRegistry) -> None:
+    context = StreamingContext()
+    context.event_queue.put_nowait("event")
+    context.event_queue.put_nowait("event")
+
+    lines = _lines(registry)
+    assert "agency_swarm_streaming_queue_depth 2" in lines
+    assert get_metrics_registry() is registry
+
+
+def test_run_timings_feed_model_latency_and_time_to_first_token(registry: MetricsRegistry) -> None:
+    timings = RunTimings()
+    timings.register_run("run_1", agent="Worker", parent_run_id=None)
+    timings.model_started(1, streaming=True)
+    timings.observe_stream_event(1, "response.created")
+    timings.observe_stream_event(1, "response.output_text.delta")
+    timings.model_finished(1, "run_1")
+    timings.tool_started(1, "call_1")
+    timings.tool_finished(1, "call_1", "run_1", tool_name="lookup")
+
+    assert registry.histogram("agency_swarm_time_to_first_token_seconds", "").count() == 1
+    assert registry.histogram("agency_swarm_model_call_seconds", "", ("agent",)).count(agent="Worker") == 1
+    assert registry.histogram("agency_swarm_tool_call_seconds", "", ("tool",)).count(tool="lookup") == 1
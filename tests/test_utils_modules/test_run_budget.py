@@ -0,0 +1,256 @@
+import asyncio
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from agents import RunContextWrapper, function_tool
+from agents.usage import InputTokensDetails, OutputTokensDetails, Usage
+from openai.types.responses import ResponseUsage
+
+from agency_swarm import Agency, Agent, BroadcastSendMessage, BudgetExceededError, RunBudget
+from agency_swarm.utils.cost_ledger import CostLedger
+from agency_swarm.utils.run_hooks import with_run_hooks
+from tests.deterministic_model import DeterministicModel, _build_tool_call_response, _stream_output_item_events
+
+TOKENS_PER_CALL = 100
+
+
+class _MeteredModel(DeterministicModel):
+    """Reports a fixed synthetic usage for every response and counts its calls."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    async def get_response(self, *args: Any, **kwargs: Any):
+        self.calls += 1
+        response = await super().get_response(*args, **kwargs)
+        response.usage = Usage(
+            requests=1,
+            input_tokens=TOKENS_PER_CALL - 10,
+            output_tokens=10,
+            total_tokens=TOKENS_PER_CALL,
+            input_tokens_details=InputTokensDetails(cached_tokens=0),
+            output_tokens_details=OutputTokensDetails(reasoning_tokens=0),
+        )
+        return response
+
+    def stream_response(self, system_instructions: Any, input: Any, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        async def _events() -> AsyncIterator[Any]:
+            response = await self.get_response(system_instructions, input, *args, **kwargs)
+            async for event in _stream_output_item_events(response.output, self.model):
+                if event.type == "response.completed":
+                    event.response.usage = ResponseUsage(
+                        input_tokens=TOKENS_PER_CALL - 10,
+                        input_tokens_details={"cached_tokens": 0},
+                        output_tokens=10,
+                        output_tokens_details={"reasoning_tokens": 0},
+                        total_tokens=TOKENS_PER_CALL,
+                    )
+                yield event
+
+        return _events()
+
+
+class _FanOutModel(DeterministicModel):
+    """Broadcasts one task to Fast and one to Slow."""
+
+    async def get_response(self, *args: Any, **kwargs: Any):
+        messages = [
+            {"recipient_agent": "Fast", "message": "echo 'ping'", "additional_instructions": ""},
+            {"recipient_agent": "Slow", "message": "Handle task-006", "additional_instructions": ""},
+        ]
+        return _build_tool_call_response("send_message_broadcast", {"messages": messages})
+
+
+class _HangingModel(DeterministicModel):
+    """Never answers; records the task it blocks and whether that task was cancelled."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = asyncio.Event()
+        self.task: asyncio.Task[Any] | None = None
+        self.cancelled = False
+
+    async def get_response(self, *args: Any, **kwargs: Any):
+        self.task = asyncio.current_task()
+        self.started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+class _WaitingMeteredModel(_MeteredModel):
+    """Answers only once ``gate`` is set, so the other sub-agent call is already in flight."""
+
+    def __init__(self, gate: asyncio.Event) -> None:
+        super().__init__()
+        self.gate = gate
+
+    async def get_response(self, *args: Any, **kwargs: Any):
+        await self.gate.wait()
+        return await super().get_response(*args, **kwargs)
+
+
+def _make_agency() -> tuple[Agency, _MeteredModel, _MeteredModel]:
+    coordinator_model, worker_model = _MeteredModel(), _MeteredModel()
+    coordinator = Agent(name="Coordinator", instructions="Delegate to Worker.", model=coordinator_model)
+    worker = Agent(name="Worker", instructions="Handle tasks.", model=worker_model)
+    return Agency(coordinator, worker, communication_flows=[coordinator > worker]), coordinator_model, worker_model
+
+
+def _assert_tool_calls_have_outputs(messages: list[dict[str, Any]]) -> None:
+    calls = {m["call_id"] for m in messages if m.get("type") == "function_call"}
+    outputs = {m["call_id"] for m in messages if m.get("type") == "function_call_output"}
+    assert calls == outputs
+
+
+@pytest.mark.asyncio
+async def test_budget_stops_the_sub_agent_and_its_caller() -> None:
+    agency, coordinator_model, worker_model = _make_agency()
+
+    with pytest.raises(BudgetExceededError) as exc_info:
+        await agency.get_response("Ask Worker to handle task-001", run_budget=RunBudget(max_tokens=TOKENS_PER_CALL))
+
+    error = exc_info.value
+    assert (error.agent_name, error.limit, error.total_tokens) == ("Worker", "tokens", TOKENS_PER_CALL)
+    assert (coordinator_model.calls, worker_model.calls) == (1, 0)
+    _assert_tool_calls_have_outputs(agency.thread_manager.get_all_messages())
+
+    # The budget belongs to that run only
+    follow_up = await agency.get_response("Ask Worker to handle task-002")
+    assert "TASK_COMPLETED" in follow_up.final_output
+    assert follow_up.cost_ledger.budget is None
+
+
+@pytest.mark.asyncio
+async def test_streaming_run_emits_one_budget_event() -> None:
+    agency, _coordinator_model, worker_model = _make_agency()
+
+    stream = agency.get_response_stream(
+        "Ask Worker to handle task-003", run_budget=RunBudget(max_tokens=2 * TOKENS_PER_CALL)
+    )
+    budget_events = [
+        event async for event in stream if isinstance(event, dict) and event.get("error_type") == "budget_exceeded"
+    ]
+
+    assert len(budget_events) == 1
+    assert budget_events[0]["agent"] == "Coordinator"
+    assert budget_events[0]["total_tokens"] == 2 * TOKENS_PER_CALL
+    assert budget_events[0]["max_tokens"] == 2 * TOKENS_PER_CALL
+    assert worker_model.calls == 1
+    assert stream.cost_ledger.budget_error is not None
+    _assert_tool_calls_have_outputs(agency.thread_manager.get_all_messages())
+
+
+@pytest.mark.asyncio
+async def test_cost_limit_uses_priced_responses() -> None:
+    agency, coordinator_model, worker_model = _make_agency()
+    for model in (coordinator_model, worker_model):
+        model._agency_swarm_usage_model_name = "gpt-4o"
+
+    first = await agency.get_response("Ask Worker to handle task-004", run_budget=RunBudget(max_cost_usd=1.0))
+    per_call_cost = first.cost_ledger.total_cost / first.cost_ledger.total.request_count
+    assert per_call_cost > 0
+
+    with pytest.raises(BudgetExceededError) as exc_info:
+        await agency.get_response("Ask Worker to handle task-005", run_budget=RunBudget(max_cost_usd=per_call_cost))
+    assert (exc_info.value.agent_name, exc_info.value.limit) == ("Worker", "cost")
+
+
+@pytest.mark.asyncio
+async def test_budget_stop_cancels_parallel_sub_agent_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    slow_model = _HangingModel()
+    fast_model = _WaitingMeteredModel(slow_model.started)
+
+    @function_tool
+    def echo_tool(message: str) -> str:
+        """Echo the message back."""
+        return message
+
+    coordinator = Agent(name="Coordinator", instructions="Fan out.", model=_FanOutModel())
+    fast = Agent(name="Fast", instructions="Echo.", model=fast_model, tools=[echo_tool])
+    slow = Agent(name="Slow", instructions="Think.", model=slow_model)
+    agency = Agency(
+        coordinator,
+        fast,
+        slow,
+        communication_flows=[coordinator > fast, coordinator > slow],
+        send_message_tool_class=BroadcastSendMessage,
+    )
+
+    # Whether Slow's cancellation was already requested when Fast's call returned with the budget error
+    slow_cancelled_before_fast_returned: list[bool] = []
+    run_recipient_call = BroadcastSendMessage._run_recipient_call
+
+    async def _record_fast_return(self, wrapper, recipient_agent, *args: Any) -> str:
+        try:
+            return await run_recipient_call(self, wrapper, recipient_agent, *args)
+        finally:
+            if recipient_agent.name == "Fast":
+                assert slow_model.task is not None
+                slow_cancelled_before_fast_returned.append(slow_model.task.cancelling() > 0 or slow_model.task.done())
+
+    monkeypatch.setattr(BroadcastSendMessage, "_run_recipient_call", _record_fast_return)
+
+    with pytest.raises(BudgetExceededError) as exc_info:
+        await asyncio.wait_for(
+            agency.get_response("Fan out task-006", run_budget=RunBudget(max_tokens=TOKENS_PER_CALL)), timeout=5
+        )
+
+    assert exc_info.value.agent_name == "Fast"
+    assert fast_model.calls == 1
+    assert slow_model.cancelled
+    assert slow_cancelled_before_fast_returned == [True]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_sub_agent_call_raises_the_budget_error() -> None:
+    ledger = CostLedger(RunBudget(max_tokens=1))
+    blocked = asyncio.Event()
+
+    async def _blocked_call() -> None:
+        with ledger.track_sub_agent_call():
+            blocked.set()
+            await asyncio.Event().wait()
+
+    async def _spending_call() -> None:
+        with ledger.track_sub_agent_call():
+            await blocked.wait()
+            ledger.total.total_tokens = 1
+            ledger.check_budget("Spender")
+
+    blocked_task = asyncio.create_task(_blocked_call())
+    spending_task = asyncio.create_task(_spending_call())
+    results = await asyncio.wait_for(asyncio.gather(blocked_task, spending_task, return_exceptions=True), timeout=5)
+
+    assert results[0] is ledger.budget_error
+    assert isinstance(results[1], BudgetExceededError)
+    assert blocked_task.cancelling() == 0
+    assert ledger._sub_agent_calls == {}
+
+
+def test_budget_validation() -> None:
+    with pytest.raises(ValueError):
+        RunBudget()
+    with pytest.raises(ValueError):
+        RunBudget(max_tokens=0)
+    with pytest.raises(ValueError):
+        RunBudget(max_cost_usd=-1.0)
+    assert RunBudget(max_tokens=10).reached_limit(10, 0.0) == "tokens"
+    assert RunBudget(max_tokens=10, max_cost_usd=0.5).reached_limit(9, 0.5) == "cost"
+    assert RunBudget(max_tokens=10).reached_limit(9, 100.0) is None
+
+
+@pytest.mark.asyncio
+async def test_budget_is_enforced_without_timing_hooks() -> None:
+    ledger = CostLedger(RunBudget(max_tokens=1))
+    ledger.total.total_tokens = 1
+    hooks = with_run_hooks(None, timing=False)
+    context = RunContextWrapper(context=SimpleNamespace(cost_ledger=ledger, run_timings=None))
+
+    with pytest.raises(BudgetExceededError):
+        await hooks.on_llm_start(context, Agent(name="Solo", model=DeterministicModel()), None, [])
@@ -0,0 +1,127 @@
+import pytest
+from agents import ModelSettings
+
+from agency_swarm import Agency, Agent
+from agency_swarm.utils.run_timings import RunTimings
+from tests.deterministic_model import DeterministicModel
+
+
+def _make_agency() -> Agency:
+    coordinator = Agent(
+        name="Coordinator",
+        instructions="Delegate work to Worker when asked.",
+        model=DeterministicModel(),
+        model_settings=ModelSettings(temperature=0.0),
+    )
+    worker = Agent(
+        name="Worker",
+        instructions="Handle delegated tasks.",
+        model=DeterministicModel(default_response="Worker done"),
+        model_settings=ModelSettings(temperature=0.0),
+    )
+    return Agency(coordinator, worker, communication_flows=[coordinator > worker])
+
+
+def _spans(timings: RunTimings, name: str, agent: str | None = None) -> list:
+    return [span for span in timings.spans if span.name == name and (agent is None or span.agent == agent)]
+
+
+def test_span_records_duration_and_run_totals() -> None:
+    timings = RunTimings()
+    timings.register_run("run_1", agent="A", parent_run_id=None)
+
+    with timings.span("persistence", agent_run_id="run_1", phase="final"):
+        pass
+    timings.add_duration("queueing", 0.5, agent_run_id="run_1")
+
+    [span] = timings.spans
+    assert span.agent == "A"
+    assert span.attributes == {"phase": "final"}
+    payload = timings.to_dict()
+    assert payload["runs"]["run_1"]["totals"]["queueing"] == 0.5
+    assert set(payload["totals"]) == {"persistence", "queueing"}
+
+
+def test_stream_events_are_matched_to_model_calls_in_order() -> None:
+    timings = RunTimings()
+    timings.model_started(1, streaming=True)
+    timings.model_finished(1, "run_1")
+    timings.model_started(1, streaming=True)
+    timings.model_finished(1, "run_1")
+
+    # A lagging consumer sees both calls' events only after both calls ended
+    first, second = timings.spans
+    for event_type in ("response.created", "response.output_text.delta", "response.output_text.delta"):
+        timings.observe_stream_event(1, event_type)
+    assert "time_to_first_token" in first.attributes
+    assert "time_to_first_token" not in second.attributes
+
+    timings.observe_stream_event(1, "response.created")
+    timings.observe_stream_event(1, "response.output_text.delta")
+    assert "time_to_first_token" in second.attributes
+
+
+@pytest.mark.asyncio
+async def test_get_response_records_spans_across_send_message_hop() -> None:
+    agency = _make_agency()
+
+    result = await agency.get_response("Ask Worker to handle task-123")
+
+    timings = result.timings
+    assert isinstance(timings, RunTimings)
+    assert len(_spans(timings, "model", "Coordinator")) == 2
+    assert len(_spans(timings, "model", "Worker")) == 1
+    [tool_span] = _spans(timings, "tool", "Coordinator")
+    assert tool_span.attributes["tool"] == "send_message"
+
+    # The Worker run is linked to the send_message call that started it
+    [worker_model] = _spans(timings, "model", "Worker")
+    assert worker_model.parent_run_id == tool_span.attributes["call_id"]
+    assert {span.agent for span in _spans(timings, "history_preparation")} == {"Coordinator", "Worker"}
+    assert _spans(timings, "persistence", "Worker")
+
+
+@pytest.mark.asyncio
+async def test_get_response_stream_records_time_to_first_token() -> None:
+    agency = _make_agency()
+
+    stream = agency.get_response_stream("Hello")
+    async for _event in stream:
+        pass
+
+    timings = stream.final_result.timings
+    [model_span] = _spans(timings, "model", "Coordinator")
+    assert "time_to_first_token" in model_span.attributes
+    assert _spans(timings, "persistence", "Coordinator")
+
+
+@pytest.mark.asyncio
+async def test_record_timings_false_skips_the_recorder_for_the_whole_run(monkeypatch) -> None:
+    agency = _make_agency()
+    created: list[RunTimings] = []
+    original_init = RunTimings.__init__
+
+    def counting_init(self: RunTimings) -> None:
+        created.append(self)
+        original_init(self)
+
+    monkeypatch.setattr(RunTimings, "__init__", counting_init)
+
+    result = await agency.get_response("Ask Worker to handle task-456", record_timings=False)
+
+    assert result.timings is None
+    assert created == []
+    # The cost ledger does not depend on timings
+    assert set(result.cost_ledger.by_agent) == {"Coordinator", "Worker"}
+
+
+def test_sub_agent_runs_follow_the_callers_record_timings_flag() -> None:
+    from types import SimpleNamespace
+
+    from agency_swarm.utils.run_timings import resolve_run_timings
+
+    # A cost ledger on the context says nothing about timings
+    ledger_only = SimpleNamespace(run_timings=None, cost_ledger=object(), record_timings=None)
+    assert isinstance(resolve_run_timings(ledger_only, True), RunTimings)
+    assert resolve_run_timings(SimpleNamespace(run_timings=None, record_timings=False), True) is None
+    assert isinstance(resolve_run_timings(SimpleNamespace(run_timings=None, record_timings=True), False), RunTimings)
@@ -23,6 +23,7 @@ from openai.types.responses.response_usage import InputTokensDetails, OutputToke
 from agency_swarm.agent.core import Agent
 from agency_swarm.context import MasterContext
 from agency_swarm.utils import usage_tracking
+from agency_swarm.utils.metrics import MetricsRegistry, set_metrics_registry
 from agency_swarm.utils.thread import ThreadManager
 from agency_swarm.utils.usage_tracking import (
     UsageStats,
@@ -32,6 +33,7 @@ from agency_swarm.utils.usage_tracking import (
     format_usage_for_display,
     get_model_pricing,
     load_pricing_data,
+    observe_prompt_cache_usage,
 )
 
 
@@ -448,6 +450,35 @@ def test_get_model_pricing_resolves_provider_and_version_fallbacks() -> None:
     assert get_model_pricing("missing-model", pricing_data) is None
 
 
+def test_pricing_index_resolves_each_name_once_and_picks_the_highest_crossed_tier(monkeypatch) -> None:
+    pricing_data = {
+        "tiered": {
+            "input_cost_per_token": 1.0,
+            "input_cost_per_token_above_200k_tokens": 3.0,
+            "input_cost_per_token_above_100k_tokens": 2.0,
+        }
+    }
+    index = usage_tracking.get_pricing_index(pricing_data)
+    resolutions: list[str] = []
+    resolve = usage_tracking._resolve_model_pricing
+
+    def counting_resolve(model_name: str, data: usage_tracking.PricingData) -> dict[str, float] | None:
+        resolutions.append(model_name)
+        return resolve(model_name, data)
+
+    monkeypatch.setattr(usage_tracking, "_resolve_model_pricing", counting_resolve)
+    for _ in range(3):
+        assert get_model_pricing("openai/tiered", pricing_data) is pricing_data["tiered"]
+    assert resolutions == ["openai/tiered"]
+    assert usage_tracking.get_pricing_index(pricing_data) is index
+
+    model_pricing = pricing_data["tiered"]
+    assert index.token_price(model_pricing, "input_cost_per_token", 100_000) == 1.0
+    assert index.token_price(model_pricing, "input_cost_per_token", 150_000) == 2.0
+    assert index.token_price(model_pricing, "input_cost_per_token", 250_000) == 3.0
+    assert index.token_price(model_pricing, "cache_read_input_token_cost", 250_000, default=1.5) == 1.5
+
+
 def test_calculate_openai_cost_handles_cached_and_reasoning_tokens() -> None:
     pricing_data = {
         "test/model": {
@@ -577,7 +608,32 @@ def test_format_usage_for_display_includes_optional_fields() -> None:
     formatted = format_usage_for_display(usage_stats, model_name="gpt-5.6-luna")
     assert "Model: gpt-5.6-luna" in formatted
     assert "Requests: 2" in formatted
-    assert "Cached: 3" in formatted
+    assert "Cached: 3 (30% of input)" in formatted
     assert "Reasoning: 2" in formatted
     assert "Audio: 1" in formatted
     assert "Cost: $1.234567" in formatted
+
+
+def test_observe_prompt_cache_usage_counts_cached_prompt_tokens() -> None:
+    registry = MetricsRegistry(include_builtin_collectors=False)
+    previous = set_metrics_registry(registry)
+    try:
+        for cached_tokens in (0, 800):
+            observe_prompt_cache_usage(
+                "Worker",
+                Usage(
+                    requests=1,
+                    input_tokens=1000,
+                    output_tokens=5,
+                    total_tokens=1005,
+                    input_tokens_details=InputTokensDetails(cached_tokens=cached_tokens),
+                    output_tokens_details=OutputTokensDetails(reasoning_tokens=0),
+                ),
+            )
+    finally:
+        set_metrics_registry(previous)
+
+    assert registry.counter("agency_swarm_prompt_input_tokens_total", "", ("agent",)).value(agent="Worker") == 2000
+    assert registry.counter("agency_swarm_prompt_cached_tokens_total", "", ("agent",)).value(agent="Worker") == 800
+    assert registry.counter("agency_swarm_prompt_cache_hits_total", "", ("agent",)).value(agent="Worker") == 1
+    assert UsageStats(input_tokens=2000, cached_tokens=800).cache_hit_ratio == 0.4